@@ -0,0 +1,83 @@
+"""Compare grep_search with and without the trigram index on a synthetic workspace.
+
+Usage: PYTHONPATH=src python benchmarks/grep_index.py [--files N] [--lines N] [--queries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.grep_search import GrepSearchTool
+from py_agent_runtime.tools.trigram_index import (
+    get_shared_trigram_index,
+    reset_shared_trigram_indexes,
+)
+
+_WORDS = (
+    "alpha beta gamma delta epsilon parser render config schedule token buffer "
+    "request response handler session policy registry message provider"
+).split()
+_OLD_NS = 1_000_000_000_000_000_000
+
+
+def _build_workspace(root: Path, files: int, lines: int, rng: random.Random) -> list[str]:
+    needles = [f"needle_{index:05d}" for index in range(files)]
+    for index in range(files):
+        path = root / f"pkg{index % 50:02d}" / f"module_{index:05d}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = [" ".join(rng.choices(_WORDS, k=8)) for _ in range(lines)]
+        body[rng.randrange(lines)] += f"  # {needles[index]}"
+        path.write_text("\n".join(body) + "\n", encoding="utf-8")
+        # Backdate so the index does not treat the files as racily modified.
+        os.utime(path, ns=(_OLD_NS, _OLD_NS))
+    return needles
+
+
+def _time_queries(config: RuntimeConfig, queries: list[str]) -> list[float]:
+    tool = GrepSearchTool()
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        result = tool.execute(config, {"query": query, "case_sensitive": True})
+        timings.append(time.perf_counter() - started)
+        assert result.error is None
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        needles = _build_workspace(root, args.files, args.lines, rng)
+        queries = rng.sample(needles, min(args.queries, len(needles)))
+
+        scan = _time_queries(RuntimeConfig(target_dir=root), queries)
+        started = time.perf_counter()
+        stats = get_shared_trigram_index(root).refresh()
+        build = time.perf_counter() - started
+        indexed = _time_queries(RuntimeConfig(target_dir=root, grep_index=True), queries)
+        reset_shared_trigram_indexes()
+
+    print(f"workspace: {args.files} files x {args.lines} lines")
+    print(f"index build: {build:.2f}s ({stats.added} files)")
+    print(f"full scan:   median {statistics.median(scan) * 1000:.1f} ms/query")
+    print(f"indexed:     median {statistics.median(indexed) * 1000:.1f} ms/query")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
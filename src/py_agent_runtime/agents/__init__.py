@@ -1,17 +1,67 @@
 """Agent runtime package (work in progress)."""
 
-from py_agent_runtime.agents.llm_runner import AgentRunResult, LLMAgentRunner
-from py_agent_runtime.agents.registry import AgentRegistry, get_model_config_alias
-from py_agent_runtime.agents.subagent_tool import SubagentTool, SubagentToolWrapper
-from py_agent_runtime.agents.types import AgentDefinition, AgentKind
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from py_agent_runtime.agents.batch_runner import BatchSession, run_batch_sessions
+    from py_agent_runtime.agents.checkpoint import SessionCheckpointer, load_session_state
+    from py_agent_runtime.agents.context_budget import CompactionStrategy, ContextBudgetManager
+    from py_agent_runtime.agents.llm_runner import AgentRunResult, LLMAgentRunner
+    from py_agent_runtime.agents.registry import AgentRegistry, get_model_config_alias
+    from py_agent_runtime.agents.subagent_tool import SubagentTool, SubagentToolWrapper
+    from py_agent_runtime.agents.task_pool import PromptTask, run_prompt_tasks
+    from py_agent_runtime.agents.types import AgentDefinition, AgentKind
+
+_LAZY_EXPORTS: dict[str, str] = {
+    "AgentRunResult": "py_agent_runtime.agents.llm_runner",
+    "AgentDefinition": "py_agent_runtime.agents.types",
+    "AgentKind": "py_agent_runtime.agents.types",
+    "AgentRegistry": "py_agent_runtime.agents.registry",
+    "BatchSession": "py_agent_runtime.agents.batch_runner",
+    "CompactionStrategy": "py_agent_runtime.agents.context_budget",
+    "ContextBudgetManager": "py_agent_runtime.agents.context_budget",
+    "LLMAgentRunner": "py_agent_runtime.agents.llm_runner",
+    "PromptTask": "py_agent_runtime.agents.task_pool",
+    "SessionCheckpointer": "py_agent_runtime.agents.checkpoint",
+    "SubagentTool": "py_agent_runtime.agents.subagent_tool",
+    "SubagentToolWrapper": "py_agent_runtime.agents.subagent_tool",
+    "get_model_config_alias": "py_agent_runtime.agents.registry",
+    "load_session_state": "py_agent_runtime.agents.checkpoint",
+    "run_batch_sessions": "py_agent_runtime.agents.batch_runner",
+    "run_prompt_tasks": "py_agent_runtime.agents.task_pool",
+}
 
 __all__ = [
     "AgentRunResult",
     "AgentDefinition",
     "AgentKind",
     "AgentRegistry",
+    "BatchSession",
+    "CompactionStrategy",
+    "ContextBudgetManager",
     "LLMAgentRunner",
+    "PromptTask",
+    "SessionCheckpointer",
     "SubagentTool",
     "SubagentToolWrapper",
     "get_model_config_alias",
+    "load_session_state",
+    "run_batch_sessions",
+    "run_prompt_tasks",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import replace
 
 from py_agent_runtime.runtime.config import RuntimeConfig
@@ -19,6 +20,65 @@ def schedule_agent_tools(
         replace(request, scheduler_id=scheduler_id, parent_call_id=parent_call_id)
         for request in requests
     ]
-    scheduler = Scheduler(config=config, tool_registry=tool_registry)
-    return scheduler.schedule(normalized_requests)
+    agent_names = set(config.get_agent_registry().get_all_agent_names())
+    subagent_indexes = [
+        index for index, request in enumerate(normalized_requests) if request.name in agent_names
+    ]
+    try:
+        if len(subagent_indexes) < 2:
+            scheduler = Scheduler(config=config, tool_registry=tool_registry)
+            return scheduler.schedule(normalized_requests)
+        return _schedule_with_parallel_subagents(
+            config, normalized_requests, set(subagent_indexes), tool_registry
+        )
+    finally:
+        # The turn's tool calls are done: group-commit their file writes (`turn` durability).
+        config.file_writer.flush()
+
+
+def _schedule_with_parallel_subagents(
+    config: RuntimeConfig,
+    requests: list[ToolCallRequestInfo],
+    subagent_indexes: set[int],
+    tool_registry: ToolRegistry | None,
+) -> list[CompletedToolCall]:
+    # Each subagent call gets its own child scheduler on a worker thread while a slot in the
+    # session-wide `subagent_slots` cap is free; otherwise it runs inline on this thread, so
+    # nested fan-out can never deadlock waiting for slots held by its own ancestors.
+    completed: dict[int, CompletedToolCall] = {}
+    workers: list[threading.Thread] = []
+    inline_indexes: list[int] = []
+
+    def _run_child(index: int, release_slot: bool) -> None:
+        try:
+            child = Scheduler(config=config, tool_registry=tool_registry)
+            completed[index] = child.schedule([requests[index]])[0]
+        finally:
+            if release_slot:
+                config.subagent_slots.release()
+
+    for index in sorted(subagent_indexes):
+        if config.subagent_slots.acquire(blocking=False):
+            worker = threading.Thread(
+                target=_run_child,
+                args=(index, True),
+                name=f"subagent:{requests[index].name}",
+                daemon=True,
+            )
+            worker.start()
+            workers.append(worker)
+        else:
+            inline_indexes.append(index)
 
+    other_indexes = [index for index in range(len(requests)) if index not in subagent_indexes]
+    if other_indexes:
+        scheduler = Scheduler(config=config, tool_registry=tool_registry)
+        for index, call in zip(
+            other_indexes, scheduler.schedule([requests[index] for index in other_indexes])
+        ):
+            completed[index] = call
+    for index in inline_indexes:
+        _run_child(index, False)
+    for worker in workers:
+        worker.join()
+    return [completed[index] for index in range(len(requests))]
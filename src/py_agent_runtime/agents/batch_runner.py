@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from py_agent_runtime.agents.llm_runner import AgentRunResult, LLMAgentRunner
+from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.batch import BatchBackend, BatchJobStatus, BatchRequest
+from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
+
+DEFAULT_MAX_CONCURRENT_SESSIONS = 256
+
+
+@dataclass(frozen=True)
+class BatchSession:
+    user_prompt: str
+    system_prompt: str | None = None
+
+
+class _PendingGenerate:
+    def __init__(self, request: BatchRequest) -> None:
+        self.request = request
+        self.response: LLMTurnResponse | None = None
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+
+class _BatchedProvider(LLMProvider):
+    def __init__(self, coordinator: BatchSessionCoordinator, session_index: int) -> None:
+        self._coordinator = coordinator
+        self._session_index = session_index
+        self._sequence = 0
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self._sequence += 1
+        request = BatchRequest(
+            custom_id=f"session-{self._session_index}-turn-{self._sequence}",
+            messages=tuple(messages),
+            tools=tuple(tools) if tools is not None else None,
+            model=model,
+            temperature=temperature,
+        )
+        return self._coordinator.enqueue(request)
+
+
+class BatchSessionCoordinator:
+    """Drive many `LLMAgentRunner` sessions through one batch job per step.
+
+    Up to `max_concurrent_sessions` sessions run at once, each on a pool thread
+    against a provider proxy that parks the session's next `generate` call. Once
+    every running session is parked, the pending requests are submitted as a single
+    job and each session resumes when the job's results are downloaded; a finished
+    session's thread picks up the next session that has not started yet.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        *,
+        poll_interval_seconds: float = 5.0,
+        max_concurrent_sessions: int = DEFAULT_MAX_CONCURRENT_SESSIONS,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if poll_interval_seconds < 0:
+            raise ValueError("poll_interval_seconds must be >= 0")
+        if max_concurrent_sessions < 1:
+            raise ValueError("max_concurrent_sessions must be >= 1")
+        self._backend = backend
+        self._poll_interval_seconds = poll_interval_seconds
+        self._max_concurrent_sessions = max_concurrent_sessions
+        self._sleep_fn = sleep_fn
+        self._condition = threading.Condition()
+        self._pending: list[_PendingGenerate] = []
+        self._queued: deque[int] = deque()
+        self._active_sessions = 0
+        self.jobs_submitted = 0
+
+    def run(
+        self,
+        sessions: Sequence[BatchSession],
+        runner_factory: Callable[[LLMProvider], LLMAgentRunner],
+    ) -> list[AgentRunResult]:
+        # Build every runner first, so a failing factory leaves no session parked.
+        runners = [runner_factory(_BatchedProvider(self, index)) for index in range(len(sessions))]
+        results: list[AgentRunResult | None] = [None] * len(sessions)
+        threads: list[threading.Thread] = []
+        with self._condition:
+            self._queued = deque(range(len(sessions)))
+            first_indexes = [
+                self._claim_locked()
+                for _ in range(min(self._max_concurrent_sessions, len(sessions)))
+            ]
+
+        for worker, index in enumerate(first_indexes):
+            thread = threading.Thread(
+                target=self._run_sessions,
+                args=(index, runners, sessions, results),
+                name=f"batch-session-{worker}",
+                daemon=True,
+            )
+            threads.append(thread)
+            thread.start()
+
+        while True:
+            with self._condition:
+                while self._active_sessions > len(self._pending):
+                    self._condition.wait()
+                if self._active_sessions == 0:
+                    break
+                batch = list(self._pending)
+                self._pending.clear()
+            self._dispatch(batch)
+
+        for thread in threads:
+            thread.join()
+        return [
+            result
+            if result is not None
+            else AgentRunResult(success=False, result=None, error="Session did not finish.", turns=0)
+            for result in results
+        ]
+
+    def enqueue(self, request: BatchRequest) -> LLMTurnResponse:
+        pending = _PendingGenerate(request)
+        with self._condition:
+            self._pending.append(pending)
+            self._condition.notify_all()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        assert pending.response is not None
+        return pending.response
+
+    def _run_sessions(
+        self,
+        index: int | None,
+        runners: list[LLMAgentRunner],
+        sessions: Sequence[BatchSession],
+        results: list[AgentRunResult | None],
+    ) -> None:
+        while index is not None:
+            session = sessions[index]
+            try:
+                results[index] = runners[index].run(
+                    session.user_prompt, system_prompt=session.system_prompt
+                )
+            except Exception as exc:
+                results[index] = AgentRunResult(success=False, result=None, error=str(exc), turns=0)
+            except BaseException:
+                with self._condition:
+                    self._active_sessions -= 1
+                    self._condition.notify_all()
+                raise
+            # Claiming the next session under the same lock keeps the running count steady,
+            # so a step is never dispatched while a worker is between sessions.
+            with self._condition:
+                self._active_sessions -= 1
+                index = self._claim_locked()
+                self._condition.notify_all()
+
+    def _claim_locked(self) -> int | None:
+        if not self._queued:
+            return None
+        self._active_sessions += 1
+        return self._queued.popleft()
+
+    def _dispatch(self, batch: list[_PendingGenerate]) -> None:
+        try:
+            job_id = self._backend.submit([pending.request for pending in batch])
+            self.jobs_submitted += 1
+            status = self._backend.poll(job_id)
+            while status == BatchJobStatus.PENDING:
+                self._sleep_fn(self._poll_interval_seconds)
+                status = self._backend.poll(job_id)
+            if status != BatchJobStatus.COMPLETED:
+                raise RuntimeError(f"Batch job {job_id} finished with status '{status.value}'.")
+            by_id = {result.custom_id: result for result in self._backend.fetch_results(job_id)}
+        except Exception as exc:
+            for pending in batch:
+                pending.error = exc
+                pending.done.set()
+            return
+
+        for pending in batch:
+            result = by_id.get(pending.request.custom_id)
+            if result is None:
+                pending.error = RuntimeError(
+                    f"Batch result missing for request '{pending.request.custom_id}'."
+                )
+            elif result.response is None:
+                pending.error = RuntimeError(result.error or "Batch request failed.")
+            else:
+                pending.response = result.response
+            pending.done.set()
+
+
+def run_batch_sessions(
+    sessions: Sequence[BatchSession],
+    runner_factory: Callable[[LLMProvider], LLMAgentRunner],
+    backend: BatchBackend,
+    *,
+    poll_interval_seconds: float = 5.0,
+    max_concurrent_sessions: int = DEFAULT_MAX_CONCURRENT_SESSIONS,
+    sleep_fn: Callable[[float], None] = time.sleep,
+) -> list[AgentRunResult]:
+    coordinator = BatchSessionCoordinator(
+        backend,
+        poll_interval_seconds=poll_interval_seconds,
+        max_concurrent_sessions=max_concurrent_sessions,
+        sleep_fn=sleep_fn,
+    )
+    return coordinator.run(sessions, runner_factory)
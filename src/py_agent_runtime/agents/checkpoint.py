@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from py_agent_runtime.llm.types import LLMMessage, llm_message_from_dict, llm_message_to_dict
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.modes import ApprovalMode
+
+SESSIONS_SUBDIR = Path(".gemini") / "tmp" / "sessions"
+
+
+@dataclass(frozen=True)
+class SessionFinalResult:
+    success: bool
+    result: str | None
+    error: str | None
+    turns: int
+
+
+@dataclass
+class SessionState:
+    session_id: str
+    user_prompt: str
+    system_prompt: str | None
+    messages: list[LLMMessage] = field(default_factory=list)
+    turn: int = 0
+    approval_mode: ApprovalMode = ApprovalMode.DEFAULT
+    todos: list[dict[str, Any]] = field(default_factory=list)
+    approved_plan_path: Path | None = None
+    final: SessionFinalResult | None = None
+
+    def apply_to(self, config: RuntimeConfig) -> None:
+        config.set_approval_mode(self.approval_mode)
+        config.todos = [dict(todo) for todo in self.todos]
+        config.set_approved_plan_path(self.approved_plan_path)
+
+
+def session_checkpoint_path(target_dir: Path, session_id: str) -> Path:
+    return target_dir / SESSIONS_SUBDIR / f"{session_id}.jsonl"
+
+
+class SessionCheckpointer:
+    """Append-only JSONL session log.
+
+    Turn records carry only the messages added since the previous record; a full
+    `snapshot` is written instead whenever history was compacted in between.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._written: list[LLMMessage] = []
+
+    def start(self, session_id: str, user_prompt: str, system_prompt: str | None) -> None:
+        self._written = []
+        self._append(
+            {
+                "type": "session",
+                "session_id": session_id,
+                "user_prompt": user_prompt,
+                "system_prompt": system_prompt,
+            },
+            mode="w",
+        )
+
+    def resume_from(self, state: SessionState) -> None:
+        """Continue the log of `state`; a missing or empty log is rewritten in full first."""
+        self._drop_torn_tail()
+        if not self.path.is_file() or self.path.stat().st_size == 0:
+            self.start(state.session_id, state.user_prompt, state.system_prompt)
+            if state.turn or state.messages:
+                self._append(
+                    _turn_record(
+                        "snapshot",
+                        state.turn,
+                        state.messages,
+                        state.approval_mode,
+                        state.todos,
+                        state.approved_plan_path,
+                    )
+                )
+        self._written = list(state.messages)
+
+    def record_turn(self, turn: int, messages: Sequence[LLMMessage], config: RuntimeConfig) -> None:
+        written = self._written
+        is_extension = len(messages) >= len(written) and all(
+            current is previous for current, previous in zip(messages, written)
+        )
+        self._append(
+            _turn_record(
+                "turn" if is_extension else "snapshot",
+                turn,
+                messages[len(written) :] if is_extension else messages,
+                config.get_approval_mode(),
+                config.todos,
+                config.get_approved_plan_path(),
+            )
+        )
+        self._written = list(messages)
+
+    def record_final(self, result: SessionFinalResult) -> None:
+        self._append(
+            {
+                "type": "final",
+                "success": result.success,
+                "result": result.result,
+                "error": result.error,
+                "turns": result.turns,
+            }
+        )
+
+    def _drop_torn_tail(self) -> None:
+        if not self.path.is_file():
+            return
+        data = self.path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with self.path.open("r+b") as handle:
+                handle.truncate(data.rfind(b"\n") + 1)
+
+    def _append(self, record: dict[str, Any], *, mode: str = "a") -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open(mode, encoding="utf-8") as handle:
+            handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def load_session_state(path: Path) -> SessionState:
+    if not path.is_file():
+        raise ValueError(f"Session checkpoint does not exist: {path}")
+    state: SessionState | None = None
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Only a torn trailing write is tolerated; it is simply ignored.
+                break
+            kind = record.get("type")
+            if kind == "session":
+                state = SessionState(
+                    session_id=str(record["session_id"]),
+                    user_prompt=str(record["user_prompt"]),
+                    system_prompt=record.get("system_prompt"),
+                )
+                continue
+            if state is None:
+                raise ValueError(f"Session checkpoint {path} is missing its header record.")
+            if kind in {"turn", "snapshot"}:
+                restored = [llm_message_from_dict(item) for item in record.get("messages") or []]
+                state.messages = restored if kind == "snapshot" else [*state.messages, *restored]
+                state.turn = int(record["turn"])
+                state.approval_mode = ApprovalMode(record["approval_mode"])
+                state.todos = [dict(todo) for todo in record.get("todos") or []]
+                plan_path = record.get("approved_plan_path")
+                state.approved_plan_path = Path(plan_path) if plan_path else None
+                state.final = None
+            elif kind == "final":
+                state.final = SessionFinalResult(
+                    success=bool(record["success"]),
+                    result=record.get("result"),
+                    error=record.get("error"),
+                    turns=int(record["turns"]),
+                )
+            else:
+                raise ValueError(f"Unknown record type {kind!r} on line {line_number} of {path}.")
+    if state is None:
+        raise ValueError(f"Session checkpoint {path} is empty.")
+    return state
+
+
+def _turn_record(
+    kind: str,
+    turn: int,
+    messages: Sequence[LLMMessage],
+    approval_mode: ApprovalMode,
+    todos: list[dict[str, Any]],
+    approved_plan_path: Path | None,
+) -> dict[str, Any]:
+    return {
+        "type": kind,
+        "turn": turn,
+        "messages": [llm_message_to_dict(message) for message in messages],
+        "approval_mode": approval_mode.value,
+        "todos": todos,
+        "approved_plan_path": _path_or_none(approved_plan_path),
+    }
+
+
+def _path_or_none(path: Path | None) -> str | None:
+    return str(path) if path is not None else None
@@ -2,233 +2,398 @@ from __future__ import annotations
 
 import json
 import re
-from collections.abc import Mapping as MappingABC
+from collections.abc import Callable, Mapping as MappingABC
+from dataclasses import dataclass
 from typing import Any, Mapping
 
+SchemaValidator = Callable[[Any, str], "str | None"]
+ERROR_PREFIX = "Completion output does not satisfy schema: "
+_MAX_CACHED_SCHEMAS = 64
+_compiled_cache: dict[int, tuple[Mapping[str, Any], CompiledCompletionSchema]] = {}
 
-def validate_completion_output(raw_output: str, schema: Mapping[str, Any]) -> str | None:
+
+@dataclass(frozen=True)
+class CompiledCompletionSchema:
+    schema: Mapping[str, Any]
+    parse_json: bool
+    validator: SchemaValidator
+
+    def validate(self, raw_output: str) -> str | None:
+        value: Any = raw_output
+        if self.parse_json:
+            try:
+                value = json.loads(raw_output)
+            except json.JSONDecodeError as exc:
+                return (
+                    f"{ERROR_PREFIX}output must be valid JSON for schema type "
+                    f"'{self.schema.get('type')}': {exc}"
+                )
+        return self.validate_value(value)
+
+    def validate_value(self, value: Any) -> str | None:
+        error = self.validator(value, "$")
+        return f"{ERROR_PREFIX}{error}" if error else None
+
+
+def compile_completion_schema(schema: Mapping[str, Any]) -> CompiledCompletionSchema:
+    # Cached by identity: schemas come from agent definitions or a file loaded once per run.
+    cached = _compiled_cache.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
     expected_type = schema.get("type")
-    value: Any = raw_output
+    compiled = CompiledCompletionSchema(
+        schema=schema,
+        parse_json=expected_type is not None and expected_type != "string",
+        validator=compile_schema_validator(schema),
+    )
+    if len(_compiled_cache) >= _MAX_CACHED_SCHEMAS:
+        _compiled_cache.pop(next(iter(_compiled_cache)), None)
+    _compiled_cache[id(schema)] = (schema, compiled)
+    return compiled
 
-    if expected_type is not None and expected_type != "string":
-        try:
-            value = json.loads(raw_output)
-        except json.JSONDecodeError as exc:
-            return (
-                "Completion output does not satisfy schema: "
-                f"output must be valid JSON for schema type '{expected_type}': {exc}"
-            )
 
-    error = _validate_value(value, schema, path="$")
-    if error:
-        return f"Completion output does not satisfy schema: {error}"
-    return None
+def validate_completion_output(raw_output: str, schema: Mapping[str, Any]) -> str | None:
+    return compile_completion_schema(schema).validate(raw_output)
+
+
+def compile_schema_validator(schema: Mapping[str, Any]) -> SchemaValidator:
+    checks: list[SchemaValidator] = []
+
+    if "const" in schema:
+        const = schema.get("const")
 
+        def _const(value: Any, path: str) -> str | None:
+            return f"{path} must equal {const!r}" if value != const else None
 
-def _validate_value(value: Any, schema: Mapping[str, Any], path: str) -> str | None:
-    if "const" in schema and value != schema.get("const"):
-        return f"{path} must equal {schema.get('const')!r}"
+        checks.append(_const)
 
     enum_values = schema.get("enum")
-    if isinstance(enum_values, list) and value not in enum_values:
-        return f"{path} must be one of {enum_values!r}"
+    if isinstance(enum_values, list):
+        allowed_values = enum_values
+
+        def _enum(value: Any, path: str) -> str | None:
+            return None if value in allowed_values else f"{path} must be one of {allowed_values!r}"
+
+        checks.append(_enum)
 
     all_of = schema.get("allOf")
     if isinstance(all_of, list):
-        for item_schema in all_of:
-            if isinstance(item_schema, MappingABC):
-                item_error = _validate_value(value, item_schema, path)
-                if item_error:
-                    return item_error
+        checks.extend(_compile_branches(all_of))
 
     any_of = schema.get("anyOf")
     if isinstance(any_of, list):
-        matched = False
-        for item_schema in any_of:
-            if not isinstance(item_schema, MappingABC):
-                continue
-            if _validate_value(value, item_schema, path) is None:
-                matched = True
-                break
-        if not matched:
+        any_of_branches = _compile_branches(any_of)
+
+        def _any_of(value: Any, path: str) -> str | None:
+            if any(branch(value, path) is None for branch in any_of_branches):
+                return None
             return f"{path} must match at least one schema in anyOf"
 
+        checks.append(_any_of)
+
     one_of = schema.get("oneOf")
     if isinstance(one_of, list):
-        match_count = 0
-        for item_schema in one_of:
-            if not isinstance(item_schema, MappingABC):
-                continue
-            if _validate_value(value, item_schema, path) is None:
-                match_count += 1
-        if match_count != 1:
-            return f"{path} must match exactly one schema in oneOf (matched {match_count})"
+        one_of_branches = _compile_branches(one_of)
+
+        def _one_of(value: Any, path: str) -> str | None:
+            match_count = sum(1 for branch in one_of_branches if branch(value, path) is None)
+            if match_count != 1:
+                return f"{path} must match exactly one schema in oneOf (matched {match_count})"
+            return None
+
+        checks.append(_one_of)
 
     not_schema = schema.get("not")
     if isinstance(not_schema, MappingABC):
-        if _validate_value(value, not_schema, path) is None:
-            return f"{path} must not match schema in not"
+        negated = compile_schema_validator(not_schema)
 
+        def _not(value: Any, path: str) -> str | None:
+            return f"{path} must not match schema in not" if negated(value, path) is None else None
+
+        checks.append(_not)
+
+    type_check = _compile_type(schema)
+    if type_check is not None:
+        checks.append(type_check)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def _validate(value: Any, path: str) -> str | None:
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+        return None
+
+    return _validate
+
+
+def _compile_branches(schemas: list[Any]) -> list[SchemaValidator]:
+    return [compile_schema_validator(item) for item in schemas if isinstance(item, MappingABC)]
+
+
+def _compile_type(schema: Mapping[str, Any]) -> SchemaValidator | None:
     schema_type = schema.get("type")
     if schema_type is None:
         return None
 
     if isinstance(schema_type, list):
         if not schema_type:
-            return f"{path} has invalid empty type union"
-        errors: list[str] = []
-        for type_name in schema_type:
-            if not isinstance(type_name, str):
-                continue
-            candidate = dict(schema)
-            candidate["type"] = type_name
-            error = _validate_value(value, candidate, path)
-            if error is None:
-                return None
-            errors.append(error)
-        if errors:
+            return _fixed_error("has invalid empty type union")
+        candidates = [
+            compile_schema_validator({**schema, "type": type_name})
+            for type_name in schema_type
+            if isinstance(type_name, str)
+        ]
+        if not candidates:
+            return _fixed_error(f"has unsupported type union {schema_type!r}")
+
+        def _union(value: Any, path: str) -> str | None:
+            errors: list[str] = []
+            for candidate in candidates:
+                error = candidate(value, path)
+                if error is None:
+                    return None
+                errors.append(error)
             return " or ".join(errors)
-        return f"{path} has unsupported type union {schema_type!r}"
+
+        return _union
 
     if not isinstance(schema_type, str):
-        return f"{path} has invalid type declaration"
+        return _fixed_error("has invalid type declaration")
+
+    compiler = _TYPE_COMPILERS.get(schema_type)
+    if compiler is None:
+        return _fixed_error(f"has unsupported schema type '{schema_type}'")
+    return compiler(schema)
+
 
-    if schema_type == "string":
+def _fixed_error(message: str) -> SchemaValidator:
+    def _error(value: Any, path: str) -> str | None:
+        return f"{path} {message}"
+
+    return _error
+
+
+def _compile_string(schema: Mapping[str, Any]) -> SchemaValidator:
+    min_length = _int_or_none(schema.get("minLength"))
+    max_length = _int_or_none(schema.get("maxLength"))
+    pattern = schema.get("pattern")
+    regex: re.Pattern[str] | None = None
+    pattern_invalid = False
+    if isinstance(pattern, str):
+        try:
+            regex = re.compile(pattern)
+        except re.error:
+            pattern_invalid = True
+
+    def _string(value: Any, path: str) -> str | None:
         if not isinstance(value, str):
             return f"{path} must be a string"
-        min_length = schema.get("minLength")
-        if isinstance(min_length, int) and len(value) < min_length:
+        if min_length is not None and len(value) < min_length:
             return f"{path} length must be >= {min_length}"
-        max_length = schema.get("maxLength")
-        if isinstance(max_length, int) and len(value) > max_length:
+        if max_length is not None and len(value) > max_length:
             return f"{path} length must be <= {max_length}"
-        pattern = schema.get("pattern")
-        if isinstance(pattern, str):
-            try:
-                if re.search(pattern, value) is None:
-                    return f"{path} must match pattern {pattern!r}"
-            except re.error:
-                return f"{path} has invalid regex pattern {pattern!r}"
+        if pattern_invalid:
+            return f"{path} has invalid regex pattern {pattern!r}"
+        if regex is not None and regex.search(value) is None:
+            return f"{path} must match pattern {pattern!r}"
         return None
 
-    if schema_type == "number":
+    return _string
+
+
+def _compile_number(schema: Mapping[str, Any]) -> SchemaValidator:
+    numeric = _compile_numeric_constraints(schema)
+
+    def _number(value: Any, path: str) -> str | None:
         if not isinstance(value, (int, float)) or isinstance(value, bool):
             return f"{path} must be a number"
-        numeric_error = _validate_numeric_constraints(float(value), schema, path)
-        if numeric_error:
-            return numeric_error
-        return None
+        return numeric(float(value), path)
+
+    return _number
+
+
+def _compile_integer(schema: Mapping[str, Any]) -> SchemaValidator:
+    numeric = _compile_numeric_constraints(schema)
 
-    if schema_type == "integer":
+    def _integer(value: Any, path: str) -> str | None:
         if not isinstance(value, int) or isinstance(value, bool):
             return f"{path} must be an integer"
-        numeric_error = _validate_numeric_constraints(float(value), schema, path)
-        if numeric_error:
-            return numeric_error
-        return None
+        return numeric(float(value), path)
 
-    if schema_type == "boolean":
-        if not isinstance(value, bool):
-            return f"{path} must be a boolean"
-        return None
+    return _integer
+
+
+def _compile_boolean(schema: Mapping[str, Any]) -> SchemaValidator:
+    def _boolean(value: Any, path: str) -> str | None:
+        return None if isinstance(value, bool) else f"{path} must be a boolean"
+
+    return _boolean
+
+
+def _compile_null(schema: Mapping[str, Any]) -> SchemaValidator:
+    def _null(value: Any, path: str) -> str | None:
+        return None if value is None else f"{path} must be null"
+
+    return _null
 
-    if schema_type == "null":
-        if value is not None:
-            return f"{path} must be null"
-        return None
 
-    if schema_type == "array":
+def _compile_array(schema: Mapping[str, Any]) -> SchemaValidator:
+    min_items = _int_or_none(schema.get("minItems"))
+    max_items = _int_or_none(schema.get("maxItems"))
+    unique_items = schema.get("uniqueItems") is True
+    item_schema = schema.get("items")
+    item_check = (
+        compile_schema_validator(item_schema) if isinstance(item_schema, MappingABC) else None
+    )
+
+    def _array(value: Any, path: str) -> str | None:
         if not isinstance(value, list):
             return f"{path} must be an array"
-        min_items = schema.get("minItems")
-        if isinstance(min_items, int) and len(value) < min_items:
+        if min_items is not None and len(value) < min_items:
             return f"{path} must have at least {min_items} items"
-        max_items = schema.get("maxItems")
-        if isinstance(max_items, int) and len(value) > max_items:
+        if max_items is not None and len(value) > max_items:
             return f"{path} must have at most {max_items} items"
-        if schema.get("uniqueItems") is True:
+        if unique_items:
             seen: set[str] = set()
             for item in value:
                 serialized = json.dumps(item, ensure_ascii=False, sort_keys=True, default=str)
                 if serialized in seen:
                     return f"{path} must not contain duplicate items"
                 seen.add(serialized)
-
-        item_schema = schema.get("items")
-        if isinstance(item_schema, MappingABC):
+        if item_check is not None:
             for idx, item in enumerate(value):
-                item_error = _validate_value(item, item_schema, f"{path}[{idx}]")
+                item_error = item_check(item, f"{path}[{idx}]")
                 if item_error:
                     return item_error
         return None
 
-    if schema_type == "object":
+    return _array
+
+
+def _compile_object(schema: Mapping[str, Any]) -> SchemaValidator:
+    min_properties = _int_or_none(schema.get("minProperties"))
+    max_properties = _int_or_none(schema.get("maxProperties"))
+    required = schema.get("required")
+    required_keys = (
+        tuple(key for key in required if isinstance(key, str)) if isinstance(required, list) else ()
+    )
+    required_set = frozenset(required_keys)
+
+    properties = schema.get("properties")
+    known_properties: dict[str, SchemaValidator] = {}
+    if isinstance(properties, MappingABC):
+        for key, property_schema in properties.items():
+            if isinstance(key, str) and isinstance(property_schema, MappingABC):
+                known_properties[key] = compile_schema_validator(property_schema)
+
+    additional_properties = schema.get("additionalProperties", True)
+    forbid_additional = additional_properties is False
+    additional_check = (
+        compile_schema_validator(additional_properties)
+        if isinstance(additional_properties, MappingABC)
+        else None
+    )
+
+    def _object(value: Any, path: str) -> str | None:
         if not isinstance(value, dict):
             return f"{path} must be an object"
-
-        min_properties = schema.get("minProperties")
-        if isinstance(min_properties, int) and len(value) < min_properties:
+        if min_properties is not None and len(value) < min_properties:
             return f"{path} must have at least {min_properties} properties"
-        max_properties = schema.get("maxProperties")
-        if isinstance(max_properties, int) and len(value) > max_properties:
+        if max_properties is not None and len(value) > max_properties:
             return f"{path} must have at most {max_properties} properties"
-
-        required = schema.get("required")
-        if isinstance(required, list):
-            for key in required:
-                if isinstance(key, str) and key not in value:
-                    return f"{path}.{key} is required"
-
-        properties = schema.get("properties")
-        known_properties: dict[str, Mapping[str, Any]] = {}
-        if isinstance(properties, MappingABC):
-            for key, item_schema in properties.items():
-                if isinstance(key, str) and isinstance(item_schema, MappingABC):
-                    known_properties[key] = item_schema
-
-        additional_properties = schema.get("additionalProperties", True)
+        if required_set and not required_set <= value.keys():
+            missing = next(key for key in required_keys if key not in value)
+            return f"{path}.{missing} is required"
         for key, item in value.items():
-            child_schema = known_properties.get(str(key))
-            if child_schema is not None:
-                child_error = _validate_value(item, child_schema, f"{path}.{key}")
-                if child_error:
-                    return child_error
-                continue
-            if additional_properties is False:
-                return f"{path}.{key} is not allowed"
-            if isinstance(additional_properties, MappingABC):
-                child_error = _validate_value(item, additional_properties, f"{path}.{key}")
-                if child_error:
-                    return child_error
+            child_check = known_properties.get(str(key))
+            if child_check is None:
+                if forbid_additional:
+                    return f"{path}.{key} is not allowed"
+                child_check = additional_check
+                if child_check is None:
+                    continue
+            child_error = child_check(item, f"{path}.{key}")
+            if child_error:
+                return child_error
         return None
 
-    return f"{path} has unsupported schema type '{schema_type}'"
+    return _object
+
 
+def _compile_numeric_constraints(schema: Mapping[str, Any]) -> Callable[[float, str], str | None]:
+    bounds: list[Callable[[float, str], str | None]] = []
 
-def _validate_numeric_constraints(
-    value: float,
-    schema: Mapping[str, Any],
-    path: str,
-) -> str | None:
     minimum = schema.get("minimum")
-    if isinstance(minimum, (int, float)) and value < float(minimum):
-        return f"{path} must be >= {minimum}"
+    if isinstance(minimum, (int, float)):
+        minimum_value = float(minimum)
+        bounds.append(
+            lambda value, path: f"{path} must be >= {minimum}" if value < minimum_value else None
+        )
 
     maximum = schema.get("maximum")
-    if isinstance(maximum, (int, float)) and value > float(maximum):
-        return f"{path} must be <= {maximum}"
+    if isinstance(maximum, (int, float)):
+        maximum_value = float(maximum)
+        bounds.append(
+            lambda value, path: f"{path} must be <= {maximum}" if value > maximum_value else None
+        )
 
     exclusive_minimum = schema.get("exclusiveMinimum")
-    if isinstance(exclusive_minimum, (int, float)) and value <= float(exclusive_minimum):
-        return f"{path} must be > {exclusive_minimum} (exclusiveMinimum)"
+    if isinstance(exclusive_minimum, (int, float)):
+        exclusive_minimum_value = float(exclusive_minimum)
+        bounds.append(
+            lambda value, path: (
+                f"{path} must be > {exclusive_minimum} (exclusiveMinimum)"
+                if value <= exclusive_minimum_value
+                else None
+            )
+        )
 
     exclusive_maximum = schema.get("exclusiveMaximum")
-    if isinstance(exclusive_maximum, (int, float)) and value >= float(exclusive_maximum):
-        return f"{path} must be < {exclusive_maximum} (exclusiveMaximum)"
+    if isinstance(exclusive_maximum, (int, float)):
+        exclusive_maximum_value = float(exclusive_maximum)
+        bounds.append(
+            lambda value, path: (
+                f"{path} must be < {exclusive_maximum} (exclusiveMaximum)"
+                if value >= exclusive_maximum_value
+                else None
+            )
+        )
 
     multiple_of = schema.get("multipleOf")
     if isinstance(multiple_of, (int, float)) and multiple_of > 0:
-        quotient = value / float(multiple_of)
-        if abs(round(quotient) - quotient) > 1e-9:
-            return f"{path} must be a multiple of {multiple_of}"
-    return None
+        divisor = float(multiple_of)
+
+        def _multiple_of(value: float, path: str) -> str | None:
+            quotient = value / divisor
+            if abs(round(quotient) - quotient) > 1e-9:
+                return f"{path} must be a multiple of {multiple_of}"
+            return None
+
+        bounds.append(_multiple_of)
+
+    def _numeric(value: float, path: str) -> str | None:
+        for bound in bounds:
+            error = bound(value, path)
+            if error:
+                return error
+        return None
+
+    return _numeric
+
+
+def _int_or_none(value: Any) -> int | None:
+    return value if isinstance(value, int) else None
+
+
+_TYPE_COMPILERS: dict[str, Callable[[Mapping[str, Any]], SchemaValidator]] = {
+    "string": _compile_string,
+    "number": _compile_number,
+    "integer": _compile_integer,
+    "boolean": _compile_boolean,
+    "null": _compile_null,
+    "array": _compile_array,
+    "object": _compile_object,
+}
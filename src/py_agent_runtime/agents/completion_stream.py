@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Mapping as MappingABC
+from dataclasses import dataclass, field
+from typing import Any, Mapping, NoReturn
+
+from py_agent_runtime.agents.completion_schema import (
+    ERROR_PREFIX,
+    CompiledCompletionSchema,
+    SchemaValidator,
+    compile_completion_schema,
+    compile_schema_validator,
+)
+from py_agent_runtime.agents.local_executor import TASK_COMPLETE_TOOL_NAME
+from py_agent_runtime.llm.types import LLMToolCallDelta
+
+StringObserver = Callable[[str, str], "str | None"]
+
+_COMBINATOR_KEYS = frozenset({"const", "enum", "allOf", "anyOf", "oneOf", "not"})
+_TYPE_KINDS = {
+    "object": "object",
+    "array": "array",
+    "string": "string",
+    "number": "number",
+    "integer": "number",
+    "boolean": "boolean",
+    "null": "null",
+}
+_KIND_SAMPLES: dict[str, Any] = {
+    "object": {},
+    "array": [],
+    "string": "",
+    "number": 0,
+    "boolean": False,
+    "null": None,
+}
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_NUMBER_PATTERN = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?\Z")
+_STRING_STOP = re.compile(r'["\\\x00-\x1f]')
+_WHITESPACE = frozenset(" \t\n\r")
+
+
+class _StreamAbort(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass
+class _StreamNode:
+    """Early-decidable constraints of one subschema.
+
+    Only plain typed schemas are checked before their value completes; any schema that uses
+    combinators, `const` or `enum` is validated once, when its value is complete.
+    """
+
+    validator: SchemaValidator | None
+    strict: bool = False
+    kinds: frozenset[str] | None = None
+    max_length: int | None = None
+    max_items: int | None = None
+    max_properties: int | None = None
+    properties: Mapping[str, Any] = field(default_factory=dict)
+    additional: Any = True
+    items: Mapping[str, Any] | None = None
+
+
+_ANY_NODE = _StreamNode(validator=None)
+
+
+class _NodeFactory:
+    def __init__(self) -> None:
+        self._nodes: dict[int, tuple[Mapping[str, Any], _StreamNode]] = {}
+
+    def node(self, schema: Mapping[str, Any]) -> _StreamNode:
+        cached = self._nodes.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        node = _build_node(schema)
+        self._nodes[id(schema)] = (schema, node)
+        return node
+
+    def child(self, parent: _StreamNode, key: str | None) -> _StreamNode:
+        if not parent.strict:
+            return _ANY_NODE
+        if key is None:
+            return self.node(parent.items) if parent.items is not None else _ANY_NODE
+        child_schema = parent.properties.get(key)
+        if isinstance(child_schema, MappingABC):
+            return self.node(child_schema)
+        if isinstance(parent.additional, MappingABC):
+            return self.node(parent.additional)
+        return _ANY_NODE
+
+
+def _build_node(schema: Mapping[str, Any]) -> _StreamNode:
+    node = _StreamNode(validator=compile_schema_validator(schema))
+    if _COMBINATOR_KEYS & schema.keys():
+        return node
+    schema_type = schema.get("type")
+    type_names = [schema_type] if isinstance(schema_type, str) else schema_type
+    if type_names is not None:
+        if not isinstance(type_names, list) or not type_names:
+            return node
+        if not all(isinstance(name, str) and name in _TYPE_KINDS for name in type_names):
+            return node
+        node.kinds = frozenset(_TYPE_KINDS[name] for name in type_names)
+    node.strict = True
+    node.max_length = _int_or_none(schema.get("maxLength"))
+    node.max_items = _int_or_none(schema.get("maxItems"))
+    node.max_properties = _int_or_none(schema.get("maxProperties"))
+    properties = schema.get("properties")
+    node.properties = properties if isinstance(properties, MappingABC) else {}
+    node.additional = schema.get("additionalProperties", True)
+    items = schema.get("items")
+    node.items = items if isinstance(items, MappingABC) else None
+    return node
+
+
+@dataclass
+class _Frame:
+    kind: str
+    node: _StreamNode
+    path: str
+    value: Any
+    key: str | None = None
+
+
+class _JsonStreamParser:
+    """Push parser for one JSON document that checks values against schema nodes as it goes."""
+
+    def __init__(
+        self,
+        root: _StreamNode,
+        factory: _NodeFactory,
+        *,
+        string_observer: StringObserver | None = None,
+    ) -> None:
+        self._root = root
+        self._factory = factory
+        self._string_observer = string_observer
+        self._stack: list[_Frame] = []
+        self._mode = "value"
+        self._allow_close = False
+        self._position = 0
+        self._token: list[str] = []
+        self._string_node = _ANY_NODE
+        self._string_path = "$"
+        self._string_is_key = False
+        self._string_length = 0
+        self._escape: str | None = None
+        self._high_surrogate: int | None = None
+        self._scalar_node = _ANY_NODE
+        self._scalar_path = "$"
+
+    def feed(self, text: str) -> None:
+        index = 0
+        length = len(text)
+        while index < length:
+            if self._mode == "string" and self._escape is None:
+                index = self._consume_string_run(text, index)
+                if index >= length:
+                    break
+            char = text[index]
+            if self._step(char):
+                index += 1
+                self._position += 1
+
+    def _consume_string_run(self, text: str, index: int) -> int:
+        match = _STRING_STOP.search(text, index)
+        end = match.start() if match else len(text)
+        if end > index:
+            self._append_string(text[index:end])
+            self._position += end - index
+        return end
+
+    def _step(self, char: str) -> bool:
+        mode = self._mode
+        if mode == "string":
+            self._string_char(char)
+            return True
+        if mode == "number":
+            if char in _NUMBER_CHARS:
+                self._token.append(char)
+                return True
+            self._finish_number()
+            return False
+        if mode == "literal":
+            self._literal_char(char)
+            return True
+        if char in _WHITESPACE:
+            return True
+        if mode == "value":
+            self._start_value(char)
+        elif mode == "key":
+            if char == '"':
+                self._begin_string(_ANY_NODE, self._stack[-1].path, is_key=True)
+            elif char == "}" and self._allow_close:
+                self._close_container("object")
+            else:
+                self._unexpected(char)
+        elif mode == "colon":
+            if char != ":":
+                self._unexpected(char)
+            self._mode = "value"
+            self._allow_close = False
+        elif mode == "after":
+            self._after_value(char)
+        else:
+            self._unexpected(char)
+        return True
+
+    def _target(self) -> tuple[_StreamNode, str]:
+        if not self._stack:
+            return self._root, "$"
+        frame = self._stack[-1]
+        if frame.kind == "array":
+            return self._factory.child(frame.node, None), f"{frame.path}[{len(frame.value)}]"
+        return self._factory.child(frame.node, frame.key), f"{frame.path}.{frame.key}"
+
+    def _start_value(self, char: str) -> None:
+        if char == "]" and self._allow_close:
+            self._close_container("array")
+            return
+        if char == "{":
+            kind = "object"
+        elif char == "[":
+            kind = "array"
+        elif char == '"':
+            kind = "string"
+        elif char == "-" or char.isdigit():
+            kind = "number"
+        elif char in _LITERALS:
+            kind = "boolean" if char != "n" else "null"
+        else:
+            self._unexpected(char)
+        node, path = self._target()
+        if self._stack and self._stack[-1].kind == "array":
+            self._check_item_count(self._stack[-1])
+        if node.strict and node.kinds is not None and kind not in node.kinds:
+            assert node.validator is not None
+            raise _StreamAbort(node.validator(_KIND_SAMPLES[kind], path) or path)
+        if kind in {"object", "array"}:
+            self._stack.append(_Frame(kind, node, path, {} if kind == "object" else []))
+            self._mode = "key" if kind == "object" else "value"
+            self._allow_close = True
+        elif kind == "string":
+            self._begin_string(node, path, is_key=False)
+        else:
+            self._scalar_node, self._scalar_path = node, path
+            self._token = [char]
+            self._mode = "number" if kind == "number" else "literal"
+
+    def _check_item_count(self, frame: _Frame) -> None:
+        max_items = frame.node.max_items if frame.node.strict else None
+        if max_items is not None and len(frame.value) >= max_items:
+            raise _StreamAbort(f"{frame.path} must have at most {max_items} items")
+
+    def _begin_string(self, node: _StreamNode, path: str, *, is_key: bool) -> None:
+        self._mode = "string"
+        self._string_node = node
+        self._string_path = path
+        self._string_is_key = is_key
+        self._string_length = 0
+        self._token = []
+        self._escape = None
+        self._high_surrogate = None
+
+    def _string_char(self, char: str) -> None:
+        if self._escape is None:
+            if char == '"':
+                self._finish_string()
+            elif char == "\\":
+                self._escape = ""
+            else:
+                # Raw control characters are the only other stop characters.
+                self._unexpected(char)
+            return
+        if self._escape == "":
+            if char == "u":
+                self._escape = "u"
+                return
+            decoded = _SIMPLE_ESCAPES.get(char)
+            if decoded is None:
+                self._unexpected(char)
+            self._escape = None
+            self._append_string(decoded)
+            return
+        self._escape += char
+        if len(self._escape) < 5:
+            return
+        try:
+            code = int(self._escape[1:], 16)
+        except ValueError:
+            self._unexpected(char)
+        self._escape = None
+        self._append_code_unit(code)
+
+    def _append_code_unit(self, code: int) -> None:
+        high = self._high_surrogate
+        self._high_surrogate = None
+        if 0xD800 <= code <= 0xDBFF:
+            if high is not None:
+                self._append_string(chr(high))
+            self._high_surrogate = code
+            return
+        if high is not None and 0xDC00 <= code <= 0xDFFF:
+            self._append_string(chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)))
+            return
+        if high is not None:
+            self._append_string(chr(high))
+        self._append_string(chr(code))
+
+    def _append_string(self, piece: str) -> None:
+        if self._high_surrogate is not None:
+            pending = chr(self._high_surrogate)
+            self._high_surrogate = None
+            self._append_string(pending)
+        self._token.append(piece)
+        self._string_length += len(piece)
+        if self._string_is_key:
+            return
+        node = self._string_node
+        if node.strict and node.max_length is not None and self._string_length > node.max_length:
+            raise _StreamAbort(f"{self._string_path} length must be <= {node.max_length}")
+        if self._string_observer is not None:
+            error = self._string_observer(self._string_path, piece)
+            if error:
+                raise _StreamAbort(error)
+
+    def _finish_string(self) -> None:
+        if self._high_surrogate is not None:
+            pending = chr(self._high_surrogate)
+            self._high_surrogate = None
+            self._append_string(pending)
+        text = "".join(self._token)
+        self._token = []
+        if not self._string_is_key:
+            self._complete_value(text, self._string_node, self._string_path)
+            return
+        frame = self._stack[-1]
+        node = frame.node
+        if node.strict:
+            if node.max_properties is not None and len(frame.value) >= node.max_properties:
+                if text not in frame.value:
+                    raise _StreamAbort(
+                        f"{frame.path} must have at most {node.max_properties} properties"
+                    )
+            if node.additional is False and text not in node.properties:
+                raise _StreamAbort(f"{frame.path}.{text} is not allowed")
+        frame.key = text
+        self._mode = "colon"
+
+    def _finish_number(self) -> None:
+        token = "".join(self._token)
+        self._token = []
+        if not _NUMBER_PATTERN.match(token):
+            raise _StreamAbort(f"invalid number {token!r} at char {self._position}")
+        self._complete_value(json.loads(token), self._scalar_node, self._scalar_path)
+
+    def _literal_char(self, char: str) -> None:
+        self._token.append(char)
+        word, value = _LITERALS[self._token[0]]
+        typed = "".join(self._token)
+        if not word.startswith(typed):
+            self._unexpected(char)
+        if typed == word:
+            self._token = []
+            self._complete_value(value, self._scalar_node, self._scalar_path)
+
+    def _close_container(self, kind: str) -> None:
+        frame = self._stack.pop()
+        if frame.kind != kind:
+            self._unexpected("}" if kind == "object" else "]")
+        self._complete_value(frame.value, frame.node, frame.path)
+
+    def _complete_value(self, value: Any, node: _StreamNode, path: str) -> None:
+        if node.validator is not None:
+            error = node.validator(value, path)
+            if error:
+                raise _StreamAbort(error)
+        self._mode = "after"
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame.kind == "array":
+            frame.value.append(value)
+        else:
+            assert frame.key is not None
+            frame.value[frame.key] = value
+            frame.key = None
+
+    def _after_value(self, char: str) -> None:
+        if not self._stack:
+            self._unexpected(char)
+        frame = self._stack[-1]
+        if char == ",":
+            self._mode = "key" if frame.kind == "object" else "value"
+            self._allow_close = False
+        elif char == "}" and frame.kind == "object":
+            self._close_container("object")
+        elif char == "]" and frame.kind == "array":
+            self._close_container("array")
+        else:
+            self._unexpected(char)
+
+    def _unexpected(self, char: str) -> NoReturn:
+        raise _StreamAbort(f"unexpected {char!r} at char {self._position}")
+
+
+class StreamingCompletionValidator:
+    """Validates completion output chunk by chunk against a compiled completion schema.
+
+    `feed` returns an error as soon as the streamed prefix can no longer satisfy the schema;
+    `finish` returns exactly what `validate_completion_output` would for the full text.
+    """
+
+    def __init__(self, schema: CompiledCompletionSchema | Mapping[str, Any]) -> None:
+        self._schema = (
+            schema
+            if isinstance(schema, CompiledCompletionSchema)
+            else compile_completion_schema(schema)
+        )
+        self._chunks: list[str] = []
+        self._length = 0
+        self._max_length: int | None = None
+        self._parser: _JsonStreamParser | None = None
+        self.error: str | None = None
+        if self._schema.parse_json:
+            factory = _NodeFactory()
+            self._parser = _JsonStreamParser(factory.node(self._schema.schema), factory)
+        elif self._schema.schema.get("type") == "string":
+            self._max_length = _build_node(self._schema.schema).max_length
+
+    def feed(self, chunk: str) -> str | None:
+        if self.error is not None or not chunk:
+            return self.error
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._parser is not None:
+            try:
+                self._parser.feed(chunk)
+            except _StreamAbort as exc:
+                self.error = self._format(exc)
+        elif self._max_length is not None and self._length > self._max_length:
+            self.error = f"{ERROR_PREFIX}$ length must be <= {self._max_length}"
+        return self.error
+
+    def finish(self) -> str | None:
+        return self._schema.validate("".join(self._chunks))
+
+    def _format(self, exc: _StreamAbort) -> str:
+        if exc.message.startswith("$"):
+            return f"{ERROR_PREFIX}{exc.message}"
+        return (
+            f"{ERROR_PREFIX}output must be valid JSON for schema type "
+            f"'{self._schema.schema.get('type')}': {exc.message}"
+        )
+
+
+class CompletionStreamMonitor:
+    """Watches streamed `complete_task` arguments and validates their `result` as it arrives."""
+
+    def __init__(self, schema: CompiledCompletionSchema | Mapping[str, Any]) -> None:
+        self._schema = schema
+        self._calls: dict[int, _JsonStreamParser | None] = {}
+
+    def on_tool_call_delta(self, delta: LLMToolCallDelta) -> str | None:
+        if delta.index not in self._calls:
+            if delta.name != TASK_COMPLETE_TOOL_NAME:
+                self._calls[delta.index] = None
+                return None
+            result_validator = StreamingCompletionValidator(self._schema)
+
+            def _observe(path: str, piece: str) -> str | None:
+                return result_validator.feed(piece) if path == "$.result" else None
+
+            self._calls[delta.index] = _JsonStreamParser(
+                _ANY_NODE, _NodeFactory(), string_observer=_observe
+            )
+        parser = self._calls[delta.index]
+        if parser is None or not delta.arguments_delta:
+            return None
+        try:
+            parser.feed(delta.arguments_delta)
+        except _StreamAbort as exc:
+            self._calls[delta.index] = None
+            # Malformed argument JSON is reported once the turn completes, not here.
+            return exc.message if exc.message.startswith(ERROR_PREFIX) else None
+        return None
+
+
+def _int_or_none(value: Any) -> int | None:
+    return value if isinstance(value, int) else None
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Sequence
+
+from py_agent_runtime.llm.rate_limit import estimate_request_tokens
+from py_agent_runtime.llm.types import LLMMessage
+
+MessageFitCheck = Callable[[list[LLMMessage]], bool]
+
+# Longest prefix wins; values are total context windows in tokens.
+MODEL_CONTEXT_WINDOWS: dict[str, int] = {
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4": 8_192,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+    "gemini-2.5": 1_048_576,
+    "gemini-2.0": 1_048_576,
+    "gemini-1.5": 1_048_576,
+    "claude-3": 200_000,
+    "claude-sonnet-4": 200_000,
+    "claude-opus-4": 200_000,
+    "moonshotai/Kimi-K2": 131_072,
+}
+FILE_TOOL_NAMES = frozenset({"read_file", "write_file", "replace", "batch_replace"})
+
+
+class ContextBudgetExceededError(ValueError):
+    pass
+
+
+def context_window_for_model(model: str | None) -> int | None:
+    if not model:
+        return None
+    best: tuple[int, int] | None = None
+    for prefix, window in MODEL_CONTEXT_WINDOWS.items():
+        if model.startswith(prefix) and (best is None or len(prefix) > best[0]):
+            best = (len(prefix), window)
+    return best[1] if best is not None else None
+
+
+class CompactionStrategy(ABC):
+    name: str
+
+    @abstractmethod
+    def compact(self, messages: list[LLMMessage], fits: MessageFitCheck) -> list[LLMMessage]:
+        raise NotImplementedError
+
+
+class DropSupersededFileReads(CompactionStrategy):
+    """Compact `read_file` results that a later tool call made stale.
+
+    A read is superseded by a later write of the file, a later read of the whole file,
+    or a later read of the same range. Reading another page leaves earlier pages alone.
+    """
+
+    name = "drop_superseded_file_reads"
+
+    def compact(self, messages: list[LLMMessage], fits: MessageFitCheck) -> list[LLMMessage]:
+        latest_whole: dict[str, int] = {}
+        latest_range: dict[tuple[str, str], int] = {}
+        events: dict[int, list[tuple[str, str | None]]] = {}
+        for index, message in enumerate(messages):
+            file_events = _tool_file_events(message)
+            if not file_events:
+                continue
+            events[index] = file_events
+            for file_path, range_key in file_events:
+                if range_key is None:
+                    latest_whole[file_path] = index
+                else:
+                    latest_range[(file_path, range_key)] = index
+
+        compacted: list[LLMMessage] = []
+        for index, message in enumerate(messages):
+            if message.name == "read_file" and index in events:
+                file_path, range_key = events[index][0]
+                superseded = latest_whole.get(file_path, -1) > index or (
+                    range_key is not None and latest_range[(file_path, range_key)] > index
+                )
+                if superseded:
+                    compacted.append(
+                        _replace_content(
+                            message,
+                            json.dumps(
+                                {"status": "compacted", "note": f"Superseded read of {file_path}."},
+                                sort_keys=True,
+                            ),
+                        )
+                    )
+                    continue
+            compacted.append(message)
+        return compacted
+
+
+class TruncateOldToolOutputs(CompactionStrategy):
+    name = "truncate_old_tool_outputs"
+
+    def __init__(self, *, keep_recent: int = 4, max_chars: int = 1_000) -> None:
+        if keep_recent < 0:
+            raise ValueError("keep_recent must be >= 0")
+        if max_chars < 0:
+            raise ValueError("max_chars must be >= 0")
+        self._keep_recent = keep_recent
+        self._max_chars = max_chars
+
+    def compact(self, messages: list[LLMMessage], fits: MessageFitCheck) -> list[LLMMessage]:
+        tool_indexes = [index for index, message in enumerate(messages) if message.role == "tool"]
+        protected = set(tool_indexes[-self._keep_recent :]) if self._keep_recent else set()
+        compacted: list[LLMMessage] = []
+        for index, message in enumerate(messages):
+            content = message.content or ""
+            if message.role != "tool" or index in protected or len(content) <= self._max_chars:
+                compacted.append(message)
+                continue
+            compacted.append(_replace_content(message, truncate_middle(content, self._max_chars)))
+        return compacted
+
+
+class SummarizeCompletedTurns(CompactionStrategy):
+    name = "summarize_completed_turns"
+
+    def __init__(self, *, keep_recent_turns: int = 2, max_text_chars: int = 200) -> None:
+        if keep_recent_turns < 1:
+            raise ValueError("keep_recent_turns must be >= 1")
+        self._keep_recent_turns = keep_recent_turns
+        self._max_text_chars = max_text_chars
+
+    def compact(self, messages: list[LLMMessage], fits: MessageFitCheck) -> list[LLMMessage]:
+        head, turns = split_turns(messages)
+        if len(turns) <= self._keep_recent_turns:
+            return list(messages)
+        old_turns = turns[: -self._keep_recent_turns]
+        recent_turns = turns[-self._keep_recent_turns :]
+        compacted = list(head)
+        compacted.extend(self._summarize(turn) for turn in old_turns)
+        for turn in recent_turns:
+            compacted.extend(turn)
+        return compacted
+
+    def _summarize(self, turn: list[LLMMessage]) -> LLMMessage:
+        assistant = turn[0]
+        parts = ["[Compacted earlier turn]"]
+        if assistant.content:
+            parts.append(f"Assistant: {truncate_middle(assistant.content, self._max_text_chars)}")
+        statuses = {
+            message.tool_call_id: _tool_status(message) for message in turn if message.role == "tool"
+        }
+        for call in assistant.tool_calls:
+            args = truncate_middle(json.dumps(call.args, sort_keys=True, default=str), 120)
+            status = statuses.get(call.call_id, "unknown")
+            parts.append(f"Called {call.name}({args}) -> {status}")
+        return LLMMessage(role="assistant", content="\n".join(parts))
+
+
+class DropOldestTurns(CompactionStrategy):
+    name = "drop_oldest_turns"
+
+    def compact(self, messages: list[LLMMessage], fits: MessageFitCheck) -> list[LLMMessage]:
+        head, turns = split_turns(messages)
+        while len(turns) > 1:
+            candidate = [*head, *(message for turn in turns for message in turn)]
+            if fits(candidate):
+                return candidate
+            turns = turns[1:]
+        return [*head, *(message for turn in turns for message in turn)]
+
+
+def default_compaction_strategies() -> list[CompactionStrategy]:
+    return [
+        DropSupersededFileReads(),
+        TruncateOldToolOutputs(),
+        SummarizeCompletedTurns(),
+        DropOldestTurns(),
+    ]
+
+
+class ContextBudgetManager:
+    def __init__(
+        self,
+        max_context_tokens: int,
+        *,
+        reserve_output_tokens: int = 4_096,
+        strategies: Sequence[CompactionStrategy] | None = None,
+        token_estimator: Callable[
+            [Sequence[LLMMessage], Sequence[dict[str, Any]] | None], int
+        ] = estimate_request_tokens,
+    ) -> None:
+        if max_context_tokens <= 0:
+            raise ValueError("max_context_tokens must be > 0")
+        if reserve_output_tokens < 0 or reserve_output_tokens >= max_context_tokens:
+            raise ValueError("reserve_output_tokens must be >= 0 and < max_context_tokens")
+        self._budget_tokens = max_context_tokens - reserve_output_tokens
+        self._strategies = (
+            list(strategies) if strategies is not None else default_compaction_strategies()
+        )
+        self._token_estimator = token_estimator
+        self.compactions = 0
+
+    @classmethod
+    def for_model(
+        cls,
+        model: str | None,
+        *,
+        reserve_output_tokens: int = 4_096,
+        strategies: Sequence[CompactionStrategy] | None = None,
+    ) -> ContextBudgetManager | None:
+        window = context_window_for_model(model)
+        if window is None:
+            return None
+        return cls(window, reserve_output_tokens=reserve_output_tokens, strategies=strategies)
+
+    @property
+    def budget_tokens(self) -> int:
+        return self._budget_tokens
+
+    def count_tokens(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+    ) -> int:
+        return self._token_estimator(messages, tools)
+
+    def fit(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+    ) -> list[LLMMessage]:
+        def _fits(candidate: list[LLMMessage]) -> bool:
+            return self.count_tokens(candidate, tools) <= self._budget_tokens
+
+        current = list(messages)
+        if _fits(current):
+            return current
+        self.compactions += 1
+        for strategy in self._strategies:
+            current = strategy.compact(current, _fits)
+            if _fits(current):
+                return current
+        raise ContextBudgetExceededError(
+            "Prompt exceeds context budget after compaction: "
+            f"{self.count_tokens(current, tools)} > {self._budget_tokens} estimated tokens."
+        )
+
+
+def split_turns(messages: Sequence[LLMMessage]) -> tuple[list[LLMMessage], list[list[LLMMessage]]]:
+    head: list[LLMMessage] = []
+    turns: list[list[LLMMessage]] = []
+    for message in messages:
+        if message.role == "assistant":
+            turns.append([message])
+        elif turns:
+            turns[-1].append(message)
+        else:
+            head.append(message)
+    return head, turns
+
+
+def truncate_middle(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    head_chars = max_chars // 2
+    tail_chars = max_chars - head_chars
+    omitted = len(text) - head_chars - tail_chars
+    tail = text[-tail_chars:] if tail_chars else ""
+    return f"{text[:head_chars]}\n...[{omitted} chars truncated]...\n{tail}"
+
+
+def _replace_content(message: LLMMessage, content: str) -> LLMMessage:
+    return LLMMessage(
+        role=message.role,
+        content=content,
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+        tool_calls=message.tool_calls,
+    )
+
+
+def _tool_payload(message: LLMMessage) -> dict[str, Any] | None:
+    if message.role != "tool" or not message.content:
+        return None
+    try:
+        payload = json.loads(message.content)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _tool_file_events(message: LLMMessage) -> list[tuple[str, str | None]]:
+    """(file_path, range) pairs a successful file tool result covers; range None = whole file."""
+    if message.name not in FILE_TOOL_NAMES:
+        return []
+    payload = _tool_payload(message)
+    if payload is None or payload.get("status") != "success":
+        return []
+    display = payload.get("result_display")
+    if not isinstance(display, dict):
+        return []
+    if message.name == "batch_replace":
+        files = display.get("files")
+        return [
+            (item["file_path"], None)
+            for item in (files if isinstance(files, list) else [])
+            if isinstance(item, dict) and isinstance(item.get("file_path"), str)
+        ]
+    file_path = display.get("file_path")
+    if not isinstance(file_path, str):
+        return []
+    return [(file_path, _read_range_key(display) if message.name == "read_file" else None)]
+
+
+def _read_range_key(display: dict[str, Any]) -> str | None:
+    # A page starting at the top with nothing left after it is a whole-file read.
+    if "start_line" in display:
+        start, end = display.get("start_line"), display.get("end_line")
+        return None if start == 1 and not display.get("truncated") else f"lines:{start}-{end}"
+    if "byte_offset" in display:
+        start, end = display.get("byte_offset"), display.get("byte_end")
+        return None if start == 0 and not display.get("truncated") else f"bytes:{start}-{end}"
+    return None
+
+
+def _tool_status(message: LLMMessage) -> str:
+    payload = _tool_payload(message)
+    if payload is None:
+        return "compacted"
+    status = payload.get("status")
+    return status if isinstance(status, str) else "unknown"
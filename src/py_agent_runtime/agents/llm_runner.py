@@ -6,16 +6,23 @@ from typing import Any
 from uuid import uuid4
 
 from py_agent_runtime.agents.agent_scheduler import schedule_agent_tools
-from py_agent_runtime.agents.completion_schema import validate_completion_output
+from py_agent_runtime.agents.checkpoint import SessionCheckpointer, SessionFinalResult, SessionState
+from py_agent_runtime.agents.completion_schema import compile_completion_schema
+from py_agent_runtime.agents.completion_stream import CompletionStreamMonitor
+from py_agent_runtime.agents.context_budget import (
+    ContextBudgetExceededError,
+    ContextBudgetManager,
+)
 from py_agent_runtime.agents.local_executor import (
     FunctionCall,
     LocalAgentExecutor,
     TASK_COMPLETE_TOOL_NAME,
 )
-from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.base_provider import LLMProvider, LLMStreamAbortedError
 from py_agent_runtime.llm.normalizer import build_openai_tool_schemas_from_registry
-from py_agent_runtime.llm.types import LLMMessage
+from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
 from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.tool_outputs import ToolOutputLimits, bound_tool_output
 from py_agent_runtime.scheduler.types import CoreToolCallStatus, ToolCallRequestInfo
 
 
@@ -39,6 +46,10 @@ class LLMAgentRunner:
         temperature: float | None = None,
         enable_recovery_turn: bool = True,
         completion_schema: dict[str, Any] | None = None,
+        context_budget: ContextBudgetManager | None = None,
+        tool_output_limits: ToolOutputLimits | None = None,
+        checkpointer: SessionCheckpointer | None = None,
+        stream_completion_validation: bool = True,
     ) -> None:
         self._config = config
         self._provider = provider
@@ -47,14 +58,58 @@ class LLMAgentRunner:
         self._model = model
         self._temperature = temperature
         self._enable_recovery_turn = enable_recovery_turn
-        self._completion_schema = completion_schema
+        self._completion_schema = (
+            compile_completion_schema(completion_schema) if completion_schema is not None else None
+        )
+        self._context_budget = context_budget
+        self._tool_output_limits = tool_output_limits or ToolOutputLimits()
+        self._checkpointer = checkpointer
+        self._stream_completion_validation = stream_completion_validation
 
     def run(self, user_prompt: str, system_prompt: str | None = None) -> AgentRunResult:
+        if self._checkpointer is not None:
+            self._checkpointer.start(self._config.session_id, user_prompt, system_prompt)
+        messages = self._initial_messages(user_prompt, system_prompt)
+        return self._finish(self._run_turns(messages, first_turn=1))
+
+    def resume(self, state: SessionState) -> AgentRunResult:
+        if state.final is not None and state.final.success:
+            return AgentRunResult(
+                success=True,
+                result=state.final.result,
+                error=None,
+                turns=state.final.turns,
+            )
+        state.apply_to(self._config)
+        if self._checkpointer is not None:
+            self._checkpointer.resume_from(state)
+        messages = list(state.messages) or self._initial_messages(
+            state.user_prompt,
+            state.system_prompt,
+        )
+        return self._finish(self._run_turns(messages, first_turn=state.turn + 1))
+
+    @staticmethod
+    def _initial_messages(user_prompt: str, system_prompt: str | None) -> list[LLMMessage]:
         messages: list[LLMMessage] = []
         if system_prompt:
             messages.append(LLMMessage(role="system", content=system_prompt))
         messages.append(LLMMessage(role="user", content=user_prompt))
+        return messages
+
+    def _finish(self, result: AgentRunResult) -> AgentRunResult:
+        if self._checkpointer is not None:
+            self._checkpointer.record_final(
+                SessionFinalResult(
+                    success=result.success,
+                    result=result.result,
+                    error=result.error,
+                    turns=result.turns,
+                )
+            )
+        return result
 
+    def _run_turns(self, messages: list[LLMMessage], *, first_turn: int) -> AgentRunResult:
         allowed_tool_names = self._build_allowed_tool_names()
         tool_schemas = build_openai_tool_schemas_from_registry(
             self._config.tool_registry,
@@ -62,13 +117,19 @@ class LLMAgentRunner:
         )
         tool_schemas.append(self._completion_tool_schema())
 
-        for turn in range(1, self._max_turns + 1):
-            llm_response = self._provider.generate(
-                messages=messages,
-                tools=tool_schemas,
-                model=self._model,
-                temperature=self._temperature,
-            )
+        last_turn = first_turn + self._max_turns - 1
+        for turn in range(first_turn, last_turn + 1):
+            try:
+                messages = self._fit_context(messages, tool_schemas)
+            except ContextBudgetExceededError as exc:
+                return AgentRunResult(success=False, result=None, error=str(exc), turns=turn)
+            try:
+                llm_response = self._generate(messages, tool_schemas)
+            except LLMStreamAbortedError as exc:
+                messages.append(LLMMessage(role="user", content=self._stream_abort_prompt(exc)))
+                if self._checkpointer is not None:
+                    self._checkpointer.record_turn(turn, messages, self._config)
+                continue
             messages.append(
                 LLMMessage(
                     role="assistant",
@@ -128,7 +189,7 @@ class LLMAgentRunner:
                         LLMMessage(
                             role="tool",
                             tool_call_id=completed_call.request.call_id,
-                            content=self._serialize_tool_response(completed_call),
+                            content=self._tool_message_content(completed_call),
                             name=completed_call.request.name,
                         )
                     )
@@ -171,10 +232,13 @@ class LLMAgentRunner:
                     reason="no_executable_calls",
                 )
 
+            if self._checkpointer is not None:
+                self._checkpointer.record_turn(turn, messages, self._config)
+
         return self._failure_with_optional_recovery(
             messages=messages,
             tool_schemas=tool_schemas,
-            turn=self._max_turns,
+            turn=last_turn,
             fallback_error=f"Agent exceeded max turns ({self._max_turns}) without completing task.",
             reason="max_turns",
         )
@@ -208,14 +272,22 @@ class LLMAgentRunner:
             },
         }
 
-    @staticmethod
-    def _serialize_tool_response(completed_call: Any) -> str:
+    def _tool_message_content(self, completed_call: Any) -> str:
+        bounded = bound_tool_output(
+            completed_call.response.result_display,
+            tool_name=completed_call.request.name,
+            limits=self._tool_output_limits,
+            store=self._config.tool_output_store,
+        )
         payload: dict[str, Any] = {
             "status": completed_call.status.value,
-            "result_display": completed_call.response.result_display,
+            "result_display": bounded.result_display,
             "error": completed_call.response.error,
             "error_type": completed_call.response.error_type,
         }
+        if bounded.truncated:
+            payload["truncated"] = True
+            payload["output_handles"] = list(bounded.handles)
         return json.dumps(payload, default=str, sort_keys=True)
 
     def _failure_with_optional_recovery(
@@ -250,12 +322,8 @@ class LLMAgentRunner:
         )
         recovery_messages = [*messages, LLMMessage(role="user", content=recovery_prompt)]
         try:
-            recovery_response = self._provider.generate(
-                messages=recovery_messages,
-                tools=tool_schemas,
-                model=self._model,
-                temperature=self._temperature,
-            )
+            recovery_messages = self._fit_context(recovery_messages, tool_schemas)
+            recovery_response = self._generate(recovery_messages, tool_schemas)
         except Exception:
             return None
         recovery_calls = [
@@ -286,7 +354,45 @@ class LLMAgentRunner:
             turns=turn,
         )
 
+    def _generate(
+        self,
+        messages: list[LLMMessage],
+        tool_schemas: list[dict[str, Any]],
+    ) -> LLMTurnResponse:
+        if self._completion_schema is None or not self._stream_completion_validation:
+            return self._provider.generate(
+                messages=messages,
+                tools=tool_schemas,
+                model=self._model,
+                temperature=self._temperature,
+            )
+        monitor = CompletionStreamMonitor(self._completion_schema)
+        return self._provider.generate_streaming(
+            messages=messages,
+            tools=tool_schemas,
+            model=self._model,
+            temperature=self._temperature,
+            on_tool_call_delta=monitor.on_tool_call_delta,
+        )
+
+    @staticmethod
+    def _stream_abort_prompt(exc: LLMStreamAbortedError) -> str:
+        return (
+            f"Your `{TASK_COMPLETE_TOOL_NAME}` call was stopped while streaming because its "
+            f"result cannot satisfy the completion schema: {exc.reason}. Call "
+            f"`{TASK_COMPLETE_TOOL_NAME}` again with a result that satisfies the schema."
+        )
+
+    def _fit_context(
+        self,
+        messages: list[LLMMessage],
+        tool_schemas: list[dict[str, Any]],
+    ) -> list[LLMMessage]:
+        if self._context_budget is None:
+            return messages
+        return self._context_budget.fit(messages, tool_schemas)
+
     def _validate_completion_result(self, result: str) -> str | None:
         if self._completion_schema is None:
             return None
-        return validate_completion_output(result, self._completion_schema)
+        return self._completion_schema.validate(result)
@@ -17,6 +17,11 @@ class AgentRegistry:
         self._config = config
         self._agents: dict[str, AgentDefinition] = {}
         self._all_definitions: dict[str, AgentDefinition] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def register_agent(self, definition: AgentDefinition) -> bool:
         if not definition.name.strip() or not definition.description.strip():
@@ -27,6 +32,7 @@ class AgentRegistry:
             return False
 
         self._agents[definition.name] = definition
+        self._version += 1
         self._add_agent_policy(definition)
         return True
 
@@ -48,6 +54,7 @@ class AgentRegistry:
     def clear(self) -> None:
         self._agents.clear()
         self._all_definitions.clear()
+        self._version += 1
 
     def _add_agent_policy(self, definition: AgentDefinition) -> None:
         policy_engine = self._config.policy_engine
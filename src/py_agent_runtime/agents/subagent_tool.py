@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from dataclasses import dataclass
+from typing import AbstractSet, Any, Mapping
 
 from py_agent_runtime.agents.agent_scheduler import schedule_agent_tools
 from py_agent_runtime.agents.completion_schema import validate_completion_output
@@ -24,11 +25,21 @@ class SubagentToolWrapper:
         return SubagentTool(self._definition)
 
 
+@dataclass(frozen=True)
+class _AgentToolScope:
+    tool_registry: ToolRegistry
+    tool_registry_version: int
+    agent_registry_version: int
+    allowed_tool_names: frozenset[str]
+    agent_tool_registry: ToolRegistry
+
+
 class SubagentTool(BaseTool):
     def __init__(self, definition: AgentDefinition) -> None:
         self._definition = definition
         self.name = definition.name
         self.description = definition.description
+        self._scope: _AgentToolScope | None = None
 
     def validate_params(self, params: Mapping[str, Any]) -> str | None:
         turns = params.get("turns")
@@ -57,8 +68,7 @@ class SubagentTool(BaseTool):
         raw_turns = params.get("turns")
         assert isinstance(raw_turns, list)  # validated above
 
-        allowed_tool_names = self._build_allowed_tool_names(config)
-        agent_tool_registry = self._build_agent_tool_registry(config, allowed_tool_names)
+        allowed_tool_names, agent_tool_registry = self._agent_tool_scope(config)
         scheduler_id = f"subagent:{self._definition.name}"
 
         for turn_index, raw_turn in enumerate(raw_turns, start=1):
@@ -144,6 +154,28 @@ class SubagentTool(BaseTool):
             error=message,
         )
 
+    def _agent_tool_scope(self, config: RuntimeConfig) -> tuple[frozenset[str], ToolRegistry]:
+        # Rebuilt only when the parent registries mutate; racing rebuilds are harmless.
+        tool_registry = config.tool_registry
+        agent_registry = config.get_agent_registry()
+        scope = self._scope
+        if (
+            scope is None
+            or scope.tool_registry is not tool_registry
+            or scope.tool_registry_version != tool_registry.version
+            or scope.agent_registry_version != agent_registry.version
+        ):
+            allowed_tool_names = frozenset(self._build_allowed_tool_names(config))
+            scope = _AgentToolScope(
+                tool_registry=tool_registry,
+                tool_registry_version=tool_registry.version,
+                agent_registry_version=agent_registry.version,
+                allowed_tool_names=allowed_tool_names,
+                agent_tool_registry=self._build_agent_tool_registry(config, allowed_tool_names),
+            )
+            self._scope = scope
+        return scope.allowed_tool_names, scope.agent_tool_registry
+
     def _build_allowed_tool_names(self, config: RuntimeConfig) -> set[str]:
         available = set(config.tool_registry.get_all_tool_names())
         all_agents = set(config.get_agent_registry().get_all_agent_names())
@@ -156,7 +188,9 @@ class SubagentTool(BaseTool):
         )
 
     @staticmethod
-    def _build_agent_tool_registry(config: RuntimeConfig, allowed_tool_names: set[str]) -> ToolRegistry:
+    def _build_agent_tool_registry(
+        config: RuntimeConfig, allowed_tool_names: AbstractSet[str]
+    ) -> ToolRegistry:
         registry = ToolRegistry()
         for tool_name in sorted(allowed_tool_names):
             tool = config.tool_registry.get_tool(tool_name)
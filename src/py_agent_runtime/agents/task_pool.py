@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from py_agent_runtime.agents.llm_runner import AgentRunResult, LLMAgentRunner
+
+
+@dataclass(frozen=True)
+class PromptTask:
+    task_id: str
+    prompt: str
+    system_prompt: str | None = None
+
+
+@dataclass(frozen=True)
+class PromptTaskResult:
+    task: PromptTask
+    result: AgentRunResult
+    elapsed_seconds: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.task.task_id,
+            "success": self.result.success,
+            "result": self.result.result,
+            "error": self.result.error,
+            "turns": self.result.turns,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+def load_prompt_tasks(path: Path, *, default_system_prompt: str | None = None) -> list[PromptTask]:
+    tasks: list[PromptTask] = []
+    seen: set[str] = set()
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid task JSON on line {line_number}: {exc.msg}") from exc
+            if not isinstance(payload, dict):
+                raise ValueError(f"Task on line {line_number} must be a JSON object.")
+            prompt = payload.get("prompt")
+            if not isinstance(prompt, str) or not prompt.strip():
+                raise ValueError(f"Task on line {line_number} needs a non-empty 'prompt'.")
+            task_id = str(payload.get("id") or f"line-{line_number}")
+            if task_id in seen:
+                raise ValueError(f"Duplicate task id '{task_id}' on line {line_number}.")
+            seen.add(task_id)
+            system_prompt = payload.get("system_prompt", default_system_prompt)
+            tasks.append(
+                PromptTask(
+                    task_id=task_id,
+                    prompt=prompt,
+                    system_prompt=str(system_prompt) if system_prompt is not None else None,
+                )
+            )
+    return tasks
+
+
+def completed_task_ids(results_path: Path) -> set[str]:
+    if not results_path.exists():
+        return set()
+    completed: set[str] = set()
+    with results_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a torn final line; that task simply runs again.
+                continue
+            if isinstance(payload, dict) and payload.get("id") is not None:
+                completed.add(str(payload["id"]))
+    return completed
+
+
+def run_prompt_tasks(
+    tasks: Iterable[PromptTask],
+    runner_factory: Callable[[PromptTask], LLMAgentRunner],
+    *,
+    workers: int = 4,
+    clock: Callable[[], float] = time.monotonic,
+) -> Iterator[PromptTaskResult]:
+    """Run tasks on a thread pool and yield results in completion order.
+
+    At most `workers` tasks are in flight, so huge task files are never fully
+    materialised as futures.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    def _run(task: PromptTask) -> PromptTaskResult:
+        started = clock()
+        try:
+            runner = runner_factory(task)
+            result = runner.run(task.prompt, system_prompt=task.system_prompt)
+        except Exception as exc:
+            result = AgentRunResult(success=False, result=None, error=str(exc), turns=0)
+        return PromptTaskResult(task=task, result=result, elapsed_seconds=clock() - started)
+
+    pending_tasks = iter(tasks)
+    in_flight: set[Future[PromptTaskResult]] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prompt-task") as executor:
+        for task in pending_tasks:
+            in_flight.add(executor.submit(_run, task))
+            if len(in_flight) >= workers:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_task = next(pending_tasks, None)
+                if next_task is not None:
+                    in_flight.add(executor.submit(_run, next_task))
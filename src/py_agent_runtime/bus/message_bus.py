@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from collections import defaultdict
 from collections.abc import Callable
 from typing import Any
@@ -16,14 +17,20 @@ class MessageBus:
     def __init__(self, policy_engine: PolicyEngine | None = None) -> None:
         self._subscribers: dict[MessageBusType, list[MessageHandler]] = defaultdict(list)
         self._policy_engine = policy_engine
+        # Parallel subagents share one bus, so subscriber lists are copy-on-write.
+        self._lock = threading.Lock()
 
     def subscribe(self, message_type: MessageBusType, handler: MessageHandler) -> None:
-        self._subscribers[message_type].append(handler)
+        with self._lock:
+            self._subscribers[message_type] = [*self._subscribers[message_type], handler]
 
     def unsubscribe(self, message_type: MessageBusType, handler: MessageHandler) -> None:
-        self._subscribers[message_type] = [
-            registered for registered in self._subscribers[message_type] if registered != handler
-        ]
+        with self._lock:
+            self._subscribers[message_type] = [
+                registered
+                for registered in self._subscribers[message_type]
+                if registered != handler
+            ]
 
     def publish(self, message_type: MessageBusType, payload: dict[str, Any]) -> None:
         if (
@@ -10,6 +10,7 @@ class MessageBusType(str, Enum):
     TOOL_CONFIRMATION_RESPONSE = "tool-confirmation-response"
     UPDATE_POLICY = "update-policy"
     TOOL_CALLS_UPDATE = "tool-calls-update"
+    TOOL_OUTPUT_UPDATE = "tool-output-update"
     ASK_USER_REQUEST = "ask-user-request"
     ASK_USER_RESPONSE = "ask-user-response"
 
@@ -3,54 +3,78 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import threading
+import time
+from collections.abc import Callable
+from importlib import import_module
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from py_agent_runtime.agents.llm_runner import LLMAgentRunner
-from py_agent_runtime.llm import LLMMessage
-from py_agent_runtime.llm.factory import create_provider
-from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.agents.checkpoint import (
+    SessionCheckpointer,
+    load_session_state,
+    session_checkpoint_path,
+)
+from py_agent_runtime.agents.context_budget import ContextBudgetManager
+from py_agent_runtime.llm.base_provider import LLMProvider, close_provider
+from py_agent_runtime.llm.factory import (
+    create_failover_provider,
+    create_provider,
+    get_provider_default_model,
+    get_registered_provider_names,
+)
+from py_agent_runtime.llm.raw_retention import RawRetentionMode, RawRetentionPolicy
+from py_agent_runtime.llm.rate_limit import RateLimitedProvider, get_shared_rate_limiter
+from py_agent_runtime.llm.types import LLMMessage
+from py_agent_runtime.runtime.config import DEFAULT_SHELL_OUTPUT_MAX_BYTES, RuntimeConfig
 from py_agent_runtime.runtime.modes import ApprovalMode
-from py_agent_runtime.tools.glob_search import GlobSearchTool
-from py_agent_runtime.tools.grep_search import GrepSearchTool
-from py_agent_runtime.tools.enter_plan_mode import EnterPlanModeTool
-from py_agent_runtime.tools.exit_plan_mode import ExitPlanModeTool
-from py_agent_runtime.tools.list_directory import ListDirectoryTool
-from py_agent_runtime.tools.read_file import ReadFileTool
-from py_agent_runtime.tools.read_todos import ReadTodosTool
-from py_agent_runtime.tools.replace import ReplaceTool
-from py_agent_runtime.tools.run_shell_command import RunShellCommandTool
-from py_agent_runtime.tools.write_file import WriteFileTool
-from py_agent_runtime.tools.write_todos import WriteTodosTool
+from py_agent_runtime.tools.builtin import BUILTIN_TOOLS, load_tool, register_builtin_tools
 from py_agent_runtime.policy.types import PolicyRule
 
-SUPPORTED_PROVIDERS = ("openai", "gemini", "anthropic", "huggingface")
-PROVIDER_DEFAULT_MODELS: dict[str, str] = {
-    "openai": "gpt-4.1-mini",
-    "gemini": "gemini-2.5-pro",
-    "anthropic": "claude-3-7-sonnet-latest",
-    "huggingface": "moonshotai/Kimi-K2.5",
+if TYPE_CHECKING:
+    from py_agent_runtime.agents.llm_runner import AgentRunResult, LLMAgentRunner
+    from py_agent_runtime.agents.task_pool import PromptTask, PromptTaskResult
+    from py_agent_runtime.runtime.tool_outputs import ToolOutputLimits
+
+RAW_TRACE_SUBDIR = Path(".gemini") / "tmp" / "traces"
+DEFAULT_SERVER_ADDRESS = "unix:~/.gemini/server/py-agent-runtime.sock"
+SERVER_METHODS: dict[str, tuple[str, ...]] = {
+    "chat": ("chat",),
+    "run": ("run",),
+    "tools.list": ("tools", "list"),
 }
 
 
+# Heavy modules resolved on first use so light subcommands (`tools list`, `mode`) start fast.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "LLMAgentRunner": "py_agent_runtime.agents.llm_runner",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _runner_class() -> type[LLMAgentRunner]:
+    runner_class: type[LLMAgentRunner] = globals().get("LLMAgentRunner") or __getattr__(
+        "LLMAgentRunner"
+    )
+    return runner_class
+
+
 def _register_default_tools(config: RuntimeConfig) -> None:
-    config.tool_registry.register_tool(GlobSearchTool())
-    config.tool_registry.register_tool(GrepSearchTool())
-    config.tool_registry.register_tool(ListDirectoryTool())
-    config.tool_registry.register_tool(ReadFileTool())
-    config.tool_registry.register_tool(ReadTodosTool())
-    config.tool_registry.register_tool(ReplaceTool())
-    config.tool_registry.register_tool(RunShellCommandTool())
-    config.tool_registry.register_tool(WriteFileTool())
-    config.tool_registry.register_tool(EnterPlanModeTool())
-    config.tool_registry.register_tool(ExitPlanModeTool())
-    config.tool_registry.register_tool(WriteTodosTool())
+    register_builtin_tools(config.tool_registry)
 
 
 def _default_provider_from_env() -> str:
     raw_value = os.environ.get("PY_AGENT_DEFAULT_PROVIDER", "openai")
     normalized = raw_value.strip().lower()
-    if normalized in SUPPORTED_PROVIDERS:
+    if normalized in get_registered_provider_names():
         return normalized
     return "openai"
 
@@ -64,51 +88,178 @@ def _resolve_model(provider: str, model: str | None) -> str:
     if env_model:
         return env_model
 
-    return PROVIDER_DEFAULT_MODELS.get(provider.strip().lower(), "gpt-4.1-mini")
+    return _provider_default_model(provider)
 
 
-def _chat_command(
+def _provider_default_model(provider: str) -> str:
+    default_model = get_provider_default_model(provider)
+    if default_model is None:
+        raise ValueError(f"Provider {provider!r} has no default model; pass a model explicitly.")
+    return default_model
+
+
+def _chat_payload(
     prompt: str,
     provider_name: str,
     model: str | None,
     temperature: float | None,
-) -> int:
-    resolved_model = _resolve_model(provider_name, model)
-    provider = create_provider(provider_name, model=resolved_model)
+    provider: LLMProvider | None = None,
+) -> dict[str, Any]:
+    if provider is None:
+        provider = create_provider(provider_name, model=_resolve_model(provider_name, model))
     response = provider.generate(
         messages=[LLMMessage(role="user", content=prompt)],
         temperature=temperature,
     )
-    print(response.content or "")
-    if response.tool_calls:
-        print(json.dumps([call.__dict__ for call in response.tool_calls], ensure_ascii=False, indent=2))
+    return {
+        "content": response.content,
+        "tool_calls": [call.__dict__ for call in response.tool_calls],
+    }
+
+
+def _print_chat_payload(payload: dict[str, Any]) -> None:
+    print(payload.get("content") or "")
+    if payload.get("tool_calls"):
+        print(json.dumps(payload["tool_calls"], ensure_ascii=False, indent=2))
+
+
+def _chat_command(
+    prompt: str,
+    provider_name: str,
+    model: str | None,
+    temperature: float | None,
+) -> int:
+    _print_chat_payload(_chat_payload(prompt, provider_name, model, temperature))
     return 0
 
 
+def _parse_provider_target(value: str) -> tuple[str, str]:
+    provider_name, _, model = value.partition(":")
+    normalized = provider_name.strip().lower()
+    supported = get_registered_provider_names()
+    if normalized not in supported:
+        raise ValueError(
+            f"Unsupported fallback provider: {provider_name!r}. "
+            f"Expected one of {', '.join(supported)}."
+        )
+    return normalized, model.strip() or _provider_default_model(normalized)
+
+
+def _raw_retention_policy(mode: str, target_dir: Path) -> RawRetentionPolicy:
+    retention_mode = RawRetentionMode(mode)
+    if retention_mode == RawRetentionMode.SPILL:
+        return RawRetentionPolicy(mode=retention_mode, spill_dir=target_dir / RAW_TRACE_SUBDIR)
+    return RawRetentionPolicy(mode=retention_mode)
+
+
+def _apply_rate_limit(
+    provider: LLMProvider,
+    provider_name: str,
+    requests_per_minute: int | None,
+    tokens_per_minute: int | None,
+) -> LLMProvider:
+    if requests_per_minute is None and tokens_per_minute is None:
+        return provider
+    limiter = get_shared_rate_limiter(
+        provider_name.strip().lower(),
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+    )
+    return RateLimitedProvider(provider, limiter)
+
+
+def _context_budget(model: str, context_window_tokens: int | None) -> ContextBudgetManager | None:
+    if context_window_tokens is None:
+        return ContextBudgetManager.for_model(model)
+    if context_window_tokens <= 0:
+        return None
+    return ContextBudgetManager(
+        context_window_tokens,
+        reserve_output_tokens=min(4_096, context_window_tokens // 4),
+    )
+
+
+def _tool_output_limits(max_chars: int | None) -> ToolOutputLimits | None:
+    if max_chars is None:
+        return None
+    from py_agent_runtime.runtime.tool_outputs import ToolOutputLimits
+
+    if max_chars <= 0:
+        return ToolOutputLimits.unbounded()
+    return ToolOutputLimits(default_max_chars=max_chars, per_tool={})
+
+
 def _print_json_payload(payload: dict[str, Any]) -> None:
     print(json.dumps(payload, ensure_ascii=False, indent=2))
 
 
-def _run_command(args: argparse.Namespace) -> int:
-    resolved_model = _resolve_model(args.provider, args.model)
-    provider = create_provider(
+def _build_agent_provider(
+    args: argparse.Namespace,
+    resolved_model: str,
+    target_dir: Path,
+) -> LLMProvider:
+    raw_retention = _raw_retention_policy(args.raw_response_retention, target_dir)
+    fallback_targets = [_parse_provider_target(value) for value in args.fallback_provider or []]
+    if fallback_targets or args.hedge_percentile is not None:
+        provider = create_failover_provider(
+            [(args.provider, resolved_model), *fallback_targets],
+            max_retries=args.max_retries,
+            retry_base_delay_seconds=args.retry_base_delay_seconds,
+            retry_max_delay_seconds=args.retry_max_delay_seconds,
+            hedge_percentile=args.hedge_percentile,
+            raw_retention=raw_retention,
+        )
+    else:
+        provider = create_provider(
+            args.provider,
+            model=resolved_model,
+            max_retries=args.max_retries,
+            retry_base_delay_seconds=args.retry_base_delay_seconds,
+            retry_max_delay_seconds=args.retry_max_delay_seconds,
+            raw_retention=raw_retention,
+        )
+    return _apply_rate_limit(
+        provider,
         args.provider,
-        model=resolved_model,
-        max_retries=args.max_retries,
-        retry_base_delay_seconds=args.retry_base_delay_seconds,
-        retry_max_delay_seconds=args.retry_max_delay_seconds,
+        args.requests_per_minute,
+        args.tokens_per_minute,
     )
-    target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+
+
+def _build_agent_runner(
+    args: argparse.Namespace,
+    provider: LLMProvider,
+    resolved_model: str,
+    target_dir: Path,
+    completion_schema: dict[str, Any] | None,
+    *,
+    session_id: str | None = None,
+    session_file: Path | None = None,
+) -> tuple[LLMAgentRunner, RuntimeConfig]:
+    from py_agent_runtime.tools.shell_output import ShellResourceLimits
+
+    session_kwargs: dict[str, Any] = {"session_id": session_id} if session_id is not None else {}
     config = RuntimeConfig(
         target_dir=target_dir,
         interactive=not args.non_interactive,
         plan_enabled=args.plan_enabled,
         approval_mode=ApprovalMode(args.approval_mode),
+        max_parallel_subagents=args.max_parallel_subagents,
+        grep_index=args.grep_index,
+        write_durability=args.write_durability,
+        shell_output_max_bytes=args.shell_output_max_bytes,
+        shell_limits=ShellResourceLimits(
+            cpu_seconds=args.shell_cpu_seconds,
+            address_space_bytes=args.shell_memory_bytes,
+            max_processes=args.shell_max_processes,
+        ),
+        **session_kwargs,
     )
     _register_default_tools(config)
-    completion_schema = _load_completion_schema(args.completion_schema_file)
-
-    runner = LLMAgentRunner(
+    if session_file is None and (args.checkpoint or session_id is not None):
+        session_file = session_checkpoint_path(target_dir, config.session_id)
+    checkpointer = SessionCheckpointer(session_file) if session_file is not None else None
+    runner = _runner_class()(
         config=config,
         provider=provider,
         max_turns=args.max_turns,
@@ -116,19 +267,204 @@ def _run_command(args: argparse.Namespace) -> int:
         temperature=args.temperature,
         enable_recovery_turn=not args.disable_recovery_turn,
         completion_schema=completion_schema,
+        context_budget=_context_budget(resolved_model, args.context_window_tokens),
+        tool_output_limits=_tool_output_limits(args.tool_output_max_chars),
+        checkpointer=checkpointer,
+    )
+    return runner, config
+
+
+def _run_payload(args: argparse.Namespace, provider: LLMProvider | None = None) -> dict[str, Any]:
+    resolved_model = _resolve_model(args.provider, args.model)
+    target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+    if provider is None:
+        owned_provider = _build_agent_provider(args, resolved_model, target_dir)
+        try:
+            return _run_payload(args, owned_provider)
+        finally:
+            close_provider(owned_provider)
+    completion_schema = _load_completion_schema(args.completion_schema_file)
+    runner, config = _build_agent_runner(
+        args,
+        provider,
+        resolved_model,
+        target_dir,
+        completion_schema,
     )
     result = runner.run(user_prompt=args.prompt, system_prompt=args.system_prompt)
-    _print_json_payload(
-        {
-            "success": result.success,
-            "result": result.result,
-            "error": result.error,
-            "turns": result.turns,
-            "approval_mode": config.get_approval_mode().value,
-            "interactive": config.interactive,
-        }
+    session_file = (
+        session_checkpoint_path(target_dir, config.session_id) if args.checkpoint else None
+    )
+    return _agent_result_payload(result, config, session_file=session_file)
+
+
+def _agent_result_payload(
+    result: AgentRunResult,
+    config: RuntimeConfig,
+    *,
+    session_file: Path | None,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "success": result.success,
+        "result": result.result,
+        "error": result.error,
+        "turns": result.turns,
+        "approval_mode": config.get_approval_mode().value,
+        "interactive": config.interactive,
+    }
+    if session_file is not None:
+        payload["session_id"] = config.session_id
+        payload["session_file"] = str(session_file)
+    return payload
+
+
+def _run_command(args: argparse.Namespace) -> int:
+    payload = _run_payload(args)
+    _print_json_payload(payload)
+    return 0 if payload["success"] else 2
+
+
+def _resume_command(args: argparse.Namespace) -> int:
+    target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+    if args.session_file:
+        session_file = Path(args.session_file).resolve()
+    elif args.session_id:
+        session_file = session_checkpoint_path(target_dir, args.session_id)
+    else:
+        raise ValueError("resume needs --session-id or --session-file.")
+    state = load_session_state(session_file)
+
+    resolved_model = _resolve_model(args.provider, args.model)
+    completion_schema = _load_completion_schema(args.completion_schema_file)
+    provider = _build_agent_provider(args, resolved_model, target_dir)
+    try:
+        runner, config = _build_agent_runner(
+            args,
+            provider,
+            resolved_model,
+            target_dir,
+            completion_schema,
+            session_id=state.session_id,
+            # Keep appending to the log being resumed, wherever it lives.
+            session_file=session_file,
+        )
+        result = runner.resume(state)
+    finally:
+        close_provider(provider)
+    payload = _agent_result_payload(result, config, session_file=session_file)
+    _print_json_payload(payload)
+    return 0 if payload["success"] else 2
+
+
+def _run_batch_command(args: argparse.Namespace) -> int:
+    from py_agent_runtime.agents.task_pool import (
+        PromptTask,
+        completed_task_ids,
+        load_prompt_tasks,
+        run_prompt_tasks,
+    )
+
+    if args.resume and args.output == "-":
+        raise ValueError("--resume requires --output to point at a results file.")
+    if args.batch_api == "openai" and args.provider != "openai":
+        raise ValueError("--batch-api openai requires --provider openai.")
+    tasks = load_prompt_tasks(Path(args.tasks_file), default_system_prompt=args.system_prompt)
+    output_path = Path(args.output) if args.output != "-" else None
+    if args.resume and output_path is not None:
+        done = completed_task_ids(output_path)
+        tasks = [task for task in tasks if task.task_id not in done]
+
+    resolved_model = _resolve_model(args.provider, args.model)
+    target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+    completion_schema = _load_completion_schema(args.completion_schema_file)
+    provider = (
+        _build_agent_provider(args, resolved_model, target_dir) if args.batch_api is None else None
+    )
+
+    def _runner_for(task: PromptTask) -> LLMAgentRunner:
+        assert provider is not None
+        runner, _config = _build_agent_runner(
+            args,
+            provider,
+            resolved_model,
+            target_dir,
+            completion_schema,
+        )
+        return runner
+
+    failures = 0
+    handle = (
+        output_path.open("a" if args.resume else "w", encoding="utf-8")
+        if output_path is not None
+        else None
+    )
+    try:
+        task_results = (
+            run_prompt_tasks(tasks, _runner_for, workers=args.workers)
+            if args.batch_api is None
+            else _batch_api_task_results(
+                args, tasks, resolved_model, target_dir, completion_schema
+            )
+        )
+        for task_result in task_results:
+            line = json.dumps(task_result.to_dict(), ensure_ascii=False)
+            if handle is not None:
+                handle.write(line + "\n")
+                handle.flush()
+            else:
+                print(line, flush=True)
+            if not task_result.result.success:
+                failures += 1
+    finally:
+        if handle is not None:
+            handle.close()
+        if provider is not None:
+            close_provider(provider)
+    return 0 if failures == 0 else 2
+
+
+def _batch_api_task_results(
+    args: argparse.Namespace,
+    tasks: list[PromptTask],
+    resolved_model: str,
+    target_dir: Path,
+    completion_schema: dict[str, Any] | None,
+) -> list[PromptTaskResult]:
+    """Run every task as a session whose model turns go through provider batch jobs.
+
+    Each step submits one job holding the next request of every live session, so
+    results are written once all tasks finish; `elapsed_seconds` is the whole run.
+    """
+    from py_agent_runtime.agents.batch_runner import BatchSession, run_batch_sessions
+    from py_agent_runtime.agents.task_pool import PromptTaskResult
+    from py_agent_runtime.llm.openai_batch import OpenAIBatchBackend
+
+    def _runner_for(provider: LLMProvider) -> LLMAgentRunner:
+        runner, _config = _build_agent_runner(
+            args,
+            provider,
+            resolved_model,
+            target_dir,
+            completion_schema,
+        )
+        return runner
+
+    started = time.monotonic()
+    results = run_batch_sessions(
+        [BatchSession(task.prompt, system_prompt=task.system_prompt) for task in tasks],
+        _runner_for,
+        OpenAIBatchBackend(
+            model=resolved_model,
+            raw_retention=_raw_retention_policy(args.raw_response_retention, target_dir),
+        ),
+        poll_interval_seconds=args.batch_poll_seconds,
+        max_concurrent_sessions=args.batch_max_sessions,
     )
-    return 0 if result.success else 2
+    elapsed = time.monotonic() - started
+    return [
+        PromptTaskResult(task=task, result=result, elapsed_seconds=elapsed)
+        for task, result in zip(tasks, results)
+    ]
 
 
 def _mode_command(args: argparse.Namespace) -> int:
@@ -202,7 +538,7 @@ def _policies_command(args: argparse.Namespace) -> int:
     return 1
 
 
-def _tools_list_command(args: argparse.Namespace) -> int:
+def _tools_list_payload(args: argparse.Namespace) -> dict[str, Any]:
     target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
     config = RuntimeConfig(
         target_dir=target_dir,
@@ -210,19 +546,19 @@ def _tools_list_command(args: argparse.Namespace) -> int:
         plan_enabled=args.plan_enabled,
         approval_mode=ApprovalMode(args.approval_mode),
     )
-    _register_default_tools(config)
-    tools = []
-    for tool in config.tool_registry.get_all_tools():
-        tools.append({"name": tool.name, "description": tool.description})
+    # Listed from the static specs so `tools list` does not import every tool module.
+    tools = [{"name": spec.name, "description": spec.description} for spec in BUILTIN_TOOLS]
     tools.sort(key=lambda item: item["name"])
-    _print_json_payload(
-        {
-            "success": True,
-            "approval_mode": config.get_approval_mode().value,
-            "interactive": config.interactive,
-            "tools": tools,
-        }
-    )
+    return {
+        "success": True,
+        "approval_mode": config.get_approval_mode().value,
+        "interactive": config.interactive,
+        "tools": tools,
+    }
+
+
+def _tools_list_command(args: argparse.Namespace) -> int:
+    _print_json_payload(_tools_list_payload(args))
     return 0
 
 
@@ -241,7 +577,7 @@ def _plan_enter_command(args: argparse.Namespace) -> int:
         plan_enabled=True,
         approval_mode=ApprovalMode.DEFAULT,
     )
-    tool = EnterPlanModeTool()
+    tool = load_tool("py_agent_runtime.tools.enter_plan_mode:EnterPlanModeTool")
     params: dict[str, Any] = {}
     reason = str(args.reason or "").strip()
     if reason:
@@ -267,7 +603,7 @@ def _plan_exit_command(args: argparse.Namespace) -> int:
         plan_enabled=True,
         approval_mode=ApprovalMode.PLAN,
     )
-    tool = ExitPlanModeTool()
+    tool = load_tool("py_agent_runtime.tools.exit_plan_mode:ExitPlanModeTool")
     params: dict[str, Any] = {
         "plan_path": args.plan_path,
         "approved": not args.rejected,
@@ -303,11 +639,20 @@ def _plan_command(args: argparse.Namespace) -> int:
     return 1
 
 
+_completion_schema_cache: dict[tuple[str, int, int], dict[str, Any]] = {}
+
+
 def _load_completion_schema(schema_file: str | None) -> dict[str, Any] | None:
     if schema_file is None:
         return None
     path = Path(schema_file)
     try:
+        stat = path.stat()
+        # Reusing the same dict lets the compiled validator cache hit across server requests.
+        cache_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        cached = _completion_schema_cache.get(cache_key)
+        if cached is not None:
+            return cached
         parsed = json.loads(path.read_text(encoding="utf-8"))
     except Exception as exc:
         raise ValueError(f"Invalid completion schema JSON file: {path}: {exc}") from exc
@@ -315,101 +660,413 @@ def _load_completion_schema(schema_file: str | None) -> dict[str, Any] | None:
         raise ValueError(
             f"Invalid completion schema JSON file: {path}: top-level value must be an object."
         )
+    _completion_schema_cache[cache_key] = parsed
     return parsed
 
 
-def main() -> int:
-    default_provider = _default_provider_from_env()
-    parser = argparse.ArgumentParser(description="py-agent-runtime CLI")
-    subparsers = parser.add_subparsers(dest="command")
+class _ProviderCache:
+    def __init__(self) -> None:
+        self._providers: dict[tuple[Any, ...], LLMProvider] = {}
+        self._lock = threading.Lock()
 
-    chat_parser = subparsers.add_parser("chat", help="Run a basic LLM chat completion.")
-    chat_parser.add_argument("--prompt", required=True, help="User prompt.")
-    chat_parser.add_argument(
-        "--provider",
-        default=default_provider,
-        choices=list(SUPPORTED_PROVIDERS),
-        help="LLM provider backend.",
-    )
-    chat_parser.add_argument(
-        "--model",
-        default=None,
-        help="Optional model name. If omitted, provider-specific default is used.",
-    )
-    chat_parser.add_argument(
-        "--temperature",
-        type=float,
-        default=None,
-        help="Optional sampling temperature.",
-    )
-    run_parser = subparsers.add_parser(
-        "run",
-        help="Run the provider-driven agent loop with scheduler and tools.",
-    )
-    run_parser.add_argument("--prompt", required=True, help="User task prompt.")
-    run_parser.add_argument(
+    def get(self, key: tuple[Any, ...], factory: Callable[[], LLMProvider]) -> LLMProvider:
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                provider = factory()
+                self._providers[key] = provider
+            return provider
+
+
+def _params_to_argv(params: dict[str, Any]) -> list[str]:
+    argv: list[str] = []
+    for key, value in params.items():
+        if key == "server" or value is None or value is False:
+            continue
+        flag = "--" + key.replace("_", "-")
+        # `--flag=value` keeps values that start with a dash from being read as options.
+        if value is True:
+            argv.append(flag)
+        elif isinstance(value, list):
+            argv.extend(f"{flag}={item}" for item in value)
+        else:
+            argv.append(f"{flag}={value}")
+    return argv
+
+
+# Approval modes from most to least restrictive, for capping what server clients request.
+_APPROVAL_MODE_ORDER = (
+    ApprovalMode.PLAN,
+    ApprovalMode.DEFAULT,
+    ApprovalMode.AUTO_EDIT,
+    ApprovalMode.YOLO,
+)
+
+
+def _server_handlers(
+    parser: argparse.ArgumentParser,
+    *,
+    max_approval_mode: ApprovalMode = ApprovalMode.DEFAULT,
+) -> dict[str, Callable[[dict[str, Any]], dict[str, Any]]]:
+    from py_agent_runtime.cli.server import INVALID_PARAMS, RpcError
+
+    providers = _ProviderCache()
+    max_rank = _APPROVAL_MODE_ORDER.index(max_approval_mode)
+
+    def _parse(method: str, params: dict[str, Any]) -> argparse.Namespace:
+        try:
+            return parser.parse_args([*SERVER_METHODS[method], *_params_to_argv(params)])
+        except SystemExit as exc:
+            raise RpcError(INVALID_PARAMS, f"Invalid params for '{method}'.") from exc
+
+    def _chat(params: dict[str, Any]) -> dict[str, Any]:
+        args = _parse("chat", params)
+        resolved_model = _resolve_model(args.provider, args.model)
+        provider = providers.get(
+            ("chat", args.provider, resolved_model),
+            lambda: create_provider(args.provider, model=resolved_model),
+        )
+        return _chat_payload(args.prompt, args.provider, args.model, args.temperature, provider)
+
+    def _run(params: dict[str, Any]) -> dict[str, Any]:
+        args = _parse("run", params)
+        if _APPROVAL_MODE_ORDER.index(ApprovalMode(args.approval_mode)) > max_rank:
+            raise RpcError(
+                INVALID_PARAMS,
+                f"approval_mode '{args.approval_mode}' exceeds this server's limit "
+                f"'{max_approval_mode.value}'; restart `serve` with a higher --approval-mode.",
+            )
+        resolved_model = _resolve_model(args.provider, args.model)
+        target_dir = Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+        key = (
+            "run",
+            args.provider,
+            resolved_model,
+            args.max_retries,
+            args.retry_base_delay_seconds,
+            args.retry_max_delay_seconds,
+            tuple(args.fallback_provider or ()),
+            args.hedge_percentile,
+            args.requests_per_minute,
+            args.tokens_per_minute,
+            args.raw_response_retention,
+            str(target_dir) if args.raw_response_retention == RawRetentionMode.SPILL.value else None,
+        )
+        provider = providers.get(
+            key,
+            lambda: _build_agent_provider(args, resolved_model, target_dir),
+        )
+        return _run_payload(args, provider)
+
+    def _tools_list(params: dict[str, Any]) -> dict[str, Any]:
+        return _tools_list_payload(_parse("tools.list", params))
+
+    return {"chat": _chat, "run": _run, "tools.list": _tools_list}
+
+
+def _serve_command(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    from py_agent_runtime.cli.server import JsonRpcDispatcher, create_rpc_server
+
+    # Pay the heavy imports once, before the first request arrives.
+    _runner_class()
+    handlers = _server_handlers(parser, max_approval_mode=ApprovalMode(args.approval_mode))
+    dispatcher = JsonRpcDispatcher(handlers, max_concurrent=args.max_concurrent)
+    server = create_rpc_server(args.listen, dispatcher)
+    announcement: dict[str, Any] = {"listening": args.listen, "methods": dispatcher.methods}
+    token_path = getattr(server, "token_path", None)
+    if token_path is not None:
+        announcement["token_file"] = str(token_path)
+    print(json.dumps(announcement), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _forward_to_server(args: argparse.Namespace) -> int:
+    from py_agent_runtime.cli.server import call_server
+
+    if args.command == "tools":
+        method = "tools.list"
+    else:
+        method = str(args.command)
+    params = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in {"command", "tools_command", "server"}
+    }
+    if method != "chat":
+        # The daemon has its own working directory; pin paths to the caller's.
+        params["target_dir"] = str(
+            Path(args.target_dir).resolve() if args.target_dir else Path.cwd().resolve()
+        )
+    if params.get("completion_schema_file"):
+        params["completion_schema_file"] = str(Path(params["completion_schema_file"]).resolve())
+
+    payload = call_server(args.server, method, params)
+    if method == "chat":
+        _print_chat_payload(payload)
+        return 0
+    _print_json_payload(payload)
+    return 0 if payload.get("success") else 2
+
+
+def _add_agent_run_arguments(parser: argparse.ArgumentParser, default_provider: str) -> None:
+    from py_agent_runtime.tools.atomic_write import WriteDurability
+
+    parser.add_argument(
         "--target-dir",
         default=None,
         help="Optional target working directory for runtime path confinement.",
     )
-    run_parser.add_argument("--system-prompt", default=None, help="Optional system prompt.")
-    run_parser.add_argument(
+    parser.add_argument(
         "--provider",
         default=default_provider,
-        choices=list(SUPPORTED_PROVIDERS),
+        choices=get_registered_provider_names(),
         help="LLM provider backend.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--model",
         default=None,
         help="Optional model name. If omitted, provider-specific default is used.",
     )
-    run_parser.add_argument("--temperature", type=float, default=None, help="Sampling temperature.")
-    run_parser.add_argument(
+    parser.add_argument("--temperature", type=float, default=None, help="Sampling temperature.")
+    parser.add_argument(
         "--max-retries",
         type=int,
         default=2,
         help="Maximum transient API retries per provider request.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--retry-base-delay-seconds",
         type=float,
         default=0.0,
         help="Base delay in seconds for exponential retry backoff.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--retry-max-delay-seconds",
         type=float,
         default=None,
         help="Optional max delay cap in seconds for exponential retry backoff.",
     )
-    run_parser.add_argument("--max-turns", type=int, default=15, help="Maximum tool-call turns.")
-    run_parser.add_argument(
+    parser.add_argument(
+        "--fallback-provider",
+        action="append",
+        default=None,
+        metavar="PROVIDER[:MODEL]",
+        help="Fallback provider (repeatable, in order) used when the primary fails transiently.",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="Hedge to the first fallback once primary latency exceeds this percentile (0-100).",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        default=None,
+        help="Optional client-side requests-per-minute limit shared per provider.",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=int,
+        default=None,
+        help="Optional client-side estimated tokens-per-minute limit shared per provider.",
+    )
+    parser.add_argument(
+        "--raw-response-retention",
+        default=RawRetentionMode.NONE.value,
+        choices=[mode.value for mode in RawRetentionMode],
+        help="How much of each raw SDK response to keep (spill writes to .gemini/tmp/traces).",
+    )
+    parser.add_argument("--max-turns", type=int, default=15, help="Maximum tool-call turns.")
+    parser.add_argument(
         "--approval-mode",
         default=ApprovalMode.DEFAULT.value,
         choices=[mode.value for mode in ApprovalMode],
         help="Approval mode policy.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--non-interactive",
         action="store_true",
         help="Disable interactive confirmations (ask_user => deny).",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--plan-enabled",
         action="store_true",
         help="Enable Plan Mode directory scaffolding.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
         "--disable-recovery-turn",
         action="store_true",
         help="Disable one final recovery turn when protocol/max-turn limits are hit.",
     )
-    run_parser.add_argument(
+    parser.add_argument(
+        "--max-parallel-subagents",
+        type=int,
+        default=4,
+        help="Cap on subagent calls running concurrently across nesting levels (0 = serial).",
+    )
+    parser.add_argument(
+        "--grep-index",
+        action="store_true",
+        help="Narrow grep_search with a persistent trigram index under .gemini/index.",
+    )
+    parser.add_argument(
+        "--write-durability",
+        default=WriteDurability.NONE.value,
+        choices=[durability.value for durability in WriteDurability],
+        help="Fsync file tool writes: never, after each write, or once per turn (group commit).",
+    )
+    parser.add_argument(
+        "--shell-output-max-bytes",
+        type=int,
+        default=DEFAULT_SHELL_OUTPUT_MAX_BYTES,
+        help="Per-stream cap on run_shell_command output kept in memory (head + tail).",
+    )
+    parser.add_argument(
+        "--shell-cpu-seconds",
+        type=int,
+        default=None,
+        help="RLIMIT_CPU applied to each run_shell_command process.",
+    )
+    parser.add_argument(
+        "--shell-memory-bytes",
+        type=int,
+        default=None,
+        help="RLIMIT_AS (address space) applied to each run_shell_command process.",
+    )
+    parser.add_argument(
+        "--shell-max-processes",
+        type=int,
+        default=None,
+        help="RLIMIT_NPROC for run_shell_command (counted per user by the kernel).",
+    )
+    parser.add_argument(
         "--completion-schema-file",
         default=None,
         help="Optional path to JSON Schema for validating complete_task result output.",
     )
+    parser.add_argument(
+        "--context-window-tokens",
+        type=int,
+        default=None,
+        help="Prompt token budget before history compaction (default: model window, 0 = off).",
+    )
+    parser.add_argument(
+        "--tool-output-max-chars",
+        type=int,
+        default=None,
+        help="Per-call cap on tool output kept in history; overflow spills to disk (0 = off).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint the session after each turn under .gemini/tmp/sessions for `resume`.",
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    default_provider = _default_provider_from_env()
+    parser = argparse.ArgumentParser(description="py-agent-runtime CLI")
+    subparsers = parser.add_subparsers(dest="command")
+
+    chat_parser = subparsers.add_parser("chat", help="Run a basic LLM chat completion.")
+    chat_parser.add_argument("--prompt", required=True, help="User prompt.")
+    chat_parser.add_argument(
+        "--provider",
+        default=default_provider,
+        choices=get_registered_provider_names(),
+        help="LLM provider backend.",
+    )
+    chat_parser.add_argument(
+        "--model",
+        default=None,
+        help="Optional model name. If omitted, provider-specific default is used.",
+    )
+    chat_parser.add_argument(
+        "--temperature",
+        type=float,
+        default=None,
+        help="Optional sampling temperature.",
+    )
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run the provider-driven agent loop with scheduler and tools.",
+    )
+    run_parser.add_argument("--prompt", required=True, help="User task prompt.")
+    run_parser.add_argument("--system-prompt", default=None, help="Optional system prompt.")
+    _add_agent_run_arguments(run_parser, default_provider)
+    resume_parser = subparsers.add_parser(
+        "resume",
+        help="Continue a checkpointed agent session from its last completed turn.",
+    )
+    resume_parser.add_argument("--session-id", default=None, help="Session id to resume.")
+    resume_parser.add_argument(
+        "--session-file",
+        default=None,
+        help="Explicit checkpoint file (overrides --session-id).",
+    )
+    _add_agent_run_arguments(resume_parser, default_provider)
+    run_batch_parser = subparsers.add_parser(
+        "run-batch",
+        help="Run many agent tasks from a JSONL file concurrently with a shared provider.",
+    )
+    run_batch_parser.add_argument(
+        "--tasks-file",
+        required=True,
+        help='JSONL file with one {"id", "prompt", "system_prompt"?} object per line.',
+    )
+    run_batch_parser.add_argument(
+        "--output",
+        default="-",
+        help="JSONL results file, written as tasks finish ('-' for stdout).",
+    )
+    run_batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of tasks to run concurrently.",
+    )
+    run_batch_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip task ids already present in --output and append new results.",
+    )
+    run_batch_parser.add_argument(
+        "--system-prompt",
+        default=None,
+        help="Default system prompt for tasks that do not set one.",
+    )
+    run_batch_parser.add_argument(
+        "--batch-api",
+        default=None,
+        choices=["openai"],
+        help=(
+            "Send model turns through the provider's batch API instead of live calls. "
+            "All tasks run together and --workers is ignored."
+        ),
+    )
+    run_batch_parser.add_argument(
+        "--batch-poll-seconds",
+        type=float,
+        default=30.0,
+        help="Seconds between batch job status checks with --batch-api.",
+    )
+    run_batch_parser.add_argument(
+        "--batch-max-sessions",
+        type=int,
+        default=256,
+        help=(
+            "Most sessions kept in flight with --batch-api; each step's job holds at most "
+            "this many requests."
+        ),
+    )
+    _add_agent_run_arguments(run_batch_parser, default_provider)
     mode_parser = subparsers.add_parser(
         "mode",
         help="Inspect approval mode and interactive flags for a runtime session.",
@@ -535,13 +1192,55 @@ def main() -> int:
         default=None,
         help="Optional target working directory for runtime path confinement.",
     )
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve run/chat/tools-list requests as JSON-RPC from a warm runtime.",
+    )
+    serve_parser.add_argument(
+        "--listen",
+        default=DEFAULT_SERVER_ADDRESS,
+        help=(
+            "Address to listen on: unix:/path/to/socket (owner-only) or http://127.0.0.1:PORT "
+            "(clients authenticate with a token written under ~/.gemini/server/)."
+        ),
+    )
+    serve_parser.add_argument(
+        "--approval-mode",
+        default=ApprovalMode.DEFAULT.value,
+        choices=[mode.value for mode in _APPROVAL_MODE_ORDER],
+        help="Most permissive approval mode a `run` request may ask for.",
+    )
+    serve_parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=8,
+        help="Maximum number of requests handled at once; others wait for a free slot.",
+    )
+    for client_parser in (chat_parser, run_parser, tools_list_parser):
+        client_parser.add_argument(
+            "--server",
+            default=None,
+            help="Forward this command to a running `serve` daemon at the given address.",
+        )
+    return parser
 
+
+def main() -> int:
+    parser = _build_parser()
     args = parser.parse_args()
     try:
+        if getattr(args, "server", None):
+            return _forward_to_server(args)
+        if args.command == "serve":
+            return _serve_command(args, parser)
         if args.command == "chat":
             return _chat_command(args.prompt, args.provider, args.model, args.temperature)
         if args.command == "run":
             return _run_command(args)
+        if args.command == "resume":
+            return _resume_command(args)
+        if args.command == "run-batch":
+            return _run_batch_command(args)
         if args.command == "mode":
             return _mode_command(args)
         if args.command == "plan":
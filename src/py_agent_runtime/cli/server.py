@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+JSONRPC_VERSION = "2.0"
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+LOCALHOST_NAMES = frozenset({"127.0.0.1", "localhost"})
+# Largest request body (HTTP) or line (Unix socket) a server will read.
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+SERVER_STATE_DIR = Path("~/.gemini/server")
+
+RpcHandler = Callable[[dict[str, Any]], Any]
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class JsonRpcDispatcher:
+    """Transport-independent JSON-RPC 2.0 dispatcher.
+
+    Transports serve each connection on its own thread; `max_concurrent` bounds how
+    many handler calls run at once, and further requests queue for a free slot.
+    """
+
+    def __init__(self, handlers: Mapping[str, RpcHandler], *, max_concurrent: int = 8) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        self._handlers = dict(handlers)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    @property
+    def methods(self) -> list[str]:
+        return sorted(self._handlers)
+
+    def handle_bytes(self, raw: bytes) -> bytes | None:
+        try:
+            request = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            return _encode(_error_response(None, PARSE_ERROR, f"Parse error: {exc}"))
+        response = self.handle(request)
+        return _encode(response) if response is not None else None
+
+    def handle(self, request: Any) -> dict[str, Any] | None:
+        if not isinstance(request, dict) or request.get("jsonrpc") != JSONRPC_VERSION:
+            return _error_response(None, INVALID_REQUEST, "Invalid JSON-RPC 2.0 request.")
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params", {})
+        if not isinstance(method, str):
+            return _error_response(request_id, INVALID_REQUEST, "`method` must be a string.")
+        handler = self._handlers.get(method)
+        if handler is None:
+            return _error_response(request_id, METHOD_NOT_FOUND, f"Unknown method: {method}")
+        if not isinstance(params, dict):
+            return _error_response(request_id, INVALID_PARAMS, "`params` must be an object.")
+
+        with self._slots:
+            try:
+                result = handler(params)
+            except RpcError as exc:
+                return _error_response(request_id, exc.code, exc.message)
+            except Exception as exc:
+                return _error_response(request_id, INTERNAL_ERROR, str(exc))
+        if "id" not in request:
+            return None
+        return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+
+class _UnixLineHandler(socketserver.StreamRequestHandler):
+    server: _UnixRpcServer
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                message = f"Request exceeds {MAX_REQUEST_BYTES} bytes."
+                self.wfile.write(_encode(_error_response(None, INVALID_REQUEST, message)) + b"\n")
+                return
+            if not line.strip():
+                continue
+            response = self.server.dispatcher.handle_bytes(line)
+            if response is not None:
+                self.wfile.write(response + b"\n")
+                self.wfile.flush()
+
+
+class _UnixRpcServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, dispatcher: JsonRpcDispatcher) -> None:
+        self.dispatcher = dispatcher
+        # Bind under a restrictive umask so the socket is never reachable by other users.
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _UnixLineHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(str(self.server_address)).unlink(missing_ok=True)
+
+
+class _HttpRpcHandler(BaseHTTPRequestHandler):
+    server: _HttpRpcServer
+
+    def do_POST(self) -> None:  # noqa: N802
+        rejection = self._rejection()
+        if rejection is not None:
+            status, message = rejection
+            self._send(status, _encode(_error_response(None, INVALID_REQUEST, message)))
+            return
+        length = int(self.headers["Content-Length"])
+        response = self.server.dispatcher.handle_bytes(self.rfile.read(length))
+        self._send(200 if response is not None else 204, response or b"")
+
+    def _rejection(self) -> tuple[int, str] | None:
+        """Status and reason for refusing the request before its body is read, if any."""
+        # Browsers cannot set Authorization cross-origin; Host and Origin checks also stop
+        # DNS-rebinding pages from reaching the port under another name.
+        if self.headers.get("Host") not in self.server.allowed_hosts:
+            return 403, "Host header does not name this server."
+        origin = self.headers.get("Origin")
+        if origin is not None and origin not in self.server.allowed_origins:
+            return 403, "Cross-origin requests are not allowed."
+        expected = f"Bearer {self.server.token}".encode("utf-8")
+        supplied = (self.headers.get("Authorization") or "").encode("utf-8")
+        if not hmac.compare_digest(supplied, expected):
+            return 401, "Missing or invalid bearer token."
+        content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip()
+        if content_type.lower() != "application/json":
+            return 415, "Content-Type must be application/json."
+        raw_length = self.headers.get("Content-Length")
+        if raw_length is None or not raw_length.isdigit():
+            return 411, "Content-Length is required."
+        if int(raw_length) > MAX_REQUEST_BYTES:
+            return 413, f"Request exceeds {MAX_REQUEST_BYTES} bytes."
+        return None
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status >= 400:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class _HttpRpcServer(ThreadingHTTPServer):
+    """Localhost JSON-RPC over HTTP, authenticated by a bearer token in a 0600 file."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        dispatcher: JsonRpcDispatcher,
+        *,
+        token_path: Path | None = None,
+    ) -> None:
+        self.dispatcher = dispatcher
+        super().__init__((host, port), _HttpRpcHandler)
+        bound_port = self.server_address[1]
+        names = {host, *LOCALHOST_NAMES} if host in LOCALHOST_NAMES else {host}
+        self.allowed_hosts = frozenset(f"{name}:{bound_port}" for name in names)
+        self.allowed_origins = frozenset(f"http://{name}" for name in self.allowed_hosts)
+        self.token = secrets.token_urlsafe(32)
+        self.token_path = token_path or server_token_path(f"http://{host}:{bound_port}")
+        try:
+            _write_private_file(self.token_path, self.token)
+        except BaseException:
+            super().server_close()
+            raise
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.token_path.unlink(missing_ok=True)
+
+
+def create_rpc_server(
+    address: str,
+    dispatcher: JsonRpcDispatcher,
+    *,
+    token_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """Bind a server for `address`.
+
+    Unix sockets are created 0600, so only the owner can connect. HTTP servers write a
+    random bearer token to `token_path` (default `server_token_path(address)`, 0600);
+    clients must present it.
+    """
+    kind, location = parse_server_address(address)
+    if kind == "unix":
+        path = Path(location)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if path.exists():
+            if _unix_socket_is_live(path):
+                raise ValueError(f"A server is already listening on {path}.")
+            path.unlink()
+        server: socketserver.BaseServer = _UnixRpcServer(path, dispatcher)
+        os.chmod(path, 0o600)
+        return server
+    host, port = location.rsplit(":", 1)
+    return _HttpRpcServer(host, int(port), dispatcher, token_path=token_path)
+
+
+def server_token_path(address: str) -> Path:
+    """Where the HTTP server at `address` keeps the bearer token its clients read."""
+    _, location = parse_server_address(address)
+    host, port = location.rsplit(":", 1)
+    return SERVER_STATE_DIR.expanduser() / f"http-{host}-{port}.token"
+
+
+def parse_server_address(address: str) -> tuple[str, str]:
+    if address.startswith("unix:"):
+        path = address[len("unix:") :]
+        if not path:
+            raise ValueError("Unix socket address needs a path: unix:/path/to/socket")
+        return "unix", str(Path(path).expanduser().resolve())
+    parsed = urlparse(address)
+    if parsed.scheme != "http" or parsed.hostname is None or parsed.port is None:
+        raise ValueError(
+            f"Unsupported server address {address!r}. Use unix:/path or http://127.0.0.1:PORT."
+        )
+    if parsed.hostname not in LOCALHOST_NAMES:
+        raise ValueError("HTTP server address must be a localhost address.")
+    return "http", f"{parsed.hostname}:{parsed.port}"
+
+
+def call_server(
+    address: str,
+    method: str,
+    params: Mapping[str, Any],
+    *,
+    timeout_seconds: float | None = None,
+    token_path: Path | None = None,
+) -> Any:
+    request = {"jsonrpc": JSONRPC_VERSION, "id": 1, "method": method, "params": dict(params)}
+    body = _encode(request)
+    kind, location = parse_server_address(address)
+    if kind == "unix":
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout_seconds)
+            client.connect(location)
+            client.sendall(body + b"\n")
+            with client.makefile("rb") as reader:
+                raw_response = reader.readline()
+    else:
+        token_file = token_path or server_token_path(address)
+        try:
+            token = token_file.read_text(encoding="utf-8").strip()
+        except FileNotFoundError as exc:
+            raise RuntimeError(f"No server token at {token_file}; is the server running?") from exc
+        http_request = urllib.request.Request(
+            f"http://{location}/",
+            data=body,
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout_seconds) as http_response:
+                raw_response = http_response.read()
+        except urllib.error.HTTPError as exc:
+            # Rejected requests carry a JSON-RPC error body explaining why.
+            raw_response = exc.read()
+            if not raw_response:
+                raise
+
+    if not raw_response:
+        raise RuntimeError("Server closed the connection without a response.")
+    response = json.loads(raw_response)
+    error = response.get("error")
+    if error is not None:
+        raise RpcError(int(error.get("code", INTERNAL_ERROR)), str(error.get("message", "")))
+    return response.get("result")
+
+
+def _unix_socket_is_live(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def _write_private_file(path: Path, content: str) -> None:
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    # O_EXCL after the unlink: the file is created 0600 by us, never reused from someone else.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(content)
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _encode(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
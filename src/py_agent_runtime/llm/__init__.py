@@ -1,21 +1,101 @@
-"""LLM provider adapters (work in progress)."""
+"""LLM provider adapters (work in progress).
 
-from py_agent_runtime.llm.anthropic_provider import AnthropicChatProvider
-from py_agent_runtime.llm.base_provider import LLMProvider
-from py_agent_runtime.llm.factory import create_provider
-from py_agent_runtime.llm.gemini_provider import GeminiChatProvider
-from py_agent_runtime.llm.huggingface_provider import HuggingFaceInferenceProvider
-from py_agent_runtime.llm.openai_provider import OpenAIChatProvider
-from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMTurnResponse
+Exports resolve lazily on first attribute access so importing the package (or a
+light submodule such as `llm.types`) does not pull in every provider adapter.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from py_agent_runtime.llm.anthropic_provider import AnthropicChatProvider
+    from py_agent_runtime.llm.base_provider import LLMProvider, LLMStreamAbortedError
+    from py_agent_runtime.llm.batch import BatchBackend, BatchRequest, LocalFileBatchBackend
+    from py_agent_runtime.llm.factory import create_failover_provider, create_provider
+    from py_agent_runtime.llm.failover import FailoverProvider, FailoverTarget
+    from py_agent_runtime.llm.gemini_provider import GeminiChatProvider
+    from py_agent_runtime.llm.huggingface_provider import HuggingFaceInferenceProvider
+    from py_agent_runtime.llm.openai_batch import OpenAIBatchBackend
+    from py_agent_runtime.llm.openai_provider import OpenAIChatProvider
+    from py_agent_runtime.llm.raw_retention import RawRetentionMode, RawRetentionPolicy
+    from py_agent_runtime.llm.rate_limit import (
+        RateLimitedProvider,
+        RateLimiter,
+        RateLimitMetrics,
+        get_shared_rate_limiter,
+    )
+    from py_agent_runtime.llm.types import (
+        LLMMessage,
+        LLMToolCall,
+        LLMToolCallDelta,
+        LLMTurnResponse,
+    )
+
+_LAZY_EXPORTS: dict[str, str] = {
+    "AnthropicChatProvider": "py_agent_runtime.llm.anthropic_provider",
+    "BatchBackend": "py_agent_runtime.llm.batch",
+    "BatchRequest": "py_agent_runtime.llm.batch",
+    "create_failover_provider": "py_agent_runtime.llm.factory",
+    "create_provider": "py_agent_runtime.llm.factory",
+    "FailoverProvider": "py_agent_runtime.llm.failover",
+    "FailoverTarget": "py_agent_runtime.llm.failover",
+    "get_shared_rate_limiter": "py_agent_runtime.llm.rate_limit",
+    "GeminiChatProvider": "py_agent_runtime.llm.gemini_provider",
+    "HuggingFaceInferenceProvider": "py_agent_runtime.llm.huggingface_provider",
+    "LLMMessage": "py_agent_runtime.llm.types",
+    "LLMProvider": "py_agent_runtime.llm.base_provider",
+    "LLMStreamAbortedError": "py_agent_runtime.llm.base_provider",
+    "LLMToolCall": "py_agent_runtime.llm.types",
+    "LLMToolCallDelta": "py_agent_runtime.llm.types",
+    "LLMTurnResponse": "py_agent_runtime.llm.types",
+    "LocalFileBatchBackend": "py_agent_runtime.llm.batch",
+    "OpenAIBatchBackend": "py_agent_runtime.llm.openai_batch",
+    "OpenAIChatProvider": "py_agent_runtime.llm.openai_provider",
+    "RateLimitedProvider": "py_agent_runtime.llm.rate_limit",
+    "RawRetentionMode": "py_agent_runtime.llm.raw_retention",
+    "RawRetentionPolicy": "py_agent_runtime.llm.raw_retention",
+    "RateLimiter": "py_agent_runtime.llm.rate_limit",
+    "RateLimitMetrics": "py_agent_runtime.llm.rate_limit",
+}
 
 __all__ = [
     "AnthropicChatProvider",
+    "BatchBackend",
+    "BatchRequest",
+    "create_failover_provider",
     "create_provider",
+    "FailoverProvider",
+    "FailoverTarget",
+    "get_shared_rate_limiter",
     "GeminiChatProvider",
     "HuggingFaceInferenceProvider",
     "LLMMessage",
     "LLMProvider",
+    "LLMStreamAbortedError",
     "LLMToolCall",
+    "LLMToolCallDelta",
     "LLMTurnResponse",
+    "LocalFileBatchBackend",
+    "OpenAIBatchBackend",
     "OpenAIChatProvider",
+    "RateLimitedProvider",
+    "RawRetentionMode",
+    "RawRetentionPolicy",
+    "RateLimiter",
+    "RateLimitMetrics",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
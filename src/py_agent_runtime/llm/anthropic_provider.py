@@ -10,6 +10,7 @@ from py_agent_runtime.llm.normalizer import (
     to_anthropic_messages,
     to_anthropic_tools,
 )
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
 from py_agent_runtime.llm.retry import call_with_retries
 from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
 
@@ -33,6 +34,7 @@ class AnthropicChatProvider(LLMProvider):
         max_retries: int = 2,
         retry_base_delay_seconds: float = 0.0,
         retry_max_delay_seconds: float | None = None,
+        raw_retention: RawRetentionPolicy | None = None,
         client: AnthropicClientLike | None = None,
     ) -> None:
         effective_api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
@@ -47,6 +49,7 @@ class AnthropicChatProvider(LLMProvider):
         self._max_retries = max_retries
         self._retry_base_delay_seconds = retry_base_delay_seconds
         self._retry_max_delay_seconds = retry_max_delay_seconds
+        self._raw_retention = raw_retention
         self._client = client or self._create_client()
 
     def generate(
@@ -79,7 +82,7 @@ class AnthropicChatProvider(LLMProvider):
             base_delay_seconds=self._retry_base_delay_seconds,
             max_delay_seconds=self._retry_max_delay_seconds,
         )
-        return parse_anthropic_message_response(response)
+        return parse_anthropic_message_response(response, raw_retention=self._raw_retention)
 
     def _create_client(self) -> AnthropicClientLike:
         try:
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any, Sequence
 
-from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCallDelta, LLMTurnResponse
+
+ToolCallDeltaHandler = Callable[[LLMToolCallDelta], "str | None"]
+
+
+class LLMStreamAbortedError(RuntimeError):
+    """Raised when a tool-call delta handler rejects a streaming generation."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
 
 
 class LLMProvider(ABC):
@@ -18,3 +29,30 @@ class LLMProvider(ABC):
     ) -> LLMTurnResponse:
         raise NotImplementedError
 
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        # Providers without streaming support return the whole turn; no deltas are reported.
+        return self.generate(messages=messages, tools=tools, model=model, temperature=temperature)
+
+    def close(self) -> None:
+        """Release background resources (worker threads); wrappers close what they wrap."""
+
+    def __enter__(self) -> LLMProvider:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def close_provider(provider: LLMProvider) -> None:
+    """Close `provider`, tolerating duck-typed providers that have no `close` method."""
+    close = getattr(provider, "close", None)
+    if callable(close):
+        close()
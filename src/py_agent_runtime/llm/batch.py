@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Sequence
+from uuid import uuid4
+
+from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.types import (
+    LLMMessage,
+    LLMTurnResponse,
+    llm_message_from_dict,
+    llm_message_to_dict,
+    llm_tool_call_from_dict,
+)
+
+
+class BatchJobStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    custom_id: str
+    messages: tuple[LLMMessage, ...]
+    tools: tuple[dict[str, Any], ...] | None = None
+    model: str | None = None
+    temperature: float | None = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    custom_id: str
+    response: LLMTurnResponse | None = None
+    error: str | None = None
+
+
+class BatchBackend(ABC):
+    @abstractmethod
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def poll(self, job_id: str) -> BatchJobStatus:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_results(self, job_id: str) -> list[BatchResult]:
+        raise NotImplementedError
+
+
+class LocalFileBatchBackend(BatchBackend):
+    """File-based stand-in for provider batch APIs.
+
+    Each job is a directory with `requests.jsonl`; the first `poll` after
+    `completion_polls` attempts answers every request through `provider` and
+    writes `results.jsonl`, mirroring the submit/poll/download cycle.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        provider: LLMProvider,
+        *,
+        completion_polls: int = 1,
+    ) -> None:
+        if completion_polls < 1:
+            raise ValueError("completion_polls must be >= 1")
+        self._work_dir = work_dir
+        self._provider = provider
+        self._completion_polls = completion_polls
+        self._poll_counts: dict[str, int] = {}
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        job_id = f"batch_{uuid4().hex}"
+        job_dir = self._work_dir / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        with (job_dir / "requests.jsonl").open("w", encoding="utf-8") as handle:
+            for request in requests:
+                handle.write(json.dumps(batch_request_to_dict(request), default=str) + "\n")
+        self._poll_counts[job_id] = 0
+        return job_id
+
+    def poll(self, job_id: str) -> BatchJobStatus:
+        job_dir = self._work_dir / job_id
+        if (job_dir / "results.jsonl").exists():
+            return BatchJobStatus.COMPLETED
+        if not (job_dir / "requests.jsonl").exists():
+            return BatchJobStatus.FAILED
+        self._poll_counts[job_id] = self._poll_counts.get(job_id, 0) + 1
+        if self._poll_counts[job_id] < self._completion_polls:
+            return BatchJobStatus.PENDING
+        self._process(job_dir)
+        return BatchJobStatus.COMPLETED
+
+    def fetch_results(self, job_id: str) -> list[BatchResult]:
+        results_path = self._work_dir / job_id / "results.jsonl"
+        results: list[BatchResult] = []
+        with results_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    results.append(batch_result_from_dict(json.loads(line)))
+        return results
+
+    def _process(self, job_dir: Path) -> None:
+        lines: list[str] = []
+        with (job_dir / "requests.jsonl").open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                request = batch_request_from_dict(json.loads(line))
+                try:
+                    response = self._provider.generate(
+                        messages=request.messages,
+                        tools=request.tools,
+                        model=request.model,
+                        temperature=request.temperature,
+                    )
+                    result = BatchResult(custom_id=request.custom_id, response=response)
+                except Exception as exc:
+                    result = BatchResult(custom_id=request.custom_id, error=str(exc))
+                lines.append(json.dumps(batch_result_to_dict(result), default=str))
+        temp_path = job_dir / "results.jsonl.tmp"
+        temp_path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        temp_path.replace(job_dir / "results.jsonl")
+
+
+def batch_request_to_dict(request: BatchRequest) -> dict[str, Any]:
+    return {
+        "custom_id": request.custom_id,
+        "messages": [llm_message_to_dict(message) for message in request.messages],
+        "tools": list(request.tools) if request.tools is not None else None,
+        "model": request.model,
+        "temperature": request.temperature,
+    }
+
+
+def batch_request_from_dict(payload: dict[str, Any]) -> BatchRequest:
+    tools = payload.get("tools")
+    return BatchRequest(
+        custom_id=str(payload["custom_id"]),
+        messages=tuple(llm_message_from_dict(item) for item in payload.get("messages") or []),
+        tools=tuple(tools) if isinstance(tools, list) else None,
+        model=payload.get("model"),
+        temperature=payload.get("temperature"),
+    )
+
+
+def batch_result_to_dict(result: BatchResult) -> dict[str, Any]:
+    response: dict[str, Any] | None = None
+    if result.response is not None:
+        response = {
+            "content": result.response.content,
+            "tool_calls": [asdict(call) for call in result.response.tool_calls],
+            "finish_reason": result.response.finish_reason,
+        }
+    return {"custom_id": result.custom_id, "response": response, "error": result.error}
+
+
+def batch_result_from_dict(payload: dict[str, Any]) -> BatchResult:
+    raw_response = payload.get("response")
+    response: LLMTurnResponse | None = None
+    if isinstance(raw_response, dict):
+        response = LLMTurnResponse(
+            content=raw_response.get("content"),
+            tool_calls=[
+                llm_tool_call_from_dict(item) for item in raw_response.get("tool_calls") or []
+            ],
+            finish_reason=raw_response.get("finish_reason"),
+        )
+    error = payload.get("error")
+    return BatchResult(
+        custom_id=str(payload["custom_id"]),
+        response=response,
+        error=str(error) if error is not None else None,
+    )
+
@@ -1,10 +1,82 @@
 from __future__ import annotations
 
-from py_agent_runtime.llm.anthropic_provider import AnthropicChatProvider
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Sequence, cast
+
 from py_agent_runtime.llm.base_provider import LLMProvider
-from py_agent_runtime.llm.gemini_provider import GeminiChatProvider
-from py_agent_runtime.llm.huggingface_provider import HuggingFaceInferenceProvider
-from py_agent_runtime.llm.openai_provider import OpenAIChatProvider
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
+
+PROVIDER_ENTRY_POINT_GROUP = "py_agent_runtime.providers"
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    entry_point: str
+    default_model: str | None = None
+
+    @property
+    def module_name(self) -> str:
+        return self.entry_point.partition(":")[0]
+
+    @property
+    def attribute_name(self) -> str:
+        return self.entry_point.partition(":")[2]
+
+
+_PROVIDER_SPECS: dict[str, ProviderSpec] = {
+    "openai": ProviderSpec(
+        "py_agent_runtime.llm.openai_provider:OpenAIChatProvider",
+        default_model="gpt-4.1-mini",
+    ),
+    "gemini": ProviderSpec(
+        "py_agent_runtime.llm.gemini_provider:GeminiChatProvider",
+        default_model="gemini-2.5-pro",
+    ),
+    "anthropic": ProviderSpec(
+        "py_agent_runtime.llm.anthropic_provider:AnthropicChatProvider",
+        default_model="claude-3-7-sonnet-latest",
+    ),
+    "huggingface": ProviderSpec(
+        "py_agent_runtime.llm.huggingface_provider:HuggingFaceInferenceProvider",
+        default_model="moonshotai/Kimi-K2.5",
+    ),
+}
+_BUILTIN_PROVIDER_CLASSES = {
+    spec.attribute_name: spec.module_name for spec in _PROVIDER_SPECS.values()
+}
+_entry_points_loaded = False
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _BUILTIN_PROVIDER_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def register_provider(name: str, entry_point: str, *, default_model: str | None = None) -> None:
+    module_name, separator, attribute_name = entry_point.partition(":")
+    if not module_name or not separator or not attribute_name:
+        raise ValueError(f"Provider entry point must look like 'module:ClassName': {entry_point}")
+    _PROVIDER_SPECS[name.strip().lower()] = ProviderSpec(entry_point, default_model=default_model)
+
+
+def get_registered_provider_names() -> list[str]:
+    _load_provider_entry_points()
+    return list(_PROVIDER_SPECS)
+
+
+def get_provider_default_model(provider: str) -> str | None:
+    normalized = provider.strip().lower()
+    if normalized not in _PROVIDER_SPECS:
+        _load_provider_entry_points()
+    spec = _PROVIDER_SPECS.get(normalized)
+    if spec is None:
+        raise ValueError(f"Unsupported provider: {provider}")
+    return spec.default_model
 
 
 def create_provider(
@@ -14,34 +86,81 @@ def create_provider(
     max_retries: int = 2,
     retry_base_delay_seconds: float = 0.0,
     retry_max_delay_seconds: float | None = None,
+    raw_retention: RawRetentionPolicy | None = None,
 ) -> LLMProvider:
     normalized = provider.strip().lower()
-    if normalized == "openai":
-        return OpenAIChatProvider(
-            model=model or "gpt-4.1-mini",
-            max_retries=max_retries,
-            retry_base_delay_seconds=retry_base_delay_seconds,
-            retry_max_delay_seconds=retry_max_delay_seconds,
-        )
-    if normalized == "gemini":
-        return GeminiChatProvider(
-            model=model or "gemini-2.5-pro",
-            max_retries=max_retries,
-            retry_base_delay_seconds=retry_base_delay_seconds,
-            retry_max_delay_seconds=retry_max_delay_seconds,
-        )
-    if normalized == "anthropic":
-        return AnthropicChatProvider(
-            model=model or "claude-3-7-sonnet-latest",
-            max_retries=max_retries,
-            retry_base_delay_seconds=retry_base_delay_seconds,
-            retry_max_delay_seconds=retry_max_delay_seconds,
-        )
-    if normalized == "huggingface":
-        return HuggingFaceInferenceProvider(
-            model=model or "moonshotai/Kimi-K2.5",
-            max_retries=max_retries,
-            retry_base_delay_seconds=retry_base_delay_seconds,
-            retry_max_delay_seconds=retry_max_delay_seconds,
+    spec = _PROVIDER_SPECS.get(normalized)
+    if spec is None:
+        _load_provider_entry_points()
+        spec = _PROVIDER_SPECS.get(normalized)
+    if spec is None:
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    provider_class = _resolve_provider_class(spec)
+    kwargs: dict[str, Any] = {
+        "max_retries": max_retries,
+        "retry_base_delay_seconds": retry_base_delay_seconds,
+        "retry_max_delay_seconds": retry_max_delay_seconds,
+        "raw_retention": raw_retention,
+    }
+    effective_model = model or spec.default_model
+    if effective_model is not None:
+        kwargs["model"] = effective_model
+    return cast(LLMProvider, provider_class(**kwargs))
+
+
+def create_failover_provider(
+    targets: Sequence[tuple[str, str | None]],
+    *,
+    max_retries: int = 2,
+    retry_base_delay_seconds: float = 0.0,
+    retry_max_delay_seconds: float | None = None,
+    hedge_percentile: float | None = None,
+    hedge_min_samples: int = 20,
+    raw_retention: RawRetentionPolicy | None = None,
+) -> LLMProvider:
+    from py_agent_runtime.llm.failover import FailoverProvider, FailoverTarget
+
+    if not targets:
+        raise ValueError("At least one provider target is required.")
+    failover_targets: list[FailoverTarget] = []
+    for provider_name, model in targets:
+        failover_targets.append(
+            FailoverTarget(
+                provider=create_provider(
+                    provider_name,
+                    model=model,
+                    max_retries=max_retries,
+                    retry_base_delay_seconds=retry_base_delay_seconds,
+                    retry_max_delay_seconds=retry_max_delay_seconds,
+                    raw_retention=raw_retention,
+                ),
+                model=model,
+                label=f"{provider_name}:{model}" if model else provider_name,
+            )
         )
-    raise ValueError(f"Unsupported provider: {provider}")
+    if len(failover_targets) == 1 and hedge_percentile is None:
+        return failover_targets[0].provider
+    return FailoverProvider(
+        failover_targets,
+        hedge_percentile=hedge_percentile,
+        hedge_min_samples=hedge_min_samples,
+    )
+
+
+def _resolve_provider_class(spec: ProviderSpec) -> Any:
+    # Built-in classes go through module globals so tests and callers can patch them.
+    if _BUILTIN_PROVIDER_CLASSES.get(spec.attribute_name) == spec.module_name:
+        return globals().get(spec.attribute_name) or __getattr__(spec.attribute_name)
+    return getattr(import_module(spec.module_name), spec.attribute_name)
+
+
+def _load_provider_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=PROVIDER_ENTRY_POINT_GROUP):
+        _PROVIDER_SPECS.setdefault(entry_point.name.strip().lower(), ProviderSpec(entry_point.value))
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from py_agent_runtime.llm.base_provider import (
+    LLMProvider,
+    LLMStreamAbortedError,
+    ToolCallDeltaHandler,
+    close_provider,
+)
+from py_agent_runtime.llm.retry import is_retryable_exception
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCallDelta, LLMTurnResponse
+
+
+@dataclass(frozen=True)
+class FailoverTarget:
+    provider: LLMProvider
+    model: str | None = None
+    label: str | None = None
+
+
+@dataclass(frozen=True)
+class FailoverStats:
+    requests: int
+    failovers: int
+    hedged_requests: int
+    hedge_wins: int
+    primary_latency_threshold_seconds: float | None
+
+
+class FailoverProvider(LLMProvider):
+    def __init__(
+        self,
+        targets: Sequence[FailoverTarget],
+        *,
+        is_retryable: Callable[[Exception], bool] | None = None,
+        hedge_percentile: float | None = None,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not targets:
+            raise ValueError("FailoverProvider requires at least one target.")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100 (exclusive).")
+        if hedge_min_samples < 1:
+            raise ValueError("hedge_min_samples must be >= 1")
+
+        self._targets = list(targets)
+        self._is_retryable = is_retryable or is_retryable_exception
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_samples = hedge_min_samples
+        self._clock = clock
+        self._primary_latencies: deque[float] = deque(maxlen=max(latency_window, hedge_min_samples))
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._requests = 0
+        self._failovers = 0
+        self._hedged_requests = 0
+        self._hedge_wins = 0
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        with self._lock:
+            self._requests += 1
+
+        def _call(index: int) -> LLMTurnResponse:
+            return self._call_target(index, messages, tools, model, temperature)
+
+        threshold = self.hedge_threshold_seconds()
+        start_index = 0
+        if threshold is not None and len(self._targets) > 1:
+            hedged = self._generate_hedged(_call, threshold)
+            if isinstance(hedged, LLMTurnResponse):
+                return hedged
+            start_index = 2
+            if start_index >= len(self._targets):
+                raise hedged
+
+        last_error: Exception | None = None
+        for index in range(start_index, len(self._targets)):
+            if index > 0:
+                with self._lock:
+                    self._failovers += 1
+            try:
+                return _call(index)
+            except Exception as exc:
+                if not self._is_retryable(exc) or index == len(self._targets) - 1:
+                    raise
+                last_error = exc
+        assert last_error is not None  # loop always returns or raises
+        raise last_error
+
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        """Stream from the first healthy target, failing over in order (never hedged).
+
+        Once a target has reported a delta, its errors are raised rather than failed over,
+        so the handler never sees a second stream restart the same turn.
+        """
+        with self._lock:
+            self._requests += 1
+        for index in range(len(self._targets)):
+            if index > 0:
+                with self._lock:
+                    self._failovers += 1
+            forwarder = _DeltaForwarder(on_tool_call_delta)
+            try:
+                return self._call_target(
+                    index, messages, tools, model, temperature, on_tool_call_delta=forwarder
+                )
+            except LLMStreamAbortedError:
+                raise
+            except Exception as exc:
+                if (
+                    forwarder.emitted
+                    or not self._is_retryable(exc)
+                    or index == len(self._targets) - 1
+                ):
+                    raise
+        raise AssertionError("unreachable: the last target always returns or raises")
+
+    def close(self) -> None:
+        """Stop the hedging pool without waiting for losing requests, then close targets."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for target in self._targets:
+            close_provider(target.provider)
+
+    def hedge_threshold_seconds(self) -> float | None:
+        if self._hedge_percentile is None:
+            return None
+        with self._lock:
+            samples = sorted(self._primary_latencies)
+        if len(samples) < self._hedge_min_samples:
+            return None
+        rank = max(0, math.ceil(self._hedge_percentile / 100.0 * len(samples)) - 1)
+        return samples[rank]
+
+    def stats(self) -> FailoverStats:
+        threshold = self.hedge_threshold_seconds()
+        with self._lock:
+            return FailoverStats(
+                requests=self._requests,
+                failovers=self._failovers,
+                hedged_requests=self._hedged_requests,
+                hedge_wins=self._hedge_wins,
+                primary_latency_threshold_seconds=threshold,
+            )
+
+    def _call_target(
+        self,
+        index: int,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None,
+        model: str | None,
+        temperature: float | None,
+        *,
+        on_tool_call_delta: ToolCallDeltaHandler | None = None,
+    ) -> LLMTurnResponse:
+        target = self._targets[index]
+        target_model = target.model if target.model is not None else model
+        started_at = self._clock()
+        if on_tool_call_delta is None:
+            response = target.provider.generate(
+                messages=messages, tools=tools, model=target_model, temperature=temperature
+            )
+        else:
+            response = target.provider.generate_streaming(
+                messages=messages,
+                tools=tools,
+                model=target_model,
+                temperature=temperature,
+                on_tool_call_delta=on_tool_call_delta,
+            )
+        if index == 0:
+            elapsed = self._clock() - started_at
+            with self._lock:
+                self._primary_latencies.append(elapsed)
+        return response
+
+    def _generate_hedged(
+        self,
+        call: Callable[[int], LLMTurnResponse],
+        threshold: float,
+    ) -> LLMTurnResponse | Exception:
+        executor = self._get_executor()
+        primary = executor.submit(call, 0)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            primary_error = primary.exception()
+            if primary_error is None:
+                return primary.result()
+            if not isinstance(primary_error, Exception) or not self._is_retryable(primary_error):
+                raise primary_error
+            with self._lock:
+                self._failovers += 1
+            try:
+                return call(1)
+            except Exception as exc:
+                if not self._is_retryable(exc):
+                    raise
+                return exc
+
+        with self._lock:
+            self._hedged_requests += 1
+        hedge = executor.submit(call, 1)
+        pending: set[Future[LLMTurnResponse]] = {primary, hedge}
+        last_error: Exception | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is hedge:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+                if not isinstance(error, Exception) or not self._is_retryable(error):
+                    raise error
+                last_error = error
+        assert last_error is not None
+        return last_error
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(2, len(self._targets)),
+                    thread_name_prefix="llm-hedge",
+                )
+            return self._executor
+
+
+class _DeltaForwarder:
+    """Passes deltas to the caller's handler and records whether any were reported."""
+
+    def __init__(self, handler: ToolCallDeltaHandler) -> None:
+        self._handler = handler
+        self.emitted = False
+
+    def __call__(self, delta: LLMToolCallDelta) -> str | None:
+        self.emitted = True
+        return self._handler(delta)
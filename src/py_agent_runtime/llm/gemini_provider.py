@@ -11,6 +11,7 @@ from py_agent_runtime.llm.normalizer import (
     to_gemini_contents,
     to_gemini_tools,
 )
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
 from py_agent_runtime.llm.retry import call_with_retries
 from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
 
@@ -33,6 +34,7 @@ class GeminiChatProvider(LLMProvider):
         max_retries: int = 2,
         retry_base_delay_seconds: float = 0.0,
         retry_max_delay_seconds: float | None = None,
+        raw_retention: RawRetentionPolicy | None = None,
         client: GeminiClientLike | None = None,
     ) -> None:
         effective_api_key = api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get(
@@ -48,6 +50,7 @@ class GeminiChatProvider(LLMProvider):
         self._max_retries = max_retries
         self._retry_base_delay_seconds = retry_base_delay_seconds
         self._retry_max_delay_seconds = retry_max_delay_seconds
+        self._raw_retention = raw_retention
         self._client = client or self._create_client()
 
     def generate(
@@ -78,7 +81,7 @@ class GeminiChatProvider(LLMProvider):
             base_delay_seconds=self._retry_base_delay_seconds,
             max_delay_seconds=self._retry_max_delay_seconds,
         )
-        return parse_gemini_generate_content(response)
+        return parse_gemini_generate_content(response, raw_retention=self._raw_retention)
 
     def _create_client(self) -> GeminiClientLike:
         try:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 
 from py_agent_runtime.llm.openai_provider import OpenAIChatProvider, OpenAIClientLike
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
 
 
 class HuggingFaceInferenceProvider(OpenAIChatProvider):
@@ -16,6 +17,7 @@ class HuggingFaceInferenceProvider(OpenAIChatProvider):
         max_retries: int = 2,
         retry_base_delay_seconds: float = 0.0,
         retry_max_delay_seconds: float | None = None,
+        raw_retention: RawRetentionPolicy | None = None,
         client: OpenAIClientLike | None = None,
     ) -> None:
         effective_api_key = (
@@ -41,5 +43,6 @@ class HuggingFaceInferenceProvider(OpenAIChatProvider):
             max_retries=max_retries,
             retry_base_delay_seconds=retry_base_delay_seconds,
             retry_max_delay_seconds=retry_max_delay_seconds,
+            raw_retention=raw_retention,
             client=client,
         )
@@ -4,12 +4,17 @@ import json
 from typing import Any, Iterable, Sequence
 from uuid import uuid4
 
-from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMTurnResponse
+from py_agent_runtime.llm.base_provider import LLMStreamAbortedError, ToolCallDeltaHandler
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy, retain_raw
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMToolCallDelta, LLMTurnResponse
 from py_agent_runtime.tools.base import BaseTool
 from py_agent_runtime.tools.registry import ToolRegistry
 
 
-def parse_openai_chat_completion(response: Any) -> LLMTurnResponse:
+def parse_openai_chat_completion(
+    response: Any,
+    raw_retention: RawRetentionPolicy | None = None,
+) -> LLMTurnResponse:
     choices = getattr(response, "choices", None)
     if not choices:
         raise ValueError("OpenAI response did not include choices.")
@@ -46,7 +51,73 @@ def parse_openai_chat_completion(response: Any) -> LLMTurnResponse:
         content=content if isinstance(content, str) else None,
         tool_calls=tool_calls,
         finish_reason=finish_reason if isinstance(finish_reason, str) else None,
-        raw=response,
+        raw=retain_raw(response, raw_retention),
+    )
+
+
+def parse_openai_chat_stream(
+    chunks: Iterable[Any],
+    on_tool_call_delta: ToolCallDeltaHandler | None = None,
+) -> LLMTurnResponse:
+    content_parts: list[str] = []
+    calls: dict[int, dict[str, Any]] = {}
+    finish_reason: str | None = None
+    for chunk in chunks:
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            continue
+        first_choice = choices[0]
+        chunk_finish_reason = getattr(first_choice, "finish_reason", None)
+        if isinstance(chunk_finish_reason, str):
+            finish_reason = chunk_finish_reason
+        delta = getattr(first_choice, "delta", None)
+        if delta is None:
+            continue
+        text = getattr(delta, "content", None)
+        if isinstance(text, str):
+            content_parts.append(text)
+        for item in getattr(delta, "tool_calls", None) or []:
+            index = getattr(item, "index", 0)
+            state = calls.setdefault(index, {"id": None, "name": None, "arguments": []})
+            call_id = getattr(item, "id", None)
+            if isinstance(call_id, str):
+                state["id"] = call_id
+            function_obj = getattr(item, "function", None)
+            name = getattr(function_obj, "name", None)
+            if isinstance(name, str) and name:
+                state["name"] = name
+            arguments = getattr(function_obj, "arguments", None)
+            arguments = arguments if isinstance(arguments, str) else ""
+            state["arguments"].append(arguments)
+            if on_tool_call_delta is not None:
+                error = on_tool_call_delta(
+                    LLMToolCallDelta(
+                        index=index,
+                        name=state["name"],
+                        arguments_delta=arguments,
+                        call_id=state["id"],
+                    )
+                )
+                if error:
+                    raise LLMStreamAbortedError(error)
+
+    tool_calls: list[LLMToolCall] = []
+    for index in sorted(calls):
+        state = calls[index]
+        name = state["name"]
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("OpenAI tool call function name is missing.")
+        tool_calls.append(
+            LLMToolCall(
+                name=name,
+                args=parse_tool_arguments("".join(state["arguments"]), tool_name=name),
+                call_id=state["id"],
+            )
+        )
+    return LLMTurnResponse(
+        content="".join(content_parts) if content_parts else None,
+        tool_calls=tool_calls,
+        finish_reason=finish_reason,
     )
 
 
@@ -136,7 +207,10 @@ def default_tool_schema() -> dict[str, Any]:
     }
 
 
-def parse_gemini_generate_content(response: Any) -> LLMTurnResponse:
+def parse_gemini_generate_content(
+    response: Any,
+    raw_retention: RawRetentionPolicy | None = None,
+) -> LLMTurnResponse:
     content = _extract_gemini_text(response)
     tool_calls = _extract_gemini_tool_calls(response)
     finish_reason = _extract_gemini_finish_reason(response)
@@ -144,7 +218,7 @@ def parse_gemini_generate_content(response: Any) -> LLMTurnResponse:
         content=content,
         tool_calls=tool_calls,
         finish_reason=finish_reason,
-        raw=response,
+        raw=retain_raw(response, raw_retention),
     )
 
 
@@ -220,7 +294,10 @@ def to_gemini_tools(tools: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
     return [{"function_declarations": declarations}]
 
 
-def parse_anthropic_message_response(response: Any) -> LLMTurnResponse:
+def parse_anthropic_message_response(
+    response: Any,
+    raw_retention: RawRetentionPolicy | None = None,
+) -> LLMTurnResponse:
     blocks = getattr(response, "content", None) or []
     text_parts: list[str] = []
     tool_calls: list[LLMToolCall] = []
@@ -251,7 +328,7 @@ def parse_anthropic_message_response(response: Any) -> LLMTurnResponse:
         content=text_content,
         tool_calls=tool_calls,
         finish_reason=stop_reason if isinstance(stop_reason, str) else None,
-        raw=response,
+        raw=retain_raw(response, raw_retention),
     )
 
 
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Protocol, Sequence, cast
+
+from py_agent_runtime.llm.batch import BatchBackend, BatchJobStatus, BatchRequest, BatchResult
+from py_agent_runtime.llm.normalizer import parse_openai_chat_completion
+from py_agent_runtime.llm.openai_provider import build_openai_chat_payload
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+_PENDING_STATUSES = frozenset({"validating", "in_progress", "finalizing"})
+# Expired jobs still publish the requests that finished; the rest appear in the error file.
+_COMPLETED_STATUSES = frozenset({"completed", "expired"})
+
+
+class _OpenAIFilesAPI(Protocol):
+    def create(self, **kwargs: Any) -> Any: ...
+
+    def content(self, file_id: str) -> Any: ...
+
+
+class _OpenAIBatchesAPI(Protocol):
+    def create(self, **kwargs: Any) -> Any: ...
+
+    def retrieve(self, batch_id: str) -> Any: ...
+
+
+class OpenAIBatchClientLike(Protocol):
+    @property
+    def files(self) -> _OpenAIFilesAPI: ...
+
+    @property
+    def batches(self) -> _OpenAIBatchesAPI: ...
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """`BatchBackend` on the OpenAI Batch API for Chat Completions.
+
+    `submit` uploads the requests as a JSONL file and creates a batch job, `poll`
+    maps the job status, and `fetch_results` downloads the output and error files.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str = "gpt-4.1-mini",
+        api_key: str | None = None,
+        base_url: str | None = None,
+        organization: str | None = None,
+        project: str | None = None,
+        timeout: float | None = None,
+        completion_window: str = "24h",
+        raw_retention: RawRetentionPolicy | None = None,
+        client: OpenAIBatchClientLike | None = None,
+    ) -> None:
+        effective_api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not effective_api_key:
+            raise ValueError("Missing OpenAI API key. Set OPENAI_API_KEY environment variable.")
+        self._default_model = model
+        self._api_key = effective_api_key
+        self._base_url = base_url
+        self._organization = organization
+        self._project = project
+        self._timeout = timeout
+        self._completion_window = completion_window
+        self._raw_retention = raw_retention
+        self._client = client or self._create_client()
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": CHAT_COMPLETIONS_ENDPOINT,
+                    "body": build_openai_chat_payload(
+                        request.messages,
+                        request.tools,
+                        model=request.model or self._default_model,
+                        temperature=request.temperature,
+                    ),
+                },
+                ensure_ascii=False,
+                default=str,
+            )
+            for request in requests
+        ]
+        content = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        input_file = self._client.files.create(
+            file=("requests.jsonl", content),
+            purpose="batch",
+        )
+        batch = self._client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window=self._completion_window,
+        )
+        return str(batch.id)
+
+    def poll(self, job_id: str) -> BatchJobStatus:
+        status = getattr(self._client.batches.retrieve(job_id), "status", None)
+        if status in _PENDING_STATUSES:
+            return BatchJobStatus.PENDING
+        if status in _COMPLETED_STATUSES:
+            return BatchJobStatus.COMPLETED
+        return BatchJobStatus.FAILED
+
+    def fetch_results(self, job_id: str) -> list[BatchResult]:
+        batch = self._client.batches.retrieve(job_id)
+        results: list[BatchResult] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in _file_text(self._client.files.content(file_id)).splitlines():
+                if line.strip():
+                    results.append(
+                        _batch_result_from_line(json.loads(line), self._raw_retention)
+                    )
+        return results
+
+    def _create_client(self) -> OpenAIBatchClientLike:
+        try:
+            from openai import OpenAI
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError(
+                "openai package is required for OpenAIBatchBackend. "
+                "Install with `pip install openai`."
+            ) from exc
+
+        client = OpenAI(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            organization=self._organization,
+            project=self._project,
+            timeout=self._timeout,
+        )
+        return cast(OpenAIBatchClientLike, client)
+
+
+def _file_text(content: Any) -> str:
+    text = getattr(content, "text", content)
+    if isinstance(text, bytes):
+        return text.decode("utf-8")
+    return str(text)
+
+
+def _batch_result_from_line(
+    payload: dict[str, Any], raw_retention: RawRetentionPolicy | None
+) -> BatchResult:
+    custom_id = str(payload.get("custom_id"))
+    response = payload.get("response") or {}
+    body = response.get("body") if isinstance(response, dict) else None
+    if response.get("status_code") == 200 and isinstance(body, dict):
+        try:
+            # The parser reads SDK objects by attribute, so wrap the decoded JSON to match.
+            completion = json.loads(
+                json.dumps(body), object_hook=lambda item: SimpleNamespace(**item)
+            )
+            parsed = parse_openai_chat_completion(completion, raw_retention=raw_retention)
+        except ValueError as exc:
+            return BatchResult(custom_id=custom_id, error=str(exc))
+        return BatchResult(custom_id=custom_id, response=parsed)
+    error = payload.get("error")
+    if not isinstance(error, dict) and isinstance(body, dict):
+        error = body.get("error")
+    if isinstance(error, dict):
+        message = str(error.get("message") or error.get("code") or "Batch request failed.")
+    else:
+        message = f"Batch request failed with status {response.get('status_code')}."
+    return BatchResult(custom_id=custom_id, error=message)
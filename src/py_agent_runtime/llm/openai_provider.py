@@ -3,8 +3,13 @@ from __future__ import annotations
 import os
 from typing import Any, Protocol, Sequence, cast
 
-from py_agent_runtime.llm.base_provider import LLMProvider
-from py_agent_runtime.llm.normalizer import parse_openai_chat_completion, to_openai_messages
+from py_agent_runtime.llm.base_provider import LLMProvider, ToolCallDeltaHandler
+from py_agent_runtime.llm.normalizer import (
+    parse_openai_chat_completion,
+    parse_openai_chat_stream,
+    to_openai_messages,
+)
+from py_agent_runtime.llm.raw_retention import RawRetentionPolicy
 from py_agent_runtime.llm.retry import call_with_retries
 from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
 
@@ -23,6 +28,26 @@ class OpenAIClientLike(Protocol):
     def chat(self) -> _OpenAIChatNamespace: ...
 
 
+def build_openai_chat_payload(
+    messages: Sequence[LLMMessage],
+    tools: Sequence[dict[str, Any]] | None,
+    *,
+    model: str,
+    temperature: float | None,
+) -> dict[str, Any]:
+    """Chat Completions request body, shared by live calls and batch jobs."""
+    payload: dict[str, Any] = {
+        "model": model,
+        "messages": to_openai_messages(messages),
+    }
+    if tools:
+        payload["tools"] = list(tools)
+        payload["tool_choice"] = "auto"
+    if temperature is not None:
+        payload["temperature"] = temperature
+    return payload
+
+
 class OpenAIChatProvider(LLMProvider):
     def __init__(
         self,
@@ -36,6 +61,7 @@ class OpenAIChatProvider(LLMProvider):
         max_retries: int = 2,
         retry_base_delay_seconds: float = 0.0,
         retry_max_delay_seconds: float | None = None,
+        raw_retention: RawRetentionPolicy | None = None,
         client: OpenAIClientLike | None = None,
     ) -> None:
         effective_api_key = api_key or os.environ.get("OPENAI_API_KEY")
@@ -53,6 +79,7 @@ class OpenAIChatProvider(LLMProvider):
         self._max_retries = max_retries
         self._retry_base_delay_seconds = retry_base_delay_seconds
         self._retry_max_delay_seconds = retry_max_delay_seconds
+        self._raw_retention = raw_retention
         self._client = client or self._create_client()
 
     def generate(
@@ -63,23 +90,49 @@ class OpenAIChatProvider(LLMProvider):
         model: str | None = None,
         temperature: float | None = None,
     ) -> LLMTurnResponse:
-        payload: dict[str, Any] = {
-            "model": model or self._default_model,
-            "messages": to_openai_messages(messages),
-        }
-        if tools:
-            payload["tools"] = list(tools)
-            payload["tool_choice"] = "auto"
-        if temperature is not None:
-            payload["temperature"] = temperature
-
-        response = call_with_retries(
+        payload = self._build_payload(messages, tools, model=model, temperature=temperature)
+        response = self._create(payload)
+        return parse_openai_chat_completion(response, raw_retention=self._raw_retention)
+
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        payload = self._build_payload(messages, tools, model=model, temperature=temperature)
+        payload["stream"] = True
+        stream = self._create(payload)
+        try:
+            return parse_openai_chat_stream(stream, on_tool_call_delta)
+        finally:
+            # Closing drops the HTTP stream, so an aborted turn stops generating tokens.
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+    def _build_payload(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None,
+        *,
+        model: str | None,
+        temperature: float | None,
+    ) -> dict[str, Any]:
+        return build_openai_chat_payload(
+            messages, tools, model=model or self._default_model, temperature=temperature
+        )
+
+    def _create(self, payload: dict[str, Any]) -> Any:
+        return call_with_retries(
             lambda: self._client.chat.completions.create(**payload),
             max_retries=self._max_retries,
             base_delay_seconds=self._retry_base_delay_seconds,
             max_delay_seconds=self._retry_max_delay_seconds,
         )
-        return parse_openai_chat_completion(response)
 
     def _create_client(self) -> OpenAIClientLike:
         try:
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Sequence
+
+from py_agent_runtime.llm.base_provider import LLMProvider, ToolCallDeltaHandler, close_provider
+from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
+
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_request_tokens(
+    messages: Sequence[LLMMessage],
+    tools: Sequence[dict[str, Any]] | None = None,
+) -> int:
+    serialized = json.dumps([asdict(message) for message in messages], default=str)
+    if tools:
+        serialized += json.dumps(list(tools), default=str)
+    return max(1, math.ceil(len(serialized) / CHARS_PER_TOKEN))
+
+
+class TokenBucket:
+    def __init__(self, *, capacity: float, refill_per_second: float, now: float) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if refill_per_second <= 0:
+            raise ValueError("refill_per_second must be > 0")
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = float(capacity)
+        self._updated_at = now
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self._tokens
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        needed = min(float(amount), self.capacity) - self._tokens
+        if needed <= 0:
+            return 0.0
+        return needed / self.refill_per_second
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self._tokens -= min(float(amount), self.capacity)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated_at = now
+
+
+@dataclass(frozen=True)
+class RateLimitMetrics:
+    admitted_requests: int
+    admitted_tokens: int
+    waited_requests: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+    queue_depth: int
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be > 0")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be > 0")
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep_fn = sleep_fn
+        now = clock()
+        self._request_bucket = (
+            TokenBucket(
+                capacity=requests_per_minute,
+                refill_per_second=requests_per_minute / 60.0,
+                now=now,
+            )
+            if requests_per_minute is not None
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(
+                capacity=tokens_per_minute,
+                refill_per_second=tokens_per_minute / 60.0,
+                now=now,
+            )
+            if tokens_per_minute is not None
+            else None
+        )
+        self._condition = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._admitted_requests = 0
+        self._admitted_tokens = 0
+        self._waited_requests = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def acquire(self, estimated_tokens: int, *, priority: int = 0) -> float:
+        """Block until one request of `estimated_tokens` fits both buckets.
+
+        Higher `priority` values are admitted first; equal priorities are FIFO.
+        Returns the number of seconds the caller waited.
+        """
+        started_at = self._clock()
+        ticket = (-priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                if self._waiters[0] != ticket:
+                    self._condition.wait()
+                    continue
+                now = self._clock()
+                delay = self._admission_delay(estimated_tokens, now)
+                if delay <= 0:
+                    self._admit(estimated_tokens, now)
+                    heapq.heappop(self._waiters)
+                    waited = max(0.0, now - started_at)
+                    self._record_wait(waited)
+                    self._condition.notify_all()
+                    return waited
+                self._condition.release()
+                try:
+                    self._sleep_fn(delay)
+                finally:
+                    self._condition.acquire()
+
+    def metrics(self) -> RateLimitMetrics:
+        with self._condition:
+            return RateLimitMetrics(
+                admitted_requests=self._admitted_requests,
+                admitted_tokens=self._admitted_tokens,
+                waited_requests=self._waited_requests,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds,
+                queue_depth=len(self._waiters),
+            )
+
+    def _admission_delay(self, estimated_tokens: int, now: float) -> float:
+        delay = 0.0
+        if self._request_bucket is not None:
+            delay = max(delay, self._request_bucket.wait_time(1, now))
+        if self._token_bucket is not None:
+            delay = max(delay, self._token_bucket.wait_time(estimated_tokens, now))
+        return delay
+
+    def _admit(self, estimated_tokens: int, now: float) -> None:
+        if self._request_bucket is not None:
+            self._request_bucket.consume(1, now)
+        if self._token_bucket is not None:
+            self._token_bucket.consume(estimated_tokens, now)
+        self._admitted_requests += 1
+        self._admitted_tokens += estimated_tokens
+
+    def _record_wait(self, waited: float) -> None:
+        if waited > 0:
+            self._waited_requests += 1
+        self._total_wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+
+_SHARED_LIMITERS: dict[str, RateLimiter] = {}
+_SHARED_LIMITERS_LOCK = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    key: str,
+    *,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+) -> RateLimiter:
+    """Return the process-wide limiter for `key`, creating it on first use.
+
+    Raises ValueError if `key` already has a limiter with different limits, rather than
+    silently handing back the first caller's limits.
+    """
+    with _SHARED_LIMITERS_LOCK:
+        limiter = _SHARED_LIMITERS.get(key)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+            _SHARED_LIMITERS[key] = limiter
+        elif (limiter.requests_per_minute, limiter.tokens_per_minute) != (
+            requests_per_minute,
+            tokens_per_minute,
+        ):
+            raise ValueError(
+                f"Shared rate limiter {key!r} already exists with "
+                f"requests_per_minute={limiter.requests_per_minute}, "
+                f"tokens_per_minute={limiter.tokens_per_minute}."
+            )
+        return limiter
+
+
+def reset_shared_rate_limiters() -> None:
+    with _SHARED_LIMITERS_LOCK:
+        _SHARED_LIMITERS.clear()
+
+
+class RateLimitedProvider(LLMProvider):
+    def __init__(
+        self,
+        provider: LLMProvider,
+        limiter: RateLimiter,
+        *,
+        priority: int = 0,
+        token_estimator: Callable[
+            [Sequence[LLMMessage], Sequence[dict[str, Any]] | None], int
+        ] = estimate_request_tokens,
+    ) -> None:
+        self._provider = provider
+        self._limiter = limiter
+        self._priority = priority
+        self._token_estimator = token_estimator
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return self._limiter
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self._limiter.acquire(self._token_estimator(messages, tools), priority=self._priority)
+        return self._provider.generate(
+            messages=messages,
+            tools=tools,
+            model=model,
+            temperature=temperature,
+        )
+
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        self._limiter.acquire(self._token_estimator(messages, tools), priority=self._priority)
+        return self._provider.generate_streaming(
+            messages=messages,
+            tools=tools,
+            model=model,
+            temperature=temperature,
+            on_tool_call_delta=on_tool_call_delta,
+        )
+
+    def close(self) -> None:
+        close_provider(self._provider)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+RAW_SPILL_FILE_NAME = "raw-responses.jsonl"
+COMPACT_RAW_KEYS = (
+    "id",
+    "object",
+    "type",
+    "model",
+    "model_version",
+    "created",
+    "response_id",
+    "role",
+    "stop_reason",
+    "system_fingerprint",
+    "usage",
+    "usage_metadata",
+)
+
+
+class RawRetentionMode(str, Enum):
+    FULL = "full"
+    NONE = "none"
+    COMPACT = "compact"
+    SPILL = "spill"
+
+
+@dataclass(frozen=True)
+class RawRetentionPolicy:
+    mode: RawRetentionMode = RawRetentionMode.FULL
+    spill_dir: Path | None = None
+
+    def __post_init__(self) -> None:
+        if self.mode == RawRetentionMode.SPILL and self.spill_dir is None:
+            raise ValueError("spill_dir is required for spill raw retention mode.")
+
+
+@dataclass(frozen=True)
+class RawResponseRef:
+    trace_path: Path
+    response_id: str
+
+
+_SPILL_LOCK = threading.Lock()
+
+
+def retain_raw(raw: Any, policy: RawRetentionPolicy | None) -> Any:
+    if raw is None or policy is None or policy.mode == RawRetentionMode.FULL:
+        return raw
+    if policy.mode == RawRetentionMode.NONE:
+        return None
+    if policy.mode == RawRetentionMode.COMPACT:
+        return compact_raw(raw)
+    assert policy.spill_dir is not None  # enforced by RawRetentionPolicy
+    return spill_raw(raw, policy.spill_dir)
+
+
+def compact_raw(raw: Any) -> dict[str, Any]:
+    dumped = _to_jsonable(raw)
+    if not isinstance(dumped, dict):
+        return {}
+    return {key: dumped[key] for key in COMPACT_RAW_KEYS if dumped.get(key) is not None}
+
+
+def spill_raw(raw: Any, spill_dir: Path) -> RawResponseRef:
+    response_id = str(uuid4())
+    trace_path = spill_dir / RAW_SPILL_FILE_NAME
+    line = json.dumps({"id": response_id, "raw": _to_jsonable(raw)}, default=str)
+    with _SPILL_LOCK:
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        with trace_path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+    return RawResponseRef(trace_path=trace_path, response_id=response_id)
+
+
+def load_spilled_raw(ref: RawResponseRef) -> Any:
+    with ref.trace_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if ref.response_id not in line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict) and record.get("id") == ref.response_id:
+                return record.get("raw")
+    raise KeyError(f"Raw response not found in trace file: {ref.response_id}")
+
+
+def _to_jsonable(raw: Any) -> Any:
+    if isinstance(raw, (str, int, float, bool)) or raw is None:
+        return raw
+    if isinstance(raw, dict):
+        return {str(key): _to_jsonable(value) for key, value in raw.items()}
+    if isinstance(raw, (list, tuple)):
+        return [_to_jsonable(item) for item in raw]
+    model_dump = getattr(raw, "model_dump", None)
+    if callable(model_dump):
+        try:
+            return model_dump(mode="json", exclude_none=True)
+        except TypeError:
+            return model_dump()
+    to_dict = getattr(raw, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    attributes = getattr(raw, "__dict__", None)
+    if isinstance(attributes, dict):
+        return {
+            key: _to_jsonable(value)
+            for key, value in attributes.items()
+            if not key.startswith("_")
+        }
+    return str(raw)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Any, Literal
 
 
@@ -23,6 +23,14 @@ class LLMMessage:
     tool_calls: tuple[LLMToolCall, ...] = field(default_factory=tuple)
 
 
+@dataclass(frozen=True)
+class LLMToolCallDelta:
+    index: int
+    name: str | None
+    arguments_delta: str
+    call_id: str | None = None
+
+
 @dataclass(frozen=True)
 class LLMTurnResponse:
     content: str | None
@@ -30,3 +38,24 @@ class LLMTurnResponse:
     finish_reason: str | None = None
     raw: Any | None = None
 
+
+def llm_message_to_dict(message: LLMMessage) -> dict[str, Any]:
+    return asdict(message)
+
+
+def llm_message_from_dict(payload: dict[str, Any]) -> LLMMessage:
+    return LLMMessage(
+        role=payload["role"],
+        content=payload.get("content"),
+        tool_call_id=payload.get("tool_call_id"),
+        name=payload.get("name"),
+        tool_calls=tuple(llm_tool_call_from_dict(item) for item in payload.get("tool_calls") or []),
+    )
+
+
+def llm_tool_call_from_dict(payload: dict[str, Any]) -> LLMToolCall:
+    return LLMToolCall(
+        name=str(payload["name"]),
+        args=dict(payload.get("args") or {}),
+        call_id=payload.get("call_id"),
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from py_agent_runtime.policy.loader import load_policies_from_toml
@@ -20,8 +21,15 @@ def default_policy_directory() -> Path:
 
 
 def load_default_policies() -> DefaultPolicyLoadResult:
+    rules, errors = _load_default_policies_cached()
+    return DefaultPolicyLoadResult(rules=list(rules), errors=list(errors))
+
+
+@lru_cache(maxsize=1)
+def _load_default_policies_cached() -> tuple[tuple[PolicyRule, ...], tuple[str, ...]]:
+    # Bundled files never change at runtime; parse them once per process.
     load_result = load_policies_from_toml(
         [default_policy_directory()],
         get_policy_tier=lambda _path: DEFAULT_POLICY_TIER,
     )
-    return DefaultPolicyLoadResult(rules=load_result.rules, errors=load_result.errors)
+    return tuple(load_result.rules), tuple(load_result.errors)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 from py_agent_runtime.bus.message_bus import MessageBus
 from py_agent_runtime.policy.defaults_loader import load_default_policies
@@ -12,6 +14,21 @@ from py_agent_runtime.tools.registry import ToolRegistry
 
 if TYPE_CHECKING:
     from py_agent_runtime.agents.registry import AgentRegistry
+    from py_agent_runtime.runtime.file_cache import FileContentCache
+    from py_agent_runtime.runtime.tool_outputs import ToolOutputStore
+    from py_agent_runtime.tools.atomic_write import AtomicFileWriter, WriteDurability
+    from py_agent_runtime.tools.shell_output import ShellResourceLimits
+
+# Kept in step with file_cache.DEFAULT_FILE_CACHE_MAX_BYTES; repeated here so importing the
+# config does not load the cache module.
+DEFAULT_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SHELL_OUTPUT_MAX_BYTES = 1024 * 1024
+
+
+def _default_shell_limits() -> ShellResourceLimits:
+    from py_agent_runtime.tools.shell_output import ShellResourceLimits
+
+    return ShellResourceLimits()
 
 
 @dataclass
@@ -27,13 +44,40 @@ class RuntimeConfig:
     message_bus: MessageBus = field(init=False)
     agent_registry: AgentRegistry = field(init=False)
     plans_dir: Path = field(init=False)
+    tool_output_store: ToolOutputStore = field(init=False)
     todos: list[dict[str, Any]] = field(default_factory=list)
+    session_id: str = field(default_factory=lambda: uuid4().hex)
+    max_parallel_subagents: int = 4
+    subagent_slots: threading.BoundedSemaphore = field(init=False, repr=False)
+    grep_index: bool = False
+    file_cache_max_bytes: int = DEFAULT_FILE_CACHE_MAX_BYTES
+    file_cache: FileContentCache = field(init=False, repr=False)
+    write_durability: WriteDurability | str = "none"
+    file_writer: AtomicFileWriter = field(init=False, repr=False)
+    shell_output_max_bytes: int = DEFAULT_SHELL_OUTPUT_MAX_BYTES
+    shell_limits: ShellResourceLimits = field(default_factory=_default_shell_limits)
 
     def __post_init__(self) -> None:
+        if self.max_parallel_subagents < 0:
+            raise ValueError("max_parallel_subagents must be >= 0")
+        if self.shell_output_max_bytes < 0:
+            raise ValueError("shell_output_max_bytes must be >= 0")
         self.target_dir = self.target_dir.resolve()
+        self.subagent_slots = threading.BoundedSemaphore(self.max_parallel_subagents)
+        from py_agent_runtime.runtime.file_cache import FileContentCache
+        from py_agent_runtime.tools.atomic_write import AtomicFileWriter, WriteDurability
+
+        self.file_cache = FileContentCache(self.file_cache_max_bytes)
+        self.write_durability = WriteDurability(self.write_durability)
+        self.file_writer = AtomicFileWriter(self.write_durability)
         self.plans_dir = self.target_dir / ".gemini" / "tmp" / "plans"
         if self.plan_enabled:
             self.plans_dir.mkdir(parents=True, exist_ok=True)
+        from py_agent_runtime.runtime.tool_outputs import ToolOutputStore
+
+        self.tool_output_store = ToolOutputStore(
+            self.target_dir / ".gemini" / "tmp" / "tool-outputs" / self.session_id
+        )
         if self.load_default_policies:
             loaded = load_default_policies()
             if loaded.errors:
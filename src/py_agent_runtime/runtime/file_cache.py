@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from py_agent_runtime.tools.workspace_walker import BINARY_SNIFF_BYTES, is_binary_block
+
+DEFAULT_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_FILE_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# Files modified this close to being cached may change again within the same mtime tick
+# without changing the key, so they are not cached (git's "racily clean" rule, as in
+# the trigram index).
+_RACY_WINDOW_NS = 2_000_000_000
+
+_Key = tuple[int, int, int]  # (st_mtime_ns, st_size, st_ino)
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    """Newline-normalized UTF-8 text of a file; `text` is None for binary or non-UTF-8."""
+
+    text: str | None
+    binary: bool
+    size: int
+
+
+@dataclass(frozen=True)
+class FileCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    memory_bytes: int
+    max_bytes: int
+
+
+@dataclass(frozen=True)
+class _Entry:
+    key: _Key
+    file: CachedFile
+    cost: int
+
+
+class FileContentCache:
+    """Bounded LRU of file contents, validated on every lookup by (mtime_ns, size, inode).
+
+    Text is stored the way `Path.read_text` returns it (CRLF and CR become LF), so
+    read_file, replace and grep_search can share one decoded copy. Files larger than
+    `max_entry_bytes` or modified within the last two seconds are read but not cached,
+    so writers just `invalidate` the paths they wrote.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_FILE_CACHE_MAX_BYTES,
+        *,
+        max_entry_bytes: int = DEFAULT_FILE_CACHE_MAX_ENTRY_BYTES,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def load(self, path: Path) -> CachedFile:
+        """Return the cached contents of `path`, re-reading it if it changed. Raises OSError."""
+        name = str(path)
+        key = _stat_key(os.stat(name))
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.key == key:
+                self._entries.move_to_end(name)
+                self._hits += 1
+                return entry.file
+            self._misses += 1
+        with open(name, "rb") as handle:
+            head = handle.read(BINARY_SNIFF_BYTES)
+            # Key the entry by the descriptor we read from, not the earlier path stat.
+            key = _stat_key(os.fstat(handle.fileno()))
+            if is_binary_block(head):
+                cached = CachedFile(None, True, key[1])
+            else:
+                cached = _decode(head + handle.read())
+        self._put(name, key, cached)
+        return cached
+
+    def invalidate(self, path: Path) -> None:
+        with self._lock:
+            entry = self._entries.pop(str(path), None)
+            if entry is not None:
+                self._bytes -= entry.cost
+
+    def stats(self) -> FileCacheStats:
+        with self._lock:
+            return FileCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                memory_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def _put(self, name: str, key: _Key, cached: CachedFile) -> None:
+        cost = sys.getsizeof(cached.text) if cached.text is not None else 0
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._bytes -= previous.cost
+            if key[1] > self.max_entry_bytes or cost > self.max_bytes or _is_racy(key):
+                return
+            self._entries[name] = _Entry(key, cached, cost)
+            self._bytes += cost
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.cost
+                self._evictions += 1
+
+
+def _stat_key(stat: os.stat_result) -> _Key:
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _is_racy(key: _Key) -> bool:
+    return key[0] >= time.time_ns() - _RACY_WINDOW_NS
+
+
+def _decode(data: bytes) -> CachedFile:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return CachedFile(None, False, len(data))
+    return CachedFile(_normalize_newlines(text), False, len(data))
+
+
+def _normalize_newlines(text: str) -> str:
+    if "\r" in text:
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+DEFAULT_TOOL_OUTPUT_MAX_CHARS = 32_000
+DEFAULT_TOOL_OUTPUT_CAPS: dict[str, int] = {
+    "read_file": 48_000,
+    "grep_search": 24_000,
+    "glob": 16_000,
+    "list_directory": 16_000,
+    "run_shell_command": 16_000,
+}
+MIN_FIELD_PREVIEW_CHARS = 256
+# Pages of spilled output are already capped by read_tool_output; bounding one again
+# (e.g. when escaping non-ASCII text inflates it) would hide the handle being paged.
+UNBOUNDED_TOOL_NAMES = frozenset({"read_tool_output"})
+# Spill files record the byte offset of every Nth character so reads can seek.
+_SPILL_INDEX_STRIDE_CHARS = 4096
+_HANDLE_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+@dataclass(frozen=True)
+class ToolOutputLimits:
+    default_max_chars: int = DEFAULT_TOOL_OUTPUT_MAX_CHARS
+    per_tool: Mapping[str, int] = field(default_factory=lambda: dict(DEFAULT_TOOL_OUTPUT_CAPS))
+    head_fraction: float = 0.6
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.head_fraction <= 1.0:
+            raise ValueError("head_fraction must be between 0 and 1")
+
+    @classmethod
+    def unbounded(cls) -> ToolOutputLimits:
+        return cls(default_max_chars=0, per_tool={})
+
+    def max_chars_for(self, tool_name: str) -> int | None:
+        max_chars = self.per_tool.get(tool_name, self.default_max_chars)
+        return max_chars if max_chars > 0 else None
+
+
+@dataclass(frozen=True)
+class BoundedToolOutput:
+    result_display: Any
+    handles: tuple[str, ...]
+    original_chars: int
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.handles)
+
+
+class ToolOutputStore:
+    """Session-scoped spill area for tool output that exceeded its history cap."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def spill(self, tool_name: str, content: str) -> str:
+        handle = _new_handle(tool_name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        offsets: list[int] = []
+        position = 0
+        with self._path_for(handle).open("wb") as out:
+            for start in range(0, len(content), _SPILL_INDEX_STRIDE_CHARS):
+                offsets.append(position)
+                position += out.write(
+                    content[start : start + _SPILL_INDEX_STRIDE_CHARS].encode("utf-8")
+                )
+        index = {"chars": len(content), "offsets": offsets}
+        self._index_path_for(handle).write_text(json.dumps(index), encoding="utf-8")
+        return handle
+
+    def read(self, handle: str, *, offset: int = 0, limit: int | None = None) -> tuple[str, int]:
+        """Return `limit` characters from `offset` and the total length, seeking to them."""
+        path = self._path_for(handle)
+        if not path.is_file():
+            raise KeyError(f"Unknown tool output handle: {handle}")
+        index = json.loads(self._index_path_for(handle).read_text(encoding="utf-8"))
+        total, offsets = int(index["chars"]), index["offsets"]
+        if offset >= total:
+            return "", total
+        stride = offset // _SPILL_INDEX_STRIDE_CHARS
+        with path.open("rb") as raw:
+            raw.seek(offsets[stride])
+            reader = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            reader.read(offset - stride * _SPILL_INDEX_STRIDE_CHARS)
+            text = reader.read(-1 if limit is None else limit)
+        return text, total
+
+    def _path_for(self, handle: str) -> Path:
+        if not _HANDLE_PATTERN.match(handle):
+            raise KeyError(f"Invalid tool output handle: {handle}")
+        return self.root / f"{handle}.txt"
+
+    def _index_path_for(self, handle: str) -> Path:
+        return self.root / f"{handle}.idx"
+
+
+def bound_tool_output(
+    result_display: Any,
+    *,
+    tool_name: str,
+    limits: ToolOutputLimits,
+    store: ToolOutputStore,
+) -> BoundedToolOutput:
+    """Fit `result_display` into the tool's cap, measured as serialized JSON.
+
+    Long string fields keep a head and tail preview. When a display has too many
+    fields for each to keep a useful preview, lists keep their first and last items
+    and a marker counts the rest. Everything dropped is spilled to `store`.
+    """
+    max_chars = None if tool_name in UNBOUNDED_TOOL_NAMES else limits.max_chars_for(tool_name)
+    original_chars = sum(_string_leaf_lengths(result_display))
+    if max_chars is None or _serialized_chars(result_display) <= max_chars:
+        return BoundedToolOutput(result_display, (), original_chars)
+
+    def _dry_run(content: Callable[[], str]) -> str:
+        return _new_handle(tool_name)
+
+    # Shapes are tried on placeholder handles so only the accepted one spills anything.
+    longest = _longest_list(result_display)
+    max_items: int | None = None
+    while True:
+        shape = _fit_leaves(result_display, max_items, max_chars, limits.head_fraction, _dry_run)
+        if shape is not None:
+            handles: list[str] = []
+
+            def _spill(content: Callable[[], str]) -> str:
+                handle = store.spill(tool_name, content())
+                handles.append(handle)
+                return handle
+
+            bounded = _shape(result_display, max_items, shape, limits.head_fraction, _spill)
+            return BoundedToolOutput(bounded, tuple(handles), original_chars)
+        if max_items == 0 or longest == 0:
+            break
+        max_items = longest // 2 if max_items is None else max_items // 2
+
+    # Nothing structured fits (e.g. thousands of dict keys), so preview the serialized whole.
+    serialized = json.dumps(result_display, default=str, ensure_ascii=False)
+    handle = store.spill(tool_name, serialized)
+    budget = max_chars
+    while True:
+        preview = _preview(serialized, budget, limits.head_fraction, handle)
+        excess = _serialized_chars(preview) - max_chars
+        if excess <= 0 or budget <= 0:
+            return BoundedToolOutput(preview, (handle,), original_chars)
+        budget -= excess
+
+
+class _OmittedItems(str):
+    """Marker standing in for list items that were dropped; never truncated itself."""
+
+
+def _fit_leaves(
+    value: Any,
+    max_items: int | None,
+    max_chars: int,
+    head_fraction: float,
+    spill: Callable[[Callable[[], str]], str],
+) -> int | None:
+    """Largest per-field budget that fits `max_chars` once lists are cut to `max_items`."""
+    trimmed = _shape(value, max_items, None, head_fraction, spill)
+    leaves = _string_leaf_lengths(trimmed)
+    if len(leaves) * MIN_FIELD_PREVIEW_CHARS > max_chars:
+        return None
+    structure = _serialized_chars(_shape(trimmed, None, 0, head_fraction, spill))
+    leaf_budget = _leaf_budget(leaves, max_chars - structure)
+    while leaf_budget >= MIN_FIELD_PREVIEW_CHARS:
+        # JSON escaping can make a field longer than its character count, so measure.
+        excess = _serialized_chars(_shape(trimmed, None, leaf_budget, head_fraction, spill))
+        excess -= max_chars
+        if excess <= 0:
+            return leaf_budget
+        long_leaves = sum(1 for length in leaves if length > leaf_budget)
+        leaf_budget -= max(1, -(-excess // max(1, long_leaves)))
+    return None
+
+
+def _shape(
+    value: Any,
+    max_items: int | None,
+    leaf_budget: int | None,
+    head_fraction: float,
+    spill: Callable[[Callable[[], str]], str],
+) -> Any:
+    """Copy `value` with lists cut to `max_items` and string fields cut to `leaf_budget`.
+
+    `None` leaves that dimension alone; a budget of 0 empties every field (used to
+    measure the size of the structure alone). `spill` gets the dropped content lazily.
+    """
+    if isinstance(value, _OmittedItems):
+        return value
+    if isinstance(value, str):
+        if leaf_budget is None or len(value) <= leaf_budget:
+            return value
+        if leaf_budget == 0:
+            return ""
+        return _preview(value, leaf_budget, head_fraction, spill(lambda: value))
+    if isinstance(value, Mapping):
+        return {
+            key: _shape(item, max_items, leaf_budget, head_fraction, spill)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        items = list(value)
+        kept: list[Any] = items
+        if max_items is not None and len(items) > max_items:
+            head_count = min(max_items, math.ceil(max_items * head_fraction))
+            tail_count = max_items - head_count
+            omitted = len(items) - max_items
+            handle = spill(lambda: _json_lines(items))
+            marker = _OmittedItems(
+                f"...[{omitted} of {len(items)} items omitted; call read_tool_output with "
+                f"handle '{handle}' to page through every item as JSON lines]..."
+            )
+            kept = [*items[:head_count], marker, *(items[-tail_count:] if tail_count else [])]
+        return [_shape(item, max_items, leaf_budget, head_fraction, spill) for item in kept]
+    return value
+
+
+def _json_lines(items: list[Any]) -> str:
+    return "\n".join(json.dumps(item, default=str, ensure_ascii=False) for item in items)
+
+
+def _string_leaf_lengths(value: Any) -> list[int]:
+    if isinstance(value, _OmittedItems):
+        return []
+    if isinstance(value, str):
+        return [len(value)]
+    if isinstance(value, Mapping):
+        return [length for item in value.values() for length in _string_leaf_lengths(item)]
+    if isinstance(value, (list, tuple)):
+        return [length for item in value for length in _string_leaf_lengths(item)]
+    return []
+
+
+def _longest_list(value: Any) -> int:
+    if isinstance(value, Mapping):
+        return max((_longest_list(item) for item in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        nested = max((_longest_list(item) for item in value), default=0)
+        return max(len(value), nested)
+    return 0
+
+
+def _serialized_chars(value: Any) -> int:
+    # Matches how the runner serializes tool results into history.
+    return len(json.dumps(value, default=str))
+
+
+def _leaf_budget(lengths: list[int], max_chars: int) -> int:
+    # Water-fill: short leaves keep their full text, the rest share what remains equally.
+    remaining = max_chars
+    ordered = sorted(lengths)
+    for index, length in enumerate(ordered):
+        share = remaining // (len(ordered) - index)
+        if length > share:
+            return max(MIN_FIELD_PREVIEW_CHARS, share)
+        remaining -= length
+    return max_chars
+
+
+def _new_handle(tool_name: str) -> str:
+    safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", tool_name) or "tool"
+    return f"{safe_name}-{uuid4().hex[:12]}"
+
+
+def _preview(text: str, max_chars: int, head_fraction: float, handle: str) -> str:
+    """Head and tail of `text` around an omission notice, `max_chars` long at most."""
+    # Size the notice for the largest possible count, then give the text what is left.
+    notice_chars = len(_omission_notice(len(text), len(text), handle)) + 2
+    text_chars = max(0, min(len(text), max_chars - notice_chars))
+    head_chars = int(text_chars * head_fraction)
+    tail_chars = text_chars - head_chars
+    omitted = len(text) - head_chars - tail_chars
+    tail = text[-tail_chars:] if tail_chars else ""
+    return f"{text[:head_chars]}\n{_omission_notice(omitted, len(text), handle)}\n{tail}"
+
+
+def _omission_notice(omitted: int, total: int, handle: str) -> str:
+    return (
+        f"...[{omitted} of {total} chars omitted; "
+        f"call read_tool_output with handle '{handle}' to page through the full text]..."
+    )
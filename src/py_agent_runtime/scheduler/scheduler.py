@@ -11,7 +11,7 @@ from py_agent_runtime.scheduler.types import (
     ToolCallRequestInfo,
     ToolCallResponseInfo,
 )
-from py_agent_runtime.tools.base import ToolConfirmationOutcome
+from py_agent_runtime.tools.base import ToolConfirmationOutcome, current_tool_call_id
 from py_agent_runtime.tools.registry import ToolRegistry
 
 
@@ -118,6 +118,7 @@ class Scheduler:
                     ),
                 )
 
+        call_token = current_tool_call_id.set(request.call_id)
         try:
             result = tool.execute(self._config, request.args)
             if result.error:
@@ -155,3 +156,5 @@ class Scheduler:
                     error_type="unhandled_exception",
                 ),
             )
+        finally:
+            current_tool_call_id.reset(call_token)
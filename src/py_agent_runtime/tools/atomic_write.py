@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+
+def _read_umask() -> int:
+    # The umask can only be read by setting it, so restore it straight away.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once: changing the umask from worker threads while files are created is racy.
+_UMASK = _read_umask()
+
+
+class WriteDurability(str, Enum):
+    """When file tool writes are flushed to stable storage.
+
+    Every write is atomic (temp file + rename) regardless; this only controls fsync.
+    `turn` defers the fsyncs to the end of the tool-call turn and issues them as a group.
+    """
+
+    NONE = "none"
+    FSYNC = "fsync"
+    TURN = "turn"
+
+
+@dataclass(frozen=True)
+class FileWriterStats:
+    writes: int
+    fsyncs: int
+    flushes: int
+    pending: int
+    fsync_errors: int
+
+
+def write_text_atomic(path: Path, text: str, *, fsync: bool = False) -> None:
+    """Replace `path` with `text` (UTF-8) so readers see either the old or the new file.
+
+    The content goes to a temporary sibling that is renamed over `path`; an existing
+    file's permission bits are kept, and a new file gets `0o666` minus the umask, as
+    `open` would give it. With `fsync`, the data is synced before the rename
+    and the directory entry after it.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        # mkstemp creates 0600 files regardless of the umask.
+        mode = 0o666 & ~_UMASK
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(text.encode("utf-8"))
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_path(path.parent)
+
+
+class AtomicFileWriter:
+    """Session writer used by the file tools, applying one `WriteDurability` policy.
+
+    Under `TURN`, written paths are remembered and `flush` fsyncs each file and its
+    directory once, however many times the file was rewritten during the turn. Until
+    then a power loss can drop that turn's edits, but never leaves a half-written file.
+    """
+
+    def __init__(self, durability: WriteDurability = WriteDurability.NONE) -> None:
+        self.durability = WriteDurability(durability)
+        self._pending: dict[str, None] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._fsyncs = 0
+        self._flushes = 0
+        self._fsync_errors = 0
+
+    def write_text(self, path: Path, text: str) -> None:
+        sync_now = self.durability == WriteDurability.FSYNC
+        write_text_atomic(path, text, fsync=sync_now)
+        with self._lock:
+            self._writes += 1
+            if sync_now:
+                self._fsyncs += 2
+            elif self.durability == WriteDurability.TURN:
+                self._pending[str(path)] = None
+
+    def flush(self) -> int:
+        """Fsync the files written since the last flush and their directories.
+
+        Returns how many fsyncs failed; failures are also counted in `stats`.
+        """
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        if not pending:
+            return 0
+        directories = dict.fromkeys(os.path.dirname(name) for name in pending)
+        synced = failed = 0
+        for name in [*pending, *directories]:
+            try:
+                _fsync_path(Path(name))
+            except FileNotFoundError:
+                continue  # Removed or renamed since; nothing left to persist.
+            except OSError:
+                failed += 1
+                continue
+            synced += 1
+        with self._lock:
+            self._flushes += 1
+            self._fsyncs += synced
+            self._fsync_errors += failed
+        return failed
+
+    def stats(self) -> FileWriterStats:
+        with self._lock:
+            return FileWriterStats(
+                writes=self._writes,
+                fsyncs=self._fsyncs,
+                flushes=self._flushes,
+                pending=len(self._pending),
+                fsync_errors=self._fsync_errors,
+            )
+
+
+def _fsync_path(path: Path) -> None:
+    # Directories can only be opened read-only; fsync applies to the inode, not the fd.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
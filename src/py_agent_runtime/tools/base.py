@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Mapping, TYPE_CHECKING
 
@@ -15,11 +17,47 @@ class ToolConfirmationOutcome(str, Enum):
     CANCEL = "cancel"
 
 
-@dataclass(frozen=True)
+ToolDisplay = str | dict[str, Any] | None
+
+# Call id of the tool call executing on this thread, set by the scheduler so tools can
+# tag the progress events they publish.
+current_tool_call_id: ContextVar[str | None] = ContextVar("current_tool_call_id", default=None)
+
+
+@dataclass(frozen=True, init=False)
 class ToolResult:
-    llm_content: str
-    return_display: str | dict[str, Any] | None = None
-    error: str | None = None
+    """Tool outcome whose LLM-facing text may be rendered lazily from `return_display`.
+
+    Large results (file contents, match lists) pass `render_llm_content` instead of
+    a pre-built string so the payload is held once and only formatted on demand.
+    """
+
+    return_display: ToolDisplay
+    error: str | None
+    _llm_content: str | None = field(repr=False)
+    _render_llm_content: Callable[[ToolDisplay], str] | None = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        llm_content: str | None = None,
+        return_display: ToolDisplay = None,
+        error: str | None = None,
+        *,
+        render_llm_content: Callable[[ToolDisplay], str] | None = None,
+    ) -> None:
+        if llm_content is None and render_llm_content is None:
+            raise ValueError("ToolResult needs llm_content or render_llm_content.")
+        object.__setattr__(self, "return_display", return_display)
+        object.__setattr__(self, "error", error)
+        object.__setattr__(self, "_llm_content", llm_content)
+        object.__setattr__(self, "_render_llm_content", render_llm_content)
+
+    @property
+    def llm_content(self) -> str:
+        if self._llm_content is None:
+            assert self._render_llm_content is not None
+            return self._render_llm_content(self.return_display)
+        return self._llm_content
 
 
 class BaseTool(ABC):
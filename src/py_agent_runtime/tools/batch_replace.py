@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.base import BaseTool, ToolResult
+from py_agent_runtime.tools.path_utils import resolve_path_under_target
+
+
+@dataclass
+class _FileEdit:
+    file_path: str
+    original: str
+    updated: str
+    edits: int = 0
+    replaced_count: int = 0
+    written: bool = False
+
+
+class BatchReplaceTool(BaseTool):
+    name = "batch_replace"
+    description = (
+        "Apply several text replacements across one or more UTF-8 files under the target "
+        "directory. Every edit is checked before anything is written; each file is written "
+        "once."
+    )
+    parameters_json_schema = {
+        "type": "object",
+        "properties": {
+            "edits": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "file_path": {"type": "string"},
+                        "old_text": {"type": "string"},
+                        "new_text": {"type": "string"},
+                        "replace_all": {"type": "boolean", "default": True},
+                    },
+                    "required": ["file_path", "old_text", "new_text"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["edits"],
+        "additionalProperties": False,
+    }
+
+    def validate_params(self, params: Mapping[str, Any]) -> str | None:
+        edits = params.get("edits")
+        if not isinstance(edits, list) or not edits:
+            return "`edits` must be a non-empty list."
+        for index, edit in enumerate(edits):
+            if not isinstance(edit, Mapping):
+                return f"`edits[{index}]` must be an object."
+            if not isinstance(edit.get("file_path"), str) or not edit["file_path"].strip():
+                return f"`edits[{index}].file_path` must be a non-empty string."
+            if not isinstance(edit.get("old_text"), str) or edit["old_text"] == "":
+                return f"`edits[{index}].old_text` must be a non-empty string."
+            if not isinstance(edit.get("new_text"), str):
+                return f"`edits[{index}].new_text` must be a string."
+            if not isinstance(edit.get("replace_all", True), bool):
+                return f"`edits[{index}].replace_all` must be a boolean."
+        return None
+
+    def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
+        validation_error = self.validate_params(params)
+        if validation_error:
+            return ToolResult(llm_content=validation_error, return_display="Error", error=validation_error)
+
+        files: dict[Path, _FileEdit] = {}
+        failures: list[str] = []
+        for index, edit in enumerate(params["edits"]):
+            file_path = str(edit["file_path"])
+            resolved, path_error = resolve_path_under_target(config.target_dir, file_path)
+            if path_error or resolved is None:
+                error = path_error or "Invalid file path."
+                failures.append(f"edits[{index}] ({file_path}): {error}")
+                continue
+            state = files.get(resolved)
+            if state is None:
+                state, load_error = _load(config, resolved, file_path)
+                if state is None:
+                    failures.append(f"edits[{index}] ({file_path}): {load_error}")
+                    continue
+                files[resolved] = state
+            # Edits to one file apply in order, so later anchors see earlier replacements.
+            old_text = str(edit["old_text"])
+            if old_text not in state.updated:
+                failures.append(f"edits[{index}] ({file_path}): Target text not found.")
+                continue
+            if edit.get("replace_all", True):
+                state.replaced_count += state.updated.count(old_text)
+                state.updated = state.updated.replace(old_text, str(edit["new_text"]))
+            else:
+                state.replaced_count += 1
+                state.updated = state.updated.replace(old_text, str(edit["new_text"]), 1)
+            state.edits += 1
+
+        if failures:
+            error = "No files were changed; some edits could not be applied:\n"
+            error += "\n".join(failures)
+            return ToolResult(llm_content=error, return_display="Error", error=error)
+
+        write_error = _write_all(config, files)
+        if write_error:
+            return ToolResult(llm_content=write_error, return_display="Error", error=write_error)
+
+        summary = [
+            {"file_path": str(path), "edits": state.edits, "replaced_count": state.replaced_count}
+            for path, state in files.items()
+        ]
+        total = sum(state.replaced_count for state in files.values())
+        return ToolResult(
+            llm_content=f"Updated {len(files)} file(s) with {total} replacement(s): "
+            + ", ".join(str(path) for path in files),
+            return_display={"files": summary, "total_replacements": total},
+        )
+
+
+def _load(config: RuntimeConfig, resolved: Path, file_path: str) -> tuple[_FileEdit | None, str]:
+    if not resolved.is_file():
+        return None, "File does not exist."
+    try:
+        content = config.file_cache.load(resolved).text
+    except OSError as exc:
+        return None, f"Failed to read file: {exc}"
+    if content is None:
+        return None, f"Failed to read file: {file_path} is not UTF-8 text."
+    return _FileEdit(file_path, content, content), ""
+
+
+def _write_all(config: RuntimeConfig, files: dict[Path, _FileEdit]) -> str | None:
+    """Write every changed file once; on failure, restore the files already written."""
+    for path, state in files.items():
+        if state.updated == state.original:
+            continue
+        try:
+            config.file_writer.write_text(path, state.updated)
+        except OSError as exc:
+            restore_errors = _restore(config, files)
+            error = f"Failed to write file {state.file_path}: {exc}"
+            if restore_errors:
+                error += "\nCould not restore: " + ", ".join(restore_errors)
+            else:
+                error += "\nFiles written earlier in this batch were restored."
+            return error
+        finally:
+            config.file_cache.invalidate(path)
+        state.written = True
+    return None
+
+
+def _restore(config: RuntimeConfig, files: dict[Path, _FileEdit]) -> list[str]:
+    errors: list[str] = []
+    for path, state in files.items():
+        if not state.written:
+            continue
+        try:
+            config.file_writer.write_text(path, state.original)
+        except OSError:
+            errors.append(state.file_path)
+        finally:
+            config.file_cache.invalidate(path)
+    return errors
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+
+from py_agent_runtime.tools.base import BaseTool
+from py_agent_runtime.tools.registry import ToolRegistry
+
+
+@dataclass(frozen=True)
+class BuiltinToolSpec:
+    """Name and description of a built-in tool, readable without importing its module."""
+
+    name: str
+    entry_point: str
+    description: str
+
+
+BUILTIN_TOOLS: tuple[BuiltinToolSpec, ...] = (
+    BuiltinToolSpec(
+        "glob",
+        "py_agent_runtime.tools.glob_search:GlobSearchTool",
+        "Find files with a glob pattern under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "grep_search",
+        "py_agent_runtime.tools.grep_search:GrepSearchTool",
+        "Search text in files under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "list_directory",
+        "py_agent_runtime.tools.list_directory:ListDirectoryTool",
+        "List files and folders for a path under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "read_file",
+        "py_agent_runtime.tools.read_file:ReadFileTool",
+        "Read UTF-8 file content under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "read_todos",
+        "py_agent_runtime.tools.read_todos:ReadTodosTool",
+        "Read current runtime todo list state.",
+    ),
+    BuiltinToolSpec(
+        "read_tool_output",
+        "py_agent_runtime.tools.read_tool_output:ReadToolOutputTool",
+        "Page through the full text of a tool output that was truncated in history.",
+    ),
+    BuiltinToolSpec(
+        "replace",
+        "py_agent_runtime.tools.replace:ReplaceTool",
+        "Replace text in a UTF-8 file under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "batch_replace",
+        "py_agent_runtime.tools.batch_replace:BatchReplaceTool",
+        "Apply several text replacements across one or more UTF-8 files under the target "
+        "directory. Every edit is checked before anything is written; each file is written "
+        "once.",
+    ),
+    BuiltinToolSpec(
+        "run_shell_command",
+        "py_agent_runtime.tools.run_shell_command:RunShellCommandTool",
+        "Run a shell command in a constrained working directory.",
+    ),
+    BuiltinToolSpec(
+        "write_file",
+        "py_agent_runtime.tools.write_file:WriteFileTool",
+        "Write UTF-8 content to a file under the target directory.",
+    ),
+    BuiltinToolSpec(
+        "enter_plan_mode",
+        "py_agent_runtime.tools.enter_plan_mode:EnterPlanModeTool",
+        "Switch to Plan Mode for safe analysis and plan drafting.",
+    ),
+    BuiltinToolSpec(
+        "exit_plan_mode",
+        "py_agent_runtime.tools.exit_plan_mode:ExitPlanModeTool",
+        "Request plan approval and exit Plan Mode.",
+    ),
+    BuiltinToolSpec(
+        "write_todos",
+        "py_agent_runtime.tools.write_todos:WriteTodosTool",
+        "Overwrite the full todo list with validated statuses.",
+    ),
+)
+BUILTIN_TOOL_ENTRY_POINTS: tuple[str, ...] = tuple(spec.entry_point for spec in BUILTIN_TOOLS)
+
+
+def load_tool(entry_point: str) -> BaseTool:
+    module_name, separator, class_name = entry_point.partition(":")
+    if not module_name or not separator or not class_name:
+        raise ValueError(f"Tool entry point must look like 'module:ClassName': {entry_point}")
+    tool_class = getattr(import_module(module_name), class_name)
+    tool = tool_class()
+    if not isinstance(tool, BaseTool):
+        raise TypeError(f"Tool entry point did not produce a BaseTool: {entry_point}")
+    return tool
+
+
+def register_builtin_tools(registry: ToolRegistry) -> None:
+    for entry_point in BUILTIN_TOOL_ENTRY_POINTS:
+        registry.register_tool(load_tool(entry_point))
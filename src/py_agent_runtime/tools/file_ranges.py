@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+# Newline counts are recorded at this byte stride; locating a line scans at most one stride.
+_STRIDE_BYTES = 1 << 20
+_MAX_CACHED_INDEXES = 16
+
+
+class LineIndex:
+    """Sparse line index of one file version: newline counts at fixed byte strides.
+
+    It is extended on demand, so reaching line N scans only the bytes before it once;
+    later lookups at or below N cost a bisect plus at most one stride of `find` calls.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._counts = [0]  # newlines before byte `i * _STRIDE_BYTES`
+        self._lock = threading.Lock()
+
+    def line_start(self, data: mmap.mmap, line: int) -> int | None:
+        """Byte offset where 0-based `line` starts, or None past the last line."""
+        if line == 0:
+            return 0 if self.size else None
+        with self._lock:
+            counts = self._counts
+            while counts[-1] < line and (len(counts) - 1) * _STRIDE_BYTES < self.size:
+                start = (len(counts) - 1) * _STRIDE_BYTES
+                end = min(start + _STRIDE_BYTES, self.size)
+                counts.append(counts[-1] + data[start:end].count(b"\n"))
+            stride = bisect_left(counts, line) - 1
+            if stride + 1 >= len(counts):
+                return None
+            skip = line - counts[stride]
+        position = stride * _STRIDE_BYTES
+        for _ in range(skip):
+            position = data.find(b"\n", position) + 1
+        return position if position < self.size else None
+
+
+@dataclass(frozen=True)
+class LineRange:
+    lines: list[str]
+    start_line: int
+    next_line: int | None
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    text: str
+    start: int
+    end: int
+
+
+def read_line_range(path: Path, offset: int, limit: int | None, max_bytes: int) -> LineRange:
+    """Read up to `limit` lines from 0-based line `offset`, returning at most `max_bytes`.
+
+    The file is memory-mapped, so only the pages holding (and preceding, on the first
+    visit) the requested lines are touched. Raises UnicodeDecodeError for non-UTF-8 text.
+    """
+    with path.open("rb") as handle:
+        stat = os.fstat(handle.fileno())
+        if stat.st_size == 0:
+            return LineRange([], offset, None, False)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index = _line_index(path, stat)
+            position = index.line_start(data, offset)
+            if position is None:
+                return LineRange([], offset, None, False)
+            return _collect_lines(data, position, offset, limit, max_bytes)
+
+
+def read_byte_range(path: Path, offset: int, length: int) -> ByteRange:
+    """Read `length` bytes from `offset`, widened or narrowed to UTF-8 character bounds."""
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if offset >= size:
+            return ByteRange("", size, size)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = _char_boundary(data, offset, size)
+            end = _char_boundary(data, min(size, offset + length), size)
+            if end == start:
+                # The range ends inside the first character; return that character whole.
+                end = _next_char_boundary(data, start, size)
+            return ByteRange(data[start:end].decode("utf-8"), start, end)
+
+
+def _collect_lines(
+    data: mmap.mmap, position: int, offset: int, limit: int | None, max_bytes: int
+) -> LineRange:
+    size = len(data)
+    lines: list[str] = []
+    used = 0
+    while position < size and (limit is None or len(lines) < limit):
+        newline = data.find(b"\n", position)
+        end = size if newline == -1 else newline
+        if used + end - position > max_bytes:
+            if not lines:
+                # A single oversized line is cut at the cap instead of returned whole.
+                cut = _char_boundary(data, position + max_bytes, size)
+                if cut == position:
+                    cut = _next_char_boundary(data, position, size)
+                lines.append(data[position:cut].decode("utf-8").rstrip("\r"))
+            return LineRange(lines, offset, offset + len(lines), True)
+        lines.append(data[position:end].decode("utf-8").rstrip("\r"))
+        used += end - position + 1
+        position = end + 1
+    next_line = offset + len(lines) if position < size else None
+    return LineRange(lines, offset, next_line, next_line is not None)
+
+
+def _char_boundary(data: mmap.mmap, position: int, size: int) -> int:
+    # Step back over UTF-8 continuation bytes (0b10xxxxxx) to the start of a character.
+    while 0 < position < size and data[position] & 0xC0 == 0x80:
+        position -= 1
+    return position
+
+
+def _next_char_boundary(data: mmap.mmap, position: int, size: int) -> int:
+    # Start of the character after the one at `position`.
+    position += 1
+    while position < size and data[position] & 0xC0 == 0x80:
+        position += 1
+    return min(position, size)
+
+
+_INDEXES: OrderedDict[tuple[str, int, int, int], LineIndex] = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+
+
+def _line_index(path: Path, stat: os.stat_result) -> LineIndex:
+    key = (str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = LineIndex(stat.st_size)
+            _INDEXES[key] = index
+            if len(_INDEXES) > _MAX_CACHED_INDEXES:
+                _INDEXES.popitem(last=False)
+        else:
+            _INDEXES.move_to_end(key)
+        return index
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
 from typing import Any, Mapping
 
 from py_agent_runtime.runtime.config import RuntimeConfig
-from py_agent_runtime.tools.base import BaseTool, ToolResult
+from py_agent_runtime.tools.base import BaseTool, ToolDisplay, ToolResult
 from py_agent_runtime.tools.path_utils import resolve_path_under_target
+from py_agent_runtime.tools.workspace_walker import iter_workspace_files
+
+
+DEFAULT_MAX_RESULTS = 500
 
 
 class GlobSearchTool(BaseTool):
@@ -15,6 +23,10 @@ class GlobSearchTool(BaseTool):
         "properties": {
             "pattern": {"type": "string"},
             "path": {"type": "string", "default": "."},
+            "respect_ignore": {"type": "boolean", "default": True},
+            "max_results": {"type": "integer", "minimum": 1, "default": DEFAULT_MAX_RESULTS},
+            "offset": {"type": "integer", "minimum": 0, "default": 0},
+            "sort": {"type": "string", "enum": ["path", "mtime"], "default": "path"},
         },
         "required": ["pattern"],
         "additionalProperties": False,
@@ -27,6 +39,16 @@ class GlobSearchTool(BaseTool):
         path = params.get("path", ".")
         if not isinstance(path, str) or not path.strip():
             return "`path` must be a non-empty string."
+        if not isinstance(params.get("respect_ignore", True), bool):
+            return "`respect_ignore` must be a boolean."
+        max_results = params.get("max_results", DEFAULT_MAX_RESULTS)
+        if not isinstance(max_results, int) or max_results <= 0:
+            return "`max_results` must be a positive integer."
+        offset = params.get("offset", 0)
+        if not isinstance(offset, int) or offset < 0:
+            return "`offset` must be a non-negative integer."
+        if params.get("sort", "path") not in {"path", "mtime"}:
+            return "`sort` must be one of: path, mtime."
         return None
 
     def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
@@ -36,6 +58,10 @@ class GlobSearchTool(BaseTool):
 
         pattern = str(params["pattern"])
         base_path = str(params.get("path", "."))
+        respect_ignore = bool(params.get("respect_ignore", True))
+        max_results = int(params.get("max_results", DEFAULT_MAX_RESULTS))
+        offset = int(params.get("offset", 0))
+        sort = str(params.get("sort", "path"))
         resolved_base, path_error = resolve_path_under_target(config.target_dir, base_path)
         if path_error or resolved_base is None:
             error = path_error or "Invalid base path."
@@ -45,18 +71,65 @@ class GlobSearchTool(BaseTool):
             error = f"Directory does not exist: {base_path}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
-        matches: list[str] = []
-        for item in sorted(resolved_base.glob(pattern)):
-            if not item.exists():
-                continue
-            try:
-                rel = item.resolve(strict=False).relative_to(config.target_dir.resolve(strict=False))
-            except ValueError:
-                continue
-            matches.append(rel.as_posix())
+        target = config.target_dir.resolve(strict=False)
+        try:
+            walked = iter_workspace_files(
+                resolved_base,
+                pattern,
+                root=target,
+                respect_ignore=respect_ignore,
+                include_dirs=True,
+            )
+        except ValueError as exc:
+            error = f"Invalid pattern: {exc}"
+            return ToolResult(llm_content=error, return_display="Error", error=error)
+
+        # The walk starts at a resolved base under the target and never follows symlinked
+        # directories, so every yielded path is already relative to the target lexically.
+        relative = (path.relative_to(target).as_posix() for path in walked)
+        if sort == "mtime":
+            ordered = _newest_first(target, relative, offset + max_results + 1)
+        else:
+            ordered = relative
+        # One extra match tells whether another page exists without walking any further.
+        page = list(islice(ordered, offset, offset + max_results + 1))
+        truncated = len(page) > max_results
+        matches = page[:max_results]
 
-        lines = "\n".join(f"- {path}" for path in matches) if matches else "(no matches)"
         return ToolResult(
-            llm_content=f"Glob matches for pattern `{pattern}`:\n{lines}",
-            return_display={"base_path": str(resolved_base), "pattern": pattern, "matches": matches},
+            return_display={
+                "base_path": str(resolved_base),
+                "pattern": pattern,
+                "matches": matches,
+                "offset": offset,
+                "max_results": max_results,
+                "sort": sort,
+                "truncated": truncated,
+                "next_offset": offset + len(matches) if truncated else None,
+            },
+            render_llm_content=_render_glob_results,
         )
+
+
+def _newest_first(target: Path, relative: Iterable[str], limit: int) -> Iterator[str]:
+    """The `limit` most recently modified matches; only that many are held in memory."""
+
+    def _keyed() -> Iterator[tuple[int, str]]:
+        for rel in relative:
+            try:
+                mtime_ns = (target / rel).stat().st_mtime_ns
+            except OSError:
+                continue
+            yield -mtime_ns, rel
+
+    return (rel for _, rel in heapq.nsmallest(limit, _keyed()))
+
+
+def _render_glob_results(display: ToolDisplay) -> str:
+    assert isinstance(display, dict)
+    matches = display["matches"]
+    lines = "\n".join(f"- {path}" for path in matches) if matches else "(no matches)"
+    text = f"Glob matches for pattern `{display['pattern']}`:\n{lines}"
+    if display.get("truncated"):
+        text += f"\n(more matches available; call again with offset={display['next_offset']})"
+    return text
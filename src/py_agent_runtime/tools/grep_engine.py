@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from py_agent_runtime.tools.workspace_walker import BINARY_SNIFF_BYTES, is_binary_block
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from py_agent_runtime.runtime.file_cache import FileContentCache
+
+LineHit = tuple[int, str]
+
+DEFAULT_GREP_WORKERS = min(8, os.cpu_count() or 4)
+# Files larger than this (or than the cache's entry cap) are searched line by line
+# instead of being decoded into one string.
+STREAM_SEARCH_MIN_BYTES = 4 * 1024 * 1024
+# Line separators `str.splitlines` honours beyond "\n"; such files use the per-line path.
+_EXTRA_LINE_BREAKS = re.compile("[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# Constructs whose result can depend on text outside the current line.
+_LINE_SENSITIVE_SYNTAX = ("(?=", "(?!", "(?<=", "(?<!", "\\A", "\\Z")
+
+
+class LinePattern:
+    """A query compiled for whole-buffer scanning with per-line match semantics."""
+
+    def __init__(self, pattern: re.Pattern[str]) -> None:
+        self.line_pattern = pattern
+        self.buffer_pattern: re.Pattern[str] | None = None
+        if not any(token in pattern.pattern for token in _LINE_SENSITIVE_SYNTAX):
+            self.buffer_pattern = re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+
+
+def search_text(text: str, pattern: LinePattern, max_matches: int) -> list[LineHit]:
+    if pattern.buffer_pattern is None or _EXTRA_LINE_BREAKS.search(text):
+        return _search_lines(text, pattern.line_pattern, max_matches)
+
+    hits: list[LineHit] = []
+    if not text:
+        return hits
+    buffer_search = pattern.buffer_pattern.search
+    line_search = pattern.line_pattern.search
+    text_length = len(text)
+    # `splitlines` yields no empty line after a trailing newline, so neither do we.
+    search_end = text_length - 1 if text.endswith("\n") else text_length
+    line_number = 1
+    counted_to = 0
+    position = 0
+    while position <= search_end and len(hits) < max_matches:
+        match = buffer_search(text, position, search_end)
+        if match is None:
+            break
+        start = match.start()
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", start)
+        if line_end == -1:
+            line_end = text_length
+        line_number += text.count("\n", counted_to, line_start)
+        counted_to = line_start
+        line = text[line_start:line_end]
+        if line_search(line) is not None:
+            hits.append((line_number, line))
+        position = line_end + 1
+    return hits
+
+
+def search_file(
+    path: Path,
+    pattern: LinePattern,
+    max_matches: int,
+    cache: FileContentCache | None = None,
+) -> list[LineHit]:
+    try:
+        if cache is not None and os.stat(path).st_size <= cache.max_entry_bytes:
+            text = cache.load(path).text
+            return [] if text is None else search_text(text, pattern, max_matches)
+        with path.open("rb") as handle:
+            head = handle.read(BINARY_SNIFF_BYTES)
+            if is_binary_block(head):
+                return []
+            stream_min = cache.max_entry_bytes if cache is not None else STREAM_SEARCH_MIN_BYTES
+            if os.fstat(handle.fileno()).st_size > stream_min:
+                handle.seek(0)
+                return _search_stream(handle, pattern.line_pattern, max_matches)
+            text = (head + handle.read()).decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return search_text(text, pattern, max_matches)
+
+
+def search_files(
+    paths: Iterable[Path],
+    pattern: LinePattern,
+    max_results: int,
+    *,
+    workers: int = DEFAULT_GREP_WORKERS,
+    cache: FileContentCache | None = None,
+) -> Iterator[tuple[Path, list[LineHit]]]:
+    """Search files on a thread pool, yielding hits in input order until `max_results`.
+
+    Only a bounded window of files is in flight, so the walk producing `paths` stops
+    shortly after the result limit is reached.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    remaining = max_results
+    window = max(1, workers) * 4
+    path_iter = iter(paths)
+    pending: deque[tuple[Path, Future[list[LineHit]]]] = deque()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="grep")
+    try:
+        while True:
+            while len(pending) < window:
+                path = next(path_iter, None)
+                if path is None:
+                    break
+                pending.append((path, pool.submit(search_file, path, pattern, remaining, cache)))
+            if not pending:
+                return
+            path, future = pending.popleft()
+            hits = future.result()
+            if not hits:
+                continue
+            hits = hits[:remaining]
+            remaining -= len(hits)
+            yield path, hits
+            if remaining <= 0:
+                return
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _search_stream(handle: BinaryIO, pattern: re.Pattern[str], max_matches: int) -> list[LineHit]:
+    """Per-line search that holds one line at a time; numbering matches `str.splitlines`."""
+    hits: list[LineHit] = []
+    line_number = 0
+    # Universal newlines turn CRLF and CR into LF, as the whole-buffer path does.
+    for chunk in io.TextIOWrapper(handle, encoding="utf-8", newline=None):
+        ends_line = chunk.endswith("\n")
+        lines = _EXTRA_LINE_BREAKS.split(chunk[:-1] if ends_line else chunk)
+        if not ends_line and len(lines) > 1 and not lines[-1]:
+            lines.pop()  # `splitlines` yields no empty line after a trailing break
+        for line in lines:
+            line_number += 1
+            if pattern.search(line) is None:
+                continue
+            hits.append((line_number, line))
+            if len(hits) >= max_matches:
+                return hits
+    return hits
+
+
+def _search_lines(text: str, pattern: re.Pattern[str], max_matches: int) -> list[LineHit]:
+    hits: list[LineHit] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if pattern.search(line) is None:
+            continue
+        hits.append((line_number, line))
+        if len(hits) >= max_matches:
+            break
+    return hits
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import re
+from pathlib import Path
 from typing import Any, Mapping
 
 from py_agent_runtime.runtime.config import RuntimeConfig
-from py_agent_runtime.tools.base import BaseTool, ToolResult
+from py_agent_runtime.tools.base import BaseTool, ToolDisplay, ToolResult
+from py_agent_runtime.tools.grep_engine import LinePattern, search_files
 from py_agent_runtime.tools.path_utils import resolve_path_under_target
+from py_agent_runtime.tools.workspace_walker import (
+    ignore_stack_for,
+    iter_workspace_files,
+    select_workspace_files,
+)
 
 
 class GrepSearchTool(BaseTool):
@@ -20,6 +27,7 @@ class GrepSearchTool(BaseTool):
             "max_results": {"type": "integer", "minimum": 1, "default": 100},
             "case_sensitive": {"type": "boolean", "default": False},
             "use_regex": {"type": "boolean", "default": False},
+            "respect_ignore": {"type": "boolean", "default": True},
         },
         "required": ["query"],
         "additionalProperties": False,
@@ -38,6 +46,8 @@ class GrepSearchTool(BaseTool):
         max_results = params.get("max_results", 100)
         if not isinstance(max_results, int) or max_results <= 0:
             return "`max_results` must be a positive integer."
+        if not isinstance(params.get("respect_ignore", True), bool):
+            return "`respect_ignore` must be a boolean."
         return None
 
     def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
@@ -51,6 +61,7 @@ class GrepSearchTool(BaseTool):
         max_results = int(params.get("max_results", 100))
         case_sensitive = bool(params.get("case_sensitive", False))
         use_regex = bool(params.get("use_regex", False))
+        respect_ignore = bool(params.get("respect_ignore", True))
 
         resolved_base, path_error = resolve_path_under_target(config.target_dir, base_path)
         if path_error or resolved_base is None:
@@ -68,48 +79,85 @@ class GrepSearchTool(BaseTool):
             error = f"Invalid regex query: {exc}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
-        matches: list[dict[str, Any]] = []
-        for path in sorted(resolved_base.glob(file_pattern)):
-            if len(matches) >= max_results:
-                break
-            if not path.is_file():
-                continue
-
-            resolved_file = path.resolve(strict=False)
-            try:
-                rel = resolved_file.relative_to(config.target_dir.resolve(strict=False))
-            except ValueError:
-                continue
-
-            try:
-                text = resolved_file.read_text(encoding="utf-8")
-            except Exception:
-                continue
-
-            for line_no, line in enumerate(text.splitlines(), start=1):
-                if pattern.search(line) is None:
-                    continue
-                matches.append(
-                    {
-                        "file_path": rel.as_posix(),
-                        "line_number": line_no,
-                        "line": line,
-                    }
+        target = config.target_dir.resolve(strict=False)
+        indexed = None
+        if respect_ignore and config.grep_index:
+            indexed = _indexed_candidates(target, resolved_base, query, case_sensitive, use_regex)
+        try:
+            if indexed is None:
+                walked = iter_workspace_files(
+                    resolved_base, file_pattern, root=target, respect_ignore=respect_ignore
                 )
-                if len(matches) >= max_results:
-                    break
-
-        lines = [
-            f"- {item['file_path']}:{item['line_number']}: {item['line']}"
-            for item in matches
-        ]
-        text = "\n".join(lines) if lines else "(no matches)"
+            else:
+                walked = select_workspace_files(indexed, resolved_base, file_pattern)
+        except ValueError as exc:
+            error = f"Invalid file_pattern: {exc}"
+            return ToolResult(llm_content=error, return_display="Error", error=error)
+
+        candidates = (path for path in walked if _relative_to_target(path, target) is not None)
+        matches: list[dict[str, Any]] = []
+        for path, hits in search_files(
+            candidates, LinePattern(pattern), max_results, cache=config.file_cache
+        ):
+            rel = _relative_to_target(path, target)
+            assert rel is not None
+            matches.extend(
+                {"file_path": rel, "line_number": line_no, "line": line} for line_no, line in hits
+            )
+
         return ToolResult(
-            llm_content=f"Search results for `{query}`:\n{text}",
             return_display={
                 "query": query,
                 "path": str(resolved_base),
                 "matches": matches,
                 "max_results": max_results,
             },
+            render_llm_content=_render_grep_results,
         )
+
+
+def _indexed_candidates(
+    target: Path, base: Path, query: str, case_sensitive: bool, use_regex: bool
+) -> list[Path] | None:
+    import sqlite3
+
+    from py_agent_runtime.tools.trigram_index import get_shared_trigram_index, required_trigrams
+
+    trigrams = required_trigrams(query, use_regex=use_regex, case_sensitive=case_sensitive)
+    if trigrams is None:
+        return None
+    if base != target and ignore_stack_for(target, base)[1]:
+        # The index mirrors a walk from the target, which never enters an ignored base.
+        return None
+    try:
+        return get_shared_trigram_index(target).candidates(trigrams)
+    except (OSError, sqlite3.Error):
+        # The index is an accelerator only; fall back to a full scan if it is unusable.
+        return None
+
+
+def _relative_to_target(path: Path, target: Path) -> str | None:
+    """Relative path to report for `path`, or None if it resolves outside `target`.
+
+    Symlinks are resolved before anything is read, so a link out of the target is
+    skipped; files that pass are reported by their path as walked.
+    """
+    resolved = path.resolve(strict=False)
+    try:
+        resolved_rel = resolved.relative_to(target)
+    except ValueError:
+        return None
+    try:
+        return path.relative_to(target).as_posix()
+    except ValueError:
+        return resolved_rel.as_posix()
+
+
+def _render_grep_results(display: ToolDisplay) -> str:
+    assert isinstance(display, dict)
+    lines = [
+        f"- {item['file_path']}:{item['line_number']}: {item['line']}"
+        for item in display["matches"]
+    ]
+    text = "\n".join(lines) if lines else "(no matches)"
+    return f"Search results for `{display['query']}`:\n{text}"
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any, Mapping
 
 from py_agent_runtime.runtime.config import RuntimeConfig
 from py_agent_runtime.tools.base import BaseTool, ToolResult
 from py_agent_runtime.tools.path_utils import resolve_path_under_target
+from py_agent_runtime.tools.workspace_walker import ignore_stack_for
 
 
 class ListDirectoryTool(BaseTool):
@@ -14,6 +16,7 @@ class ListDirectoryTool(BaseTool):
         "type": "object",
         "properties": {
             "path": {"type": "string", "default": "."},
+            "respect_ignore": {"type": "boolean", "default": True},
         },
         "required": [],
         "additionalProperties": False,
@@ -23,6 +26,8 @@ class ListDirectoryTool(BaseTool):
         path = params.get("path", ".")
         if not isinstance(path, str) or not path.strip():
             return "`path` must be a non-empty string."
+        if not isinstance(params.get("respect_ignore", True), bool):
+            return "`respect_ignore` must be a boolean."
         return None
 
     def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
@@ -40,8 +45,11 @@ class ListDirectoryTool(BaseTool):
             error = f"Directory does not exist: {path}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
+        children = sorted(resolved.iterdir(), key=lambda item: item.name.lower())
+        if params.get("respect_ignore", True):
+            children = _unignored(config.target_dir, resolved, children)
         entries = []
-        for child in sorted(resolved.iterdir(), key=lambda item: item.name.lower()):
+        for child in children:
             entries.append(
                 {
                     "name": child.name,
@@ -57,3 +65,12 @@ class ListDirectoryTool(BaseTool):
             llm_content=content,
             return_display={"path": str(resolved), "entries": entries},
         )
+
+
+def _unignored(target: Path, directory: Path, children: list[Path]) -> list[Path]:
+    stack, _ = ignore_stack_for(target, directory)
+    parts = directory.relative_to(target).parts
+    stack = stack.enter(directory, parts, (child.name for child in children))
+    return [
+        child for child in children if not stack.is_ignored((*parts, child.name), child.is_dir())
+    ]
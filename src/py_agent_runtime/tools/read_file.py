@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any, Mapping
 
 from py_agent_runtime.runtime.config import RuntimeConfig
-from py_agent_runtime.tools.base import BaseTool, ToolResult
+from py_agent_runtime.tools.base import BaseTool, ToolDisplay, ToolResult
+from py_agent_runtime.tools.file_ranges import read_byte_range, read_line_range
 from py_agent_runtime.tools.path_utils import resolve_path_under_target
+from py_agent_runtime.tools.workspace_walker import BINARY_SNIFF_BYTES, is_binary_block
+
+
+# Files above this size (and every ranged read) are served in pages of at most this many bytes.
+MAX_READ_BYTES = 256 * 1024
 
 
 class ReadFileTool(BaseTool):
@@ -14,6 +21,15 @@ class ReadFileTool(BaseTool):
         "type": "object",
         "properties": {
             "file_path": {"type": "string", "description": "Relative path to file."},
+            "offset": {"type": "integer", "minimum": 0, "description": "First line (0-based)."},
+            "limit": {"type": "integer", "minimum": 1, "description": "Number of lines."},
+            "byte_offset": {"type": "integer", "minimum": 0, "description": "First byte."},
+            "byte_length": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": MAX_READ_BYTES,
+                "description": "Number of bytes.",
+            },
         },
         "required": ["file_path"],
         "additionalProperties": False,
@@ -23,6 +39,17 @@ class ReadFileTool(BaseTool):
         file_path = params.get("file_path")
         if not isinstance(file_path, str) or not file_path.strip():
             return "`file_path` must be a non-empty string."
+        minimums = {"offset": 0, "limit": 1, "byte_offset": 0, "byte_length": 1}
+        for name, minimum in minimums.items():
+            value = params.get(name, minimum)
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                qualifier = "non-negative" if minimum == 0 else "positive"
+                return f"`{name}` must be a {qualifier} integer."
+        if int(params.get("byte_length", 1)) > MAX_READ_BYTES:
+            return f"`byte_length` must be at most {MAX_READ_BYTES}."
+        line_range = "offset" in params or "limit" in params
+        if line_range and ("byte_offset" in params or "byte_length" in params):
+            return "Use either `offset`/`limit` or `byte_offset`/`byte_length`, not both."
         return None
 
     def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
@@ -40,13 +67,77 @@ class ReadFileTool(BaseTool):
             error = f"File does not exist: {file_path}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
+        ranged = any(name in params for name in ("offset", "limit", "byte_offset", "byte_length"))
         try:
-            content = resolved.read_text(encoding="utf-8")
+            size = resolved.stat().st_size
+            if not ranged and size <= MAX_READ_BYTES:
+                cached = config.file_cache.load(resolved)
+                if cached.text is not None:
+                    return ToolResult(
+                        return_display={"file_path": str(resolved), "content": cached.text},
+                        render_llm_content=_render_read_file,
+                    )
+                binary = cached.binary
+                if not binary:
+                    error = f"Failed to read file: {file_path} is not valid UTF-8."
+                    return ToolResult(llm_content=error, return_display="Error", error=error)
+            else:
+                with resolved.open("rb") as handle:
+                    binary = is_binary_block(handle.read(BINARY_SNIFF_BYTES))
+            if binary:
+                error = f"Cannot read binary file: {file_path}"
+                return ToolResult(llm_content=error, return_display="Error", error=error)
+            if "byte_offset" in params or "byte_length" in params:
+                display = _read_bytes(resolved, params, size)
+            else:
+                display = _read_lines(resolved, params)
         except Exception as exc:  # pragma: no cover
             error = f"Failed to read file: {exc}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
-        return ToolResult(
-            llm_content=content,
-            return_display={"file_path": str(resolved), "content": content},
-        )
+        display["file_size"] = size
+        return ToolResult(return_display=display, render_llm_content=_render_read_file)
+
+
+def _read_lines(path: Path, params: Mapping[str, Any]) -> dict[str, Any]:
+    offset = int(params.get("offset", 0))
+    limit = params.get("limit")
+    page = read_line_range(path, offset, None if limit is None else int(limit), MAX_READ_BYTES)
+    return {
+        "file_path": str(path),
+        "content": "\n".join(page.lines),
+        "start_line": offset + 1,
+        "end_line": offset + len(page.lines),
+        "truncated": page.truncated,
+        "next_offset": page.next_line,
+    }
+
+
+def _read_bytes(path: Path, params: Mapping[str, Any], size: int) -> dict[str, Any]:
+    offset = int(params.get("byte_offset", 0))
+    length = int(params.get("byte_length", MAX_READ_BYTES))
+    chunk = read_byte_range(path, offset, length)
+    return {
+        "file_path": str(path),
+        "content": chunk.text,
+        "byte_offset": chunk.start,
+        "byte_end": chunk.end,
+        "truncated": chunk.end < size,
+        "next_byte_offset": chunk.end,
+    }
+
+
+def _render_read_file(display: ToolDisplay) -> str:
+    assert isinstance(display, dict)
+    content = str(display["content"])
+    if "byte_offset" in display:
+        notice = f"[Bytes {display['byte_offset']}-{display['byte_end']} of {display['file_size']}"
+        if display["truncated"]:
+            notice += f"; continue with byte_offset={display['next_byte_offset']}"
+        return f"{notice}]\n{content}"
+    if "start_line" in display:
+        notice = f"[Lines {display['start_line']}-{display['end_line']}"
+        if display["truncated"]:
+            notice += f"; more follows, continue with offset={display['next_offset']}"
+        return f"{notice}]\n{content}"
+    return content
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.base import BaseTool, ToolResult
+
+MAX_READ_TOOL_OUTPUT_CHARS = 16_000
+
+
+class ReadToolOutputTool(BaseTool):
+    name = "read_tool_output"
+    description = "Page through the full text of a tool output that was truncated in history."
+    parameters_json_schema = {
+        "type": "object",
+        "properties": {
+            "handle": {"type": "string", "description": "Handle from a truncated tool output."},
+            "offset": {"type": "integer", "minimum": 0, "description": "Start character."},
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": MAX_READ_TOOL_OUTPUT_CHARS,
+                "description": "Number of characters to return.",
+            },
+        },
+        "required": ["handle"],
+        "additionalProperties": False,
+    }
+
+    def validate_params(self, params: Mapping[str, Any]) -> str | None:
+        handle = params.get("handle")
+        if not isinstance(handle, str) or not handle.strip():
+            return "`handle` must be a non-empty string."
+        offset = params.get("offset", 0)
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            return "`offset` must be a non-negative integer."
+        limit = params.get("limit", MAX_READ_TOOL_OUTPUT_CHARS)
+        if (
+            not isinstance(limit, int)
+            or isinstance(limit, bool)
+            or not 1 <= limit <= MAX_READ_TOOL_OUTPUT_CHARS
+        ):
+            return f"`limit` must be an integer between 1 and {MAX_READ_TOOL_OUTPUT_CHARS}."
+        return None
+
+    def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
+        validation_error = self.validate_params(params)
+        if validation_error:
+            return ToolResult(llm_content=validation_error, return_display="Error", error=validation_error)
+
+        handle = str(params["handle"]).strip()
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", MAX_READ_TOOL_OUTPUT_CHARS))
+        try:
+            text, total_chars = config.tool_output_store.read(handle, offset=offset, limit=limit)
+        except KeyError as exc:
+            error = str(exc.args[0]) if exc.args else "Unknown tool output handle."
+            return ToolResult(llm_content=error, return_display="Error", error=error)
+
+        next_offset = offset + len(text)
+        return ToolResult(
+            llm_content=text,
+            return_display={
+                "handle": handle,
+                "offset": offset,
+                "next_offset": next_offset if next_offset < total_chars else None,
+                "total_chars": total_chars,
+                "content": text,
+            },
+        )
@@ -8,12 +8,19 @@ from py_agent_runtime.tools.base import BaseTool
 class ToolRegistry:
     def __init__(self) -> None:
         self._tools: dict[str, BaseTool] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def register_tool(self, tool: BaseTool) -> None:
         self._tools[tool.name] = tool
+        self._version += 1
 
     def unregister_tool(self, name: str) -> None:
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._version += 1
 
     def get_tool(self, name: str) -> BaseTool | None:
         return self._tools.get(name)
@@ -57,10 +57,13 @@ class ReplaceTool(BaseTool):
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
         try:
-            content = resolved.read_text(encoding="utf-8")
+            content = config.file_cache.load(resolved).text
         except Exception as exc:  # pragma: no cover
             error = f"Failed to read file: {exc}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
+        if content is None:
+            error = f"Failed to read file: {file_path} is not UTF-8 text."
+            return ToolResult(llm_content=error, return_display="Error", error=error)
 
         if old_text not in content:
             error = f"Target text not found in file: {file_path}"
@@ -74,10 +77,12 @@ class ReplaceTool(BaseTool):
             replaced_count = 1
 
         try:
-            resolved.write_text(updated, encoding="utf-8")
+            config.file_writer.write_text(resolved, updated)
         except Exception as exc:  # pragma: no cover
             error = f"Failed to write file: {exc}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
+        finally:
+            config.file_cache.invalidate(resolved)
 
         return ToolResult(
             llm_content=f"Updated file: {resolved}",
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-import subprocess
+import codecs
+import time
 from typing import Any, Mapping
 
+from py_agent_runtime.bus.message_bus import MessageBus
+from py_agent_runtime.bus.types import MessageBusType
 from py_agent_runtime.runtime.config import RuntimeConfig
-from py_agent_runtime.tools.base import BaseTool, ToolResult
+from py_agent_runtime.tools.base import BaseTool, ToolResult, current_tool_call_id
 from py_agent_runtime.tools.path_utils import resolve_path_under_target
+from py_agent_runtime.tools.shell_output import run_streaming
+
+# Output events are batched so chatty commands do not publish one event per line.
+_PUBLISH_INTERVAL_SECONDS = 0.1
 
 
 class RunShellCommandTool(BaseTool):
@@ -50,30 +57,15 @@ class RunShellCommandTool(BaseTool):
             error = cwd_error or "Invalid working directory."
             return ToolResult(llm_content=error, return_display="Error", error=error)
 
+        publisher = _OutputPublisher(config.message_bus, command)
         try:
-            completed = subprocess.run(
+            run = run_streaming(
                 command,
-                cwd=str(cwd),
-                shell=True,
-                text=True,
-                capture_output=True,
-                timeout=timeout_seconds,
-            )
-        except subprocess.TimeoutExpired as exc:
-            stdout = exc.stdout if isinstance(exc.stdout, str) else ""
-            stderr = exc.stderr if isinstance(exc.stderr, str) else ""
-            error = f"Command timed out after {timeout_seconds} second(s)."
-            return ToolResult(
-                llm_content=error,
-                return_display={
-                    "command": command,
-                    "cwd": str(cwd),
-                    "timed_out": True,
-                    "stdout": stdout,
-                    "stderr": stderr,
-                    "exit_code": None,
-                },
-                error=error,
+                cwd,
+                timeout_seconds,
+                config.shell_output_max_bytes,
+                publisher,
+                config.shell_limits,
             )
         except Exception as exc:  # pragma: no cover
             error = f"Failed to run command: {exc}"
@@ -82,16 +74,61 @@ class RunShellCommandTool(BaseTool):
         payload = {
             "command": command,
             "cwd": str(cwd),
-            "timed_out": False,
-            "stdout": completed.stdout,
-            "stderr": completed.stderr,
-            "exit_code": completed.returncode,
+            "timed_out": run.timed_out,
+            "stdout": run.stdout.text(),
+            "stderr": run.stderr.text(),
+            "exit_code": run.exit_code,
+            "stdout_bytes": run.stdout.total,
+            "stderr_bytes": run.stderr.total,
+            "output_truncated": bool(run.stdout.omitted or run.stderr.omitted),
+            "cpu_seconds": round(run.cpu_seconds, 3),
+            "peak_rss_bytes": run.peak_rss_bytes,
         }
-        if completed.returncode != 0:
-            error = f"Command failed with exit code {completed.returncode}."
+        if run.timed_out:
+            error = f"Command timed out after {timeout_seconds} second(s)."
+            return ToolResult(llm_content=error, return_display=payload, error=error)
+        if run.exit_code != 0:
+            error = f"Command failed with exit code {run.exit_code}."
             return ToolResult(llm_content=error, return_display=payload, error=error)
 
         return ToolResult(
-            llm_content=f"Command completed successfully (exit code {completed.returncode}).",
+            llm_content=f"Command completed successfully (exit code {run.exit_code}).",
             return_display=payload,
         )
+
+
+class _OutputPublisher:
+    """Publishes output chunks as TOOL_OUTPUT_UPDATE events, coalesced per interval."""
+
+    def __init__(self, bus: MessageBus, command: str) -> None:
+        self._bus = bus
+        self._command = command
+        self._call_id = current_tool_call_id.get()
+        self._decoders = {
+            stream: codecs.getincrementaldecoder("utf-8")("replace")
+            for stream in ("stdout", "stderr")
+        }
+        self._pending: dict[str, list[str]] = {"stdout": [], "stderr": []}
+        self._last_publish = time.monotonic()
+
+    def on_output(self, stream: str, data: bytes) -> None:
+        self._pending[stream].append(self._decoders[stream].decode(data))
+        if time.monotonic() - self._last_publish >= _PUBLISH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_publish = time.monotonic()
+        for stream, chunks in self._pending.items():
+            text = "".join(chunks)
+            chunks.clear()
+            if text:
+                self._bus.publish(
+                    MessageBusType.TOOL_OUTPUT_UPDATE,
+                    {
+                        "call_id": self._call_id,
+                        "tool_name": RunShellCommandTool.name,
+                        "command": self._command,
+                        "stream": stream,
+                        "text": text,
+                    },
+                )
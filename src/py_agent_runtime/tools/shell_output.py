@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import codecs
+import os
+import selectors
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import resource
+
+_READ_CHUNK_BYTES = 64 * 1024
+# While a command is quiet, sinks are flushed this often so buffered output still shows up.
+_IDLE_FLUSH_SECONDS = 0.1
+# After SIGTERM, the process group gets this long to exit before it is sent SIGKILL.
+_KILL_GRACE_SECONDS = 1.0
+_REAP_POLL_MAX_SECONDS = 0.05
+# ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+# Process groups, rlimits and wait4 are POSIX-only; elsewhere commands run via subprocess.run.
+_POSIX_PROCESSES = os.name == "posix" and hasattr(os, "wait4") and hasattr(os, "killpg")
+
+
+class OutputSink(Protocol):
+    def on_output(self, stream: str, data: bytes) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class HeadTailBuffer:
+    """Keeps the first and last bytes of a stream, `max_bytes` in total.
+
+    Half the budget holds the head and the rest is a sliding tail, so memory stays
+    bounded however much a command prints; `omitted` counts the bytes dropped between.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self._head_limit = max_bytes // 2
+        self._tail_limit = max_bytes - self._head_limit
+        self._head = bytearray()
+        self._tail = bytearray()
+        self.total = 0
+
+    @property
+    def omitted(self) -> int:
+        return self.total - len(self._head) - len(self._tail)
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self._tail_limit:
+            self._tail += data
+            excess = len(self._tail) - self._tail_limit
+            if excess > 0:
+                del self._tail[:excess]  # Front deletion is amortized O(1) for bytearray.
+
+    def text(self) -> str:
+        """Decoded output with newlines normalized, marking any omitted middle section."""
+        if not self.omitted:
+            return _normalize_newlines(bytes(self._head + self._tail).decode("utf-8", "replace"))
+        # Drop the partial characters at the cut instead of rendering replacement marks.
+        head = codecs.getincrementaldecoder("utf-8")("replace").decode(bytes(self._head))
+        tail = bytes(self._tail)
+        skip = 0
+        while skip < min(3, len(tail)) and tail[skip] & 0xC0 == 0x80:
+            skip += 1
+        marker = f"\n[... {self.omitted} bytes omitted ...]\n"
+        return _normalize_newlines(head + marker + tail[skip:].decode("utf-8", "replace"))
+
+
+@dataclass(frozen=True)
+class ShellResourceLimits:
+    """Optional rlimits applied to each shell command (and inherited by its children).
+
+    They are set by the shell's `ulimit` builtin before the command runs, so no
+    `preexec_fn` is needed and nothing the command starts escapes them. `max_processes` is
+    RLIMIT_NPROC, which the kernel counts per user, not per command.
+    """
+
+    cpu_seconds: int | None = None
+    address_space_bytes: int | None = None
+    max_processes: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("cpu_seconds", "address_space_bytes", "max_processes"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0")
+
+    def rlimits(self) -> list[tuple[int, tuple[int, int]]]:
+        """(resource, (soft, hard)) pairs to set, capped at the current hard limits."""
+        values = (self.cpu_seconds, self.address_space_bytes, self.max_processes)
+        if all(value is None for value in values):
+            return []
+        if not _POSIX_PROCESSES:
+            raise ValueError("Shell resource limits are only supported on POSIX platforms.")
+        import resource
+
+        requested = (
+            (resource.RLIMIT_CPU, self.cpu_seconds),
+            (resource.RLIMIT_AS, self.address_space_bytes),
+            (resource.RLIMIT_NPROC, self.max_processes),
+        )
+        limits: list[tuple[int, tuple[int, int]]] = []
+        for kind, value in requested:
+            if value is None:
+                continue
+            _, hard = resource.getrlimit(kind)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            limits.append((kind, (value, value)))
+        return limits
+
+
+@dataclass(frozen=True)
+class ShellRun:
+    stdout: HeadTailBuffer
+    stderr: HeadTailBuffer
+    exit_code: int | None
+    timed_out: bool
+    cpu_seconds: float
+    peak_rss_bytes: int
+
+
+def run_streaming(
+    command: str,
+    cwd: Path,
+    timeout_seconds: float,
+    max_bytes: int,
+    sink: OutputSink | None = None,
+    limits: ShellResourceLimits | None = None,
+) -> ShellRun:
+    """Run `command` through the shell, reading stdout/stderr as they are produced.
+
+    Both pipes are multiplexed with a selector, so neither can fill and stall the child.
+    Each chunk is kept in a `HeadTailBuffer` and passed to `sink.on_output`; the sink is
+    also flushed when the command goes quiet and when it finishes.
+
+    The shell leads a new session, so on timeout, or when the caller is interrupted,
+    the whole process group is terminated, not just `/bin/sh`. CPU time and peak RSS
+    cover the shell and every descendant it waited for.
+
+    Without POSIX process groups (Windows), the command runs to completion through
+    `subprocess.run` instead: output reaches `sink` at the end, a timeout kills only
+    the shell, and CPU time and peak RSS are reported as 0.
+    """
+    rlimits = limits.rlimits() if limits is not None else []
+    if not _POSIX_PROCESSES:
+        return _run_blocking(command, cwd, timeout_seconds, max_bytes, sink)
+    if rlimits:
+        command = f"{_ulimit_prefix(rlimits)}\n{command}"
+    process = subprocess.Popen(
+        command,
+        cwd=str(cwd),
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    buffers = {"stdout": HeadTailBuffer(max_bytes), "stderr": HeadTailBuffer(max_bytes)}
+    deadline = time.monotonic() + timeout_seconds
+    timed_out = False
+    try:
+        with selectors.DefaultSelector() as selector:
+            for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr)):
+                assert pipe is not None
+                os.set_blocking(pipe.fileno(), False)
+                selector.register(pipe, selectors.EVENT_READ, name)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                ready = selector.select(min(remaining, _IDLE_FLUSH_SECONDS))
+                if not ready and sink is not None:
+                    sink.flush()
+                for key, _ in ready:
+                    try:
+                        data = os.read(key.fd, _READ_CHUNK_BYTES)
+                    except BlockingIOError:
+                        continue
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    buffers[key.data].write(data)
+                    if sink is not None:
+                        sink.on_output(key.data, data)
+        usage = None if timed_out else _reap(process, deadline)
+        if usage is None:
+            timed_out = True
+            usage = _kill_group(process)
+            assert usage is not None
+    except BaseException:
+        _kill_group(process)
+        raise
+    finally:
+        for pipe in (process.stdout, process.stderr):
+            if pipe is not None:
+                pipe.close()
+    if sink is not None:
+        sink.flush()
+    return ShellRun(
+        stdout=buffers["stdout"],
+        stderr=buffers["stderr"],
+        exit_code=None if timed_out else process.returncode,
+        timed_out=timed_out,
+        cpu_seconds=usage.ru_utime + usage.ru_stime,
+        peak_rss_bytes=usage.ru_maxrss * _MAXRSS_UNIT,
+    )
+
+
+def _run_blocking(
+    command: str, cwd: Path, timeout_seconds: float, max_bytes: int, sink: OutputSink | None
+) -> ShellRun:
+    buffers = {"stdout": HeadTailBuffer(max_bytes), "stderr": HeadTailBuffer(max_bytes)}
+    exit_code: int | None = None
+    try:
+        completed = subprocess.run(
+            command, cwd=str(cwd), shell=True, capture_output=True, timeout=timeout_seconds
+        )
+        output = {"stdout": completed.stdout, "stderr": completed.stderr}
+        exit_code = completed.returncode
+    except subprocess.TimeoutExpired as exc:
+        output = {"stdout": exc.stdout or b"", "stderr": exc.stderr or b""}
+    for name, data in output.items():
+        buffers[name].write(data)
+        if sink is not None and data:
+            sink.on_output(name, data)
+    if sink is not None:
+        sink.flush()
+    return ShellRun(
+        stdout=buffers["stdout"],
+        stderr=buffers["stderr"],
+        exit_code=exit_code,
+        timed_out=exit_code is None,
+        cpu_seconds=0.0,
+        peak_rss_bytes=0,
+    )
+
+
+def _ulimit_prefix(rlimits: list[tuple[int, tuple[int, int]]]) -> str:
+    """Shell commands setting `rlimits` (soft and hard together), exiting 126 on failure."""
+    import resource
+
+    commands: list[str] = []
+    for kind, (value, _) in rlimits:
+        if kind == resource.RLIMIT_NPROC:
+            # bash and most shells spell it -u; dash uses -p.
+            commands.append(f"{{ ulimit -u {value} 2>/dev/null || ulimit -p {value}; }}")
+        elif kind == resource.RLIMIT_AS:
+            commands.append(f"ulimit -v {max(1, value // 1024)}")  # -v counts KiB
+        else:
+            commands.append(f"ulimit -t {value}")
+    return " && ".join(commands) + " || exit 126"
+
+
+def _reap(
+    process: subprocess.Popen[bytes], deadline: float | None
+) -> resource.struct_rusage | None:
+    """Wait for the shell with `wait4` to collect its rusage; None if `deadline` passes."""
+    delay = 0.001
+    while True:
+        pid, status, usage = os.wait4(process.pid, os.WNOHANG if deadline is not None else 0)
+        if pid:
+            # Popen did not reap the child itself, so record its status where it expects it.
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return usage
+        remaining = deadline - time.monotonic() if deadline is not None else 0.0
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _REAP_POLL_MAX_SECONDS)
+
+
+def _kill_group(process: subprocess.Popen[bytes]) -> resource.struct_rusage | None:
+    """SIGTERM the command's process group, SIGKILL whatever is left, and reap the shell.
+
+    Returns the shell's rusage, or None if it had already been reaped.
+    """
+    if process.returncode is not None:
+        _signal_group(process.pid, signal.SIGKILL)
+        return None
+    _signal_group(process.pid, signal.SIGTERM)
+    usage = _reap(process, time.monotonic() + _KILL_GRACE_SECONDS)
+    # Descendants that ignore SIGTERM stay in the group after the shell exits.
+    _signal_group(process.pid, signal.SIGKILL)
+    if usage is None:
+        usage = _reap(process, None)
+        assert usage is not None
+    return usage
+
+
+def _signal_group(pgid: int, signum: signal.Signals) -> None:
+    try:
+        os.killpg(pgid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _normalize_newlines(text: str) -> str:
+    # Matches what `subprocess.run(..., text=True)` returned before output was streamed.
+    if "\r" in text:
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from py_agent_runtime.tools.workspace_walker import (
+    BINARY_SNIFF_BYTES,
+    is_binary_block,
+    iter_workspace_files,
+)
+
+INDEX_SUBDIR = Path(".gemini") / "index"
+INDEX_FILENAME = "trigrams.sqlite3"
+# Larger files are never indexed; they stay candidates for every query.
+MAX_INDEXED_FILE_BYTES = 1 << 20
+# Files modified this close to a refresh may change again within the same mtime tick, so
+# they are re-read on the next refresh instead of trusted (git's "racily clean" entries).
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Bump when the on-disk layout or the trigram folding changes; older indexes are rebuilt.
+_SCHEMA_VERSION = 2
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS files ("
+    " id INTEGER PRIMARY KEY,"
+    " path TEXT NOT NULL UNIQUE,"
+    " mtime_ns INTEGER NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " indexed INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS postings ("
+    " trigram INTEGER NOT NULL,"
+    " file_id INTEGER NOT NULL,"
+    " PRIMARY KEY (trigram, file_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS postings_by_file ON postings (file_id)",
+)
+# Characters that end a line for grep_search; a line match never spans them.
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+# ASCII letters that also case-fold to non-ASCII characters (e.g. "K" and KELVIN SIGN).
+_UNSAFE_CASELESS = frozenset("iksIKS")
+_TRIGRAM_CHUNKS = re.compile(b".{3}", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class IndexUpdateStats:
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+@dataclass(frozen=True)
+class _IndexedFile:
+    file_id: int
+    mtime_ns: int
+    size: int
+
+
+class TrigramIndex:
+    """Persistent trigram index of the files under `root`, kept in SQLite.
+
+    The walk honours ignore files like grep_search does. Trigrams are taken over
+    ASCII-lowercased UTF-8 bytes. Binary and non-UTF-8 files carry no postings
+    (grep_search skips them anyway); files over `max_file_bytes` are tracked but
+    unindexed, so they stay candidates for every query. `refresh` re-reads only files
+    whose mtime or size changed since the last refresh.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        path: Path | None = None,
+        *,
+        max_file_bytes: int = MAX_INDEXED_FILE_BYTES,
+    ) -> None:
+        self.root = root.resolve(strict=False)
+        self.path = path or self.root / INDEX_SUBDIR / INDEX_FILENAME
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._files: dict[str, _IndexedFile] = {}
+        self._unindexed: set[str] = set()
+        self._data_version: int | None = None
+
+    def refresh(self) -> IndexUpdateStats:
+        with self._lock:
+            return self._refresh()
+
+    def candidates(self, trigrams: Iterable[int]) -> list[Path]:
+        """Refresh, then return files that may contain every trigram, in walk order."""
+        with self._lock:
+            self._refresh()
+            connection = self._connect()
+            ids: set[int] | None = None
+            for trigram in set(trigrams):
+                rows = connection.execute(
+                    "SELECT file_id FROM postings WHERE trigram = ?", (trigram,)
+                )
+                found = {row[0] for row in rows}
+                ids = found if ids is None else ids & found
+                if not ids:
+                    break
+            if ids is None:
+                matched = set(self._files)
+            else:
+                matched = {path for path, entry in self._files.items() if entry.file_id in ids}
+                matched |= self._unindexed
+        ordered = sorted(matched, key=lambda rel: rel.split("/"))
+        return [self.root.joinpath(*rel.split("/")) for rel in ordered]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._data_version = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            connection = self._open()
+        except sqlite3.DatabaseError:
+            # The index is only a cache: a corrupt file is discarded and rebuilt.
+            self.path.unlink(missing_ok=True)
+            connection = self._open()
+        self._connection = connection
+        return connection
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            with connection:
+                if version != _SCHEMA_VERSION:
+                    connection.execute("DROP TABLE IF EXISTS postings")
+                    connection.execute("DROP TABLE IF EXISTS files")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def _load(self, connection: sqlite3.Connection) -> None:
+        # Another process may have written the index since we last looked.
+        (data_version,) = connection.execute("PRAGMA data_version").fetchone()
+        if data_version == self._data_version:
+            return
+        self._files = {}
+        self._unindexed = set()
+        for rel, file_id, mtime_ns, size, indexed in connection.execute(
+            "SELECT path, id, mtime_ns, size, indexed FROM files"
+        ):
+            self._files[rel] = _IndexedFile(file_id, mtime_ns, size)
+            if not indexed:
+                self._unindexed.add(rel)
+        self._data_version = data_version
+
+    def _refresh(self) -> IndexUpdateStats:
+        connection = self._connect()
+        self._load(connection)
+        try:
+            return self._update(connection, racy_after_ns=time.time_ns() - _RACY_WINDOW_NS)
+        except BaseException:
+            # The transaction rolled back; reload the file table on the next refresh.
+            self._data_version = None
+            raise
+
+    def _update(self, connection: sqlite3.Connection, *, racy_after_ns: int) -> IndexUpdateStats:
+        index_dir = self.path.parent
+        seen: set[str] = set()
+        added = updated = unchanged = 0
+        with connection:
+            for path in iter_workspace_files(self.root):
+                if path.parent == index_dir:
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                rel = path.relative_to(self.root).as_posix()
+                seen.add(rel)
+                entry = self._files.get(rel)
+                if entry is not None and (entry.mtime_ns, entry.size) == (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                ):
+                    unchanged += 1
+                    continue
+                if entry is None:
+                    added += 1
+                else:
+                    updated += 1
+                    connection.execute("DELETE FROM postings WHERE file_id = ?", (entry.file_id,))
+                mtime_ns = 0 if stat.st_mtime_ns >= racy_after_ns else stat.st_mtime_ns
+                self._index_file(connection, path, rel, mtime_ns, stat.st_size, entry)
+            removed = [rel for rel in self._files if rel not in seen]
+            for rel in removed:
+                entry = self._files.pop(rel)
+                self._unindexed.discard(rel)
+                connection.execute("DELETE FROM postings WHERE file_id = ?", (entry.file_id,))
+                connection.execute("DELETE FROM files WHERE id = ?", (entry.file_id,))
+        (self._data_version,) = connection.execute("PRAGMA data_version").fetchone()
+        return IndexUpdateStats(
+            added=added, updated=updated, removed=len(removed), unchanged=unchanged
+        )
+
+    def _index_file(
+        self,
+        connection: sqlite3.Connection,
+        path: Path,
+        rel: str,
+        mtime_ns: int,
+        size: int,
+        entry: _IndexedFile | None,
+    ) -> None:
+        trigrams: set[int] | None = None
+        if size <= self.max_file_bytes:
+            try:
+                trigrams = _file_trigrams(path.read_bytes())
+            except OSError:
+                pass
+        row: tuple[Any, ...] = (mtime_ns, size, trigrams is not None)
+        if entry is None:
+            cursor = connection.execute(
+                "INSERT INTO files (path, mtime_ns, size, indexed) VALUES (?, ?, ?, ?)",
+                (rel, *row),
+            )
+            assert cursor.lastrowid is not None
+            file_id = cursor.lastrowid
+        else:
+            file_id = entry.file_id
+            connection.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, indexed = ? WHERE id = ?",
+                (*row, file_id),
+            )
+        self._files[rel] = _IndexedFile(file_id, mtime_ns, size)
+        if trigrams is None:
+            self._unindexed.add(rel)
+            return
+        self._unindexed.discard(rel)
+        connection.executemany(
+            "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+            ((trigram, file_id) for trigram in sorted(trigrams)),
+        )
+
+
+def required_trigrams(
+    query: str, *, use_regex: bool, case_sensitive: bool
+) -> frozenset[int] | None:
+    """Trigrams every file with a matching line must contain, or None to scan everything."""
+    if use_regex:
+        runs = _regex_literal_runs(query, ignore_case=not case_sensitive)
+        if runs is None:
+            return None
+    else:
+        runs = [(query, not case_sensitive)]
+    trigrams: set[int] = set()
+    for run, ignore_case in runs:
+        for segment in _foldable_segments(run, ignore_case):
+            trigrams.update(_text_trigrams(segment))
+    return frozenset(trigrams) or None
+
+
+_SHARED_INDEXES: dict[Path, TrigramIndex] = {}
+_SHARED_INDEXES_LOCK = threading.Lock()
+
+
+def get_shared_trigram_index(root: Path) -> TrigramIndex:
+    """Return the process-wide index for `root`, creating it on first use."""
+    key = root.resolve(strict=False)
+    with _SHARED_INDEXES_LOCK:
+        index = _SHARED_INDEXES.get(key)
+        if index is None:
+            index = TrigramIndex(key)
+            _SHARED_INDEXES[key] = index
+        return index
+
+
+def reset_shared_trigram_indexes() -> None:
+    with _SHARED_INDEXES_LOCK:
+        for index in _SHARED_INDEXES.values():
+            index.close()
+        _SHARED_INDEXES.clear()
+
+
+def _file_trigrams(data: bytes) -> set[int]:
+    """Trigram set of a file; empty when grep_search would skip it as binary or non-UTF-8."""
+    if is_binary_block(data[:BINARY_SNIFF_BYTES]):
+        return set()
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return set()
+    return _text_trigrams(data)
+
+
+def _text_trigrams(data: bytes) -> set[int]:
+    folded = data.lower()
+    # Three strided `findall` passes cover every offset and run far faster than slicing.
+    grams = set(_TRIGRAM_CHUNKS.findall(folded))
+    grams.update(_TRIGRAM_CHUNKS.findall(folded, 1))
+    grams.update(_TRIGRAM_CHUNKS.findall(folded, 2))
+    return {int.from_bytes(gram, "big") for gram in grams}
+
+
+def _foldable_segments(run: str, ignore_case: bool) -> list[bytes]:
+    """Split a literal run into pieces whose folded bytes must appear in a matching file."""
+    segments: list[bytes] = []
+    current: list[str] = []
+    for char in run:
+        breaks = char in _LINE_BREAKS
+        if ignore_case:
+            breaks = breaks or not char.isascii() or char in _UNSAFE_CASELESS
+        if breaks:
+            if current:
+                segments.append("".join(current).encode("utf-8"))
+                current = []
+            continue
+        current.append(char)
+    if current:
+        segments.append("".join(current).encode("utf-8"))
+    return segments
+
+
+def _regex_literal_runs(query: str, *, ignore_case: bool) -> list[tuple[str, bool]] | None:
+    try:
+        from re import _parser as sre_parse  # type: ignore[attr-defined]
+    except ImportError:  # Python < 3.11
+        import sre_parse  # type: ignore[no-redef]
+
+    try:
+        parsed = sre_parse.parse(query, 0 if not ignore_case else re.IGNORECASE)
+    except (re.error, RecursionError):
+        return None
+    ignore_case = ignore_case or bool(parsed.state.flags & re.IGNORECASE)
+    repeats = {
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+    }
+
+    def _runs(items: Any, caseless: bool) -> list[tuple[str, bool]]:
+        runs: list[tuple[str, bool]] = []
+        current: list[str] = []
+
+        def _flush() -> None:
+            if current:
+                runs.append(("".join(current), caseless))
+                current.clear()
+
+        for op, arg in items:
+            if op is sre_parse.LITERAL:
+                current.append(chr(arg))
+            elif op is sre_parse.AT:
+                # Anchors are zero-width, so the literals around them stay adjacent.
+                continue
+            elif op is sre_parse.SUBPATTERN:
+                _flush()
+                _group, add_flags, del_flags, sub = arg
+                sub_caseless = (caseless or bool(add_flags & re.IGNORECASE)) and not (
+                    del_flags & re.IGNORECASE
+                )
+                runs.extend(_runs(sub, sub_caseless))
+            elif op in repeats:
+                _flush()
+                minimum, _maximum, sub = arg
+                if minimum >= 1:
+                    runs.extend(_runs(sub, caseless))
+            else:
+                # Branches, classes, wildcards and backreferences guarantee no literal text.
+                _flush()
+        _flush()
+        return runs
+
+    return _runs(parsed, ignore_case)
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+_SegmentMatcher = Callable[[str], bool]
+_RECURSIVE = "**"
+
+# Ignore files read in every walked directory; later names take precedence (as in ripgrep).
+IGNORE_FILENAMES = (".gitignore", ".ignore")
+# Pruned regardless of ignore files: VCS metadata and dependency/cache trees.
+DEFAULT_IGNORED_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__"})
+# A directory holding this file is a virtualenv and is pruned like an ignored directory.
+_VIRTUALENV_MARKER = "pyvenv.cfg"
+# Files whose first block contains a NUL byte are treated as binary.
+BINARY_SNIFF_BYTES = 8192
+
+
+class GlobMatcher:
+    """Matches relative POSIX paths with `Path.glob` segment semantics.
+
+    `**` spans zero or more directories; every other segment is an fnmatch pattern for
+    exactly one path component. `may_contain` lets walkers prune directories up front.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        if pattern.startswith("/"):
+            raise ValueError("Non-relative glob patterns are unsupported.")
+        self.pattern = pattern
+        self._segments: tuple[str | _SegmentMatcher, ...] = tuple(
+            _RECURSIVE if part == _RECURSIVE else _segment_matcher(part)
+            for part in pattern.split("/")
+            if part not in {"", "."}
+        )
+
+    def matches(self, parts: tuple[str, ...]) -> bool:
+        segments = self._segments
+
+        def _match(index: int, position: int) -> bool:
+            if index == len(segments):
+                return position == len(parts)
+            segment = segments[index]
+            if segment == _RECURSIVE:
+                # The final component is the file itself, so `**` only spans directories.
+                return any(_match(index + 1, end) for end in range(position, len(parts)))
+            if position == len(parts):
+                return False
+            assert callable(segment)
+            return segment(parts[position]) and _match(index + 1, position + 1)
+
+        return _match(0, 0)
+
+    def may_contain(self, dir_parts: tuple[str, ...]) -> bool:
+        segments = self._segments
+
+        def _prefix(index: int, position: int) -> bool:
+            if position == len(dir_parts):
+                return index < len(segments)
+            if index == len(segments):
+                return False
+            segment = segments[index]
+            if segment == _RECURSIVE:
+                return _prefix(index + 1, position) or _prefix(index, position + 1)
+            assert callable(segment)
+            return segment(dir_parts[position]) and _prefix(index + 1, position + 1)
+
+        return _prefix(0, 0)
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> GlobMatcher:
+    return GlobMatcher(pattern)
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+class IgnoreFile:
+    """Compiled rules of one `.gitignore`-style file; the last matching rule wins."""
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.rules = tuple(rule for rule in map(_parse_ignore_line, lines) if rule is not None)
+        # One combined scan answers the common "no rule matches" case in a single call.
+        self._any = re.compile(
+            "|".join(f"(?:{rule.regex.pattern})" for rule in self.rules), re.DOTALL
+        )
+
+    def match(self, relative: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included by a `!` rule, None if no rule applies."""
+        if not self.rules or self._any.fullmatch(relative) is None:
+            return None
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(relative) is not None:
+                return not rule.negate
+        return None
+
+
+@dataclass(frozen=True)
+class IgnoreStack:
+    """Ignore files in effect inside one directory, as (directory parts, rules) pairs.
+
+    Parts are relative to the walk root; deeper files override shallower ones.
+    """
+
+    files: tuple[tuple[tuple[str, ...], IgnoreFile], ...] = ()
+
+    def is_ignored(self, parts: tuple[str, ...], is_dir: bool) -> bool:
+        if is_dir and parts and parts[-1] in DEFAULT_IGNORED_DIRS:
+            return True
+        for directory, rules in reversed(self.files):
+            decision = rules.match("/".join(parts[len(directory) :]), is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def enter(self, directory: Path, parts: tuple[str, ...], names: Iterable[str]) -> IgnoreStack:
+        """Add the ignore files found among `names`, the entries of `directory`."""
+        present = set(names)
+        files = self.files
+        for name in IGNORE_FILENAMES:
+            if name in present:
+                rules = _load_ignore_file(directory / name)
+                if rules is not None and rules.rules:
+                    files = (*files, (parts, rules))
+        return self if files is self.files else IgnoreStack(files)
+
+
+def ignore_stack_for(root: Path, directory: Path) -> tuple[IgnoreStack, bool]:
+    """Rules from the ancestors of `directory`, and whether a walk from `root` prunes it."""
+    stack = IgnoreStack()
+    try:
+        relative = directory.relative_to(root).parts
+    except ValueError:
+        return stack, False
+    ignored = False
+    current = root
+    parts: tuple[str, ...] = ()
+    for name in relative:
+        names = _list_names(current)
+        if parts and _VIRTUALENV_MARKER in names:
+            ignored = True
+        stack = stack.enter(current, parts, names)
+        parts = (*parts, name)
+        current = current / name
+        ignored = ignored or stack.is_ignored(parts, True)
+    if relative and not ignored:
+        ignored = _VIRTUALENV_MARKER in _list_names(directory)
+    return stack, ignored
+
+
+def is_binary_block(block: bytes) -> bool:
+    return b"\x00" in block
+
+
+def iter_workspace_files(
+    base: Path,
+    pattern: str = "**/*",
+    *,
+    root: Path | None = None,
+    respect_ignore: bool = True,
+    include_dirs: bool = False,
+) -> Iterator[Path]:
+    """Yield files under `base` matching `pattern`, in the order of `sorted(base.glob(...))`.
+
+    Walks with `os.scandir`, skips directories the pattern cannot reach, and does not
+    descend into symlinked directories. With `respect_ignore`, `.gitignore`/`.ignore`
+    files from `root` (default `base`) down are honoured and ignored directories are
+    pruned before descending; `base` itself is always walked. `include_dirs` also yields
+    matching directories.
+    """
+    matcher = compile_glob(pattern)
+    if not respect_ignore:
+        return _walk(base, (), matcher, None, (), include_dirs)
+    root = root or base
+    stack, _ = ignore_stack_for(root, base)
+    return _walk(base, (), matcher, stack, _relative_parts(root, base), include_dirs)
+
+
+def select_workspace_files(paths: Iterable[Path], base: Path, pattern: str) -> Iterator[Path]:
+    """Keep the walk-ordered `paths` that `iter_workspace_files(base, pattern)` would yield."""
+    matcher = compile_glob(pattern)
+    return (path for path in paths if _selected(path, base, matcher))
+
+
+def _selected(path: Path, base: Path, matcher: GlobMatcher) -> bool:
+    try:
+        parts = path.relative_to(base).parts
+    except ValueError:
+        return False
+    return matcher.matches(parts)
+
+
+def _walk(
+    directory: Path,
+    parts: tuple[str, ...],
+    matcher: GlobMatcher,
+    ignore: IgnoreStack | None,
+    offset: tuple[str, ...],
+    include_dirs: bool,
+) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as scanner:
+            entries = sorted(scanner, key=lambda entry: entry.name)
+    except OSError:
+        return
+    if ignore is not None:
+        names = [entry.name for entry in entries]
+        if parts and _VIRTUALENV_MARKER in names:
+            return
+        ignore = ignore.enter(directory, (*offset, *parts), names)
+    for entry in entries:
+        entry_parts = (*parts, entry.name)
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            is_file = not is_dir and entry.is_file()
+        except OSError:
+            continue
+        if ignore is not None and ignore.is_ignored((*offset, *entry_parts), is_dir):
+            continue
+        if is_dir:
+            if include_dirs and matcher.matches(entry_parts):
+                yield directory / entry.name
+            if matcher.may_contain(entry_parts):
+                yield from _walk(
+                    directory / entry.name, entry_parts, matcher, ignore, offset, include_dirs
+                )
+        elif is_file and matcher.matches(entry_parts):
+            yield directory / entry.name
+
+
+def _list_names(directory: Path) -> list[str]:
+    try:
+        return os.listdir(directory)
+    except OSError:
+        return []
+
+
+def _relative_parts(root: Path, path: Path) -> tuple[str, ...]:
+    try:
+        return path.relative_to(root).parts
+    except ValueError:
+        return ()
+
+
+def _segment_matcher(segment: str) -> _SegmentMatcher:
+    if not any(char in segment for char in "*?["):
+        return segment.__eq__
+    return re.compile(fnmatch.translate(segment)).match
+
+
+def _load_ignore_file(path: Path) -> IgnoreFile | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return _compile_ignore_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=512)
+def _compile_ignore_file(path: str, mtime_ns: int, size: int) -> IgnoreFile | None:
+    # mtime and size are only cache keys, so an edited ignore file is recompiled.
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    return IgnoreFile(text.splitlines())
+
+
+def _parse_ignore_line(line: str) -> _IgnoreRule | None:
+    if not line or line.startswith("#"):
+        return None
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the ignore file's directory.
+    anchored = "/" in line
+    segments = line.lstrip("/").split("/")
+    regex = "" if anchored else "(?:[^/]+/)*"
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == _RECURSIVE:
+            regex += ".+" if last else "(?:[^/]+/)*"
+            continue
+        regex += _translate_ignore_segment(segment) + ("" if last else "/")
+    return _IgnoreRule(re.compile(regex, re.DOTALL), negate, dir_only)
+
+
+def _translate_ignore_segment(segment: str) -> str:
+    out: list[str] = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        if char == "\\" and index + 1 < len(segment):
+            out.append(re.escape(segment[index + 1]))
+            index += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            start = index + 1
+            if start < len(segment) and segment[start] in "!^":
+                start += 1
+            # A "]" right after the opening bracket is a literal member of the class.
+            end = segment.find("]", start + 1)
+            if end != -1:
+                body = segment[index + 1 : end]
+                if body[:1] in {"!", "^"}:
+                    body = "^" + body[1:]
+                body = body.replace("\\", "\\\\").replace("[", "\\[")
+                out.append(f"(?!/)[{body}]")
+                index = end + 1
+                continue
+            out.append(re.escape(char))
+        else:
+            out.append(re.escape(char))
+        index += 1
+    return "".join(out)
@@ -43,10 +43,12 @@ class WriteFileTool(BaseTool):
 
         try:
             resolved.parent.mkdir(parents=True, exist_ok=True)
-            resolved.write_text(content, encoding="utf-8")
+            config.file_writer.write_text(resolved, content)
         except Exception as exc:  # pragma: no cover
             error = f"Failed to write file: {exc}"
             return ToolResult(llm_content=error, return_display="Error", error=error)
+        finally:
+            config.file_cache.invalidate(resolved)
 
         message = f"Wrote file: {resolved}"
         return ToolResult(
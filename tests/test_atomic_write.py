@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.agents.agent_scheduler import schedule_agent_tools
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.modes import ApprovalMode
+from py_agent_runtime.scheduler.types import CoreToolCallStatus, ToolCallRequestInfo
+from py_agent_runtime.tools import atomic_write
+from py_agent_runtime.tools.atomic_write import (
+    AtomicFileWriter,
+    WriteDurability,
+    write_text_atomic,
+)
+from py_agent_runtime.tools.write_file import WriteFileTool
+
+
+def _count_fsyncs(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    real_fsync = os.fsync
+
+    def counting(fd: int) -> None:
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(atomic_write.os, "fsync", counting)
+    return calls
+
+
+def test_atomic_write_keeps_mode_and_original_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "run.sh"
+    path.write_text("old\n", encoding="utf-8")
+    os.chmod(path, 0o750)
+
+    write_text_atomic(path, "new\n")
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert path.stat().st_mode & 0o777 == 0o750
+
+    def broken_replace(src: str, dst: Path) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(atomic_write.os, "replace", broken_replace)
+    with pytest.raises(OSError, match="disk full"):
+        write_text_atomic(path, "lost\n")
+
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert os.listdir(tmp_path) == ["run.sh"]
+
+
+def test_atomic_write_gives_new_files_the_umask_mode(tmp_path: Path) -> None:
+    path = tmp_path / "new.txt"
+
+    write_text_atomic(path, "hello\n")
+
+    assert path.stat().st_mode & 0o777 == 0o666 & ~atomic_write._UMASK
+
+
+@pytest.mark.parametrize(("umask", "expected"), [(0o022, 0o644), (0o002, 0o664)])
+def test_atomic_write_applies_the_process_umask(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, umask: int, expected: int
+) -> None:
+    monkeypatch.setattr(atomic_write, "_UMASK", umask)
+    path = tmp_path / "new.txt"
+
+    write_text_atomic(path, "hello\n")
+
+    assert path.stat().st_mode & 0o777 == expected
+
+
+def test_writer_fsyncs_per_write_or_once_per_file_at_flush(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = _count_fsyncs(monkeypatch)
+    each = AtomicFileWriter(WriteDurability.FSYNC)
+    each.write_text(tmp_path / "a.txt", "1")
+    each.write_text(tmp_path / "a.txt", "2")
+    assert len(calls) == 4  # data + directory per write
+
+    calls.clear()
+    grouped = AtomicFileWriter(WriteDurability.TURN)
+    for text in ["1", "2", "3"]:
+        grouped.write_text(tmp_path / "a.txt", text)
+    grouped.write_text(tmp_path / "b.txt", "x")
+    assert calls == []
+    assert grouped.stats().pending == 2
+
+    assert grouped.flush() == 0
+    assert len(calls) == 3  # a.txt, b.txt and their shared directory
+    stats = grouped.stats()
+    assert (stats.writes, stats.fsyncs, stats.flushes, stats.pending) == (4, 3, 1, 0)
+    assert grouped.flush() == 0
+    assert grouped.stats().flushes == 1
+
+
+def test_scheduled_turn_group_commits_file_tool_writes(tmp_path: Path) -> None:
+    config = RuntimeConfig(
+        target_dir=tmp_path,
+        approval_mode=ApprovalMode.YOLO,
+        write_durability=WriteDurability.TURN,
+    )
+    config.tool_registry.register_tool(WriteFileTool())
+
+    completed = schedule_agent_tools(
+        config=config,
+        requests=[
+            ToolCallRequestInfo(name="write_file", args={"file_path": "a.txt", "content": "a"}),
+            ToolCallRequestInfo(name="write_file", args={"file_path": "b.txt", "content": "b"}),
+        ],
+        scheduler_id="root_agent",
+    )
+
+    assert [call.status for call in completed] == [CoreToolCallStatus.SUCCESS] * 2
+    stats = config.file_writer.stats()
+    assert (stats.writes, stats.flushes, stats.pending, stats.fsyncs) == (2, 1, 0, 3)
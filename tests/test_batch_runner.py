@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Sequence
+
+import pytest
+
+from py_agent_runtime.agents.batch_runner import BatchSession, run_batch_sessions
+from py_agent_runtime.agents.llm_runner import LLMAgentRunner
+from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.batch import (
+    BatchBackend,
+    BatchJobStatus,
+    BatchRequest,
+    BatchResult,
+    LocalFileBatchBackend,
+)
+from py_agent_runtime.llm.openai_batch import OpenAIBatchBackend
+from py_agent_runtime.llm.raw_retention import RawRetentionMode, RawRetentionPolicy
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMTurnResponse
+from py_agent_runtime.policy.types import PolicyDecision, PolicyRule
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.base import BaseTool, ToolResult
+
+
+class EchoTool(BaseTool):
+    name = "echo"
+    description = "Echo text."
+
+    def execute(self, config: RuntimeConfig, params: Any) -> ToolResult:
+        return ToolResult(llm_content=str(params.get("text")), return_display=params.get("text"))
+
+
+class PromptScriptedProvider(LLMProvider):
+    """Echo once, then complete with the session prompt as the result."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self.calls += 1
+        prompt = next(message.content for message in messages if message.role == "user")
+        if not any(message.role == "tool" for message in messages):
+            return LLMTurnResponse(
+                content=None,
+                tool_calls=[LLMToolCall(name="echo", args={"text": prompt}, call_id=f"echo-{prompt}")],
+            )
+        return LLMTurnResponse(
+            content=None,
+            tool_calls=[LLMToolCall(name="complete_task", args={"result": f"done:{prompt}"})],
+        )
+
+
+def _runner_factory(tmp_path: Path):  # noqa: ANN202
+    def _factory(provider: LLMProvider) -> LLMAgentRunner:
+        config = RuntimeConfig(target_dir=tmp_path, interactive=False)
+        config.tool_registry.register_tool(EchoTool())
+        config.policy_engine.add_rule(
+            PolicyRule(tool_name="echo", decision=PolicyDecision.ALLOW, priority=9.0)
+        )
+        return LLMAgentRunner(config=config, provider=provider, max_turns=4)
+
+    return _factory
+
+
+class RecordingBackend(LocalFileBatchBackend):
+    def __init__(self, work_dir: Path, provider: LLMProvider) -> None:
+        super().__init__(work_dir, provider, completion_polls=2)
+        self.batch_sizes: list[int] = []
+
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        self.batch_sizes.append(len(requests))
+        return super().submit(requests)
+
+
+def test_batch_sessions_share_one_job_per_turn(tmp_path: Path) -> None:
+    provider = PromptScriptedProvider()
+    backend = RecordingBackend(tmp_path / "batches", provider)
+    sleeps: list[float] = []
+
+    results = run_batch_sessions(
+        [BatchSession("a"), BatchSession("b"), BatchSession("c")],
+        _runner_factory(tmp_path),
+        backend,
+        poll_interval_seconds=0.5,
+        sleep_fn=sleeps.append,
+    )
+
+    assert [result.result for result in results] == ["done:a", "done:b", "done:c"]
+    assert all(result.success for result in results)
+    assert backend.batch_sizes == [3, 3]
+    assert provider.calls == 6
+    assert sleeps == [0.5, 0.5]
+    assert len(list((tmp_path / "batches").glob("*/results.jsonl"))) == 2
+
+
+def test_batch_sessions_run_on_a_bounded_pool(tmp_path: Path) -> None:
+    provider = PromptScriptedProvider()
+    backend = RecordingBackend(tmp_path / "batches", provider)
+    prompts = [f"p{index}" for index in range(5)]
+
+    results = run_batch_sessions(
+        [BatchSession(prompt) for prompt in prompts],
+        _runner_factory(tmp_path),
+        backend,
+        poll_interval_seconds=0.0,
+        max_concurrent_sessions=2,
+    )
+
+    assert [result.result for result in results] == [f"done:{prompt}" for prompt in prompts]
+    assert max(backend.batch_sizes) == 2
+    assert sum(backend.batch_sizes) == 10
+    assert provider.calls == 10
+
+
+def test_batch_sessions_start_nothing_when_a_runner_cannot_be_built(tmp_path: Path) -> None:
+    factory = _runner_factory(tmp_path)
+    built: list[LLMProvider] = []
+
+    def flaky_factory(provider: LLMProvider) -> LLMAgentRunner:
+        built.append(provider)
+        if len(built) == 2:
+            raise RuntimeError("no runner")
+        return factory(provider)
+
+    backend = RecordingBackend(tmp_path / "batches", PromptScriptedProvider())
+    with pytest.raises(RuntimeError, match="no runner"):
+        run_batch_sessions(
+            [BatchSession("a"), BatchSession("b"), BatchSession("c")],
+            flaky_factory,
+            backend,
+            poll_interval_seconds=0.0,
+        )
+
+    assert backend.batch_sizes == []
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("batch-")]
+
+
+class FailingBackend(BatchBackend):
+    def submit(self, requests: Sequence[BatchRequest]) -> str:
+        return "job"
+
+    def poll(self, job_id: str) -> BatchJobStatus:
+        return BatchJobStatus.FAILED
+
+    def fetch_results(self, job_id: str) -> list[BatchResult]:
+        return []
+
+
+def test_batch_sessions_surface_failed_jobs_as_session_errors(tmp_path: Path) -> None:
+    results = run_batch_sessions(
+        [BatchSession("a")],
+        _runner_factory(tmp_path),
+        FailingBackend(),
+        poll_interval_seconds=0.0,
+    )
+
+    assert len(results) == 1
+    assert results[0].success is False
+    assert results[0].error is not None
+    assert "failed" in results[0].error
+
+
+class FakeOpenAIBatchClient:
+    def __init__(self, statuses: list[str], output: str, errors: str) -> None:
+        self.uploads: list[bytes] = []
+        self.created: dict[str, object] = {}
+        self._statuses = statuses
+        self._contents = {"file-out": output, "file-err": errors}
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    def _create_file(self, *, file: tuple[str, bytes], purpose: str) -> object:
+        assert purpose == "batch"
+        self.uploads.append(file[1])
+        return SimpleNamespace(id="file-in")
+
+    def _content(self, file_id: str) -> object:
+        return SimpleNamespace(text=self._contents[file_id])
+
+    def _create_batch(self, **kwargs: object) -> object:
+        self.created = dict(kwargs)
+        return SimpleNamespace(id="batch-1")
+
+    def _retrieve(self, batch_id: str) -> object:
+        status = self._statuses.pop(0) if len(self._statuses) > 1 else self._statuses[0]
+        return SimpleNamespace(
+            id=batch_id, status=status, output_file_id="file-out", error_file_id="file-err"
+        )
+
+
+def test_openai_batch_backend_uploads_jsonl_and_parses_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    completion = {
+        "choices": [
+            {
+                "message": {
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": "call-1",
+                            "type": "function",
+                            "function": {"name": "echo", "arguments": '{"text": "hi"}'},
+                        }
+                    ],
+                },
+                "finish_reason": "tool_calls",
+            }
+        ],
+        "id": "chatcmpl-1",
+    }
+    output = json.dumps(
+        {"custom_id": "a", "response": {"status_code": 200, "body": completion}, "error": None}
+    )
+    errors = json.dumps(
+        {
+            "custom_id": "b",
+            "response": None,
+            "error": {"code": "batch_expired", "message": "This request expired."},
+        }
+    )
+    client = FakeOpenAIBatchClient(["validating", "in_progress", "completed"], output, errors)
+    backend = OpenAIBatchBackend(
+        model="gpt-4.1-mini",
+        raw_retention=RawRetentionPolicy(RawRetentionMode.COMPACT),
+        client=client,
+    )
+
+    job_id = backend.submit(
+        [
+            BatchRequest("a", (LLMMessage(role="user", content="hi"),), temperature=0.2),
+            BatchRequest("b", (LLMMessage(role="user", content="yo"),), model="gpt-4.1"),
+        ]
+    )
+
+    assert job_id == "batch-1"
+    assert client.created == {
+        "input_file_id": "file-in",
+        "endpoint": "/v1/chat/completions",
+        "completion_window": "24h",
+    }
+    lines = [json.loads(line) for line in client.uploads[0].decode("utf-8").splitlines()]
+    assert [line["custom_id"] for line in lines] == ["a", "b"]
+    assert lines[0]["method"] == "POST"
+    assert lines[0]["url"] == "/v1/chat/completions"
+    assert lines[0]["body"]["model"] == "gpt-4.1-mini"
+    assert lines[0]["body"]["temperature"] == 0.2
+    assert lines[1]["body"]["model"] == "gpt-4.1"
+
+    assert backend.poll(job_id) == BatchJobStatus.PENDING
+    assert backend.poll(job_id) == BatchJobStatus.PENDING
+    assert backend.poll(job_id) == BatchJobStatus.COMPLETED
+
+    results = {result.custom_id: result for result in backend.fetch_results(job_id)}
+    response = results["a"].response
+    assert response is not None
+    assert response.finish_reason == "tool_calls"
+    assert [(call.name, call.args, call.call_id) for call in response.tool_calls] == [
+        ("echo", {"text": "hi"}, "call-1")
+    ]
+    assert response.raw == {"id": "chatcmpl-1"}
+    assert results["b"].response is None
+    assert results["b"].error == "This request expired."
+
+
+def test_openai_batch_backend_reports_failed_jobs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    backend = OpenAIBatchBackend(client=FakeOpenAIBatchClient(["failed"], "", ""))
+
+    assert backend.poll("batch-1") == BatchJobStatus.FAILED
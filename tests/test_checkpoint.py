@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from py_agent_runtime.agents.checkpoint import (
+    SessionCheckpointer,
+    load_session_state,
+    session_checkpoint_path,
+)
+from py_agent_runtime.agents.llm_runner import LLMAgentRunner
+from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMTurnResponse
+from py_agent_runtime.policy.types import PolicyDecision, PolicyRule
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.modes import ApprovalMode
+from py_agent_runtime.tools.base import BaseTool, ToolResult
+
+
+class EchoTool(BaseTool):
+    name = "echo"
+    description = "Echo text."
+
+    def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
+        config.todos.append({"description": str(params["text"]), "status": "completed"})
+        return ToolResult(llm_content=str(params["text"]), return_display=str(params["text"]))
+
+
+class ScriptedProvider(LLMProvider):
+    def __init__(self, responses: Sequence[LLMTurnResponse]) -> None:
+        self._responses = list(responses)
+        self.calls: list[list[LLMMessage]] = []
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self.calls.append(list(messages))
+        return self._responses.pop(0)
+
+
+def _echo(call_id: str) -> LLMTurnResponse:
+    return LLMTurnResponse(
+        content=None,
+        tool_calls=[LLMToolCall(name="echo", args={"text": call_id}, call_id=call_id)],
+    )
+
+
+def _complete() -> LLMTurnResponse:
+    return LLMTurnResponse(
+        content=None,
+        tool_calls=[LLMToolCall(name="complete_task", args={"result": "done"}, call_id="done")],
+    )
+
+
+def _config(tmp_path: Path, session_id: str = "session-1") -> RuntimeConfig:
+    config = RuntimeConfig(target_dir=tmp_path, session_id=session_id)
+    config.tool_registry.register_tool(EchoTool())
+    config.policy_engine.add_rule(
+        PolicyRule(tool_name="echo", decision=PolicyDecision.ALLOW, priority=9.0)
+    )
+    return config
+
+
+def test_runner_checkpoints_each_turn_and_resumes_after_max_turns(tmp_path: Path) -> None:
+    path = session_checkpoint_path(tmp_path, "session-1")
+    config = _config(tmp_path)
+    config.set_approval_mode(ApprovalMode.AUTO_EDIT)
+    first = LLMAgentRunner(
+        config=config,
+        provider=ScriptedProvider([_echo("a"), _echo("b")]),
+        max_turns=2,
+        enable_recovery_turn=False,
+        checkpointer=SessionCheckpointer(path),
+    )
+    result = first.run("do task", system_prompt="sys")
+    assert result.success is False
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["type"] for record in records] == ["session", "turn", "turn", "final"]
+    assert len(records[1]["messages"]) == 4
+    assert len(records[2]["messages"]) == 2
+
+    state = load_session_state(path)
+    assert state.turn == 2
+    assert state.approval_mode == ApprovalMode.AUTO_EDIT
+    assert [todo["description"] for todo in state.todos] == ["a", "b"]
+    assert [message.role for message in state.messages] == [
+        "system",
+        "user",
+        "assistant",
+        "tool",
+        "assistant",
+        "tool",
+    ]
+
+    resumed_config = _config(tmp_path)
+    provider = ScriptedProvider([_complete()])
+    second = LLMAgentRunner(
+        config=resumed_config,
+        provider=provider,
+        max_turns=2,
+        checkpointer=SessionCheckpointer(path),
+    )
+    resumed = second.resume(state)
+    assert resumed.success is True
+    assert resumed.turns == 3
+    assert len(provider.calls) == 1
+    assert provider.calls[0] == state.messages
+    assert resumed_config.get_approval_mode() == ApprovalMode.AUTO_EDIT
+    assert len(resumed_config.todos) == 2
+
+    final_state = load_session_state(path)
+    assert final_state.final is not None
+    assert final_state.final.success is True
+    untouched = ScriptedProvider([])
+    again = LLMAgentRunner(config=_config(tmp_path), provider=untouched).resume(final_state)
+    assert again.result == "done"
+    assert untouched.calls == []
+
+
+def test_checkpointer_writes_snapshot_after_history_compaction(tmp_path: Path) -> None:
+    path = tmp_path / "session.jsonl"
+    config = RuntimeConfig(target_dir=tmp_path)
+    checkpointer = SessionCheckpointer(path)
+    checkpointer.start(config.session_id, "task", None)
+    messages = [LLMMessage(role="user", content="task"), LLMMessage(role="assistant", content="a")]
+    checkpointer.record_turn(1, messages, config)
+    compacted = [messages[0], LLMMessage(role="assistant", content="[summary]")]
+    checkpointer.record_turn(2, compacted, config)
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["type"] for record in records] == ["session", "turn", "snapshot"]
+    assert [message.content for message in load_session_state(path).messages] == [
+        "task",
+        "[summary]",
+    ]
+
+
+def test_resume_drops_torn_trailing_record(tmp_path: Path) -> None:
+    path = tmp_path / "session.jsonl"
+    config = RuntimeConfig(target_dir=tmp_path)
+    checkpointer = SessionCheckpointer(path)
+    checkpointer.start(config.session_id, "task", None)
+    checkpointer.record_turn(1, [LLMMessage(role="user", content="task")], config)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "turn", "tur')
+
+    state = load_session_state(path)
+    assert state.turn == 1
+    resumed = SessionCheckpointer(path)
+    resumed.resume_from(state)
+    resumed.record_turn(2, [*state.messages, LLMMessage(role="assistant", content="x")], config)
+    assert load_session_state(path).turn == 2
+
+
+def test_resume_into_a_new_log_writes_header_and_snapshot_first(tmp_path: Path) -> None:
+    source = tmp_path / "source.jsonl"
+    config = RuntimeConfig(target_dir=tmp_path)
+    checkpointer = SessionCheckpointer(source)
+    checkpointer.start(config.session_id, "task", "system")
+    checkpointer.record_turn(1, [LLMMessage(role="user", content="task")], config)
+    state = load_session_state(source)
+
+    copy = tmp_path / "copy.jsonl"
+    resumed = SessionCheckpointer(copy)
+    resumed.resume_from(state)
+    resumed.record_turn(2, [*state.messages, LLMMessage(role="assistant", content="x")], config)
+
+    restored = load_session_state(copy)
+    assert (restored.session_id, restored.system_prompt, restored.turn) == (
+        config.session_id,
+        "system",
+        2,
+    )
+    assert [message.content for message in restored.messages] == ["task", "x"]
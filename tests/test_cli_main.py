@@ -3,10 +3,21 @@ from __future__ import annotations
 import sys
 import json
 
+import pytest
+
 from py_agent_runtime.cli import main as cli_main
+from py_agent_runtime.llm import factory as llm_factory
 from py_agent_runtime.runtime.modes import ApprovalMode
 from py_agent_runtime.agents.llm_runner import AgentRunResult
+from py_agent_runtime.llm.rate_limit import (
+    RateLimitedProvider,
+    get_shared_rate_limiter,
+    reset_shared_rate_limiters,
+)
+from py_agent_runtime.llm.raw_retention import RawRetentionMode, RawRetentionPolicy
 from py_agent_runtime.llm.types import LLMTurnResponse
+from py_agent_runtime.tools.builtin import BUILTIN_TOOLS, register_builtin_tools
+from py_agent_runtime.tools.registry import ToolRegistry
 
 
 class FakeProvider:
@@ -19,10 +30,12 @@ class FakeProvider:
 
 class FakeRunner:
     last_config = None
+    last_provider = None
     last_kwargs = None
 
     def __init__(self, config, provider, **kwargs):  # noqa: ANN001, ANN003
         FakeRunner.last_config = config
+        FakeRunner.last_provider = provider
         FakeRunner.last_kwargs = dict(kwargs)
 
     def run(self, user_prompt: str, system_prompt: str | None = None) -> AgentRunResult:
@@ -42,6 +55,24 @@ def test_cli_chat_command(monkeypatch, capsys) -> None:  # noqa: ANN001
     assert "pong" in captured.out
 
 
+def test_cli_chat_accepts_registered_provider_and_its_default_model(monkeypatch, capsys) -> None:  # noqa: ANN001
+    monkeypatch.setattr(llm_factory, "_PROVIDER_SPECS", dict(llm_factory._PROVIDER_SPECS))
+    llm_factory.register_provider("echo", "tests_echo:EchoProvider", default_model="echo-1")
+    calls = []
+
+    def fake_create_provider(provider, model, **kwargs):  # noqa: ANN001, ANN003, ANN202, ARG001
+        calls.append((provider, model))
+        return FakeProvider(model)
+
+    monkeypatch.setattr(cli_main, "create_provider", fake_create_provider)
+    monkeypatch.setattr(
+        sys, "argv", ["py-agent-runtime", "chat", "--provider", "echo", "--prompt", "ping"]
+    )
+    assert cli_main.main() == 0
+    assert "pong" in capsys.readouterr().out
+    assert calls == [("echo", "echo-1")]
+
+
 def test_cli_without_command_shows_help(monkeypatch, capsys) -> None:  # noqa: ANN001
     monkeypatch.setattr(sys, "argv", ["py-agent-runtime"])
     code = cli_main.main()
@@ -256,6 +287,78 @@ def test_cli_run_command_forwards_retry_settings_to_provider(monkeypatch, capsys
     assert captured["retry_max_delay_seconds"] == 1.1
 
 
+def test_cli_run_command_wraps_provider_with_rate_limiter(monkeypatch, capsys) -> None:  # noqa: ANN001
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: FakeProvider(model),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+    reset_shared_rate_limiters()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "run",
+            "--prompt",
+            "Do work",
+            "--requests-per-minute",
+            "30",
+            "--tokens-per-minute",
+            "9000",
+        ],
+    )
+    try:
+        code = cli_main.main()
+        _ = capsys.readouterr()
+        assert code == 0
+        assert isinstance(FakeRunner.last_provider, RateLimitedProvider)
+        assert FakeRunner.last_provider.limiter is get_shared_rate_limiter(
+            "openai", requests_per_minute=30, tokens_per_minute=9000
+        )
+    finally:
+        reset_shared_rate_limiters()
+
+
+def test_cli_run_command_builds_failover_provider(monkeypatch, capsys) -> None:  # noqa: ANN001
+    captured: dict[str, object] = {}
+
+    def _create_failover_provider(targets, **kwargs):  # noqa: ANN001, ANN003, ANN202
+        captured["targets"] = list(targets)
+        captured.update(kwargs)
+        return FakeProvider()
+
+    monkeypatch.setattr(cli_main, "create_failover_provider", _create_failover_provider)
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "run",
+            "--prompt",
+            "Do work",
+            "--fallback-provider",
+            "anthropic",
+            "--fallback-provider",
+            "gemini:gemini-x",
+            "--hedge-percentile",
+            "95",
+        ],
+    )
+    code = cli_main.main()
+    _ = capsys.readouterr()
+
+    assert code == 0
+    assert captured["targets"] == [
+        ("openai", "gpt-4.1-mini"),
+        ("anthropic", "claude-3-7-sonnet-latest"),
+        ("gemini", "gemini-x"),
+    ]
+    assert captured["hedge_percentile"] == 95.0
+
+
 def test_cli_run_command_uses_env_default_provider_and_model(monkeypatch, capsys) -> None:  # noqa: ANN001
     captured: dict[str, object] = {}
 
@@ -359,3 +462,254 @@ def test_cli_tools_list_command_outputs_registered_tools(monkeypatch, capsys) ->
     assert "read_file" in names
     assert "write_file" in names
     assert "run_shell_command" in names
+
+
+def test_builtin_tool_specs_match_the_registered_tools() -> None:
+    registry = ToolRegistry()
+    register_builtin_tools(registry)
+
+    loaded = {(tool.name, tool.description) for tool in registry.get_all_tools()}
+    assert loaded == {(spec.name, spec.description) for spec in BUILTIN_TOOLS}
+
+
+def test_cli_run_command_configures_context_budget(monkeypatch, capsys) -> None:  # noqa: ANN001
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: FakeProvider(model),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["py-agent-runtime", "run", "--prompt", "Do work", "--context-window-tokens", "32000"],
+    )
+    assert cli_main.main() == 0
+    _ = capsys.readouterr()
+    assert FakeRunner.last_kwargs is not None
+    budget = FakeRunner.last_kwargs["context_budget"]
+    assert budget is not None
+    assert budget.budget_tokens == 32_000 - 4_096
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["py-agent-runtime", "run", "--prompt", "Do work", "--context-window-tokens", "0"],
+    )
+    assert cli_main.main() == 0
+    _ = capsys.readouterr()
+    assert FakeRunner.last_kwargs["context_budget"] is None
+
+
+def test_cli_run_batch_streams_results_and_resumes(monkeypatch, capsys, tmp_path) -> None:  # noqa: ANN001
+    created: list[str] = []
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: created.append(model) or FakeProvider(model),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+
+    tasks_file = tmp_path / "tasks.jsonl"
+    tasks_file.write_text(
+        '{"id": "t1", "prompt": "one"}\n{"id": "t2", "prompt": "two"}\n',
+        encoding="utf-8",
+    )
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"id": "t1", "success": true}\n', encoding="utf-8")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "run-batch",
+            "--tasks-file",
+            str(tasks_file),
+            "--output",
+            str(output),
+            "--workers",
+            "2",
+            "--resume",
+            "--target-dir",
+            str(tmp_path),
+        ],
+    )
+    assert cli_main.main() == 0
+    _ = capsys.readouterr()
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["id"] for record in records] == ["t1", "t2"]
+    assert records[1]["result"] == "ok"
+    assert len(created) == 1
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["py-agent-runtime", "run-batch", "--tasks-file", str(tasks_file), "--target-dir", str(tmp_path)],
+    )
+    assert cli_main.main() == 0
+    streamed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(record["id"] for record in streamed) == ["t1", "t2"]
+
+
+def test_cli_run_batch_sends_turns_through_the_batch_api(monkeypatch, capsys, tmp_path) -> None:  # noqa: ANN001
+    from py_agent_runtime.agents.batch_runner import BatchSession
+    from py_agent_runtime.llm import openai_batch
+
+    backends: list[tuple[str, object]] = []
+    sessions: list[list[BatchSession]] = []
+
+    def fake_backend(*, model: str, raw_retention: object) -> object:
+        backends.append((model, raw_retention))
+        return object()
+
+    def fake_run_batch_sessions(batch_sessions, runner_factory, backend, **kwargs):  # noqa: ANN001, ANN003, ANN202
+        sessions.append(list(batch_sessions))
+        assert kwargs["poll_interval_seconds"] == 5.0
+        assert kwargs["max_concurrent_sessions"] == 8
+        return [runner_factory(FakeProvider()).run(item.user_prompt) for item in batch_sessions]
+
+    monkeypatch.setattr(openai_batch, "OpenAIBatchBackend", fake_backend)
+    monkeypatch.setattr(
+        "py_agent_runtime.agents.batch_runner.run_batch_sessions", fake_run_batch_sessions
+    )
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: pytest.fail("live provider created"),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+    tasks_file = tmp_path / "tasks.jsonl"
+    tasks_file.write_text(
+        '{"id": "t1", "prompt": "one"}\n{"id": "t2", "prompt": "two"}\n',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "run-batch",
+            "--tasks-file",
+            str(tasks_file),
+            "--batch-api",
+            "openai",
+            "--batch-poll-seconds",
+            "5",
+            "--batch-max-sessions",
+            "8",
+            "--raw-response-retention",
+            "none",
+            "--target-dir",
+            str(tmp_path),
+        ],
+    )
+
+    assert cli_main.main() == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(record["id"], record["result"]) for record in records] == [("t1", "ok"), ("t2", "ok")]
+    assert backends == [("gpt-4.1-mini", RawRetentionPolicy(RawRetentionMode.NONE))]
+    assert [item.user_prompt for item in sessions[0]] == ["one", "two"]
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "run-batch",
+            "--tasks-file",
+            str(tasks_file),
+            "--batch-api",
+            "openai",
+            "--provider",
+            "gemini",
+        ],
+    )
+    assert cli_main.main() == 2
+    assert "--batch-api openai requires --provider openai" in capsys.readouterr().out
+
+
+def test_cli_resume_command_continues_checkpointed_session(monkeypatch, capsys, tmp_path) -> None:  # noqa: ANN001
+    from py_agent_runtime.agents.checkpoint import SessionCheckpointer, session_checkpoint_path
+    from py_agent_runtime.llm.types import LLMMessage
+    from py_agent_runtime.runtime.config import RuntimeConfig
+
+    config = RuntimeConfig(target_dir=tmp_path, session_id="abc123")
+    config.set_approval_mode(ApprovalMode.AUTO_EDIT)
+    checkpointer = SessionCheckpointer(session_checkpoint_path(tmp_path, "abc123"))
+    checkpointer.start("abc123", "Do work", None)
+    checkpointer.record_turn(1, [LLMMessage(role="user", content="Do work")], config)
+
+    class ResumingRunner(FakeRunner):
+        resumed_state = None
+
+        def resume(self, state):  # noqa: ANN001, ANN201
+            ResumingRunner.resumed_state = state
+            state.apply_to(FakeRunner.last_config)
+            return AgentRunResult(success=True, result="resumed", error=None, turns=state.turn + 1)
+
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: FakeProvider(model),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", ResumingRunner)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["py-agent-runtime", "resume", "--session-id", "abc123", "--target-dir", str(tmp_path)],
+    )
+    assert cli_main.main() == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["result"] == "resumed"
+    assert payload["turns"] == 2
+    assert payload["session_id"] == "abc123"
+    assert payload["approval_mode"] == ApprovalMode.AUTO_EDIT.value
+    assert FakeRunner.last_config.session_id == "abc123"
+    assert FakeRunner.last_kwargs["checkpointer"] is not None
+
+
+def test_cli_resume_appends_to_the_session_file_it_loaded(monkeypatch, capsys, tmp_path) -> None:  # noqa: ANN001
+    from py_agent_runtime.agents.checkpoint import SessionCheckpointer, load_session_state
+    from py_agent_runtime.llm.types import LLMMessage
+    from py_agent_runtime.runtime.config import RuntimeConfig
+
+    session_file = tmp_path / "elsewhere" / "saved.jsonl"
+    config = RuntimeConfig(target_dir=tmp_path, session_id="abc123")
+    checkpointer = SessionCheckpointer(session_file)
+    checkpointer.start("abc123", "Do work", None)
+    checkpointer.record_turn(1, [LLMMessage(role="user", content="Do work")], config)
+
+    class ResumingRunner(FakeRunner):
+        def resume(self, state):  # noqa: ANN001, ANN201
+            checkpointer = FakeRunner.last_kwargs["checkpointer"]
+            checkpointer.resume_from(state)
+            messages = [*state.messages, LLMMessage(role="assistant", content="more")]
+            checkpointer.record_turn(state.turn + 1, messages, FakeRunner.last_config)
+            return AgentRunResult(success=True, result="resumed", error=None, turns=state.turn + 1)
+
+    monkeypatch.setattr(
+        cli_main,
+        "create_provider",
+        lambda provider, model, **kwargs: FakeProvider(model),  # noqa: ARG005
+    )
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", ResumingRunner)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "py-agent-runtime",
+            "resume",
+            "--session-file",
+            str(session_file),
+            "--target-dir",
+            str(tmp_path),
+        ],
+    )
+    assert cli_main.main() == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["session_file"] == str(session_file.resolve())
+    assert not (tmp_path / ".gemini" / "tmp" / "sessions").exists()
+    state = load_session_state(session_file)
+    assert state.turn == 2
+    assert [message.content for message in state.messages] == ["Do work", "more"]
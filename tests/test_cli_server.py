@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.agents.llm_runner import AgentRunResult
+from py_agent_runtime.cli import main as cli_main
+from py_agent_runtime.cli.server import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    MAX_REQUEST_BYTES,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    JsonRpcDispatcher,
+    RpcError,
+    call_server,
+    create_rpc_server,
+    parse_server_address,
+    server_token_path,
+)
+from py_agent_runtime.llm.types import LLMTurnResponse
+
+
+class FakeProvider:
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def generate(self, messages, tools=None, *, model=None, temperature=None):  # noqa: ANN001, ANN201
+        return LLMTurnResponse(content=f"pong:{messages[-1].content}", tool_calls=[])
+
+
+class FakeRunner:
+    def __init__(self, config, provider, **kwargs):  # noqa: ANN001, ANN003
+        self.config = config
+
+    def run(self, user_prompt: str, system_prompt: str | None = None) -> AgentRunResult:
+        return AgentRunResult(
+            success=True,
+            result=f"{user_prompt}@{self.config.target_dir.name}",
+            error=None,
+            turns=1,
+        )
+
+
+def _serve(address: str, parser_handlers: dict) -> tuple[object, threading.Thread]:  # noqa: ANN001
+    server = create_rpc_server(address, JsonRpcDispatcher(parser_handlers))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def _stop(server, thread: threading.Thread) -> None:  # noqa: ANN001
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def test_dispatcher_reports_json_rpc_errors() -> None:
+    dispatcher = JsonRpcDispatcher({"echo": lambda params: params})
+    parse_error = json.loads(dispatcher.handle_bytes(b"{not json") or b"{}")
+    assert parse_error["error"]["code"] == PARSE_ERROR
+
+    missing = dispatcher.handle({"jsonrpc": "2.0", "id": 1, "method": "nope"})
+    assert missing is not None
+    assert missing["error"]["code"] == METHOD_NOT_FOUND
+
+    ok = dispatcher.handle({"jsonrpc": "2.0", "id": 2, "method": "echo", "params": {"a": 1}})
+    assert ok == {"jsonrpc": "2.0", "id": 2, "result": {"a": 1}}
+    assert dispatcher.handle({"jsonrpc": "2.0", "method": "echo"}) is None
+
+
+def test_params_to_argv_attaches_values_to_their_flags() -> None:
+    argv = cli_main._params_to_argv(
+        {"prompt": "-v", "fallback_provider": ["-x", "gemini"], "verbose": True, "quiet": False}
+    )
+
+    assert argv == [
+        "--prompt=-v",
+        "--fallback-provider=-x",
+        "--fallback-provider=gemini",
+        "--verbose",
+    ]
+
+
+def test_parse_server_address_rejects_non_local_http() -> None:
+    assert parse_server_address("http://127.0.0.1:9000") == ("http", "127.0.0.1:9000")
+    with pytest.raises(ValueError):
+        parse_server_address("http://example.com:9000")
+    with pytest.raises(ValueError):
+        parse_server_address("tcp://127.0.0.1:9000")
+
+
+def test_server_handlers_over_unix_socket(monkeypatch, tmp_path: Path) -> None:  # noqa: ANN001
+    created: list[str] = []
+
+    def _create(provider, model, **kwargs):  # noqa: ANN001, ANN003, ANN202
+        created.append(model)
+        return FakeProvider(model)
+
+    monkeypatch.setattr(cli_main, "create_provider", _create)
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+    address = f"unix:{tmp_path / 'agent.sock'}"
+    server, thread = _serve(address, cli_main._server_handlers(cli_main._build_parser()))
+    try:
+        assert (tmp_path / "agent.sock").stat().st_mode & 0o777 == 0o600
+        for _ in range(2):
+            result = call_server(
+                address,
+                "run",
+                {"prompt": "task", "target_dir": str(tmp_path), "provider": "openai"},
+                timeout_seconds=5,
+            )
+            assert result["success"] is True
+            assert result["result"] == f"task@{tmp_path.name}"
+        assert created == ["gpt-4.1-mini"]
+
+        for prompt in ["-v", "--verbose"]:
+            dashed = call_server(
+                address, "run", {"prompt": prompt, "target_dir": str(tmp_path)}, timeout_seconds=5
+            )
+            assert dashed["result"] == f"{prompt}@{tmp_path.name}"
+
+        chat = call_server(address, "chat", {"prompt": "ping"}, timeout_seconds=5)
+        assert chat["content"] == "pong:ping"
+
+        tools = call_server(address, "tools.list", {"target_dir": str(tmp_path)}, timeout_seconds=5)
+        assert "read_file" in {tool["name"] for tool in tools["tools"]}
+
+        with pytest.raises(RpcError) as exc_info:
+            call_server(address, "run", {"target_dir": str(tmp_path)}, timeout_seconds=5)
+        assert exc_info.value.code == INVALID_PARAMS
+
+        with pytest.raises(RpcError, match="exceeds this server's limit") as exc_info:
+            call_server(
+                address,
+                "run",
+                {"prompt": "task", "target_dir": str(tmp_path), "approval_mode": "yolo"},
+                timeout_seconds=5,
+            )
+        assert exc_info.value.code == INVALID_PARAMS
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(5)
+            client.connect(str(tmp_path / "agent.sock"))
+            client.sendall(b"x" * (MAX_REQUEST_BYTES + 1))
+            with client.makefile("rb") as reader:
+                oversized = json.loads(reader.readline())
+        assert oversized["error"]["code"] == INVALID_REQUEST
+    finally:
+        _stop(server, thread)
+    assert not (tmp_path / "agent.sock").exists()
+
+
+def test_cli_thin_client_forwards_over_http(monkeypatch, capsys, tmp_path: Path) -> None:  # noqa: ANN001
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(cli_main, "create_provider", lambda provider, model, **kwargs: FakeProvider(model))  # noqa: ARG005
+    monkeypatch.setattr(cli_main, "LLMAgentRunner", FakeRunner)
+    server, thread = _serve(
+        "http://127.0.0.1:0",
+        cli_main._server_handlers(cli_main._build_parser()),
+    )
+    host, port = server.server_address[:2]  # type: ignore[attr-defined]
+    address = f"http://{host}:{port}"
+    monkeypatch.chdir(tmp_path)
+    try:
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["py-agent-runtime", "run", "--prompt", "remote", "--server", address],
+        )
+        assert cli_main.main() == 0
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["result"] == f"remote@{tmp_path.name}"
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["py-agent-runtime", "chat", "--prompt", "hi", "--server", address],
+        )
+        assert cli_main.main() == 0
+        assert capsys.readouterr().out.strip() == "pong:hi"
+    finally:
+        _stop(server, thread)
+
+
+def test_http_server_requires_token_json_and_local_host(monkeypatch, tmp_path: Path) -> None:  # noqa: ANN001
+    monkeypatch.setenv("HOME", str(tmp_path))
+    server, thread = _serve("http://127.0.0.1:0", {"echo": lambda params: params})
+    host, port = server.server_address[:2]  # type: ignore[attr-defined]
+    address = f"http://{host}:{port}"
+    token_path = server_token_path(address)
+    try:
+        assert token_path.is_relative_to(tmp_path)
+        assert token_path.stat().st_mode & 0o777 == 0o600
+        token = token_path.read_text(encoding="utf-8")
+        assert call_server(address, "echo", {"a": 1}, timeout_seconds=5) == {"a": 1}
+
+        body = b'{"jsonrpc": "2.0", "id": 1, "method": "echo", "params": {}}'
+        good = {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+
+        def _status(headers: dict[str, str], data: bytes = body) -> int:
+            request = urllib.request.Request(
+                f"{address}/", data=data, headers=headers, method="POST"
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    return response.status
+            except urllib.error.HTTPError as exc:
+                return exc.code
+
+        assert _status(good) == 200
+        assert _status({**good, "Authorization": "Bearer wrong"}) == 401
+        assert _status({key: value for key, value in good.items() if key != "Authorization"}) == 401
+        assert _status({**good, "Content-Type": "text/plain"}) == 415
+        assert _status({**good, "Host": f"attacker.example:{port}"}) == 403
+        assert _status({**good, "Origin": "http://attacker.example"}) == 403
+        assert _status({**good, "Origin": f"http://localhost:{port}"}) == 200
+
+        with socket.create_connection((host, port), timeout=5) as client:
+            client.sendall(
+                (
+                    f"POST / HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                    f"Authorization: Bearer {token}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {MAX_REQUEST_BYTES + 1}\r\n\r\n"
+                ).encode("ascii")
+            )
+            assert client.recv(64).startswith(b"HTTP/1.0 413")
+    finally:
+        _stop(server, thread)
+    assert not token_path.exists()
+
+
+def test_serve_defaults_to_a_unix_socket() -> None:
+    args = cli_main._build_parser().parse_args(["serve"])
+    kind, location = parse_server_address(args.listen)
+    assert kind == "unix"
+    assert location == os.path.expanduser("~/.gemini/server/py-agent-runtime.sock")
+    assert args.approval_mode == "default"
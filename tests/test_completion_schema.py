@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from py_agent_runtime.agents.completion_schema import validate_completion_output
+from py_agent_runtime.agents.completion_schema import (
+    compile_completion_schema,
+    validate_completion_output,
+)
 
 
 def test_validate_completion_output_object_success() -> None:
@@ -188,3 +191,29 @@ def test_validate_completion_output_one_of_and_const() -> None:
     assert success is None
     assert invalid is not None
     assert "oneof" in invalid.lower()
+
+
+def test_compile_completion_schema_is_cached_by_identity() -> None:
+    schema = {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+
+    compiled = compile_completion_schema(schema)
+
+    assert compile_completion_schema(schema) is compiled
+    assert compile_completion_schema(dict(schema)) is not compiled
+    assert compiled.validate('{"name":"ok"}') is None
+    assert compiled.validate_value({"name": 3}) == (
+        "Completion output does not satisfy schema: $.name must be a string"
+    )
+
+
+def test_compiled_schema_reports_invalid_pattern_and_type_union() -> None:
+    invalid_pattern = compile_completion_schema({"type": "string", "pattern": "("})
+    assert invalid_pattern.validate("x") == (
+        "Completion output does not satisfy schema: $ has invalid regex pattern '('"
+    )
+
+    union = compile_completion_schema({"type": ["integer", "null"]})
+    assert union.validate("null") is None
+    assert union.validate('"text"') == (
+        "Completion output does not satisfy schema: $ must be an integer or $ must be null"
+    )
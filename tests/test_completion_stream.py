@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+
+from py_agent_runtime.agents.completion_schema import validate_completion_output
+from py_agent_runtime.agents.completion_stream import (
+    CompletionStreamMonitor,
+    StreamingCompletionValidator,
+)
+from py_agent_runtime.llm.types import LLMToolCallDelta
+
+SCHEMA = {
+    "type": "object",
+    "required": ["summary", "findings"],
+    "properties": {
+        "summary": {"type": "string", "maxLength": 20},
+        "findings": {"type": "array", "items": {"type": "integer"}, "maxItems": 3},
+    },
+    "additionalProperties": False,
+}
+
+
+def _feed_until_error(validator: StreamingCompletionValidator, text: str, step: int = 3) -> int:
+    for start in range(0, len(text), step):
+        if validator.feed(text[start : start + step]):
+            return start + step
+    return -1
+
+
+def test_streaming_validator_accepts_valid_output_and_matches_final_result() -> None:
+    text = json.dumps({"summary": "ok é 😀", "findings": [1, 2]})
+    validator = StreamingCompletionValidator(SCHEMA)
+
+    assert _feed_until_error(validator, text) == -1
+    assert validator.finish() is None
+
+
+def test_streaming_validator_aborts_on_disallowed_key_before_value_arrives() -> None:
+    text = '{"extra": "' + "x" * 500 + '"}'
+    validator = StreamingCompletionValidator(SCHEMA)
+
+    stopped_at = _feed_until_error(validator, text)
+
+    assert 0 < stopped_at < 20
+    assert validator.error == "Completion output does not satisfy schema: $.extra is not allowed"
+
+
+def test_streaming_validator_aborts_on_type_length_and_item_limits() -> None:
+    wrong_type = StreamingCompletionValidator(SCHEMA)
+    assert wrong_type.feed('{"findings": {') == (
+        "Completion output does not satisfy schema: $.findings must be an array"
+    )
+
+    too_long = StreamingCompletionValidator(SCHEMA)
+    assert too_long.feed('{"summary": "' + "y" * 21) == (
+        "Completion output does not satisfy schema: $.summary length must be <= 20"
+    )
+
+    too_many = StreamingCompletionValidator(SCHEMA)
+    assert too_many.feed('{"findings": [1, 2, 3, 4') == (
+        "Completion output does not satisfy schema: $.findings must have at most 3 items"
+    )
+
+    bad_item = StreamingCompletionValidator(SCHEMA)
+    assert bad_item.feed('{"findings": [1, 2.5,') == (
+        "Completion output does not satisfy schema: $.findings[1] must be an integer"
+    )
+
+
+def test_streaming_validator_reports_syntax_errors_and_defers_required_checks() -> None:
+    syntax = StreamingCompletionValidator(SCHEMA)
+    assert syntax.feed("{summary") is not None
+    assert "output must be valid JSON" in (syntax.error or "")
+
+    missing = StreamingCompletionValidator(SCHEMA)
+    assert missing.feed('{"summary": "ok"') is None
+    assert missing.feed("}") == "Completion output does not satisfy schema: $.findings is required"
+    assert missing.finish() == validate_completion_output('{"summary": "ok"}', SCHEMA)
+
+
+def test_completion_stream_monitor_validates_complete_task_result_argument() -> None:
+    arguments = json.dumps({"result": json.dumps({"summary": "ok", "bogus": 1})})
+    monitor = CompletionStreamMonitor(SCHEMA)
+    other = LLMToolCallDelta(index=0, name="read_file", arguments_delta='{"bogus": 1}')
+    assert monitor.on_tool_call_delta(other) is None
+
+    errors = [
+        monitor.on_tool_call_delta(
+            LLMToolCallDelta(
+                index=1,
+                name="complete_task",
+                arguments_delta=arguments[start : start + 4],
+            )
+        )
+        for start in range(0, len(arguments), 4)
+    ]
+
+    reported = [error for error in errors if error]
+    assert reported[0] == "Completion output does not satisfy schema: $.bogus is not allowed"
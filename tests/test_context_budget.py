@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from py_agent_runtime.agents.context_budget import (
+    ContextBudgetExceededError,
+    ContextBudgetManager,
+    DropOldestTurns,
+    DropSupersededFileReads,
+    SummarizeCompletedTurns,
+    TruncateOldToolOutputs,
+    context_window_for_model,
+    split_turns,
+)
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCall
+
+
+def _char_estimator(messages, tools=None) -> int:  # noqa: ANN001
+    return sum(len(message.content or "") for message in messages)
+
+
+def _tool_turn(call_id: str, name: str, display: object, status: str = "success") -> list[LLMMessage]:
+    return [
+        LLMMessage(
+            role="assistant",
+            content=None,
+            tool_calls=(LLMToolCall(name=name, args={"id": call_id}, call_id=call_id),),
+        ),
+        LLMMessage(
+            role="tool",
+            tool_call_id=call_id,
+            name=name,
+            content=json.dumps({"status": status, "result_display": display, "error": None}),
+        ),
+    ]
+
+
+def _always_fits(messages: list[LLMMessage]) -> bool:
+    return True
+
+
+def test_context_window_for_model_uses_longest_prefix() -> None:
+    assert context_window_for_model("gpt-4o-mini") == 128_000
+    assert context_window_for_model("gpt-4.1-mini") == 1_047_576
+    assert context_window_for_model("unknown-model") is None
+    assert context_window_for_model(None) is None
+
+
+def test_split_turns_groups_assistant_and_tool_messages() -> None:
+    messages = [
+        LLMMessage(role="system", content="sys"),
+        LLMMessage(role="user", content="task"),
+        *_tool_turn("c1", "echo", "a"),
+        *_tool_turn("c2", "echo", "b"),
+    ]
+    head, turns = split_turns(messages)
+    assert [message.role for message in head] == ["system", "user"]
+    assert [[message.role for message in turn] for turn in turns] == [
+        ["assistant", "tool"],
+        ["assistant", "tool"],
+    ]
+
+
+def test_drop_superseded_file_reads_keeps_latest_read() -> None:
+    messages = [
+        LLMMessage(role="user", content="task"),
+        *_tool_turn("c1", "read_file", {"file_path": "a.py", "content": "old"}),
+        *_tool_turn("c2", "read_file", {"file_path": "b.py", "content": "other"}),
+        *_tool_turn("c3", "read_file", {"file_path": "a.py", "content": "new"}),
+    ]
+    compacted = DropSupersededFileReads().compact(messages, _always_fits)
+    assert len(compacted) == len(messages)
+    assert "Superseded read of a.py" in (compacted[2].content or "")
+    assert compacted[2].tool_call_id == "c1"
+    assert compacted[4] is messages[4]
+    assert compacted[6] is messages[6]
+
+
+def test_drop_superseded_file_reads_treats_writes_as_superseding() -> None:
+    messages = [
+        *_tool_turn("c1", "read_file", {"file_path": "a.py", "content": "old"}),
+        *_tool_turn("c2", "write_file", {"file_path": "a.py"}),
+    ]
+    compacted = DropSupersededFileReads().compact(messages, _always_fits)
+    assert "Superseded" in (compacted[1].content or "")
+    assert compacted[3] is messages[3]
+
+
+def test_drop_superseded_file_reads_keeps_other_pages_of_the_same_file() -> None:
+    def _page(start: int, end: int, truncated: bool) -> dict[str, object]:
+        return {
+            "file_path": "a.py",
+            "content": f"lines {start}-{end}",
+            "start_line": start,
+            "end_line": end,
+            "truncated": truncated,
+        }
+
+    messages = [
+        *_tool_turn("c1", "read_file", _page(1, 100, True)),
+        *_tool_turn("c2", "read_file", _page(101, 200, True)),
+        *_tool_turn("c3", "read_file", _page(101, 200, True)),
+    ]
+    compacted = DropSupersededFileReads().compact(messages, _always_fits)
+    assert compacted[1] is messages[1]
+    assert "Superseded" in (compacted[3].content or "")
+    assert compacted[5] is messages[5]
+
+    messages.extend(
+        _tool_turn("c4", "batch_replace", {"files": [{"file_path": "a.py", "edits": 1}]})
+    )
+    compacted = DropSupersededFileReads().compact(messages, _always_fits)
+    assert all("Superseded" in (compacted[index].content or "") for index in (1, 3, 5))
+
+
+def test_truncate_old_tool_outputs_preserves_recent_and_head_tail() -> None:
+    messages = [
+        *_tool_turn("c1", "echo", "x" * 500 + "TAIL"),
+        *_tool_turn("c2", "echo", "y" * 500),
+    ]
+    compacted = TruncateOldToolOutputs(keep_recent=1, max_chars=100).compact(
+        messages, _always_fits
+    )
+    old_content = compacted[1].content or ""
+    assert "chars truncated" in old_content
+    assert old_content.endswith('null}')
+    assert old_content.startswith('{"status"')
+    assert compacted[3] is messages[3]
+
+
+def test_summarize_completed_turns_replaces_old_turns() -> None:
+    messages = [
+        LLMMessage(role="user", content="task"),
+        *_tool_turn("c1", "echo", "first"),
+        *_tool_turn("c2", "echo", "second", status="error"),
+        *_tool_turn("c3", "echo", "third"),
+    ]
+    compacted = SummarizeCompletedTurns(keep_recent_turns=1).compact(messages, _always_fits)
+    assert [message.role for message in compacted] == [
+        "user",
+        "assistant",
+        "assistant",
+        "assistant",
+        "tool",
+    ]
+    assert compacted[1].tool_calls == ()
+    assert 'Called echo({"id": "c1"}) -> success' in (compacted[1].content or "")
+    assert "-> error" in (compacted[2].content or "")
+    assert compacted[-1] is messages[-1]
+
+
+def test_drop_oldest_turns_stops_once_prompt_fits() -> None:
+    messages = [
+        LLMMessage(role="user", content="task"),
+        *_tool_turn("c1", "echo", "a" * 100),
+        *_tool_turn("c2", "echo", "b"),
+    ]
+    compacted = DropOldestTurns().compact(
+        messages,
+        lambda candidate: _char_estimator(candidate) < 100,
+    )
+    assert [message.tool_call_id for message in compacted if message.role == "tool"] == ["c2"]
+    assert compacted[0].content == "task"
+
+
+def test_manager_returns_history_unchanged_when_under_budget() -> None:
+    manager = ContextBudgetManager(1_000, reserve_output_tokens=0, token_estimator=_char_estimator)
+    messages = [LLMMessage(role="user", content="hello")]
+    assert manager.fit(messages) == messages
+    assert manager.compactions == 0
+
+
+def test_manager_applies_strategies_until_prompt_fits() -> None:
+    manager = ContextBudgetManager(
+        400,
+        reserve_output_tokens=0,
+        strategies=[TruncateOldToolOutputs(keep_recent=1, max_chars=80), DropOldestTurns()],
+        token_estimator=_char_estimator,
+    )
+    messages = [
+        LLMMessage(role="user", content="task"),
+        *_tool_turn("c1", "echo", "a" * 300),
+        *_tool_turn("c2", "echo", "b" * 100),
+    ]
+    fitted = manager.fit(messages)
+    assert manager.compactions == 1
+    assert _char_estimator(fitted) <= 400
+    assert [message.tool_call_id for message in fitted if message.role == "tool"] == ["c1", "c2"]
+
+
+def test_manager_raises_when_compaction_cannot_fit() -> None:
+    manager = ContextBudgetManager(10, reserve_output_tokens=0, token_estimator=_char_estimator)
+    with pytest.raises(ContextBudgetExceededError):
+        manager.fit([LLMMessage(role="user", content="x" * 50)])
+
+
+def test_manager_validates_arguments() -> None:
+    with pytest.raises(ValueError):
+        ContextBudgetManager(0)
+    with pytest.raises(ValueError):
+        ContextBudgetManager(100, reserve_output_tokens=100)
+    assert ContextBudgetManager.for_model("unknown-model") is None
+    manager = ContextBudgetManager.for_model("gpt-4o")
+    assert manager is not None
+    assert manager.budget_tokens == 128_000 - 4_096
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.runtime import file_cache
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.file_cache import FileContentCache
+from py_agent_runtime.tools.grep_engine import LinePattern, search_file
+from py_agent_runtime.tools.grep_search import GrepSearchTool
+from py_agent_runtime.tools.read_file import ReadFileTool
+from py_agent_runtime.tools.replace import ReplaceTool
+from py_agent_runtime.tools.write_file import WriteFileTool
+
+
+def _backdate(path: Path, seconds: int = 60) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_file_cache_hits_until_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"one\r\ntwo\n")
+    _backdate(path)
+    cache = FileContentCache()
+
+    first = cache.load(path)
+    second = cache.load(path)
+    path.write_bytes(b"ONE\r\ntwo\n")
+    _backdate(path, 30)
+    third = cache.load(path)
+
+    assert first.text == "one\ntwo\n"
+    assert second is first
+    assert third.text == "ONE\ntwo\n"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 1)
+    assert stats.memory_bytes > 0
+
+
+def test_file_cache_marks_binary_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    blob = tmp_path / "blob.bin"
+    blob.write_bytes(b"\x00\x01")
+    _backdate(blob)
+    paths = []
+    for name in ["a", "b", "c"]:
+        path = tmp_path / f"{name}.txt"
+        path.write_text(name * 100, encoding="utf-8")
+        _backdate(path)
+        paths.append(path)
+    cache = FileContentCache(max_bytes=400)
+
+    assert cache.load(blob).binary
+    for path in paths:
+        cache.load(path)
+    cache.load(paths[2])
+    cache.load(paths[1])
+    cache.load(paths[0])
+
+    stats = cache.stats()
+    # Two 100-character strings fit in 400 bytes; "a" was least recently used.
+    assert (stats.hits, stats.misses) == (2, 5)
+    assert stats.evictions >= 2
+    assert stats.memory_bytes <= 400
+
+
+def test_file_cache_does_not_trust_recently_modified_files(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"one\n")
+    cache = FileContentCache()
+
+    first = cache.load(path)
+    # Same size and, on coarse filesystems, possibly the same mtime: only a re-read sees it.
+    stat = path.stat()
+    path.write_bytes(b"two\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    second = cache.load(path)
+
+    assert (first.text, second.text) == ("one\n", "two\n")
+    assert cache.stats().entries == 0
+
+
+def test_file_cache_skips_oversized_files_and_grep_streams_them(tmp_path: Path) -> None:
+    big = tmp_path / "big.log"
+    big.write_text("".join(f"row {index}\r\n" for index in range(2_000)), encoding="utf-8")
+    _backdate(big)
+    cache = FileContentCache(max_entry_bytes=1_024)
+
+    hits = search_file(big, LinePattern(re.compile(r"row 1999$")), 10, cache)
+
+    assert hits == [(2_000, "row 1999")]
+    assert cache.load(big).text is not None
+    stats = cache.stats()
+    assert (stats.misses, stats.entries) == (1, 0)
+
+
+def test_file_writes_invalidate_the_cached_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(file_cache, "_RACY_WINDOW_NS", 0)
+    config = RuntimeConfig(target_dir=tmp_path)
+    path = tmp_path / "app.py"
+    path.write_text("x = 1\n", encoding="utf-8")
+    _backdate(path)
+    stat = path.stat()
+
+    first = ReadFileTool().execute(config, {"file_path": "app.py"})
+    WriteFileTool().execute(config, {"file_path": "app.py", "content": "x = 2\n"})
+    # A coarse mtime could leave (mtime, size, inode) unchanged; the write must still count.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    second = ReadFileTool().execute(config, {"file_path": "app.py"})
+
+    assert (first.llm_content, second.llm_content) == ("x = 1\n", "x = 2\n")
+
+
+def test_file_tools_share_the_session_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The tools write and read back immediately, inside the racy window.
+    monkeypatch.setattr(file_cache, "_RACY_WINDOW_NS", 0)
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    WriteFileTool().execute(config, {"file_path": "app.py", "content": "x = 1\n"})
+    read = ReadFileTool().execute(config, {"file_path": "app.py"})
+    ReplaceTool().execute(config, {"file_path": "app.py", "old_text": "1", "new_text": "2"})
+    grepped = GrepSearchTool().execute(config, {"query": "x = 2"})
+    reread = ReadFileTool().execute(config, {"file_path": "app.py"})
+
+    assert read.llm_content == "x = 1\n"
+    assert isinstance(grepped.return_display, dict)
+    assert len(grepped.return_display["matches"]) == 1
+    assert reread.llm_content == "x = 2\n"
+    stats = config.file_cache.stats()
+    # Writes invalidate: replace hits read_file's copy, the reread hits grep's.
+    assert (stats.hits, stats.misses) == (2, 2)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
+import pytest
+
 from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools import file_ranges, glob_search, read_file
+from py_agent_runtime.tools.batch_replace import BatchReplaceTool
 from py_agent_runtime.tools.glob_search import GlobSearchTool
 from py_agent_runtime.tools.grep_search import GrepSearchTool
 from py_agent_runtime.tools.list_directory import ListDirectoryTool
@@ -88,6 +94,102 @@ def test_replace_tool_errors_when_old_text_missing(tmp_path: Path) -> None:
     assert "not found" in result.error
 
 
+def test_batch_replace_applies_edits_with_one_write_per_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "a.py").write_text("x = 1\ny = 2\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("x = 1\n", encoding="utf-8")
+    os.chmod(tmp_path / "a.py", 0o640)
+    config = RuntimeConfig(target_dir=tmp_path)
+    writes: list[Path] = []
+    real_write = config.file_writer.write_text
+
+    def spy(path: Path, text: str) -> None:
+        writes.append(path)
+        real_write(path, text)
+
+    monkeypatch.setattr(config.file_writer, "write_text", spy)
+
+    result = BatchReplaceTool().execute(
+        config,
+        {
+            "edits": [
+                {"file_path": "a.py", "old_text": "x = 1", "new_text": "x = 10"},
+                {"file_path": "b.py", "old_text": "1", "new_text": "3"},
+                {"file_path": "a.py", "old_text": "x = 10\n", "new_text": "x = 10\nz = 0\n"},
+            ]
+        },
+    )
+
+    assert result.error is None
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "x = 10\nz = 0\ny = 2\n"
+    assert (tmp_path / "b.py").read_text(encoding="utf-8") == "x = 3\n"
+    assert (tmp_path / "a.py").stat().st_mode & 0o777 == 0o640
+    assert writes == [tmp_path / "a.py", tmp_path / "b.py"]
+    assert result.return_display == {
+        "files": [
+            {"file_path": str(tmp_path / "a.py"), "edits": 2, "replaced_count": 2},
+            {"file_path": str(tmp_path / "b.py"), "edits": 1, "replaced_count": 1},
+        ],
+        "total_replacements": 3,
+    }
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "b.py"]
+
+
+def test_batch_replace_reports_every_failed_anchor_and_writes_nothing(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    result = BatchReplaceTool().execute(
+        config,
+        {
+            "edits": [
+                {"file_path": "a.py", "old_text": "x = 1", "new_text": "x = 2"},
+                {"file_path": "a.py", "old_text": "missing", "new_text": "?"},
+                {"file_path": "gone.py", "old_text": "x", "new_text": "y"},
+                {"file_path": "../out.py", "old_text": "x", "new_text": "y"},
+            ]
+        },
+    )
+
+    assert result.error is not None
+    assert "edits[1] (a.py): Target text not found." in result.error
+    assert "edits[2] (gone.py): File does not exist." in result.error
+    assert "edits[3] (../out.py): Access denied" in result.error
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "x = 1\n"
+
+
+def test_batch_replace_restores_written_files_when_a_later_write_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "a.py").write_text("a\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("b\n", encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+    real_write = config.file_writer.write_text
+
+    def failing(path: Path, text: str) -> None:
+        if path.name == "b.py":
+            raise PermissionError("read-only")
+        real_write(path, text)
+
+    monkeypatch.setattr(config.file_writer, "write_text", failing)
+
+    result = BatchReplaceTool().execute(
+        config,
+        {
+            "edits": [
+                {"file_path": "a.py", "old_text": "a", "new_text": "A"},
+                {"file_path": "b.py", "old_text": "b", "new_text": "B"},
+            ]
+        },
+    )
+
+    assert result.error is not None
+    assert "Failed to write file b.py: read-only" in result.error
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "a\n"
+    assert config.file_cache.load(tmp_path / "a.py").text == "a\n"
+
+
 def test_glob_tool_finds_matching_files(tmp_path: Path) -> None:
     (tmp_path / "a.py").write_text("print(1)\n", encoding="utf-8")
     (tmp_path / "b.txt").write_text("x\n", encoding="utf-8")
@@ -106,6 +208,52 @@ def test_glob_tool_finds_matching_files(tmp_path: Path) -> None:
     assert "sub/c.py" in matches
 
 
+def test_glob_tool_paginates_and_stops_walking_early(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(10):
+        (tmp_path / f"f{index}.txt").write_text("x", encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+    walk = glob_search.iter_workspace_files
+    consumed: list[Path] = []
+
+    def _spy(*args: object, **kwargs: object) -> Iterator[Path]:
+        for path in walk(*args, **kwargs):  # type: ignore[arg-type]
+            consumed.append(path)
+            yield path
+
+    monkeypatch.setattr(glob_search, "iter_workspace_files", _spy)
+    result = GlobSearchTool().execute(config, {"pattern": "*.txt", "max_results": 3, "offset": 2})
+
+    payload = result.return_display
+    assert isinstance(payload, dict)
+    assert payload["matches"] == ["f2.txt", "f3.txt", "f4.txt"]
+    assert payload["truncated"] is True
+    assert payload["next_offset"] == 5
+    assert len(consumed) == 6
+    assert result.llm_content.endswith("(more matches available; call again with offset=5)")
+
+    last = GlobSearchTool().execute(config, {"pattern": "*.txt", "max_results": 3, "offset": 9})
+    assert isinstance(last.return_display, dict)
+    assert last.return_display["matches"] == ["f9.txt"]
+    assert last.return_display["truncated"] is False
+
+
+def test_glob_tool_sorts_by_mtime_newest_first(tmp_path: Path) -> None:
+    for name, seconds in [("old.py", 1), ("new.py", 3), ("mid.py", 2)]:
+        path = tmp_path / name
+        path.write_text("x", encoding="utf-8")
+        os.utime(path, ns=(seconds * 1_000_000_000, seconds * 1_000_000_000))
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    params = {"pattern": "*.py", "sort": "mtime", "max_results": 2}
+    result = GlobSearchTool().execute(config, params)
+
+    assert isinstance(result.return_display, dict)
+    assert result.return_display["matches"] == ["new.py", "mid.py"]
+    assert result.return_display["next_offset"] == 2
+
+
 def test_grep_tool_returns_line_hits(tmp_path: Path) -> None:
     source = tmp_path / "app.py"
     source.write_text("alpha\nneedle line\nomega\n", encoding="utf-8")
@@ -124,3 +272,142 @@ def test_grep_tool_returns_line_hits(tmp_path: Path) -> None:
     assert len(hits) == 1
     assert hits[0]["file_path"] == "app.py"
     assert hits[0]["line_number"] == 2
+
+
+@pytest.mark.parametrize("grep_index", [False, True])
+def test_grep_tool_skips_symlinks_that_escape_the_target(tmp_path: Path, grep_index: bool) -> None:
+    workspace = tmp_path / "ws"
+    outside = tmp_path / "outside"
+    workspace.mkdir()
+    outside.mkdir()
+    (outside / "secret.txt").write_text("SECRET_TOKEN=abc\n", encoding="utf-8")
+    (workspace / "real.txt").write_text("SECRET_TOKEN=local\n", encoding="utf-8")
+    (workspace / "link.txt").symlink_to(Path("..") / "outside" / "secret.txt")
+    (workspace / "alias.txt").symlink_to("real.txt")
+    config = RuntimeConfig(target_dir=workspace, grep_index=grep_index)
+
+    result = GrepSearchTool().execute(config, {"query": "SECRET_TOKEN"})
+
+    assert isinstance(result.return_display, dict)
+    assert sorted(
+        (match["file_path"], match["line"]) for match in result.return_display["matches"]
+    ) == [("alias.txt", "SECRET_TOKEN=local"), ("real.txt", "SECRET_TOKEN=local")]
+
+
+def test_large_result_tools_render_llm_content_lazily(tmp_path: Path) -> None:
+    (tmp_path / "big.txt").write_text("needle\n" * 50, encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    read_result = ReadFileTool().execute(config, {"file_path": "big.txt"})
+    assert read_result._llm_content is None
+    assert isinstance(read_result.return_display, dict)
+    assert read_result.llm_content is read_result.return_display["content"]
+
+    grep_result = GrepSearchTool().execute(config, {"query": "needle", "max_results": 2})
+    assert grep_result._llm_content is None
+    assert grep_result.llm_content == (
+        "Search results for `needle`:\n- big.txt:1: needle\n- big.txt:2: needle"
+    )
+
+    glob_result = GlobSearchTool().execute(config, {"pattern": "*.txt"})
+    assert glob_result._llm_content is None
+    assert glob_result.llm_content == "Glob matches for pattern `*.txt`:\n- big.txt"
+
+
+def test_file_tools_respect_ignore_files(tmp_path: Path) -> None:
+    (tmp_path / ".gitignore").write_text("dist/\n*.log\n", encoding="utf-8")
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "bundle.py").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "run.log").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "app.py").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "blob.bin").write_bytes(b"\x00needle")
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    globbed = GlobSearchTool().execute(config, {"pattern": "**/*"})
+    listed = ListDirectoryTool().execute(config, {"path": "."})
+    grepped = GrepSearchTool().execute(config, {"query": "needle"})
+    unfiltered = GlobSearchTool().execute(config, {"pattern": "**/*", "respect_ignore": False})
+    binary = ReadFileTool().execute(config, {"file_path": "blob.bin"})
+
+    assert isinstance(globbed.return_display, dict)
+    assert globbed.return_display["matches"] == [".gitignore", "app.py", "blob.bin"]
+    assert isinstance(listed.return_display, dict)
+    assert [entry["name"] for entry in listed.return_display["entries"]] == [
+        ".gitignore",
+        "app.py",
+        "blob.bin",
+    ]
+    assert isinstance(grepped.return_display, dict)
+    assert [match["file_path"] for match in grepped.return_display["matches"]] == ["app.py"]
+    assert isinstance(unfiltered.return_display, dict)
+    assert "dist/bundle.py" in unfiltered.return_display["matches"]
+    assert binary.error == "Cannot read binary file: blob.bin"
+
+
+def test_read_file_tool_serves_line_and_byte_ranges(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(file_ranges, "_STRIDE_BYTES", 64)
+    lines = [f"line {index} é" for index in range(1, 301)]
+    (tmp_path / "log.txt").write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+    tool = ReadFileTool()
+
+    middle = tool.execute(config, {"file_path": "log.txt", "offset": 250, "limit": 3})
+    tail = tool.execute(config, {"file_path": "log.txt", "offset": 298})
+    past_end = tool.execute(config, {"file_path": "log.txt", "offset": 300})
+    first = tool.execute(config, {"file_path": "log.txt", "limit": 1})
+    # Byte 8 is the second byte of "é", so the range starts at that character instead.
+    chunk = tool.execute(config, {"file_path": "log.txt", "byte_offset": 8, "byte_length": 10})
+    mixed = tool.execute(config, {"file_path": "log.txt", "offset": 1, "byte_offset": 1})
+
+    assert middle.llm_content == (
+        "[Lines 251-253; more follows, continue with offset=253]\n"
+        "line 251 é\nline 252 é\nline 253 é"
+    )
+    assert isinstance(tail.return_display, dict)
+    assert tail.return_display["content"] == "line 299 é\nline 300 é"
+    assert tail.return_display["next_offset"] is None
+    assert isinstance(past_end.return_display, dict)
+    assert past_end.return_display["content"] == ""
+    assert first.llm_content == "[Lines 1-1; more follows, continue with offset=1]\nline 1 é"
+    assert isinstance(chunk.return_display, dict)
+    assert chunk.return_display["content"] == "é\r\nline 2 "
+    assert chunk.return_display["byte_offset"] == 7
+    assert mixed.error is not None and "not both" in mixed.error
+
+
+def test_read_byte_range_always_advances_past_one_character(tmp_path: Path) -> None:
+    path = tmp_path / "wide.txt"
+    path.write_text("é€😀", encoding="utf-8")
+
+    chunks: list[file_ranges.ByteRange] = []
+    offset = 0
+    for _ in range(3):
+        chunks.append(file_ranges.read_byte_range(path, offset, 1))
+        offset = chunks[-1].end
+
+    assert [chunk.text for chunk in chunks] == ["é", "€", "😀"]
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0, 2), (2, 5), (5, 9)]
+    assert file_ranges.read_byte_range(path, 3, 1).text == "€"
+
+
+def test_read_file_tool_caps_large_files_with_a_preview(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(read_file, "MAX_READ_BYTES", 40)
+    (tmp_path / "big.txt").write_text(
+        "".join(f"row {index:03d}\n" for index in range(50)), encoding="utf-8"
+    )
+    (tmp_path / "small.txt").write_text("tiny\n", encoding="utf-8")
+    config = RuntimeConfig(target_dir=tmp_path)
+
+    preview = ReadFileTool().execute(config, {"file_path": "big.txt"})
+    small = ReadFileTool().execute(config, {"file_path": "small.txt"})
+
+    assert isinstance(preview.return_display, dict)
+    assert preview.return_display["content"].splitlines() == [f"row {i:03d}" for i in range(5)]
+    assert preview.return_display["truncated"] is True
+    assert preview.return_display["next_offset"] == 5
+    assert preview.return_display["file_size"] == 400
+    assert small.llm_content == "tiny\n"
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.tools import grep_engine
+from py_agent_runtime.tools.grep_engine import LinePattern, search_file, search_files, search_text
+
+
+def _per_line(text: str, pattern: re.Pattern[str]) -> list[tuple[int, str]]:
+    lines = enumerate(text.splitlines(), start=1)
+    return [(number, line) for number, line in lines if pattern.search(line)]
+
+
+def test_search_text_matches_per_line_semantics() -> None:
+    text = "alpha\nbeta gamma\n\nbeta\n  \ndelta beta\n"
+    for query in ["beta", "^beta$", "a$", "^$", r"\s+", "a.b", "(?<=a )beta", r"\Abeta"]:
+        pattern = re.compile(query)
+        assert search_text(text, LinePattern(pattern), 100) == _per_line(text, pattern), query
+
+
+def test_search_text_handles_form_feed_lines_and_limits() -> None:
+    text = "one\x0ctwo\nthree two\n"
+    pattern = re.compile("two")
+
+    assert search_text(text, LinePattern(pattern), 100) == _per_line(text, pattern)
+    assert search_text("x\nx\nx\n", LinePattern(re.compile("x")), 2) == [(1, "x"), (2, "x")]
+    assert search_text("", LinePattern(re.compile("x*")), 5) == []
+
+
+def test_search_files_yields_in_order_and_stops_at_limit(tmp_path: Path) -> None:
+    paths = []
+    for index in range(40):
+        path = tmp_path / f"file-{index:02d}.txt"
+        path.write_text("needle\nhay\nneedle\n", encoding="utf-8")
+        paths.append(path)
+    (tmp_path / "binary.bin").write_bytes(b"\xff\xfeneedle")
+    consumed: list[Path] = []
+
+    def _walk() -> Iterator[Path]:
+        for path in [tmp_path / "binary.bin", *paths]:
+            consumed.append(path)
+            yield path
+
+    results = list(search_files(_walk(), LinePattern(re.compile("needle")), 5, workers=2))
+
+    assert [path.name for path, _ in results] == ["file-00.txt", "file-01.txt", "file-02.txt"]
+    assert [hits for _, hits in results][-1] == [(1, "needle")]
+    assert sum(len(hits) for _, hits in results) == 5
+    assert len(consumed) < len(paths)
+
+
+def test_search_file_skips_binary_content(tmp_path: Path) -> None:
+    binary = tmp_path / "image.bin"
+    binary.write_bytes(b"needle\x00needle\n")
+    text = tmp_path / "notes.txt"
+    text.write_text("needle\r\nhay\r\n", encoding="utf-8")
+    pattern = LinePattern(re.compile("needle"))
+
+    assert search_file(binary, pattern, 10) == []
+    assert search_file(text, pattern, 10) == [(1, "needle")]
+
+
+def test_search_file_streams_large_files_with_splitlines_numbering(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(grep_engine, "STREAM_SEARCH_MIN_BYTES", 8)
+    text = "one\x0ctwo\r\nthree\rtwo\n\nlast two\x0c"
+    path = tmp_path / "big.txt"
+    path.write_bytes(text.encode("utf-8"))
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    for query in ["two", "^$", "^", "t"]:
+        pattern = re.compile(query)
+        expected = _per_line(normalized, pattern)
+        assert search_file(path, LinePattern(pattern), 100) == expected, query
+    assert search_file(path, LinePattern(re.compile("two")), 2) == [(2, "two"), (4, "two")]
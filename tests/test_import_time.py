@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that must stay off the import path of light CLI subcommands.
+HEAVY_MODULES = (
+    "py_agent_runtime.agents.llm_runner",
+    "py_agent_runtime.agents.subagent_tool",
+    "py_agent_runtime.llm.anthropic_provider",
+    "py_agent_runtime.llm.failover",
+    "py_agent_runtime.llm.gemini_provider",
+    "py_agent_runtime.llm.huggingface_provider",
+    "py_agent_runtime.llm.normalizer",
+    "py_agent_runtime.llm.openai_provider",
+    "py_agent_runtime.scheduler.scheduler",
+    "concurrent.futures",
+    "openai",
+)
+# `tools list` reads names from the builtin specs, so no tool module should load.
+TOOL_MODULES = (
+    "py_agent_runtime.tools.glob_search",
+    "py_agent_runtime.tools.grep_search",
+    "py_agent_runtime.tools.read_file",
+    "py_agent_runtime.tools.run_shell_command",
+    "py_agent_runtime.tools.write_file",
+)
+# RuntimeConfig builds these on construction, so importing the CLI should not load them.
+CONFIG_FIELD_MODULES = (
+    "py_agent_runtime.runtime.file_cache",
+    "py_agent_runtime.runtime.tool_outputs",
+    "py_agent_runtime.tools.atomic_write",
+    "py_agent_runtime.tools.shell_output",
+)
+# Cumulative `-X importtime` microseconds spent importing py_agent_runtime modules. The
+# slowest light entry point takes about 90 ms here; the budget is roughly twice that.
+IMPORT_TIME_BUDGET_US = 200_000
+IMPORT_TIME_RUNS = 3
+LIGHT_ENTRYPOINTS = [
+    ("-c", "import py_agent_runtime.cli.main"),
+    ("-c", "import py_agent_runtime.llm; import py_agent_runtime.agents"),
+    ("-m", "py_agent_runtime.cli.main", "tools", "list"),
+]
+
+
+def _importtime_lines(*args: str, cwd: Path) -> list[tuple[int, str, bool]]:
+    """(cumulative microseconds, module, is top level) for each `-X importtime` record."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=str(cwd),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records: list[tuple[int, str, bool]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or line.rstrip().endswith("imported package"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module that triggered them.
+        records.append((int(cumulative), name.strip(), not name.startswith("  ")))
+    return records
+
+
+def _imported_modules(*args: str, cwd: Path) -> set[str]:
+    return {name for _, name, _ in _importtime_lines(*args, cwd=cwd)}
+
+
+def _package_import_us(*args: str, cwd: Path) -> int:
+    return sum(
+        cumulative
+        for cumulative, name, top_level in _importtime_lines(*args, cwd=cwd)
+        if top_level and name.split(".", 1)[0] == "py_agent_runtime"
+    )
+
+
+@pytest.mark.parametrize("args", LIGHT_ENTRYPOINTS)
+def test_light_entrypoints_do_not_import_provider_stack(args: tuple[str, ...], tmp_path: Path) -> None:
+    modules = _imported_modules(*args, cwd=tmp_path)
+
+    assert "py_agent_runtime" in modules
+    leaked = sorted(module for module in HEAVY_MODULES if module in modules)
+    assert leaked == []
+
+
+def test_tools_list_does_not_import_tool_modules(tmp_path: Path) -> None:
+    modules = _imported_modules("-m", "py_agent_runtime.cli.main", "tools", "list", cwd=tmp_path)
+
+    assert sorted(module for module in TOOL_MODULES if module in modules) == []
+
+
+def test_cli_import_defers_config_field_modules(tmp_path: Path) -> None:
+    modules = _imported_modules("-c", "import py_agent_runtime.cli.main", cwd=tmp_path)
+
+    assert sorted(module for module in CONFIG_FIELD_MODULES if module in modules) == []
+
+
+@pytest.mark.parametrize("args", LIGHT_ENTRYPOINTS)
+def test_light_entrypoints_stay_within_import_time_budget(
+    args: tuple[str, ...], tmp_path: Path
+) -> None:
+    # The fastest of a few runs filters out scheduler noise.
+    elapsed_us = min(_package_import_us(*args, cwd=tmp_path) for _ in range(IMPORT_TIME_RUNS))
+
+    assert 0 < elapsed_us <= IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_package_exports_still_resolve() -> None:
+    import py_agent_runtime.agents as agents
+    import py_agent_runtime.llm as llm
+
+    assert llm.OpenAIChatProvider.__name__ == "OpenAIChatProvider"
+    assert llm.create_provider.__module__ == "py_agent_runtime.llm.factory"
+    assert agents.LLMAgentRunner.__name__ == "LLMAgentRunner"
+    assert "LLMMessage" in dir(llm)
+    with pytest.raises(AttributeError):
+        _ = llm.DoesNotExist  # type: ignore[attr-defined]
+
+
+def test_cli_imports_without_posix_only_modules(tmp_path: Path) -> None:
+    # Windows has no `resource`; a None entry in sys.modules makes importing it fail.
+    script = (
+        "import sys; sys.modules['resource'] = None; "
+        "import py_agent_runtime.cli.main, py_agent_runtime.tools.run_shell_command"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=str(tmp_path), env=env, capture_output=True, text=True
+    )
+
+    assert completed.returncode == 0, completed.stderr
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+
 import pytest
 
 import py_agent_runtime.llm.factory as llm_factory
@@ -76,3 +78,30 @@ def test_factory_forwards_retry_settings_to_provider(monkeypatch: pytest.MonkeyP
     assert provider.kwargs["max_retries"] == 5
     assert provider.kwargs["retry_base_delay_seconds"] == 0.2
     assert provider.kwargs["retry_max_delay_seconds"] == 1.2
+
+
+def test_factory_supports_registered_entry_point_providers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm_factory, "_PROVIDER_SPECS", dict(llm_factory._PROVIDER_SPECS))
+    llm_factory.register_provider(
+        "echo",
+        "tests_support_echo_provider:EchoProvider",
+        default_model="echo-1",
+    )
+
+    class EchoProvider:
+        def __init__(self, model: str, **kwargs: object) -> None:
+            self.model = model
+
+    module = type(sys)("tests_support_echo_provider")
+    module.EchoProvider = EchoProvider  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "tests_support_echo_provider", module)
+
+    provider = llm_factory.create_provider("echo")
+    assert isinstance(provider, EchoProvider)
+    assert provider.model == "echo-1"
+    assert "echo" in llm_factory.get_registered_provider_names()
+
+
+def test_factory_rejects_malformed_entry_point() -> None:
+    with pytest.raises(ValueError):
+        llm_factory.register_provider("bad", "no_colon_here")
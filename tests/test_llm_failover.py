@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Sequence
+
+import pytest
+
+import py_agent_runtime.llm.factory as llm_factory
+from py_agent_runtime.llm.base_provider import (
+    LLMProvider,
+    LLMStreamAbortedError,
+    ToolCallDeltaHandler,
+)
+from py_agent_runtime.llm.failover import FailoverProvider, FailoverTarget
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCallDelta, LLMTurnResponse
+
+
+class StatusError(RuntimeError):
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ScriptedProvider(LLMProvider):
+    def __init__(
+        self,
+        name: str,
+        *,
+        error: Exception | None = None,
+        gate: threading.Event | None = None,
+    ) -> None:
+        self.name = name
+        self.error = error
+        self.gate = gate
+        self.models: list[str | None] = []
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self.models.append(model)
+        if self.gate is not None:
+            self.gate.wait(timeout=5.0)
+        if self.error is not None:
+            raise self.error
+        return LLMTurnResponse(content=self.name, tool_calls=[])
+
+
+_MESSAGES = [LLMMessage(role="user", content="hi")]
+
+
+def test_failover_provider_uses_primary_when_healthy() -> None:
+    primary = ScriptedProvider("primary")
+    secondary = ScriptedProvider("secondary")
+    provider = FailoverProvider(
+        [FailoverTarget(primary, model="m1"), FailoverTarget(secondary, model="m2")]
+    )
+
+    response = provider.generate(_MESSAGES, model="ignored")
+
+    assert response.content == "primary"
+    assert primary.models == ["m1"]
+    assert secondary.models == []
+
+
+def test_failover_provider_fails_over_on_retryable_error() -> None:
+    primary = ScriptedProvider("primary", error=StatusError("overloaded", 503))
+    secondary = ScriptedProvider("secondary")
+    provider = FailoverProvider([FailoverTarget(primary), FailoverTarget(secondary, model="m2")])
+
+    response = provider.generate(_MESSAGES, model="m1")
+
+    assert response.content == "secondary"
+    assert primary.models == ["m1"]
+    assert secondary.models == ["m2"]
+    assert provider.stats().failovers == 1
+
+
+def test_failover_provider_raises_non_retryable_error() -> None:
+    primary = ScriptedProvider("primary", error=StatusError("bad request", 400))
+    secondary = ScriptedProvider("secondary")
+    provider = FailoverProvider([FailoverTarget(primary), FailoverTarget(secondary)])
+
+    with pytest.raises(StatusError):
+        provider.generate(_MESSAGES)
+    assert secondary.models == []
+
+
+def test_failover_provider_raises_last_error_when_all_targets_fail() -> None:
+    provider = FailoverProvider(
+        [
+            FailoverTarget(ScriptedProvider("a", error=StatusError("a", 503))),
+            FailoverTarget(ScriptedProvider("b", error=StatusError("b", 429))),
+        ]
+    )
+
+    with pytest.raises(StatusError, match="b"):
+        provider.generate(_MESSAGES)
+
+
+def test_failover_provider_hedges_slow_primary() -> None:
+    gate = threading.Event()
+    primary = ScriptedProvider("primary")
+    secondary = ScriptedProvider("secondary")
+    provider = FailoverProvider(
+        [FailoverTarget(primary), FailoverTarget(secondary)],
+        hedge_percentile=90,
+        hedge_min_samples=3,
+    )
+    for _ in range(3):
+        assert provider.generate(_MESSAGES).content == "primary"
+    assert provider.hedge_threshold_seconds() is not None
+
+    primary.gate = gate
+    try:
+        response = provider.generate(_MESSAGES)
+    finally:
+        gate.set()
+
+    assert response.content == "secondary"
+    stats = provider.stats()
+    assert stats.hedged_requests == 1
+    assert stats.hedge_wins == 1
+
+
+def test_failover_provider_rejects_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        FailoverProvider([])
+    with pytest.raises(ValueError):
+        FailoverProvider([FailoverTarget(ScriptedProvider("a"))], hedge_percentile=100)
+
+
+def test_factory_builds_failover_provider_from_targets(monkeypatch: pytest.MonkeyPatch) -> None:
+    created: list[tuple[str, str | None]] = []
+
+    def _create_provider(provider: str, *, model: str | None = None, **kwargs: object) -> LLMProvider:
+        created.append((provider, model))
+        return ScriptedProvider(provider)
+
+    monkeypatch.setattr(llm_factory, "create_provider", _create_provider)
+    provider = llm_factory.create_failover_provider(
+        [("openai", "gpt-x"), ("anthropic", "claude-x")],
+    )
+
+    assert isinstance(provider, FailoverProvider)
+    assert created == [("openai", "gpt-x"), ("anthropic", "claude-x")]
+    assert provider.generate(_MESSAGES).content == "openai"
+
+
+class StreamingProvider(ScriptedProvider):
+    def __init__(self, name: str, *, deltas: int = 0, error: Exception | None = None) -> None:
+        super().__init__(name, error=error)
+        self.deltas = deltas
+        self.streamed = 0
+
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        self.streamed += 1
+        for index in range(self.deltas):
+            reason = on_tool_call_delta(LLMToolCallDelta(index=index, name="write_file", arguments_delta=""))
+            if reason is not None:
+                raise LLMStreamAbortedError(reason)
+        if self.error is not None:
+            raise self.error
+        return LLMTurnResponse(content=self.name, tool_calls=[])
+
+
+def test_failover_provider_forwards_streaming_and_fails_over_before_deltas() -> None:
+    primary = StreamingProvider("primary", error=StatusError("down", 503))
+    secondary = StreamingProvider("secondary", deltas=1)
+    provider = FailoverProvider([FailoverTarget(primary), FailoverTarget(secondary)])
+    seen: list[LLMToolCallDelta] = []
+
+    def _record(delta: LLMToolCallDelta) -> str | None:
+        seen.append(delta)
+        return None
+
+    response = provider.generate_streaming(_MESSAGES, on_tool_call_delta=_record)
+
+    assert response.content == "secondary"
+    assert (primary.streamed, secondary.streamed) == (1, 1)
+    assert primary.models == [] and secondary.models == []  # never fell back to generate()
+    assert len(seen) == 1
+    assert provider.stats().failovers == 1
+
+
+def test_failover_provider_streaming_does_not_fail_over_after_deltas_or_abort() -> None:
+    primary = StreamingProvider("primary", deltas=1, error=StatusError("reset", 503))
+    secondary = StreamingProvider("secondary")
+    provider = FailoverProvider([FailoverTarget(primary), FailoverTarget(secondary)])
+
+    with pytest.raises(StatusError):
+        provider.generate_streaming(_MESSAGES, on_tool_call_delta=lambda delta: None)
+    with pytest.raises(LLMStreamAbortedError):
+        provider.generate_streaming(_MESSAGES, on_tool_call_delta=lambda delta: "stop")
+    assert secondary.streamed == 0
+
+
+def test_failover_provider_close_shuts_down_hedge_pool() -> None:
+    primary = ScriptedProvider("primary")
+    with FailoverProvider(
+        [FailoverTarget(primary), FailoverTarget(ScriptedProvider("secondary"))],
+        hedge_percentile=50,
+        hedge_min_samples=1,
+    ) as provider:
+        provider.generate(_MESSAGES)
+        provider.generate(_MESSAGES)
+        executor = provider._executor
+        assert executor is not None
+
+    assert provider._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Sequence
+
+import pytest
+
+from py_agent_runtime.llm.base_provider import LLMProvider
+from py_agent_runtime.llm.rate_limit import (
+    RateLimitedProvider,
+    RateLimiter,
+    estimate_request_tokens,
+    get_shared_rate_limiter,
+    reset_shared_rate_limiters,
+)
+from py_agent_runtime.llm.types import LLMMessage, LLMTurnResponse
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class EchoProvider(LLMProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+    ) -> LLMTurnResponse:
+        self.calls += 1
+        return LLMTurnResponse(content="ok", tool_calls=[])
+
+
+def test_estimate_request_tokens_grows_with_message_size() -> None:
+    small = estimate_request_tokens([LLMMessage(role="user", content="hi")])
+    large = estimate_request_tokens([LLMMessage(role="user", content="hi" * 400)])
+    assert small >= 1
+    assert large > small
+
+
+def test_rate_limiter_blocks_when_requests_per_minute_exhausted() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, clock=clock, sleep_fn=clock.sleep)
+
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) == 0.0
+    waited = limiter.acquire(1)
+
+    assert waited == pytest.approx(30.0)
+    assert clock.sleeps == [pytest.approx(30.0)]
+    metrics = limiter.metrics()
+    assert metrics.admitted_requests == 3
+    assert metrics.waited_requests == 1
+    assert metrics.max_wait_seconds == pytest.approx(30.0)
+    assert metrics.queue_depth == 0
+
+
+def test_rate_limiter_blocks_when_tokens_per_minute_exhausted() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=600, clock=clock, sleep_fn=clock.sleep)
+
+    limiter.acquire(500)
+    waited = limiter.acquire(200)
+
+    assert waited == pytest.approx(10.0)
+    assert limiter.metrics().admitted_tokens == 700
+
+
+def test_rate_limiter_clamps_oversized_requests_to_bucket_capacity() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=100, clock=clock, sleep_fn=clock.sleep)
+
+    assert limiter.acquire(10_000) == 0.0
+    assert limiter.acquire(10_000) == pytest.approx(60.0)
+
+
+def test_rate_limiter_admits_higher_priority_waiters_first() -> None:
+    clock = FakeClock()
+    gate = threading.Event()
+    clock_lock = threading.Lock()
+
+    def _gated_sleep(seconds: float) -> None:
+        gate.wait(timeout=5.0)
+        with clock_lock:
+            clock.now += seconds
+
+    limiter = RateLimiter(requests_per_minute=1, clock=clock, sleep_fn=_gated_sleep)
+    limiter.acquire(1)  # drain the bucket so later callers must queue
+    order: list[str] = []
+
+    def _worker(name: str, priority: int) -> None:
+        limiter.acquire(1, priority=priority)
+        order.append(name)
+
+    low = threading.Thread(target=_worker, args=("low", 0))
+    high = threading.Thread(target=_worker, args=("high", 5))
+    low.start()
+    deadline = time.monotonic() + 5.0
+    while limiter.metrics().queue_depth < 1 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    high.start()
+    while limiter.metrics().queue_depth < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    gate.set()
+    low.join(timeout=5.0)
+    high.join(timeout=5.0)
+
+    assert order == ["high", "low"]
+
+
+def test_rate_limited_provider_acquires_before_generate() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=1, clock=clock, sleep_fn=clock.sleep)
+    inner = EchoProvider()
+    provider = RateLimitedProvider(inner, limiter)
+
+    provider.generate([LLMMessage(role="user", content="one")])
+    provider.generate([LLMMessage(role="user", content="two")])
+
+    assert inner.calls == 2
+    assert clock.sleeps == [pytest.approx(60.0)]
+    assert provider.limiter.metrics().admitted_requests == 2
+
+
+def test_shared_rate_limiter_is_reused_per_key() -> None:
+    reset_shared_rate_limiters()
+    try:
+        first = get_shared_rate_limiter("openai", requests_per_minute=10)
+        second = get_shared_rate_limiter("openai", requests_per_minute=10)
+        other = get_shared_rate_limiter("gemini", requests_per_minute=10)
+        assert first is second
+        assert first is not other
+        with pytest.raises(ValueError, match="already exists"):
+            get_shared_rate_limiter("openai", requests_per_minute=99)
+        with pytest.raises(ValueError, match="already exists"):
+            get_shared_rate_limiter("openai", requests_per_minute=10, tokens_per_minute=500)
+    finally:
+        reset_shared_rate_limiters()
+
+
+def test_rate_limiter_rejects_non_positive_limits() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_minute=0)
+    with pytest.raises(ValueError):
+        RateLimiter(tokens_per_minute=-1)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from py_agent_runtime.llm.normalizer import parse_openai_chat_completion
+from py_agent_runtime.llm.raw_retention import (
+    RawResponseRef,
+    RawRetentionMode,
+    RawRetentionPolicy,
+    load_spilled_raw,
+    retain_raw,
+)
+
+
+def _fake_completion() -> SimpleNamespace:
+    return SimpleNamespace(
+        id="chatcmpl-1",
+        model="gpt-x",
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=2),
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content="x" * 1000, tool_calls=[]),
+                finish_reason="stop",
+            )
+        ],
+    )
+
+
+def test_retain_raw_full_keeps_original_object() -> None:
+    raw = _fake_completion()
+    assert retain_raw(raw, None) is raw
+    assert retain_raw(raw, RawRetentionPolicy()) is raw
+
+
+def test_retain_raw_none_drops_payload() -> None:
+    response = parse_openai_chat_completion(
+        _fake_completion(),
+        raw_retention=RawRetentionPolicy(mode=RawRetentionMode.NONE),
+    )
+    assert response.content == "x" * 1000
+    assert response.raw is None
+
+
+def test_retain_raw_compact_keeps_only_metadata() -> None:
+    compact = retain_raw(_fake_completion(), RawRetentionPolicy(mode=RawRetentionMode.COMPACT))
+    assert compact == {
+        "id": "chatcmpl-1",
+        "model": "gpt-x",
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2},
+    }
+
+
+def test_retain_raw_spill_writes_trace_and_returns_reference(tmp_path: Path) -> None:
+    policy = RawRetentionPolicy(mode=RawRetentionMode.SPILL, spill_dir=tmp_path / "traces")
+    first = retain_raw(_fake_completion(), policy)
+    second = retain_raw({"id": "other"}, policy)
+
+    assert isinstance(first, RawResponseRef)
+    assert isinstance(second, RawResponseRef)
+    assert first.trace_path == second.trace_path
+    assert first.response_id != second.response_id
+    assert load_spilled_raw(first)["id"] == "chatcmpl-1"
+    assert load_spilled_raw(second) == {"id": "other"}
+
+
+def test_spill_policy_requires_directory() -> None:
+    with pytest.raises(ValueError):
+        RawRetentionPolicy(mode=RawRetentionMode.SPILL)
@@ -4,11 +4,17 @@ import json
 from pathlib import Path
 from typing import Any, Mapping, Sequence
 
+from py_agent_runtime.agents.context_budget import ContextBudgetManager, TruncateOldToolOutputs
 from py_agent_runtime.agents.llm_runner import LLMAgentRunner
-from py_agent_runtime.llm.base_provider import LLMProvider
-from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMTurnResponse
+from py_agent_runtime.llm.base_provider import (
+    LLMProvider,
+    LLMStreamAbortedError,
+    ToolCallDeltaHandler,
+)
+from py_agent_runtime.llm.types import LLMMessage, LLMToolCall, LLMToolCallDelta, LLMTurnResponse
 from py_agent_runtime.policy.types import PolicyDecision, PolicyRule
 from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.tool_outputs import ToolOutputLimits
 from py_agent_runtime.tools.base import BaseTool, ToolResult
 
 
@@ -342,3 +348,164 @@ def test_llm_runner_recovery_turn_rejects_non_complete_tool_calls() -> None:
     assert result.error is not None
     assert "complete_task" in result.error
     assert result.turns == 1
+
+
+def test_llm_runner_compacts_history_with_context_budget() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True)
+    echo = EchoTool()
+    config.tool_registry.register_tool(echo)
+    _allow_tool(config, "echo")
+
+    responses = [
+        LLMTurnResponse(
+            content=None,
+            tool_calls=[
+                LLMToolCall(name="echo", args={"text": str(index) * 400}, call_id=f"call_{index}")
+            ],
+        )
+        for index in range(3)
+    ]
+    responses.append(
+        LLMTurnResponse(
+            content=None,
+            tool_calls=[LLMToolCall(name="complete_task", args={"result": "done"}, call_id="done")],
+        )
+    )
+    provider = FakeProvider(responses=responses)
+
+    def estimator(messages, tools=None) -> int:  # noqa: ANN001
+        return sum(len(message.content or "") for message in messages)
+
+    budget = ContextBudgetManager(
+        900,
+        reserve_output_tokens=0,
+        strategies=[TruncateOldToolOutputs(keep_recent=1, max_chars=100)],
+        token_estimator=estimator,
+    )
+    runner = LLMAgentRunner(config=config, provider=provider, max_turns=5, context_budget=budget)
+    result = runner.run("do task")
+
+    assert result.success is True
+    assert budget.compactions >= 1
+    assert all(estimator(call) <= 900 for call in provider.calls)
+    last_tool_contents = [m.content or "" for m in provider.calls[-1] if m.role == "tool"]
+    assert "chars truncated" in last_tool_contents[0]
+    assert "chars truncated" not in last_tool_contents[-1]
+
+
+def test_llm_runner_fails_when_context_budget_cannot_fit() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True)
+    provider = FakeProvider(responses=[])
+    budget = ContextBudgetManager(
+        5,
+        reserve_output_tokens=0,
+        token_estimator=lambda messages, tools=None: 100,
+    )
+    runner = LLMAgentRunner(config=config, provider=provider, context_budget=budget)
+    result = runner.run("do task")
+
+    assert result.success is False
+    assert "context budget" in (result.error or "")
+    assert provider.calls == []
+
+
+def test_llm_runner_bounds_large_tool_output_in_history(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path, interactive=True)
+    echo = EchoTool()
+    config.tool_registry.register_tool(echo)
+    _allow_tool(config, "echo")
+
+    big_text = "start-" + "z" * 10_000 + "-end"
+    provider = FakeProvider(
+        responses=[
+            LLMTurnResponse(
+                content=None,
+                tool_calls=[LLMToolCall(name="echo", args={"text": big_text}, call_id="call_1")],
+            ),
+            LLMTurnResponse(
+                content=None,
+                tool_calls=[
+                    LLMToolCall(name="complete_task", args={"result": "done"}, call_id="done")
+                ],
+            ),
+        ]
+    )
+    runner = LLMAgentRunner(
+        config=config,
+        provider=provider,
+        tool_output_limits=ToolOutputLimits(default_max_chars=500, per_tool={}),
+    )
+    result = runner.run("do task")
+
+    assert result.success is True
+    tool_message = next(m for m in provider.calls[1] if m.role == "tool")
+    payload = json.loads(tool_message.content or "{}")
+    assert payload["truncated"] is True
+    assert len(tool_message.content or "") < 1_000
+    assert payload["result_display"].startswith("start-")
+    assert payload["result_display"].endswith("-end")
+    spilled, _ = config.tool_output_store.read(payload["output_handles"][0])
+    assert spilled == big_text
+
+
+class StreamingFakeProvider(FakeProvider):
+    def __init__(self, streams: Sequence[list[str]]) -> None:
+        super().__init__(responses=[])
+        self._streams = list(streams)
+        self.delivered: list[int] = []
+
+    def generate_streaming(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[dict[str, Any]] | None = None,
+        *,
+        model: str | None = None,
+        temperature: float | None = None,
+        on_tool_call_delta: ToolCallDeltaHandler,
+    ) -> LLMTurnResponse:
+        self.calls.append(list(messages))
+        chunks = self._streams.pop(0)
+        for count, chunk in enumerate(chunks, start=1):
+            error = on_tool_call_delta(
+                LLMToolCallDelta(index=0, name="complete_task", arguments_delta=chunk)
+            )
+            if error:
+                self.delivered.append(count)
+                raise LLMStreamAbortedError(error)
+        self.delivered.append(len(chunks))
+        return LLMTurnResponse(
+            content=None,
+            tool_calls=[LLMToolCall(name="complete_task", args=json.loads("".join(chunks)))],
+        )
+
+
+def test_llm_runner_aborts_streamed_completion_early_and_reprompts() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True)
+    bad_result = json.dumps({"result": json.dumps({"summary": 1, "notes": "x" * 400})})
+    good_result = json.dumps({"result": json.dumps({"summary": "done"})})
+    provider = StreamingFakeProvider(
+        streams=[
+            [bad_result[start : start + 8] for start in range(0, len(bad_result), 8)],
+            [good_result],
+        ]
+    )
+    runner = LLMAgentRunner(
+        config=config,
+        provider=provider,
+        enable_recovery_turn=False,
+        completion_schema={
+            "type": "object",
+            "required": ["summary"],
+            "properties": {"summary": {"type": "string"}},
+        },
+    )
+
+    result = runner.run("do task")
+
+    assert result.success is True
+    assert result.result == json.dumps({"summary": "done"})
+    assert result.turns == 2
+    assert provider.delivered[0] < 5
+    reprompt = provider.calls[1][-1]
+    assert reprompt.role == "user"
+    assert "$.summary must be a string" in (reprompt.content or "")
@@ -4,7 +4,9 @@ from types import SimpleNamespace
 
 import pytest
 
+from py_agent_runtime.llm.base_provider import LLMStreamAbortedError
 from py_agent_runtime.llm.openai_provider import OpenAIChatProvider
+from py_agent_runtime.llm.raw_retention import RawRetentionMode, RawRetentionPolicy
 from py_agent_runtime.llm.types import LLMMessage
 
 
@@ -132,3 +134,94 @@ def test_openai_provider_passes_retry_backoff_settings(
     assert captured["max_retries"] == 3
     assert captured["base_delay_seconds"] == 0.25
     assert captured["max_delay_seconds"] == 1.5
+
+
+def test_openai_provider_applies_raw_retention_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    provider = OpenAIChatProvider(
+        client=FakeOpenAIClient(),
+        raw_retention=RawRetentionPolicy(mode=RawRetentionMode.NONE),
+    )
+    response = provider.generate(messages=[LLMMessage(role="user", content="hello")])
+    assert response.content == "ok"
+    assert response.raw is None
+
+
+class FakeStream:
+    def __init__(self, chunks: list[object]) -> None:
+        self._chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):  # noqa: ANN204
+        for chunk in self._chunks:
+            self.consumed += 1
+            yield chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _tool_chunk(arguments: str, *, name: str | None = None, call_id: str | None = None) -> object:
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                delta=SimpleNamespace(
+                    content=None,
+                    tool_calls=[
+                        SimpleNamespace(
+                            index=0,
+                            id=call_id,
+                            function=SimpleNamespace(name=name, arguments=arguments),
+                        )
+                    ],
+                ),
+                finish_reason=None,
+            )
+        ]
+    )
+
+
+def test_openai_provider_streams_tool_call_deltas(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    fake_client = FakeOpenAIClient()
+    stream = FakeStream(
+        [
+            _tool_chunk('{"res', name="complete_task", call_id="call-1"),
+            _tool_chunk('ult": "done"}'),
+            SimpleNamespace(
+                choices=[SimpleNamespace(delta=None, finish_reason="tool_calls")]
+            ),
+        ]
+    )
+    fake_client.chat.completions.create = lambda **kwargs: stream  # type: ignore[method-assign]
+    provider = OpenAIChatProvider(client=fake_client)
+    seen: list[str] = []
+
+    response = provider.generate_streaming(
+        messages=[LLMMessage(role="user", content="hello")],
+        on_tool_call_delta=lambda delta: seen.append(delta.arguments_delta) or None,
+    )
+
+    assert seen == ['{"res', 'ult": "done"}']
+    assert response.finish_reason == "tool_calls"
+    assert response.tool_calls[0].name == "complete_task"
+    assert response.tool_calls[0].args == {"result": "done"}
+    assert response.tool_calls[0].call_id == "call-1"
+    assert stream.closed is True
+
+
+def test_openai_provider_stream_abort_closes_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    fake_client = FakeOpenAIClient()
+    stream = FakeStream([_tool_chunk("{", name="complete_task"), _tool_chunk("}")])
+    fake_client.chat.completions.create = lambda **kwargs: stream  # type: ignore[method-assign]
+    provider = OpenAIChatProvider(client=fake_client)
+
+    with pytest.raises(LLMStreamAbortedError, match="schema"):
+        provider.generate_streaming(
+            messages=[LLMMessage(role="user", content="hello")],
+            on_tool_call_delta=lambda delta: "schema violation",
+        )
+    assert stream.consumed == 1
+    assert stream.closed is True
@@ -30,9 +30,11 @@ def test_auto_edit_mode_allows_write_tools_from_default_policies() -> None:
 
     write_result = config.policy_engine.check(PolicyCheckInput(name="write_file"))
     replace_result = config.policy_engine.check(PolicyCheckInput(name="replace"))
+    batch_result = config.policy_engine.check(PolicyCheckInput(name="batch_replace"))
 
     assert write_result.decision == PolicyDecision.ALLOW
     assert replace_result.decision == PolicyDecision.ALLOW
+    assert batch_result.decision == PolicyDecision.ALLOW
 
 
 def test_yolo_mode_enables_catch_all_allow_except_explicit_ask_user() -> None:
@@ -60,6 +62,13 @@ def test_plan_mode_applies_catch_all_deny_with_explicit_read_tool_allow() -> Non
 
     read_result = config.policy_engine.check(PolicyCheckInput(name="read_file"))
     write_result = config.policy_engine.check(PolicyCheckInput(name="write_file"))
+    batch_result = config.policy_engine.check(
+        PolicyCheckInput(
+            name="batch_replace",
+            args={"edits": [{"file_path": "/w/.gemini/tmp/s/plans/p.md"}]},
+        )
+    )
 
     assert read_result.decision == PolicyDecision.ALLOW
     assert write_result.decision == PolicyDecision.DENY
+    assert batch_result.decision == PolicyDecision.DENY
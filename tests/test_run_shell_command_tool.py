@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import os
+import resource
 import sys
+import time
 from pathlib import Path
 
+import pytest
+
+from py_agent_runtime.bus.types import Message, MessageBusType
 from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.base import current_tool_call_id
 from py_agent_runtime.tools.run_shell_command import RunShellCommandTool
+from py_agent_runtime.tools import shell_output
+from py_agent_runtime.tools.shell_output import HeadTailBuffer, ShellResourceLimits, run_streaming
 
 
 def test_run_shell_command_success(tmp_path: Path) -> None:
@@ -61,3 +70,186 @@ def test_run_shell_command_denies_cwd_escape(tmp_path: Path) -> None:
     )
     assert result.error is not None
     assert "access denied" in result.error.lower()
+
+
+def test_run_shell_command_keeps_head_and_tail_of_large_output(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path, shell_output_max_bytes=1000)
+    tool = RunShellCommandTool()
+
+    script = "import sys; sys.stdout.write('START' + 'x' * 200000 + 'END')"
+    result = tool.execute(config, {"command": f'"{sys.executable}" -c "{script}"'})
+
+    assert result.error is None
+    payload = result.return_display
+    assert isinstance(payload, dict)
+    assert payload["stdout_bytes"] == 200008
+    assert payload["output_truncated"] is True
+    assert payload["stdout"].startswith("START")
+    assert payload["stdout"].endswith("END")
+    assert "[... 199008 bytes omitted ...]" in payload["stdout"]
+    assert len(payload["stdout"]) < 1100
+
+
+def test_head_tail_buffer_drops_partial_characters_at_the_cut() -> None:
+    buffer = HeadTailBuffer(8)
+    buffer.write("ééé".encode("utf-8"))  # 6 bytes: fits
+    assert buffer.text() == "ééé"
+
+    buffer.write("ééé".encode("utf-8"))
+    assert buffer.omitted == 4
+    assert buffer.text() == "éé\n[... 4 bytes omitted ...]\néé"
+
+
+def test_run_shell_command_publishes_output_while_running(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path)
+    events: list[Message] = []
+    config.message_bus.subscribe(MessageBusType.TOOL_OUTPUT_UPDATE, events.append)
+    tool = RunShellCommandTool()
+
+    script = (
+        "import sys, time; print('one', flush=True); time.sleep(0.5); "
+        "print('two', flush=True); print('oops', file=sys.stderr)"
+    )
+    token = current_tool_call_id.set("call-1")
+    try:
+        result = tool.execute(config, {"command": f'"{sys.executable}" -c "{script}"'})
+    finally:
+        current_tool_call_id.reset(token)
+
+    assert result.error is None
+    stdout_events = [event.payload for event in events if event.payload["stream"] == "stdout"]
+    assert [event["text"] for event in stdout_events] == ["one\n", "two\n"]
+    assert all(event["call_id"] == "call-1" for event in stdout_events)
+    stderr_text = "".join(
+        event.payload["text"] for event in events if event.payload["stream"] == "stderr"
+    )
+    assert stderr_text == "oops\n"
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as handle:
+            state = handle.read().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    except OSError:  # pragma: no cover - no procfs
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+    return state != "Z"
+
+
+def test_run_shell_command_timeout_kills_the_whole_process_group(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path)
+    tool = RunShellCommandTool()
+
+    script = (
+        "import subprocess, sys, time; "
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+        "print(child.pid, flush=True); time.sleep(60)"
+    )
+    started = time.monotonic()
+    result = tool.execute(
+        config, {"command": f'"{sys.executable}" -c "{script}"', "timeout_seconds": 1}
+    )
+
+    assert time.monotonic() - started < 10
+    payload = result.return_display
+    assert isinstance(payload, dict)
+    assert payload["timed_out"] is True
+    grandchild = int(payload["stdout"].split()[0])
+    deadline = time.monotonic() + 5
+    while _is_running(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _is_running(grandchild)
+
+
+def test_run_shell_command_reports_cpu_time_and_peak_rss(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path)
+    tool = RunShellCommandTool()
+
+    script = "block = bytearray(64 * 1024 * 1024); sum(range(2000000))"
+    result = tool.execute(config, {"command": f'"{sys.executable}" -c "{script}"'})
+
+    assert result.error is None
+    payload = result.return_display
+    assert isinstance(payload, dict)
+    assert payload["cpu_seconds"] > 0
+    assert payload["peak_rss_bytes"] >= 64 * 1024 * 1024
+
+
+def test_run_shell_command_applies_resource_limits(tmp_path: Path) -> None:
+    config = RuntimeConfig(
+        target_dir=tmp_path,
+        shell_limits=ShellResourceLimits(address_space_bytes=512 * 1024 * 1024),
+    )
+    tool = RunShellCommandTool()
+
+    script = "bytearray(1024 * 1024 * 1024)"
+    result = tool.execute(config, {"command": f'"{sys.executable}" -c "{script}"'})
+
+    assert result.error is not None
+    payload = result.return_display
+    assert isinstance(payload, dict)
+    assert "MemoryError" in payload["stderr"]
+    with pytest.raises(ValueError, match="cpu_seconds"):
+        ShellResourceLimits(cpu_seconds=0)
+
+
+def test_run_streaming_sets_limits_without_preexec_fn(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    popen_kwargs: list[dict[str, object]] = []
+    real_popen = shell_output.subprocess.Popen
+
+    def spy(*args: object, **kwargs: object) -> object:
+        popen_kwargs.append(kwargs)
+        return real_popen(*args, **kwargs)  # type: ignore[call-overload]
+
+    monkeypatch.setattr(shell_output.subprocess, "Popen", spy)
+    limits = ShellResourceLimits(cpu_seconds=7, max_processes=50_000)
+    script = (
+        "import resource; "
+        "print(resource.getrlimit(resource.RLIMIT_CPU), resource.getrlimit(resource.RLIMIT_NPROC))"
+    )
+
+    # The limits must already be in place when the command's first child starts.
+    runs = [
+        run_streaming(f'"{sys.executable}" -c "{script}" | cat', tmp_path, 10, 1024, limits=limits)
+        for _ in range(5)
+    ]
+
+    nproc = dict(limits.rlimits())[resource.RLIMIT_NPROC]  # capped at the hard limit
+    assert all("preexec_fn" not in kwargs for kwargs in popen_kwargs)
+    assert {run.stdout.text().strip() for run in runs} == {f"(7, 7) {nproc}"}
+
+
+def test_run_streaming_falls_back_to_subprocess_run_without_posix_processes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(shell_output, "_POSIX_PROCESSES", False)
+    monkeypatch.setattr(
+        shell_output.os, "wait4", lambda *args: pytest.fail("wait4 used"), raising=False
+    )
+    seen: list[tuple[str, bytes]] = []
+
+    class _Sink:
+        def on_output(self, stream: str, data: bytes) -> None:
+            seen.append((stream, data))
+
+        def flush(self) -> None:
+            pass
+
+    done = run_streaming("echo out; echo err >&2; exit 3", tmp_path, 10, 1024, _Sink())
+    slow = run_streaming(f'"{sys.executable}" -c "import time; time.sleep(5)"', tmp_path, 0.2, 1024)
+
+    assert (done.exit_code, done.timed_out) == (3, False)
+    assert (done.stdout.text(), done.stderr.text()) == ("out\n", "err\n")
+    assert seen == [("stdout", b"out\n"), ("stderr", b"err\n")]
+    assert (done.cpu_seconds, done.peak_rss_bytes) == (0.0, 0)
+    assert (slow.exit_code, slow.timed_out) == (None, True)
+    with pytest.raises(ValueError, match="POSIX"):
+        run_streaming("true", tmp_path, 10, 1024, limits=ShellResourceLimits(cpu_seconds=1))
+
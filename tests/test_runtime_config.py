@@ -29,3 +29,14 @@ def test_runtime_config_set_interactive_updates_policy_engine() -> None:
     after = config.policy_engine.check(PolicyCheckInput(name="ask_user_tool"))
     assert after.decision == PolicyDecision.DENY
 
+
+
+def test_runtime_config_builds_lazily_imported_fields(tmp_path: Path) -> None:
+    from py_agent_runtime.runtime.file_cache import DEFAULT_FILE_CACHE_MAX_BYTES
+    from py_agent_runtime.tools.atomic_write import WriteDurability
+
+    config = RuntimeConfig(target_dir=tmp_path, write_durability="turn")
+
+    assert config.write_durability is WriteDurability.TURN
+    assert config.file_cache.stats().max_bytes == DEFAULT_FILE_CACHE_MAX_BYTES
+    assert RuntimeConfig(target_dir=tmp_path).write_durability is WriteDurability.NONE
@@ -1,6 +1,8 @@
+import threading
 from pathlib import Path
 from typing import Any, Mapping
 
+from py_agent_runtime.agents.agent_scheduler import schedule_agent_tools
 from py_agent_runtime.agents.subagent_tool import SubagentToolWrapper
 from py_agent_runtime.agents.types import AgentDefinition, AgentKind
 from py_agent_runtime.policy.types import PolicyDecision, PolicyRule
@@ -235,3 +237,147 @@ def test_subagent_tool_completion_schema_success_with_structured_output() -> Non
     result = scheduler.schedule([call])[0]
 
     assert result.status == CoreToolCallStatus.SUCCESS
+
+
+class RendezvousTool(BaseTool):
+    name = "rendezvous"
+    description = "Track how many calls are in flight at once."
+
+    def __init__(self, parties: int, timeout: float = 5.0) -> None:
+        self._barrier = threading.Barrier(parties, timeout=timeout)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def validate_params(self, params: Mapping[str, Any]) -> str | None:
+        return None
+
+    def execute(self, config: RuntimeConfig, params: Mapping[str, Any]) -> ToolResult:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self._barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            with self._lock:
+                self.active -= 1
+        return ToolResult(llm_content="ok", return_display="ok")
+
+
+def _register_fanout_agents(config: RuntimeConfig, names: list[str]) -> None:
+    for name in names:
+        definition = AgentDefinition(
+            kind=AgentKind.LOCAL,
+            name=name,
+            description="Fan-out worker",
+            tool_names=("rendezvous",),
+        )
+        assert config.get_agent_registry().register_agent(definition) is True
+        config.tool_registry.register_tool(SubagentToolWrapper(definition).build())
+        _allow_tool(config, name)
+
+
+def _fanout_call(name: str) -> ToolCallRequestInfo:
+    return ToolCallRequestInfo(
+        name=name,
+        args={
+            "turns": [
+                [{"name": "rendezvous", "args": {}}],
+                [{"name": "complete_task", "args": {"result": name}}],
+            ]
+        },
+        call_id=f"call-{name}",
+    )
+
+
+def test_same_turn_subagent_calls_run_concurrently_in_call_order() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True)
+    rendezvous = RendezvousTool(parties=3)
+    config.tool_registry.register_tool(rendezvous)
+    config.tool_registry.register_tool(EchoTool())
+    _allow_tool(config, "rendezvous")
+    _allow_tool(config, "echo")
+    _register_fanout_agents(config, ["agent_a", "agent_b", "agent_c"])
+
+    requests = [
+        _fanout_call("agent_a"),
+        ToolCallRequestInfo(name="echo", args={"text": "between"}, call_id="call-echo"),
+        _fanout_call("agent_b"),
+        _fanout_call("agent_c"),
+    ]
+    completed = schedule_agent_tools(config, requests, scheduler_id="root_agent")
+
+    assert rendezvous.peak == 3
+    assert [call.request.call_id for call in completed] == [
+        "call-agent_a",
+        "call-echo",
+        "call-agent_b",
+        "call-agent_c",
+    ]
+    assert all(call.status == CoreToolCallStatus.SUCCESS for call in completed)
+    assert [call.response.result_display["result"] for call in completed if call.request.name != "echo"] == [
+        "agent_a",
+        "agent_b",
+        "agent_c",
+    ]
+
+
+def test_parallel_subagents_respect_global_slot_cap() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True, max_parallel_subagents=1)
+    rendezvous = RendezvousTool(parties=3, timeout=0.3)
+    config.tool_registry.register_tool(rendezvous)
+    _allow_tool(config, "rendezvous")
+    _register_fanout_agents(config, ["agent_a", "agent_b", "agent_c"])
+
+    requests = [_fanout_call("agent_a"), _fanout_call("agent_b"), _fanout_call("agent_c")]
+    completed = schedule_agent_tools(config, requests, scheduler_id="root_agent")
+
+    # One worker thread plus the calling thread running the overflow inline.
+    assert rendezvous.peak == 2
+    assert [call.status for call in completed] == [CoreToolCallStatus.SUCCESS] * 3
+    assert config.subagent_slots.acquire(blocking=False) is True
+
+
+def test_zero_parallel_subagents_runs_serially() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True, max_parallel_subagents=0)
+    rendezvous = RendezvousTool(parties=1)
+    config.tool_registry.register_tool(rendezvous)
+    _allow_tool(config, "rendezvous")
+    _register_fanout_agents(config, ["agent_a", "agent_b"])
+
+    completed = schedule_agent_tools(
+        config, [_fanout_call("agent_a"), _fanout_call("agent_b")], scheduler_id="root_agent"
+    )
+
+    assert rendezvous.peak == 1
+    assert [call.request.call_id for call in completed] == ["call-agent_a", "call-agent_b"]
+
+
+def test_subagent_tool_reuses_scope_until_registries_mutate() -> None:
+    config = RuntimeConfig(target_dir=Path("."), interactive=True)
+    config.tool_registry.register_tool(EchoTool())
+    definition = AgentDefinition(
+        kind=AgentKind.LOCAL,
+        name="research_agent",
+        description="Research assistant",
+    )
+    assert config.get_agent_registry().register_agent(definition) is True
+    subagent_tool = SubagentToolWrapper(definition).build()
+    config.tool_registry.register_tool(subagent_tool)
+
+    allowed, registry = subagent_tool._agent_tool_scope(config)
+    assert allowed == {"echo"}
+    assert subagent_tool._agent_tool_scope(config) == (allowed, registry)
+
+    config.tool_registry.register_tool(UppercaseTool())
+    allowed_after_tool, registry_after_tool = subagent_tool._agent_tool_scope(config)
+    assert allowed_after_tool == {"echo", "uppercase"}
+    assert registry_after_tool is not registry
+    assert registry_after_tool.get_tool("uppercase") is not None
+
+    helper = AgentDefinition(kind=AgentKind.LOCAL, name="uppercase", description="Shadowing agent")
+    assert config.get_agent_registry().register_agent(helper) is True
+    allowed_after_agent, _ = subagent_tool._agent_tool_scope(config)
+    assert allowed_after_agent == {"echo"}
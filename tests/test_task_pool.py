@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.agents.llm_runner import AgentRunResult
+from py_agent_runtime.agents.task_pool import (
+    PromptTask,
+    completed_task_ids,
+    load_prompt_tasks,
+    run_prompt_tasks,
+)
+
+
+class FakeRunner:
+    def __init__(self, gate: threading.Barrier | None = None, fail: bool = False) -> None:
+        self._gate = gate
+        self._fail = fail
+
+    def run(self, user_prompt: str, system_prompt: str | None = None) -> AgentRunResult:
+        if self._gate is not None:
+            self._gate.wait(timeout=5)
+        if self._fail:
+            raise RuntimeError("boom")
+        return AgentRunResult(success=True, result=f"{system_prompt}:{user_prompt}", error=None, turns=1)
+
+
+def test_load_prompt_tasks_parses_ids_and_default_system_prompt(tmp_path: Path) -> None:
+    tasks_file = tmp_path / "tasks.jsonl"
+    tasks_file.write_text(
+        '{"id": "a", "prompt": "first"}\n'
+        "\n"
+        '{"prompt": "second", "system_prompt": "custom"}\n',
+        encoding="utf-8",
+    )
+    tasks = load_prompt_tasks(tasks_file, default_system_prompt="sys")
+    assert tasks == [
+        PromptTask(task_id="a", prompt="first", system_prompt="sys"),
+        PromptTask(task_id="line-3", prompt="second", system_prompt="custom"),
+    ]
+
+
+def test_load_prompt_tasks_rejects_duplicates_and_missing_prompt(tmp_path: Path) -> None:
+    tasks_file = tmp_path / "tasks.jsonl"
+    tasks_file.write_text('{"id": "a", "prompt": "x"}\n{"id": "a", "prompt": "y"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_prompt_tasks(tasks_file)
+    tasks_file.write_text('{"id": "a"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="prompt"):
+        load_prompt_tasks(tasks_file)
+
+
+def test_completed_task_ids_ignores_torn_lines(tmp_path: Path) -> None:
+    results = tmp_path / "results.jsonl"
+    assert completed_task_ids(results) == set()
+    results.write_text('{"id": "a", "success": true}\n{"id": "b", "succ', encoding="utf-8")
+    assert completed_task_ids(results) == {"a"}
+
+
+def test_run_prompt_tasks_runs_concurrently_and_reports_failures() -> None:
+    gate = threading.Barrier(3)
+    tasks = [PromptTask(task_id=str(index), prompt=f"p{index}") for index in range(3)]
+    results = list(
+        run_prompt_tasks(
+            tasks,
+            lambda task: FakeRunner(gate=gate, fail=task.task_id == "1"),  # type: ignore[arg-type,return-value]
+            workers=3,
+        )
+    )
+    by_id = {item.task.task_id: item for item in results}
+    assert set(by_id) == {"0", "1", "2"}
+    assert by_id["0"].result.result == "None:p0"
+    assert by_id["1"].result.success is False
+    assert by_id["1"].result.error == "boom"
+    record = by_id["2"].to_dict()
+    assert record["id"] == "2"
+    assert json.loads(json.dumps(record))["success"] is True
+
+
+def test_run_prompt_tasks_bounds_in_flight_work() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    class CountingRunner:
+        def run(self, user_prompt: str, system_prompt: str | None = None) -> AgentRunResult:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            with lock:
+                active -= 1
+            return AgentRunResult(success=True, result=user_prompt, error=None, turns=1)
+
+    tasks = (PromptTask(task_id=str(index), prompt=str(index)) for index in range(20))
+    results = list(run_prompt_tasks(tasks, lambda task: CountingRunner(), workers=2))  # type: ignore[arg-type,return-value]
+    assert len(results) == 20
+    assert peak <= 2
+    with pytest.raises(ValueError):
+        list(run_prompt_tasks([], lambda task: CountingRunner(), workers=0))  # type: ignore[arg-type,return-value]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.runtime import tool_outputs
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.runtime.tool_outputs import (
+    ToolOutputLimits,
+    ToolOutputStore,
+    bound_tool_output,
+)
+from py_agent_runtime.tools.read_tool_output import ReadToolOutputTool
+
+
+def test_limits_resolve_per_tool_caps() -> None:
+    limits = ToolOutputLimits(default_max_chars=100, per_tool={"read_file": 500, "glob": 0})
+    assert limits.max_chars_for("read_file") == 500
+    assert limits.max_chars_for("grep_search") == 100
+    assert limits.max_chars_for("glob") is None
+    assert ToolOutputLimits.unbounded().max_chars_for("read_file") is None
+    with pytest.raises(ValueError):
+        ToolOutputLimits(head_fraction=1.5)
+
+
+def test_bound_tool_output_keeps_small_output_untouched(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path / "outputs")
+    display = {"file_path": "/tmp/a.py", "content": "short"}
+    bounded = bound_tool_output(
+        display, tool_name="read_file", limits=ToolOutputLimits(), store=store
+    )
+    assert bounded.result_display is display
+    assert bounded.truncated is False
+    assert not (tmp_path / "outputs").exists()
+
+
+def test_bound_tool_output_spills_large_fields_with_head_and_tail(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path / "outputs")
+    stdout = "HEAD" + "x" * 5_000 + "TAIL"
+    display = {"command": "make", "stdout": stdout, "stderr": "", "exit_code": 0}
+    bounded = bound_tool_output(
+        display,
+        tool_name="run_shell_command",
+        limits=ToolOutputLimits(default_max_chars=1_000, per_tool={}),
+        store=store,
+    )
+
+    assert bounded.truncated is True
+    assert bounded.original_chars == len(stdout) + len("make")
+    assert len(bounded.handles) == 1
+    preview = bounded.result_display["stdout"]
+    assert preview.startswith("HEAD")
+    assert preview.endswith("TAIL")
+    assert bounded.handles[0] in preview
+    assert len(preview) < 1_200
+    assert bounded.result_display["command"] == "make"
+    assert bounded.result_display["exit_code"] == 0
+    text, total = store.read(bounded.handles[0])
+    assert text == stdout
+    assert total == len(stdout)
+
+
+def test_bound_tool_output_caps_many_leaf_displays_by_dropping_list_items(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path / "outputs")
+    matches = [
+        {"file_path": f"src/module_{index}.py", "line_number": index, "line": "x" * 150}
+        for index in range(10_000)
+    ]
+    display = {"query": "x", "path": "/repo", "matches": matches, "max_results": 10_000}
+
+    bounded = bound_tool_output(
+        display,
+        tool_name="grep_search",
+        limits=ToolOutputLimits(default_max_chars=24_000, per_tool={}),
+        store=store,
+    )
+
+    assert bounded.truncated is True
+    assert len(json.dumps(bounded.result_display, default=str)) <= 24_000
+    kept = bounded.result_display["matches"]
+    assert kept[0] == matches[0]
+    assert kept[-1] == matches[-1]
+    marker = next(item for item in kept if isinstance(item, str))
+    assert f"of {len(matches)} items omitted" in marker
+    assert bounded.result_display["query"] == "x"
+    handle = next(handle for handle in bounded.handles if handle in marker)
+    text, _ = store.read(handle)
+    assert [json.loads(line) for line in text.splitlines()] == matches
+
+
+def test_bound_tool_output_counts_structure_against_the_cap(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path / "outputs")
+    display = {"lines": ["é\n" * 400, "y" * 2_000], "numbers": list(range(200))}
+
+    bounded = bound_tool_output(
+        display,
+        tool_name="run_shell_command",
+        limits=ToolOutputLimits(default_max_chars=2_000, per_tool={}),
+        store=store,
+    )
+
+    assert bounded.truncated is True
+    assert len(json.dumps(bounded.result_display, default=str)) <= 2_000
+
+
+def test_store_rejects_invalid_handles(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.read("../escape")
+    with pytest.raises(KeyError):
+        store.read("missing-handle")
+
+
+def test_store_reads_pages_of_multibyte_text_by_seeking(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(tool_outputs, "_SPILL_INDEX_STRIDE_CHARS", 3)
+    store = ToolOutputStore(tmp_path)
+    content = "aé€😀\r\nbçd漢字e"
+    handle = store.spill("shell", content)
+
+    for offset in range(len(content) + 2):
+        for limit in (1, 2, 5, None):
+            end = None if limit is None else offset + limit
+            assert store.read(handle, offset=offset, limit=limit) == (
+                content[offset:end],
+                len(content),
+            ), (offset, limit)
+
+
+def test_read_tool_output_pages_are_not_bounded_again(tmp_path: Path) -> None:
+    store = ToolOutputStore(tmp_path / "outputs")
+    # Escaped as \uXXXX, 16,000 CJK characters serialize well past the 32k default cap.
+    page = {"handle": "h", "offset": 0, "content": "漢" * 16_000}
+
+    bounded = bound_tool_output(
+        page, tool_name="read_tool_output", limits=ToolOutputLimits(), store=store
+    )
+
+    assert bounded.truncated is False
+    assert bounded.result_display is page
+
+
+def test_read_tool_output_pages_through_spilled_text(tmp_path: Path) -> None:
+    config = RuntimeConfig(target_dir=tmp_path)
+    handle = config.tool_output_store.spill("run_shell_command", "abcdefghij")
+    assert str(config.tool_output_store.root).startswith(str(tmp_path / ".gemini" / "tmp"))
+    tool = ReadToolOutputTool()
+
+    first = tool.execute(config, {"handle": handle, "offset": 0, "limit": 4})
+    assert first.error is None
+    assert first.llm_content == "abcd"
+    assert first.return_display["next_offset"] == 4
+    assert first.return_display["total_chars"] == 10
+
+    last = tool.execute(config, {"handle": handle, "offset": 8, "limit": 4})
+    assert last.llm_content == "ij"
+    assert last.return_display["next_offset"] is None
+
+    missing = tool.execute(config, {"handle": "nope"})
+    assert missing.error is not None
+    assert tool.validate_params({"handle": handle, "limit": 0}) is not None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.runtime.config import RuntimeConfig
+from py_agent_runtime.tools.grep_search import GrepSearchTool
+from py_agent_runtime.tools.trigram_index import (
+    INDEX_FILENAME,
+    INDEX_SUBDIR,
+    TrigramIndex,
+    required_trigrams,
+    reset_shared_trigram_indexes,
+)
+
+_OLD_NS = 1_000_000_000_000_000_000
+
+
+def _trigram(text: str) -> int:
+    return int.from_bytes(text.encode("utf-8"), "big")
+
+
+def _write(root: Path, relative: str, content: str | bytes) -> Path:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    # Age the file past the racy window so the index trusts its mtime.
+    os.utime(path, ns=(_OLD_NS, _OLD_NS))
+    return path
+
+
+def test_required_trigrams_for_literals_and_regexes() -> None:
+    assert required_trigrams("Parse", use_regex=False, case_sensitive=True) == {
+        _trigram("par"),
+        _trigram("ars"),
+        _trigram("rse"),
+    }
+    # i/k/s also case-fold to non-ASCII characters, so caseless queries drop them.
+    assert required_trigrams("Parse", use_regex=False, case_sensitive=False) == {_trigram("par")}
+    assert required_trigrams("ab", use_regex=False, case_sensitive=True) is None
+    assert required_trigrams("def (foo|bar)", use_regex=True, case_sensitive=True) == {
+        _trigram("def"),
+        _trigram("ef "),
+    }
+    assert required_trigrams(r"^foo\d+bar(qux)?$", use_regex=True, case_sensitive=True) == {
+        _trigram("foo"),
+        _trigram("bar"),
+    }
+    assert required_trigrams("(?i)FOO", use_regex=True, case_sensitive=True) == {_trigram("foo")}
+    assert required_trigrams("foo|bar", use_regex=True, case_sensitive=True) is None
+    assert required_trigrams("[a-z]+", use_regex=True, case_sensitive=True) is None
+
+
+def test_index_narrows_candidates_and_refreshes_incrementally(tmp_path: Path) -> None:
+    _write(tmp_path, "a.py", "def parse_args():\n    pass\n")
+    _write(tmp_path, "b.py", "def render():\n    pass\n")
+    _write(tmp_path, "pkg/c.py", "PARSE = 1\n")
+    _write(tmp_path, "blob.bin", b"\xffparse")
+    index = TrigramIndex(tmp_path)
+
+    assert index.refresh().added == 4
+    parse = required_trigrams("parse", use_regex=False, case_sensitive=True)
+    assert parse is not None
+    assert index.candidates(parse) == [tmp_path / "a.py", tmp_path / "pkg" / "c.py"]
+    assert (tmp_path / INDEX_SUBDIR / INDEX_FILENAME).is_file()
+
+    _write(tmp_path, "b.py", "def render(parsed):\n    pass\n")
+    (tmp_path / "a.py").unlink()
+    stats = index.refresh()
+    assert (stats.added, stats.updated, stats.removed, stats.unchanged) == (0, 1, 1, 2)
+    assert index.candidates(parse) == [tmp_path / "b.py", tmp_path / "pkg" / "c.py"]
+    index.close()
+
+    reopened = TrigramIndex(tmp_path)
+    assert reopened.refresh().unchanged == 3
+    reopened.close()
+
+
+def test_index_keeps_oversized_and_recent_files_as_candidates(tmp_path: Path) -> None:
+    _write(tmp_path, "big.txt", "x" * 64)
+    fresh = tmp_path / "fresh.txt"
+    fresh.write_text("alpha\n", encoding="utf-8")
+    index = TrigramIndex(tmp_path, max_file_bytes=32)
+    trigrams = required_trigrams("needle", use_regex=False, case_sensitive=True)
+    assert trigrams is not None
+
+    assert index.candidates(trigrams) == [tmp_path / "big.txt"]
+    # Same size, same second: a racily-clean entry is re-read rather than trusted.
+    fresh.write_text("needl\n", encoding="utf-8")
+    assert index.refresh().updated == 1
+    index.close()
+
+
+@pytest.mark.parametrize(
+    ("query", "case_sensitive", "use_regex"),
+    [
+        ("needle", False, False),
+        ("Needle", True, False),
+        ("NEEDLE", False, False),
+        ("kelvin", False, False),
+        (r"need(le)+\s*=", True, True),
+        ("n.edle|haystack", False, True),
+        ("(?i)HAY", True, True),
+    ],
+)
+def test_grep_with_index_matches_full_scan(
+    tmp_path: Path, query: str, case_sensitive: bool, use_regex: bool
+) -> None:
+    _write(tmp_path, "a.txt", "needle = 1\nhaystack\n")
+    _write(tmp_path, "b.txt", "Needle\nneedleneedle =\n")
+    _write(tmp_path, "c/d.txt", "nothing here\n")
+    _write(tmp_path, "c/e.txt", "\u212aELVIN and NEEDLE\n")
+    params = {"query": query, "case_sensitive": case_sensitive, "use_regex": use_regex}
+    try:
+        expected = GrepSearchTool().execute(RuntimeConfig(target_dir=tmp_path), params)
+        indexed = GrepSearchTool().execute(
+            RuntimeConfig(target_dir=tmp_path, grep_index=True), params
+        )
+    finally:
+        reset_shared_trigram_indexes()
+
+    assert indexed.error is None
+    assert isinstance(expected.return_display, dict) and expected.return_display["matches"]
+    assert indexed.return_display == expected.return_display
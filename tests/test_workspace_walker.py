@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from py_agent_runtime.tools.workspace_walker import (
+    GlobMatcher,
+    IgnoreFile,
+    ignore_stack_for,
+    iter_workspace_files,
+)
+
+
+def _make_tree(root: Path, files: list[str] | None = None) -> None:
+    default = ["a.py", "b.txt", "src/a.py", "src/pkg/c.py", "src/pkg/d.txt", "docs/x.md"]
+    for relative in files or default:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+
+
+def _relative(root: Path, paths: list[Path]) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+@pytest.mark.parametrize("pattern", ["**/*", "*.py", "**/*.py", "src/**/*.py", "*/*", "src/*"])
+def test_iter_workspace_files_matches_sorted_path_glob(tmp_path: Path, pattern: str) -> None:
+    _make_tree(tmp_path)
+
+    expected = [path for path in sorted(tmp_path.glob(pattern)) if path.is_file()]
+
+    assert list(iter_workspace_files(tmp_path, pattern)) == expected
+
+
+def test_glob_matcher_prunes_unreachable_directories() -> None:
+    matcher = GlobMatcher("src/**/*.py")
+
+    assert matcher.may_contain(("src",))
+    assert matcher.may_contain(("src", "pkg", "deep"))
+    assert not matcher.may_contain(("docs",))
+    assert not GlobMatcher("*.py").may_contain(("src",))
+    assert matcher.matches(("src", "a.py"))
+    assert not matcher.matches(("src", "a.txt"))
+
+
+def test_glob_matcher_rejects_absolute_patterns() -> None:
+    with pytest.raises(ValueError):
+        GlobMatcher("/etc/*")
+
+
+@pytest.mark.parametrize(
+    ("rule", "path", "is_dir", "expected"),
+    [
+        ("*.log", "deep/x.log", False, True),
+        ("build/", "src/build", True, True),
+        ("build/", "src/build", False, None),
+        ("/top.txt", "sub/top.txt", False, None),
+        ("/top.txt", "top.txt", False, True),
+        ("docs/**/*.tmp", "docs/a/b/f.tmp", False, True),
+        ("docs/**/*.tmp", "x/docs/f.tmp", False, None),
+        ("**/cache", "a/b/cache", True, True),
+        ("a/**", "a/b/c", False, True),
+        ("[!d]y.c", "dy.c", False, None),
+        ("\\#hash", "#hash", False, True),
+        ("!keep.log", "keep.log", False, False),
+    ],
+)
+def test_ignore_file_follows_gitignore_rules(
+    rule: str, path: str, is_dir: bool, expected: bool | None
+) -> None:
+    assert IgnoreFile([rule]).match(path, is_dir) is expected
+
+
+def test_iter_workspace_files_prunes_ignored_directories(tmp_path: Path) -> None:
+    _make_tree(
+        tmp_path,
+        [
+            "app.py",
+            "debug.log",
+            "keep.log",
+            "build/out.py",
+            ".git/HEAD",
+            "node_modules/pkg/index.js",
+            ".venv/pyvenv.cfg",
+            ".venv/lib/site.py",
+            "src/gen/x.py",
+            "src/main.py",
+            "src/notes.md",
+        ],
+    )
+    (tmp_path / ".gitignore").write_text("*.log\n!keep.log\nbuild/\n", encoding="utf-8")
+    (tmp_path / "src" / ".gitignore").write_text("gen/\n*.md\n", encoding="utf-8")
+    (tmp_path / "src" / ".ignore").write_text("!notes.md\n", encoding="utf-8")
+
+    walked = list(iter_workspace_files(tmp_path))
+
+    assert _relative(tmp_path, walked) == [
+        ".gitignore",
+        "app.py",
+        "keep.log",
+        "src/.gitignore",
+        "src/.ignore",
+        "src/main.py",
+        "src/notes.md",
+    ]
+    assert len(list(iter_workspace_files(tmp_path, respect_ignore=False))) == 14
+
+
+def test_iter_workspace_files_applies_ancestor_rules_from_root(tmp_path: Path) -> None:
+    _make_tree(tmp_path, ["src/a.py", "src/a.pyc", "src/build/b.py"])
+    (tmp_path / ".gitignore").write_text("*.pyc\nbuild/\n", encoding="utf-8")
+    base = tmp_path / "src"
+
+    assert _relative(base, list(iter_workspace_files(base, root=tmp_path))) == ["a.py"]
+    assert ignore_stack_for(tmp_path, base / "build")[1]
+    assert not ignore_stack_for(tmp_path, base)[1]
+    # An explicitly requested ignored directory is still walked.
+    walked = iter_workspace_files(base / "build", root=tmp_path)
+    assert _relative(base, list(walked)) == ["build/b.py"]